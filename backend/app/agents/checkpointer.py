@@ -0,0 +1,496 @@
+"""
+Postgres-backed LangGraph checkpointer for node-granular workflow resume.
+
+Checkpoints are stored as compact per-superstep deltas: the checkpoint row
+holds only channel versions and bookkeeping, while channel values live in a
+blob table keyed by (channel, version) and are written only for the channels
+that changed in that superstep (LangGraph's ``new_versions``). Pending writes
+of tasks that finished inside an interrupted superstep are stored as well,
+so a resumed run skips every node that already completed - including
+finished parallel branches - and never repeats their LLM calls.
+
+Values that cannot be serialized (progress callbacks and other transient
+callables) are not persisted; callers re-inject them when resuming (see
+``ainvoke_checkpointed``).
+
+Persistence is best-effort: database errors are logged and the workflow keeps
+running without a checkpoint rather than failing the analysis.
+"""
+
+import logging
+import random
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.types import Command
+
+from app.core.config import get_settings
+from app.database.connection import get_service_role_connection
+
+logger = logging.getLogger(__name__)
+
+# Separator between a workflow thread id and the threads of its subflows
+SUBFLOW_THREAD_SEPARATOR = "/"
+
+_SELECT_CHECKPOINT_SQL = """
+    SELECT checkpoint_id, parent_checkpoint_id, checkpoint_type, checkpoint,
+           metadata_type, metadata
+    FROM workflow_checkpoints
+    WHERE thread_id = $1 AND checkpoint_ns = $2
+"""
+
+
+def _dumps(serde: Any, value: Any) -> Optional[Tuple[str, bytes]]:
+    """Serialize a value, returning None for transient (unserializable) values."""
+    try:
+        return serde.dumps_typed(value)
+    except (TypeError, ValueError) as e:
+        logger.debug(f"[Checkpointer] Skipping unserializable value: {e}")
+        return None
+
+
+class PostgresCheckpointSaver(BaseCheckpointSaver[str]):
+    """Async LangGraph checkpoint saver backed by the service-role asyncpg pool."""
+
+    def __init__(self, *, serde: Any = None, connection_factory: Any = None):
+        super().__init__(serde=serde)
+        self._connection_factory = connection_factory or get_service_role_connection
+
+    # ---------- Read path ----------
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        try:
+            async with self._connection_factory() as conn:
+                if checkpoint_id:
+                    row = await conn.fetchrow(
+                        _SELECT_CHECKPOINT_SQL + " AND checkpoint_id = $3",
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint_id,
+                    )
+                else:
+                    row = await conn.fetchrow(
+                        _SELECT_CHECKPOINT_SQL + " ORDER BY checkpoint_id DESC LIMIT 1",
+                        thread_id,
+                        checkpoint_ns,
+                    )
+                if row is None:
+                    return None
+                return await self._load_tuple(conn, thread_id, checkpoint_ns, row)
+        except Exception as e:
+            logger.warning(
+                f"[Checkpointer] Failed to load checkpoint for {thread_id}: {e}"
+            )
+            return None
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        if not config:
+            # Listing across all threads is not supported for this store
+            return
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        query = _SELECT_CHECKPOINT_SQL
+        args: List[Any] = [thread_id, checkpoint_ns]
+        if before and (before_id := get_checkpoint_id(before)):
+            args.append(before_id)
+            query += f" AND checkpoint_id < ${len(args)}"
+        query += " ORDER BY checkpoint_id DESC"
+
+        async with self._connection_factory() as conn:
+            rows = await conn.fetch(query, *args)
+            yielded = 0
+            for row in rows:
+                if limit is not None and yielded >= limit:
+                    break
+                item = await self._load_tuple(conn, thread_id, checkpoint_ns, row)
+                if filter and not all(
+                    item.metadata.get(k) == v for k, v in filter.items()
+                ):
+                    continue
+                yielded += 1
+                yield item
+
+    async def _load_tuple(
+        self, conn: Any, thread_id: str, checkpoint_ns: str, row: Any
+    ) -> CheckpointTuple:
+        checkpoint_id = row["checkpoint_id"]
+        checkpoint: Checkpoint = self.serde.loads_typed(
+            (row["checkpoint_type"], bytes(row["checkpoint"]))
+        )
+        metadata = self.serde.loads_typed(
+            (row["metadata_type"], bytes(row["metadata"]))
+        )
+
+        versions = checkpoint.get("channel_versions") or {}
+        channel_values: Dict[str, Any] = {}
+        if versions:
+            blob_rows = await conn.fetch(
+                """
+                SELECT b.channel, b.type, b.blob
+                FROM workflow_checkpoint_blobs b
+                JOIN unnest($3::text[], $4::text[]) AS v(channel, version)
+                  ON b.channel = v.channel AND b.version = v.version
+                WHERE b.thread_id = $1 AND b.checkpoint_ns = $2
+                """,
+                thread_id,
+                checkpoint_ns,
+                list(versions.keys()),
+                [str(v) for v in versions.values()],
+            )
+            for blob in blob_rows:
+                if blob["type"] != "empty":
+                    channel_values[blob["channel"]] = self.serde.loads_typed(
+                        (blob["type"], bytes(blob["blob"]))
+                    )
+
+        write_rows = await conn.fetch(
+            """
+            SELECT task_id, channel, type, blob
+            FROM workflow_checkpoint_writes
+            WHERE thread_id = $1 AND checkpoint_ns = $2 AND checkpoint_id = $3
+            ORDER BY task_id, idx
+            """,
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+        )
+        pending_writes = [
+            (
+                w["task_id"],
+                w["channel"],
+                self.serde.loads_typed((w["type"], bytes(w["blob"]))),
+            )
+            for w in write_rows
+        ]
+
+        parent_id = row["parent_checkpoint_id"]
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=metadata,
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=pending_writes,
+        )
+
+    # ---------- Write path ----------
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        next_config: RunnableConfig = {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+        stored = checkpoint.copy()
+        values: Dict[str, Any] = stored.pop("channel_values", {})  # type: ignore[misc]
+        # Only channels that changed in this superstep get a new blob
+        blob_rows = []
+        for channel, version in new_versions.items():
+            if channel in values:
+                typed = _dumps(self.serde, values[channel])
+                if typed is None:
+                    continue
+            else:
+                typed = ("empty", b"")
+            blob_rows.append(
+                (thread_id, checkpoint_ns, channel, str(version), typed[0], typed[1])
+            )
+
+        checkpoint_type, checkpoint_blob = self.serde.dumps_typed(stored)
+        metadata_type, metadata_blob = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+
+        try:
+            async with self._connection_factory() as conn:
+                async with conn.transaction():
+                    if blob_rows:
+                        await conn.executemany(
+                            """
+                            INSERT INTO workflow_checkpoint_blobs
+                                (thread_id, checkpoint_ns, channel, version, type, blob)
+                            VALUES ($1, $2, $3, $4, $5, $6)
+                            ON CONFLICT (thread_id, checkpoint_ns, channel, version)
+                            DO NOTHING
+                            """,
+                            blob_rows,
+                        )
+                    await conn.execute(
+                        """
+                        INSERT INTO workflow_checkpoints
+                            (thread_id, checkpoint_ns, checkpoint_id,
+                             parent_checkpoint_id, checkpoint_type, checkpoint,
+                             metadata_type, metadata)
+                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                        ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id)
+                        DO UPDATE SET checkpoint_type = EXCLUDED.checkpoint_type,
+                                      checkpoint = EXCLUDED.checkpoint,
+                                      metadata_type = EXCLUDED.metadata_type,
+                                      metadata = EXCLUDED.metadata
+                        """,
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint["id"],
+                        configurable.get("checkpoint_id"),
+                        checkpoint_type,
+                        checkpoint_blob,
+                        metadata_type,
+                        metadata_blob,
+                    )
+        except Exception as e:
+            logger.warning(
+                f"[Checkpointer] Failed to save checkpoint for {thread_id}: {e}"
+            )
+        return next_config
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable["checkpoint_id"]
+
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            typed = _dumps(self.serde, value)
+            if typed is None:
+                continue
+            rows.append(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id,
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    typed[0],
+                    typed[1],
+                    task_path,
+                )
+            )
+        if not rows:
+            return
+
+        # Special writes (errors, interrupts) replace earlier ones; regular
+        # task writes are immutable once stored
+        on_conflict = (
+            "DO UPDATE SET channel = EXCLUDED.channel, type = EXCLUDED.type, "
+            "blob = EXCLUDED.blob"
+            if all(channel in WRITES_IDX_MAP for channel, _ in writes)
+            else "DO NOTHING"
+        )
+        try:
+            async with self._connection_factory() as conn:
+                await conn.executemany(
+                    f"""
+                    INSERT INTO workflow_checkpoint_writes
+                        (thread_id, checkpoint_ns, checkpoint_id, task_id, idx,
+                         channel, type, blob, task_path)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+                    ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                    {on_conflict}
+                    """,
+                    rows,
+                )
+        except Exception as e:
+            logger.warning(
+                f"[Checkpointer] Failed to save writes for {thread_id}/{task_id}: {e}"
+            )
+
+    # ---------- Cleanup ----------
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Delete a thread's checkpoints together with its subflow threads."""
+        await self._delete_threads(
+            "thread_id = $1 OR thread_id LIKE $2",
+            thread_id,
+            f"{thread_id}{SUBFLOW_THREAD_SEPARATOR}%",
+        )
+
+    async def adelete_expired(self, max_age_hours: int) -> int:
+        """Delete threads whose latest checkpoint is older than ``max_age_hours``.
+
+        Returns:
+            Number of threads removed
+        """
+        async with self._connection_factory() as conn:
+            async with conn.transaction():
+                expired = await conn.fetch(
+                    """
+                    SELECT thread_id FROM workflow_checkpoints
+                    GROUP BY thread_id
+                    HAVING MAX(created_at) < NOW() - make_interval(hours => $1)
+                    """,
+                    max_age_hours,
+                )
+                thread_ids = [r["thread_id"] for r in expired]
+                if thread_ids:
+                    for table in (
+                        "workflow_checkpoint_writes",
+                        "workflow_checkpoint_blobs",
+                        "workflow_checkpoints",
+                    ):
+                        await conn.execute(
+                            f"DELETE FROM {table} WHERE thread_id = ANY($1::text[])",
+                            thread_ids,
+                        )
+        return len(thread_ids)
+
+    async def _delete_threads(self, where: str, *args: Any) -> None:
+        async with self._connection_factory() as conn:
+            async with conn.transaction():
+                for table in (
+                    "workflow_checkpoint_writes",
+                    "workflow_checkpoint_blobs",
+                    "workflow_checkpoints",
+                ):
+                    await conn.execute(f"DELETE FROM {table} WHERE {where}", *args)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+
+# Global checkpointer instance
+_workflow_checkpointer: Optional[PostgresCheckpointSaver] = None
+
+
+def get_workflow_checkpointer() -> Optional[BaseCheckpointSaver]:
+    """Get the shared workflow checkpointer, or None when checkpointing is disabled."""
+    global _workflow_checkpointer
+    if not get_settings().workflow_checkpointing_enabled:
+        return None
+    if _workflow_checkpointer is None:
+        _workflow_checkpointer = PostgresCheckpointSaver()
+    return _workflow_checkpointer
+
+
+def workflow_thread_id(state: Dict[str, Any]) -> Optional[str]:
+    """Stable checkpoint thread id for a contract analysis run."""
+    user_id = (state or {}).get("user_id")
+    content_hash = (state or {}).get("content_hash")
+    if not user_id or not content_hash:
+        return None
+    return f"contract_analysis:{user_id}:{content_hash}"
+
+
+def subflow_thread_id(name: str) -> Optional[str]:
+    """Derive a subflow thread id from the checkpointed graph currently running.
+
+    Returns None outside a checkpointed parent run, in which case the subflow
+    runs without persistence.
+    """
+    from langgraph.config import get_config
+
+    try:
+        parent_thread = get_config().get("configurable", {}).get("thread_id")
+    except RuntimeError:
+        return None
+    if not parent_thread:
+        return None
+    return f"{parent_thread}{SUBFLOW_THREAD_SEPARATOR}{name}"
+
+
+async def ainvoke_checkpointed(
+    graph: Any,
+    state: Dict[str, Any],
+    thread_id: str,
+    checkpointer: BaseCheckpointSaver,
+    *,
+    allow_resume: bool = True,
+    delete_on_success: bool = True,
+) -> Dict[str, Any]:
+    """Invoke a compiled graph against a checkpoint thread.
+
+    If the thread holds an interrupted run (pending next nodes) and
+    ``allow_resume`` is set, the run continues from its last checkpoint:
+    completed nodes and finished branches of the interrupted superstep are
+    not executed again. Transient callables from ``state`` are re-injected
+    since they are never persisted. Otherwise any stale thread is discarded
+    and the graph starts fresh from ``state``.
+
+    The subflow is run as its own top-level graph (its configurable is not
+    inherited from the caller) so LangGraph applies saved pending writes on
+    the first resumed superstep.
+    """
+    if getattr(graph, "checkpointer", None) is not checkpointer:
+        graph = graph.copy(update={"checkpointer": checkpointer})
+    config: RunnableConfig = {"configurable": {"thread_id": thread_id}}
+
+    snapshot = await graph.aget_state(config) if allow_resume else None
+    if snapshot is not None and snapshot.next:
+        transient = {k: v for k, v in (state or {}).items() if callable(v)}
+        logger.info(f"[Checkpointer] Resuming {thread_id} at {list(snapshot.next)}")
+        result = await graph.ainvoke(
+            Command(update=transient) if transient else None, config
+        )
+    else:
+        try:
+            await checkpointer.adelete_thread(thread_id)
+        except Exception as e:
+            logger.warning(f"[Checkpointer] Failed to clear thread {thread_id}: {e}")
+        result = await graph.ainvoke(state, config)
+
+    if delete_on_success:
+        try:
+            await checkpointer.adelete_thread(thread_id)
+        except Exception as e:
+            logger.warning(f"[Checkpointer] Failed to clear thread {thread_id}: {e}")
+    return result
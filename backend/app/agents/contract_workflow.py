@@ -12,6 +12,14 @@ from datetime import datetime, UTC
 
 # Core imports
 from app.agents.states.contract_state import RealEstateAgentState
+from app.agents.full_text_memo import FullTextMemo, full_text_memo_scope
+from app.agents.run_blobs import (
+    RunBlobStore,
+    is_blob_ref,
+    resolve_blob,
+    run_blob_scope,
+)
+from app.core.span_trace import span, trace_scope
 from app.schema.enums import ProcessingStatus
 from app.core.async_utils import AsyncContextManager
 from app.prompts.schema.workflow_outputs import (
@@ -188,6 +196,9 @@ class ContractAnalysisWorkflow:
             "validation_failures": 0,
             "total_processing_time": 0.0,
             "average_processing_time": 0.0,
+            "full_text_memo_hits": 0,
+            "full_text_memo_misses": 0,
+            "peak_state_bytes": 0,
         }
 
         # Environment-aware logging
@@ -202,11 +213,6 @@ class ContractAnalysisWorkflow:
             and not self._is_production
         )
 
-        # Persistent event loop for node execution in worker context to avoid
-        # cross-loop issues with async resources (e.g., asyncpg pools, clients)
-        self._event_loop = None
-        self._event_loop_thread = None
-
         # Initialize node instances
         self._initialize_nodes()
 
@@ -271,8 +277,14 @@ class ContractAnalysisWorkflow:
                 logger.warning(f"Failed to initialize Gemini client: {e}")
                 self.gemini_client = None
 
-            # Verify at least one client is available
-            if not self.openai_client and not self.gemini_client:
+            # Verify at least one client is available (replayed runs need none)
+            from app.core.llm_replay import get_llm_replay
+
+            if (
+                not self.openai_client
+                and not self.gemini_client
+                and not get_llm_replay().replaying
+            ):
                 error_msg = (
                     "No AI clients could be initialized. Both OpenAI and Gemini failed. "
                     "Please check your API keys and configuration."
@@ -389,225 +401,19 @@ class ContractAnalysisWorkflow:
         return workflow.compile()
 
     # Node execution wrapper methods
-    def _run_async_node(self, node_coro_factory):
-        """Run async node in a persistent event loop to prevent cross-loop issues.
-
-        Accepts a factory callable to create a FRESH coroutine each time we schedule,
-        avoiding reusing an already-awaited coroutine when falling back across paths.
-        """
-        import asyncio
-        import threading
-        import contextvars
-
-        # Diagnostic: capture loop/thread/auth context before execution
-        try:
-            from app.core.auth_context import AuthContext
-
-            auth_ctx = AuthContext.create_task_context()
-            logger.debug(
-                "[Workflow] _run_async_node pre-exec",
-                extra={
-                    "thread_name": threading.current_thread().name,
-                    "has_running_loop": True,
-                    "user_id": AuthContext.get_user_id(),
-                    "has_token": bool(AuthContext.get_user_token()),
-                    # Add coroutine identity to help diagnose reuse
-                    "coroutine_repr": repr(node_coro_factory),
-                    "coroutine_id": id(node_coro_factory),
-                },
-            )
-        except Exception:
-            auth_ctx = None  # type: ignore[assignment]
-
-        try:
-            # If already inside an async loop (e.g., being called from an async context),
-            # dispatch the coroutine to a persistent background event loop running in a
-            # dedicated thread to avoid creating a new loop per call (which breaks DB pools).
-            running_loop = asyncio.get_running_loop()
-            if running_loop is None:
-                raise RuntimeError("No running event loop found")
-
-            # Lazily start a dedicated background loop thread
-            if (
-                self._event_loop is None
-                or self._event_loop.is_closed()
-                or self._event_loop_thread is None
-            ):
-                import threading as _threading
-
-                def _loop_worker():
-                    self._event_loop = asyncio.new_event_loop()
-                    try:
-                        self._event_loop.run_forever()
-                    finally:
-                        try:
-                            self._event_loop.close()
-                        except Exception:
-                            pass
-
-                self._event_loop_thread = _threading.Thread(
-                    target=_loop_worker, name="workflow-loop", daemon=True
-                )
-                self._event_loop_thread.start()
-
-                # Wait briefly for loop to start
-                import time as _time
-
-                for _ in range(50):
-                    if self._event_loop is not None and self._event_loop.is_running():
-                        break
-                    _time.sleep(0.01)
-
-            # Submit coroutine to the persistent background loop
-            import concurrent.futures as _cf
-
-            # Capture contextvars to propagate tracing/auth context
-            current_context = contextvars.copy_context()
-
-            async def _wrapper():
-                try:
-                    from app.core.auth_context import AuthContext as _AC
-
-                    if auth_ctx:
-                        _AC.restore_task_context(auth_ctx)
-                except Exception:
-                    pass
-                # Create a fresh coroutine per scheduling
-                return await node_coro_factory()
-
-            future = _cf.Future()
-
-            def _submit_to_loop():
-                try:
-                    task = self._event_loop.create_task(_wrapper())
-                    task.add_done_callback(
-                        lambda t: (
-                            future.set_result(t.result())
-                            if not t.exception()
-                            else future.set_exception(t.exception())
-                        )
-                    )
-                except Exception as submit_error:
-                    future.set_exception(submit_error)
-
-            # Use call_soon_threadsafe to schedule the coroutine
-            self._event_loop.call_soon_threadsafe(
-                lambda: current_context.run(_submit_to_loop)
-            )
-            result = future.result()
-            try:
-                logger.debug(
-                    "[Workflow] _run_async_node post-exec",
-                    extra={
-                        "coroutine_id": id(node_coro_factory),
-                        "coroutine_repr": repr(node_coro_factory),
-                    },
-                )
-            except Exception:
-                pass
-            return result
-        except (RuntimeError, AttributeError, ImportError) as loop_error:
-            # No running loop, asyncio not available, or loop detection failed
-            logger.debug(
-                f"[Workflow] No running loop detected ({type(loop_error).__name__}: {loop_error}), creating persistent loop"
-            )
-            # Ensure a persistent background loop is running, then schedule onto it
-            import threading as _threading
-            import time as _time
-            import concurrent.futures as _cf
-            import contextvars as _ctxvars
-
-            # Start background loop thread if needed
-            if (
-                self._event_loop is None
-                or self._event_loop.is_closed()
-                or self._event_loop_thread is None
-                or not getattr(self._event_loop, "is_running", lambda: False)()
-            ):
-
-                def _loop_worker():
-                    import asyncio as _asyncio
-
-                    self._event_loop = _asyncio.new_event_loop()
-                    try:
-                        self._event_loop.run_forever()
-                    finally:
-                        try:
-                            self._event_loop.close()
-                        except Exception:
-                            pass
-
-                self._event_loop_thread = _threading.Thread(
-                    target=_loop_worker, name="workflow-loop", daemon=True
-                )
-                self._event_loop_thread.start()
-
-                # Wait briefly for loop to start
-                for _ in range(50):
-                    if self._event_loop is not None and self._event_loop.is_running():
-                        break
-                    _time.sleep(0.01)
-
-            # Schedule coroutine onto the background loop and wait synchronously
-            current_context = _ctxvars.copy_context()
-
-            async def _wrapper_bg():
-                try:
-                    from app.core.auth_context import AuthContext as _AC
-
-                    if auth_ctx:
-                        _AC.restore_task_context(auth_ctx)
-                except Exception:
-                    pass
-                # Create a fresh coroutine per scheduling
-                return await node_coro_factory()
-
-            future = _cf.Future()
-
-            def _submit_to_running_loop():
-                try:
-                    task = self._event_loop.create_task(_wrapper_bg())
-                    task.add_done_callback(
-                        lambda t: (
-                            future.set_result(t.result())
-                            if not t.exception()
-                            else future.set_exception(t.exception())
-                        )
-                    )
-                except Exception as submit_error:
-                    future.set_exception(submit_error)
-
-            self._event_loop.call_soon_threadsafe(
-                lambda: current_context.run(_submit_to_running_loop)
-            )
-
-            result = future.result()
-
-            # Do not close persistent loop; reuse across nodes
-            try:
-                from app.core.auth_context import AuthContext
-
-                logger.debug(
-                    "[Workflow] _run_async_node post-exec (background loop)",
-                    extra={
-                        "thread_name": _threading.current_thread().name,
-                        "execution_path": "background_loop",
-                        "had_running_loop": False,
-                        "user_id": AuthContext.get_user_id(),
-                        "has_token": bool(AuthContext.get_user_token()),
-                        "coroutine_id": id(node_coro_factory),
-                        "coroutine_repr": repr(node_coro_factory),
-                    },
-                )
-            except Exception:
-                pass
-
-            return result
+    #
+    # The compiled graph is driven with `ainvoke`, so every node below runs as
+    # a task on the event loop that called `analyze_contract`. Loop affinity
+    # contract: that loop is the one ConnectionPoolManager binds its asyncpg
+    # pools to (via AsyncContextManager), and node code must keep all DB and
+    # client I/O on it - no background loops or thread hops while holding a
+    # connection. Auth and LLM-metrics context vars propagate through the
+    # LangGraph task context, so no manual restore is needed.
 
     @langsmith_trace(name="validate_input", run_type="tool")
-    def validate_input(self, state: RealEstateAgentState) -> RealEstateAgentState:
+    async def validate_input(self, state: RealEstateAgentState) -> RealEstateAgentState:
         """Execute input validation node."""
-        return self._run_async_node(lambda: self.input_validation_node.execute(state))
+        return await self.input_validation_node.execute(state)
 
     async def extract_entities(
         self, state: RealEstateAgentState
@@ -633,28 +439,32 @@ class ContractAnalysisWorkflow:
                 state, e, "Section extraction failed"
             )
 
-    def step1_extraction(self, state: RealEstateAgentState) -> RealEstateAgentState:
+    async def step1_extraction(
+        self, state: RealEstateAgentState
+    ) -> RealEstateAgentState:
         """Execute Step 1 entry node that runs entities + sections subflow."""
-        return self._run_async_node(lambda: self.step1_extraction_node.execute(state))
+        return await self.step1_extraction_node.execute(state)
 
-    def process_document(self, state: RealEstateAgentState) -> RealEstateAgentState:
+    async def process_document(
+        self, state: RealEstateAgentState
+    ) -> RealEstateAgentState:
         """Execute document processing node."""
-        return self._run_async_node(
-            lambda: self.document_processing_node.execute(state)
-        )
+        return await self.document_processing_node.execute(state)
 
     # Removed: document quality validation, handled in Step 3 subflow where relevant
-    def extract_section_analysis(
+    async def extract_section_analysis(
         self, state: RealEstateAgentState
     ) -> RealEstateAgentState:
         """Execute Step 2 section-by-section analysis node."""
-        return self._run_async_node(lambda: self.section_analysis_node.execute(state))
+        return await self.section_analysis_node.execute(state)
 
     # Removed: terms validation, covered by Step 3 synthesis outputs
 
-    def step3_synthesize(self, state: RealEstateAgentState) -> RealEstateAgentState:
+    async def step3_synthesize(
+        self, state: RealEstateAgentState
+    ) -> RealEstateAgentState:
         """Execute Step 3 synthesis node."""
-        return self._run_async_node(lambda: self.step3_synthesis_node.execute(state))
+        return await self.step3_synthesis_node.execute(state)
 
     # Removed: compliance analysis node (replaced by Step 3 compliance summary)
 
@@ -668,15 +478,17 @@ class ContractAnalysisWorkflow:
 
     # Removed: report compilation node (buyer report generated in Step 3)
 
-    def handle_processing_error(
+    async def handle_processing_error(
         self, state: RealEstateAgentState
     ) -> RealEstateAgentState:
         """Execute error handling node."""
-        return self._run_async_node(lambda: self.error_handling_node.execute(state))
+        return await self.error_handling_node.execute(state)
 
-    def retry_failed_step(self, state: RealEstateAgentState) -> RealEstateAgentState:
+    async def retry_failed_step(
+        self, state: RealEstateAgentState
+    ) -> RealEstateAgentState:
         """Execute retry processing node."""
-        return self._run_async_node(lambda: self.retry_processing_node.execute(state))
+        return await self.retry_processing_node.execute(state)
 
     # Conditional edge check methods (kept simple for orchestration)
     def _has_error_state(self, state: RealEstateAgentState) -> bool:
@@ -988,7 +800,19 @@ class ContractAnalysisWorkflow:
                     )
                 except Exception:
                     pass
-                result = await self.workflow.ainvoke(state)
+                # Per-node timing trace, persisted by the analysis task
+                with (
+                    full_text_memo_scope() as full_text_memo,
+                    run_blob_scope() as run_blobs,
+                    trace_scope((state or {}).get("content_hash")),
+                    span("analysis"),
+                ):
+                    try:
+                        result = await self._invoke_graph(state)
+                    finally:
+                        self._record_full_text_memo(state, full_text_memo)
+                        self._record_run_blobs(state, run_blobs)
+                    result = self._resolve_result_blobs(result)
 
             # Update performance metrics
             processing_time = (datetime.now(UTC) - start_time).total_seconds()
@@ -1007,9 +831,87 @@ class ContractAnalysisWorkflow:
             self._metrics["validation_failures"] += 1
             raise
 
+    def _record_full_text_memo(
+        self, state: RealEstateAgentState, memo: FullTextMemo
+    ) -> None:
+        """Fold one run's full-text memo counters into the workflow metrics."""
+        stats = memo.stats()
+        self._metrics["full_text_memo_hits"] += stats["hits"]
+        self._metrics["full_text_memo_misses"] += stats["misses"]
+        if stats["hits"] or stats["misses"]:
+            logger.info(
+                "Full-text memo for workflow run",
+                extra={"content_hash": (state or {}).get("content_hash"), **stats},
+            )
+
+    def _record_run_blobs(
+        self, state: RealEstateAgentState, store: RunBlobStore
+    ) -> None:
+        """Log one run's blob store usage and peak node input state size."""
+        self._metrics["peak_state_bytes"] = max(
+            self._metrics["peak_state_bytes"], store.peak_state_bytes
+        )
+        logger.info(
+            "Run blob store for workflow run",
+            extra={"content_hash": (state or {}).get("content_hash"), **store.stats()},
+        )
+
+    @staticmethod
+    def _resolve_result_blobs(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Swap Step 0 text handles back for the text before the run scope ends.
+
+        Callers of `analyze_contract` keep reading the final state as before.
+        """
+        if not isinstance(result, dict):
+            return result
+        result = dict(result)
+        if is_blob_ref(result.get("extracted_text")):
+            result["extracted_text"] = resolve_blob(result["extracted_text"])
+        ocr = result.get("step0_ocr_processing")
+        if isinstance(ocr, dict) and is_blob_ref(ocr.get("full_text")):
+            result["step0_ocr_processing"] = {
+                **ocr,
+                "full_text": resolve_blob(ocr["full_text"]),
+            }
+        return result
+
+    async def _invoke_graph(self, state: RealEstateAgentState) -> Dict[str, Any]:
+        """Run the compiled graph, checkpointing per node when enabled.
+
+        A retry (``resume_from_step`` set) continues an interrupted run from its
+        last completed node; any other run starts a fresh checkpoint thread.
+        """
+        from app.agents.checkpointer import (
+            ainvoke_checkpointed,
+            get_workflow_checkpointer,
+            workflow_thread_id,
+        )
+
+        checkpointer = get_workflow_checkpointer()
+        thread_id = workflow_thread_id(state)
+        if checkpointer is None or thread_id is None:
+            return await self.workflow.ainvoke(state)
+
+        return await ainvoke_checkpointed(
+            self.workflow,
+            state,
+            thread_id,
+            checkpointer,
+            allow_resume=bool((state or {}).get("resume_from_step")),
+        )
+
     def get_metrics(self) -> Dict[str, Any]:
         """Get workflow performance metrics including node-specific metrics."""
         workflow_metrics = self._metrics.copy()
+        memo_lookups = (
+            workflow_metrics["full_text_memo_hits"]
+            + workflow_metrics["full_text_memo_misses"]
+        )
+        workflow_metrics["full_text_memo_hit_rate"] = (
+            round(workflow_metrics["full_text_memo_hits"] / memo_lookups, 3)
+            if memo_lookups
+            else 0.0
+        )
 
         # Add node-specific metrics
         node_metrics = {}
@@ -1017,9 +919,12 @@ class ContractAnalysisWorkflow:
             if hasattr(node, "get_node_metrics"):
                 node_metrics[node_name] = node.get_node_metrics()
 
+        from app.core.llm_metrics import llm_metrics
+
         return {
             "workflow_metrics": workflow_metrics,
             "node_metrics": node_metrics,
+            "llm_metrics": llm_metrics.snapshot(),
             "total_nodes": len(self.nodes),
             "configuration": {
                 "enable_validation": self.enable_validation,
@@ -1037,6 +942,9 @@ class ContractAnalysisWorkflow:
             "validation_failures": 0,
             "total_processing_time": 0.0,
             "average_processing_time": 0.0,
+            "full_text_memo_hits": 0,
+            "full_text_memo_misses": 0,
+            "peak_state_bytes": 0,
         }
 
         # Reset node metrics
@@ -1133,7 +1041,7 @@ class ProgressTrackingWorkflow(ContractAnalysisWorkflow):
                 ] = "processing"
         except Exception:
             pass
-        result = super().validate_input(state)
+        result = await super().validate_input(state)
         self._ws_progress(state, "validate_input", 7, "Initialize analysis")
         await self._notify_status(state, "validate_input", 7, "Initialize analysis")
         return result
@@ -1142,7 +1050,7 @@ class ProgressTrackingWorkflow(ContractAnalysisWorkflow):
         if self._should_skip("process_document", state):
             return state
         self._ws_progress(state, "document_processing", 7, "Extract text & diagrams")
-        result = super().process_document(state)
+        result = await super().process_document(state)
         await self._notify_status(
             state, "document_processing", 30, "Extract text & diagrams"
         )
@@ -1180,7 +1088,7 @@ class ProgressTrackingWorkflow(ContractAnalysisWorkflow):
             59,
             "Performing Step 2 section-by-section analysis",
         )
-        return super().extract_section_analysis(state)
+        return await super().extract_section_analysis(state)
 
     async def step3_synthesize(self, state):
         if self._should_skip("step3_synthesize", state):
@@ -1197,7 +1105,7 @@ class ProgressTrackingWorkflow(ContractAnalysisWorkflow):
             60,
             "Synthesizing analysis results for actionable recommendations",
         )
-        return super().step3_synthesize(state)
+        return await super().step3_synthesize(state)
 
     # Removed overridden progress step for compliance
 
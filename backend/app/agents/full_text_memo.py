@@ -0,0 +1,89 @@
+"""
+Run-scoped memo for document full text.
+
+Contract nodes that receive trimmed state (no `step0_ocr_processing.full_text`)
+rebuild the text through documents -> artifacts -> storage. Within one
+workflow run every such node asks for the same document, and parallel Step 2
+branches ask at the same time. `FullTextMemo` caches each hop's result for
+the lifetime of a run and lets concurrent callers for the same key await the
+single in-flight fetch instead of starting their own.
+
+The memo is bound to the run through a ContextVar (`full_text_memo_scope`),
+which LangGraph propagates into every node and nested subflow. Outside a
+scope, lookups go straight to the fetcher.
+"""
+
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FullTextMemo:
+    """Async-safe memo with in-flight deduplication.
+
+    Failed fetches are not cached: waiters see the error and the next caller
+    retries.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        future = self._entries.get(key)
+        if future is not None:
+            # Completed or in flight: either way the fetch is not repeated
+            self.hits += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = future
+        try:
+            value = await fetch()
+        except BaseException as fetch_error:
+            self._entries.pop(key, None)
+            future.set_exception(fetch_error)
+            future.exception()  # retrieved here; waiters re-raise it
+            raise
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+_run_memo: ContextVar[Optional[FullTextMemo]] = ContextVar(
+    "full_text_memo", default=None
+)
+
+
+@contextmanager
+def full_text_memo_scope() -> Iterator[FullTextMemo]:
+    """Bind a fresh memo to the current workflow run."""
+    memo = FullTextMemo()
+    token = _run_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _run_memo.reset(token)
+
+
+async def memoized(key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Fetch through the current run's memo, or directly outside a run."""
+    memo = _run_memo.get()
+    if memo is None:
+        return await fetch()
+    return await memo.get_or_fetch(key, fetch)
@@ -0,0 +1,74 @@
+"""
+Input fingerprints for contract-backed LLM nodes.
+
+A node's output is a function of the contract (its content hash), the
+state-derived variables its prompt renders, the prompt composition (rule and
+template versions) and the model. `ContractLLMNode` subclasses supply the
+variables from `_prompt_inputs`, the same accessor their context builder
+uses, and name the composition (`COMPOSITION_NAME`); the composition
+signature supplies versions and models. The fingerprint is stored next to the
+persisted analysis column (`contracts.analysis_fingerprints`).
+
+On re-analysis a cached column is reused only while its fingerprint still
+matches, so changing e.g. `australian_state` re-runs just the nodes that read
+it. Upstream outputs are ordinary prompt inputs, so downstream nodes re-run only
+when an upstream node actually produced a different value.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every stored fingerprint (e.g. when hashing changes)
+FINGERPRINT_SCHEME = 2
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def _digest(value: Any) -> str:
+    """Stable digest of a JSON-compatible value (key order independent)."""
+    canonical = json.dumps(
+        value, sort_keys=True, separators=(",", ":"), default=_json_default
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def compute_fingerprint(
+    prompt_inputs: Dict[str, Any],
+    composition_signature: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Fingerprint of a node's inputs, with per-input digests for diagnostics."""
+    inputs = {name: _digest(value) for name, value in sorted(prompt_inputs.items())}
+    inputs["composition"] = _digest(composition_signature)
+    return {
+        "fingerprint": _digest({"scheme": FINGERPRINT_SCHEME, **inputs}),
+        "inputs": inputs,
+        "composition": composition_signature.get("composition"),
+        "model": composition_signature.get("primary_model"),
+    }
+
+
+def changed_inputs(
+    stored: Optional[Dict[str, Any]], current: Dict[str, Any]
+) -> List[str]:
+    """Names of inputs whose digest differs from the stored fingerprint."""
+    previous = (stored or {}).get("inputs") or {}
+    names = set(previous) | set(current.get("inputs") or {})
+    return sorted(
+        name
+        for name in names
+        if previous.get(name) != (current.get("inputs") or {}).get(name)
+    )
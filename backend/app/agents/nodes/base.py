@@ -7,16 +7,20 @@ containing common functionality, logging, error handling, and state management.
 
 from abc import ABC, abstractmethod
 from typing import Awaitable, Callable, Dict, Any, Optional, TYPE_CHECKING
+import functools
+import inspect
 import json
 import logging
 from datetime import UTC, datetime
 
+from app.agents.run_blobs import estimate_state_bytes, get_run_blob_store
 from app.agents.states.base import LangGraphBaseState
 from app.agents.states.contract_state import (
     RealEstateAgentState,
     update_state_step,
 )
 from app.core.config import get_settings
+from app.core.span_trace import current_span, span
 from app.clients.base.exceptions import ClientError
 
 if TYPE_CHECKING:
@@ -26,6 +30,25 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _execute_in_span(execute):
+    @functools.wraps(execute)
+    async def execute_in_span(self, state, *args, **kwargs):
+        name = f"node:{getattr(self, 'node_name', type(self).__name__)}"
+        if current_span().name == name:
+            # An override delegating to the base execute: one span is enough
+            return await execute(self, state, *args, **kwargs)
+        with span(name, node_class=type(self).__name__) as node_span:
+            store = get_run_blob_store()
+            if store is not None:
+                # Input state size per node, large payloads counted as handles
+                state_bytes = estimate_state_bytes(state)
+                store.record_state_size(name, state_bytes)
+                node_span.set(state_bytes=state_bytes)
+            return await execute(self, state, *args, **kwargs)
+
+    return execute_in_span
+
+
 class BaseNode(ABC):
     """
     Base class for all workflow nodes in the ContractAnalysisWorkflow.
@@ -73,6 +96,13 @@ class BaseNode(ABC):
         _get_progress_update(): Calculate progress updates based on current state
     """
 
+    def __init_subclass__(cls, **kwargs):
+        """Record a `node:<name>` span around every concrete `execute`."""
+        super().__init_subclass__(**kwargs)
+        execute = cls.__dict__.get("execute")
+        if inspect.iscoroutinefunction(execute):
+            cls.execute = _execute_in_span(execute)
+
     def __init__(
         self, workflow: any, node_name: str, progress_range: tuple[int, int] = (0, 100)
     ):
@@ -7,11 +7,25 @@ Parameters:
 Subclasses can override `_build_updated_fields(parsed, state)` to supply additional
 repository fields (e.g., contract_type, property_address) while the base class
 handles short-circuiting and state updates generically.
+
+When the state carries a `contract_snapshot` (loaded once per workflow by
+`load_contract_snapshot`), the short-circuit check only touches the database
+for attributes the snapshot lists as populated.
+
+Subclasses return their state-derived prompt variables from `_prompt_inputs`
+and build their prompt context from it, so the input fingerprint (see
+app.agents.node_fingerprint) covers exactly what the prompt reads. A cached
+attribute is reused only while the stored fingerprint matches, so a change to
+e.g. the user's state or experience level re-runs just the nodes that depend
+on it.
 """
 
 import logging
+from datetime import datetime, UTC
 from typing import Any, Dict, Optional
 
+from app.agents.node_fingerprint import changed_inputs, compute_fingerprint
+from app.agents.run_blobs import resolve_blob
 from app.agents.states.contract_state import RealEstateAgentState
 from .llm_base import LLMNode
 
@@ -20,7 +34,53 @@ logger = logging.getLogger(__name__)
 DEFAULT_MIN_CONFIDENCE = 0.5
 
 
+async def load_contract_snapshot(
+    content_hash: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    """Load which analysis columns are populated for a contract, with their
+    input fingerprints (non-fatal)."""
+    if not content_hash:
+        return None
+    try:
+        from app.services.repositories.contracts_repository import (
+            ContractsRepository,
+        )
+
+        stored = await ContractsRepository().get_analysis_snapshot(content_hash)
+    except Exception as load_err:
+        logger.warning(f"Contract snapshot load failed (non-fatal): {load_err}")
+        return None
+    return {
+        "content_hash": content_hash,
+        "populated_keys": sorted(stored["populated_keys"]),
+        "fingerprints": stored["fingerprints"],
+        "loaded_at": datetime.now(UTC).isoformat(),
+    }
+
+
+def snapshot_with_key(
+    snapshot: Dict[str, Any], key: str, fingerprint: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Copy of ``snapshot`` that also lists ``key`` as populated."""
+    populated = set(snapshot.get("populated_keys") or [])
+    populated.add(key)
+    fingerprints = dict(snapshot.get("fingerprints") or {})
+    if fingerprint:
+        fingerprints[key] = fingerprint
+    else:
+        fingerprints.pop(key, None)
+    return {
+        **snapshot,
+        "populated_keys": sorted(populated),
+        "fingerprints": fingerprints,
+    }
+
+
 class ContractLLMNode(LLMNode):
+    # Composition the prompt renders; part of the input fingerprint. Nodes
+    # without a composition keep the plain cache behaviour.
+    COMPOSITION_NAME: Optional[str] = None
+
     def __init__(
         self,
         workflow,
@@ -40,6 +100,7 @@ class ContractLLMNode(LLMNode):
     ) -> Optional[RealEstateAgentState]:
         try:
             from app.services.repositories.contracts_repository import (
+                SECTION_ANALYSIS_SNAPSHOT_KEYS,
                 ContractsRepository,
             )
 
@@ -49,13 +110,31 @@ class ContractLLMNode(LLMNode):
                 return None
 
             contracts_repo = ContractsRepository()
-            existing_contract = await contracts_repo.get_contract_by_content_hash(
-                content_hash
-            )
-            if not existing_contract:
-                return None
-
-            cached_value = getattr(existing_contract, self.contract_attribute, None)
+            snapshot = state.get("contract_snapshot")
+            if (
+                snapshot
+                and snapshot.get("content_hash") == content_hash
+                and self.contract_attribute in SECTION_ANALYSIS_SNAPSHOT_KEYS
+            ):
+                if self.contract_attribute not in snapshot.get("populated_keys", []):
+                    return None
+                if self._fingerprint_changed(state, snapshot):
+                    return None
+                cached_value = await contracts_repo.get_section_analysis_value(
+                    content_hash, self.contract_attribute
+                )
+            else:
+                columns = (
+                    (self.contract_attribute,)
+                    if self.contract_attribute in SECTION_ANALYSIS_SNAPSHOT_KEYS
+                    else None
+                )
+                existing_contract = await contracts_repo.get_contract_by_content_hash(
+                    content_hash, columns=columns
+                )
+                if not existing_contract:
+                    return None
+                cached_value = getattr(existing_contract, self.contract_attribute, None)
             if isinstance(cached_value, dict) and bool(cached_value):
                 state[self.contract_attribute] = cached_value
                 try:
@@ -87,6 +166,70 @@ class ContractLLMNode(LLMNode):
             )
         return None
 
+    def _prompt_inputs(self, state: RealEstateAgentState) -> Dict[str, Any]:
+        """Prompt variables derived from state, shared by the context builder
+        and the input fingerprint.
+
+        Contract content (full text, OCR metadata) is covered by the content
+        hash and per-run values (timestamps) are left out.
+        """
+        return {}
+
+    def input_fingerprint(self, state: RealEstateAgentState) -> Optional[Dict[str, Any]]:
+        """Fingerprint of this node's inputs, or None if it declares none."""
+        if not self.COMPOSITION_NAME:
+            return None
+        try:
+            signature = self.prompt_manager.get_composition_signature(
+                self.COMPOSITION_NAME
+            )
+            return compute_fingerprint(self._prompt_inputs(state), signature)
+        except Exception as fp_err:
+            logger.warning(
+                f"{self.__class__.__name__}: Input fingerprint unavailable (non-fatal): {fp_err}"
+            )
+            return None
+
+    def _fingerprint_changed(
+        self, state: RealEstateAgentState, snapshot: Dict[str, Any]
+    ) -> bool:
+        """True when the cached attribute was produced from different inputs.
+
+        Attributes cached before fingerprints existed are reused as before.
+        """
+        stored = (snapshot.get("fingerprints") or {}).get(self.contract_attribute)
+        if not stored:
+            return False
+        current = self.input_fingerprint(state)
+        if not current or current["fingerprint"] == stored.get("fingerprint"):
+            return False
+        self._log_step_debug(
+            f"Re-running {self.node_name}; inputs changed since {self.contract_attribute} was cached",
+            state,
+            {"changed_inputs": changed_inputs(stored, current)},
+        )
+        return True
+
+    def _refresh_snapshot(
+        self,
+        state: RealEstateAgentState,
+        fingerprint: Optional[Dict[str, Any]],
+    ) -> None:
+        """Keep the workflow snapshot in step with what was just written."""
+        from app.services.repositories.contracts_repository import (
+            SECTION_ANALYSIS_SNAPSHOT_KEYS,
+        )
+
+        snapshot = state.get("contract_snapshot")
+        if (
+            snapshot
+            and snapshot.get("content_hash") == state.get("content_hash")
+            and self.contract_attribute in SECTION_ANALYSIS_SNAPSHOT_KEYS
+        ):
+            state["contract_snapshot"] = snapshot_with_key(
+                snapshot, self.contract_attribute, fingerprint
+            )
+
     def _coerce_to_model(self, data: Any) -> Optional[Any]:
         try:
             if isinstance(data, self.result_model):
@@ -117,12 +260,15 @@ class ContractLLMNode(LLMNode):
                 else parsed
             )
             repo = ContractsRepository()
+            fingerprint = self.input_fingerprint(state)
             await repo.update_section_analysis_key(
                 content_hash,
                 self.contract_attribute,
                 value,
                 updated_by=self.node_name,
+                fingerprint=fingerprint,
             )
+            self._refresh_snapshot(state, fingerprint)
         except Exception as repo_err:
             logger.warning(
                 f"{self.__class__.__name__}: Section persist failed (non-fatal): [{type(repo_err).__name__}] {repo_err}"
@@ -251,8 +397,11 @@ class ContractLLMNode(LLMNode):
         Returns empty string on failure; logs details for diagnostics.
         """
         try:
-            document_metadata = state.get("step0_ocr_processing", {})
-            full_text = document_metadata.get("full_text", "")
+            document_metadata = state.get("step0_ocr_processing") or {}
+            full_text = resolve_blob(document_metadata.get("full_text")) or ""
+            if not full_text:
+                # Step 2 state carries the text as `contract_text`
+                full_text = resolve_blob(state.get("contract_text")) or ""
         except Exception:
             document_metadata = {}
             full_text = ""
@@ -274,31 +423,42 @@ class ContractLLMNode(LLMNode):
             )
             from app.utils.storage_utils import ArtifactStorageService
             from app.core.auth_context import AuthContext
+            from app.agents.full_text_memo import memoized
 
             user_id = AuthContext.get_user_id() or state.get("user_id")
             if not user_id:
                 raise Exception("No user_id available for repository access")
 
-            documents_repo = DocumentsRepository(user_id=user_id)
-            document = await documents_repo.get_document(document_id)
+            async def _fetch_document():
+                documents_repo = DocumentsRepository(user_id=user_id)
+                return await documents_repo.get_document(document_id)
+
+            # Memoized per workflow run: concurrent nodes share one fetch of
+            # each hop (see app.agents.full_text_memo)
+            document = await memoized(
+                ("document", str(user_id), str(document_id)), _fetch_document
+            )
             if not document:
                 raise Exception(f"Document not found in repository: {document_id}")
 
             if not document.artifact_text_id:
                 raise Exception("Document has no associated text artifact")
 
-            artifacts_repo = ArtifactsRepository()
-            full_text_artifact = await artifacts_repo.get_full_text_artifact_by_id(
-                document.artifact_text_id
-            )
-            if not full_text_artifact:
-                raise Exception(
-                    f"Full text artifact not found: {document.artifact_text_id}"
+            async def _fetch_full_text():
+                artifacts_repo = ArtifactsRepository()
+                artifact = await artifacts_repo.get_full_text_artifact_by_id(
+                    document.artifact_text_id
                 )
-
-            storage_service = ArtifactStorageService()
-            full_text = await storage_service.download_text_blob(
-                full_text_artifact.full_text_uri
+                if not artifact:
+                    raise Exception(
+                        f"Full text artifact not found: {document.artifact_text_id}"
+                    )
+                storage_service = ArtifactStorageService()
+                text = await storage_service.download_text_blob(artifact.full_text_uri)
+                return artifact, text
+
+            full_text_artifact, full_text = await memoized(
+                ("full_text", str(document.artifact_text_id)), _fetch_full_text
             )
             self._log_step_debug(
                 "Retrieved text for contract processing",
@@ -1,7 +1,8 @@
 from typing import Any, Dict, List, Optional
 
-from app.agents.nodes.contract_llm_base import ContractLLMNode
+from app.agents.nodes.contract_llm_base import ContractLLMNode, snapshot_with_key
 from app.core.langsmith_config import langsmith_trace
+from app.core.llm_metrics import llm_call_context
 from app.agents.states.contract_state import RealEstateAgentState
 
 
@@ -148,14 +149,19 @@ class DiagramSemanticsNode(ContractLLMNode):
             analysis_prompt = composition_batched.get("user_prompt", "")
             system_prompt = composition_batched.get("system_prompt", "")
 
-            parsing_result = await llm_service.generate_image_semantics(
-                contents=contents_list,
-                analysis_prompt=analysis_prompt,
-                system_prompt=system_prompt,
-                output_parser=parser,
-                model=primary_model,
-                parse_generation_max_attempts=max_retries,
-            )
+            with llm_call_context(
+                node=self.node_name,
+                composition=composition_name,
+                contract_key=state.get("content_hash"),
+            ):
+                parsing_result = await llm_service.generate_image_semantics(
+                    contents=contents_list,
+                    analysis_prompt=analysis_prompt,
+                    system_prompt=system_prompt,
+                    output_parser=parser,
+                    model=primary_model,
+                    parse_generation_max_attempts=max_retries,
+                )
 
             parsed = (
                 self._coerce_to_model(parsing_result.parsed_data)
@@ -250,16 +256,22 @@ class DiagramSemanticsNode(ContractLLMNode):
                     {"diagram_type": self.diagram_type},
                 )
 
-                fallback_result = await llm_service.generate_image_semantics(
-                    content=content_bytes,
-                    content_type=content_type,
-                    filename=filename,
-                    composition_name=composition_name,
-                    context_variables=context_vars,
-                    output_parser=parser,
-                    model=fallback_model,
-                    parse_generation_max_attempts=max_retries,
-                )
+                with llm_call_context(
+                    node=self.node_name,
+                    composition=composition_name,
+                    contract_key=state.get("content_hash"),
+                    is_fallback=True,
+                ):
+                    fallback_result = await llm_service.generate_image_semantics(
+                        content=content_bytes,
+                        content_type=content_type,
+                        filename=filename,
+                        composition_name=composition_name,
+                        context_variables=context_vars,
+                        output_parser=parser,
+                        model=fallback_model,
+                        parse_generation_max_attempts=max_retries,
+                    )
 
                 fallback_parsed = (
                     self._coerce_to_model(fallback_result.parsed_data)
@@ -301,14 +313,22 @@ class DiagramSemanticsNode(ContractLLMNode):
                 return None
 
             contracts_repo = ContractsRepository()
-            existing_contract = await contracts_repo.get_contract_by_content_hash(
-                content_hash
-            )
-            if not existing_contract:
-                return None
+            snapshot = state.get("contract_snapshot")
+            if snapshot and snapshot.get("content_hash") == content_hash:
+                if "image_semantics" not in snapshot.get("populated_keys", []):
+                    return None
+                image_semantics = await contracts_repo.get_section_analysis_value(
+                    content_hash, "image_semantics"
+                )
+            else:
+                existing_contract = await contracts_repo.get_contract_by_content_hash(
+                    content_hash, columns=("image_semantics",)
+                )
+                if not existing_contract:
+                    return None
+                image_semantics = getattr(existing_contract, "image_semantics", None)
 
             # Check for diagram-type-specific cached value in image_semantics
-            image_semantics = getattr(existing_contract, "image_semantics", None)
             if isinstance(image_semantics, dict):
                 cached_value = image_semantics.get(self.diagram_type)
                 if isinstance(cached_value, dict) and bool(cached_value):
@@ -413,6 +433,12 @@ class DiagramSemanticsNode(ContractLLMNode):
                 value,
                 updated_by=self.node_name,
             )
+
+            snapshot = state.get("contract_snapshot")
+            if snapshot and snapshot.get("content_hash") == content_hash:
+                state["contract_snapshot"] = snapshot_with_key(
+                    snapshot, "image_semantics"
+                )
         except Exception as repo_err:
             self._log_warning(
                 f"{self.__class__.__name__}: Diagram semantics persist failed (non-fatal): {repo_err}"
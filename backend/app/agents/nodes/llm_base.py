@@ -17,6 +17,8 @@ from abc import abstractmethod
 from typing import Any, Dict, Optional, Tuple, List
 
 from app.agents.states.contract_state import RealEstateAgentState
+from app.core.llm_metrics import llm_call_context
+from app.core.span_trace import span
 from .base import BaseNode
 
 logger = logging.getLogger(__name__)
@@ -41,21 +43,24 @@ class LLMNode(BaseNode):
             self._log_step_debug("Starting LLM node execution", state)
 
             # 1) Short-circuit
-            short_circuit = await self._short_circuit_check(state)
+            with span("short_circuit") as check_span:
+                short_circuit = await self._short_circuit_check(state)
+                check_span.set(cache_hit=short_circuit is not None)
             if short_circuit is not None:
                 return short_circuit
 
             # 2) Build context
-            context, parser, composition_name = await self._build_context_and_parser(
-                state
-            )
+            with span("build_context"):
+                built = await self._build_context_and_parser(state)
+            context, parser, composition_name = built
 
             # 3) Render prompts
-            composition_result = await self.prompt_manager.render_composed(
-                composition_name=composition_name,
-                context=context,
-                output_parser=parser,
-            )
+            with span("render_prompt", composition=composition_name):
+                composition_result = await self.prompt_manager.render_composed(
+                    composition_name=composition_name,
+                    context=context,
+                    output_parser=parser,
+                )
             rendered_prompt = composition_result["user_prompt"]
             system_prompt = composition_result.get("system_prompt", "")
             metadata = composition_result.get("metadata", {})
@@ -76,34 +81,44 @@ class LLMNode(BaseNode):
             # Use static defaults; do not depend on workflow/node extraction_config
             max_retries = int(self.CONFIG_KEYS["max_retries"])
 
-            parsing_result = await llm_service.generate_content(
-                prompt=rendered_prompt,
-                system_message=system_prompt,
-                model=primary_model,
-                output_parser=parser,
-                parse_generation_max_attempts=max_retries,
-            )
+            with llm_call_context(
+                node=self.node_name,
+                composition=composition_name,
+                contract_key=state.get("content_hash"),
+            ), span("generate", model=primary_model) as generate_span:
+                parsing_result = await llm_service.generate_content(
+                    prompt=rendered_prompt,
+                    system_message=system_prompt,
+                    model=primary_model,
+                    output_parser=parser,
+                    parse_generation_max_attempts=max_retries,
+                    on_partial=self._make_partial_publisher(state),
+                )
+                generate_span.set(
+                    parsed=bool(getattr(parsing_result, "success", False))
+                )
 
-            parsed = (
-                self._coerce_to_model(parsing_result.parsed_data)
-                if getattr(parsing_result, "success", False)
-                else None
-            )
-            quality = self._evaluate_quality(parsed, state)
-
-            # 5) Backup call if quality not passed
-            if not quality.get("ok") and fallback_models:
-                parsed, quality = await self._evaluate_fallbacks(
-                    llm_service,
-                    parser,
-                    rendered_prompt,
-                    system_prompt,
-                    fallback_models,
-                    max_retries,
-                    parsed,
-                    quality,
-                    state,
+                parsed = (
+                    self._coerce_to_model(parsing_result.parsed_data)
+                    if getattr(parsing_result, "success", False)
+                    else None
                 )
+                quality = self._evaluate_quality(parsed, state)
+
+                # 5) Backup call if quality not passed
+                if not quality.get("ok") and fallback_models:
+                    generate_span.set(fallback_models=fallback_models)
+                    parsed, quality = await self._evaluate_fallbacks(
+                        llm_service,
+                        parser,
+                        rendered_prompt,
+                        system_prompt,
+                        fallback_models,
+                        max_retries,
+                        parsed,
+                        quality,
+                        state,
+                    )
 
             if parsed is None:
                 # Not fatal; allow workflow to proceed gracefully
@@ -115,7 +130,8 @@ class LLMNode(BaseNode):
                 )
 
             # 6) Persist domain-specific fields
-            await self._persist_results(state, parsed)
+            with span("persist"):
+                await self._persist_results(state, parsed)
 
             # 7) Update state
             return await self._update_state_success(state, parsed, quality)
@@ -162,6 +178,20 @@ class LLMNode(BaseNode):
 
     # ---------- Shared helpers ----------
 
+    def _make_partial_publisher(self, state: RealEstateAgentState):
+        """Return an on_partial callback that surfaces streamed fields as progress."""
+        if not (state or {}).get("notify_progress"):
+            return None
+
+        async def _publish(partial: Dict[str, Any]) -> None:
+            await self.emit_progress(
+                state,
+                self.progress_range[0],
+                f"Receiving {self.node_name} results ({len(partial)} fields so far)",
+            )
+
+        return _publish
+
     async def _get_llm_service(self):
         from app.services import get_llm_service
 
@@ -198,13 +228,16 @@ class LLMNode(BaseNode):
 
         for fb_model in fallback_models:
             try:
-                fb = await llm_service.generate_content(
-                    prompt=rendered_prompt,
-                    system_message=system_prompt,
-                    model=fb_model,
-                    output_parser=parser,
-                    parse_generation_max_attempts=max_retries,
-                )
+                with llm_call_context(is_fallback=True), span(
+                    "fallback", model=fb_model
+                ):
+                    fb = await llm_service.generate_content(
+                        prompt=rendered_prompt,
+                        system_message=system_prompt,
+                        model=fb_model,
+                        output_parser=parser,
+                        parse_generation_max_attempts=max_retries,
+                    )
                 if (
                     getattr(fb, "success", False)
                     and getattr(fb, "parsed_data", None) is not None
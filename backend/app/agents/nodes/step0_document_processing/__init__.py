@@ -29,6 +29,7 @@ try:
     from .mark_basic_complete_node import MarkBasicCompleteNode
     from .build_summary_node import BuildSummaryNode
     from .error_handling_node import ErrorHandlingNode
+    from .document_processing_node import DocumentProcessingNode
 
     logger.debug("Successfully imported all document processing subflow nodes")
 
@@ -55,4 +56,5 @@ __all__ = [
     "MarkBasicCompleteNode",
     "BuildSummaryNode",
     "ErrorHandlingNode",
+    "DocumentProcessingNode",
 ]
@@ -13,6 +13,7 @@ from app.agents.nodes.step0_document_processing.base_node import (
 )
 from app.agents.subflows.step0_document_processing_workflow import DocumentProcessingState
 from app.core.langsmith_config import langsmith_trace
+from app.core.llm_metrics import llm_call_context
 from app.services.ai.gemini_ocr_service import GeminiOCRService
 from app.prompts.schema.diagram_detection_schema import DiagramDetectionItem
 from app.services.visual_artifact_service import VisualArtifactService
@@ -410,15 +411,20 @@ class DetectDiagramsWithOCRNode(DocumentProcessingNodeBase):
             # Use shared Gemini OCR service with PromptManager to detect diagram for this page
             # Reuse the same structured method as text OCR, focusing the analysis on diagram detection
             state = getattr(self, "_current_state", {}) or {}
-            llm_result = await self.ocr_service.extract_text_diagram_insight(
-                file_content=page_jpg_bytes,
-                file_type="jpg",
-                filename=f"page_{page_number}.jpg",
-                analysis_focus="diagram_detection",
-                australian_state=state.get("australian_state"),
-                contract_type=state.get("contract_type"),
-                document_type=state.get("document_type"),
-            )
+            with llm_call_context(
+                node=self.node_name,
+                composition="diagram_detection",
+                contract_key=state.get("content_hash"),
+            ):
+                llm_result = await self.ocr_service.extract_text_diagram_insight(
+                    file_content=page_jpg_bytes,
+                    file_type="jpg",
+                    filename=f"page_{page_number}.jpg",
+                    analysis_focus="diagram_detection",
+                    australian_state=state.get("australian_state"),
+                    contract_type=state.get("contract_type"),
+                    document_type=state.get("document_type"),
+                )
 
             page_diagrams = []
             # Diagrams are returned directly as a list of DiagramType enums
@@ -9,10 +9,11 @@ import logging
 from datetime import datetime, UTC
 from typing import Dict, Any
 
+from app.agents.run_blobs import stash_blob
 from app.agents.states.contract_state import RealEstateAgentState
 from app.schema.enums import ProcessingStatus
 from app.core.async_utils import AsyncContextManager
-from .base import BaseNode
+from ..base import BaseNode
 from app.agents.subflows.step0_document_processing_workflow import (
     DocumentProcessingWorkflow,
 )
@@ -251,10 +252,12 @@ class DocumentProcessingNode(BaseNode):
                 else 0.0
             )
 
+            # Readers resolve the handle (app.agents.run_blobs)
+            text_ref = stash_blob(extracted_text, "full_text")
             updated_data = {
                 # Keep detailed metadata (existing consumers rely on this)
                 "step0_ocr_processing": {
-                    "full_text": extracted_text,
+                    "full_text": text_ref,
                     "extraction_method": extraction_method,
                     "extraction_confidence": extraction_confidence,
                     "text_quality": text_quality,
@@ -280,7 +283,7 @@ class DocumentProcessingNode(BaseNode):
                     ),
                 },
                 # Provide top-level extracted_text for backward/compatibility checks
-                "extracted_text": extracted_text,
+                "extracted_text": text_ref,
                 "parsing_status": ProcessingStatus.COMPLETED,
             }
 
@@ -24,6 +24,7 @@ from app.services.repositories.artifacts_repository import ArtifactsRepository
 from app.utils.content_utils import compute_content_hmac, compute_params_fingerprint
 from app.utils.storage_utils import ArtifactStorageService
 from app.core.config import get_settings
+from app.core.llm_metrics import llm_call_context
 from app.services.visual_artifact_service import VisualArtifactService
 from app.schema.document import DiagramProcessingResult
 
@@ -1119,23 +1120,28 @@ class ExtractTextNode(DocumentProcessingNodeBase):
                                     zoom=self._jpeg_zoom,
                                     quality=self._jpeg_quality,
                                 )
-                                llm_result = (
-                                    await gemini_service.extract_text_diagram_insight(
-                                        file_content=jpeg_bytes,
-                                        file_type="jpeg",
-                                        filename=f"page_{page_index+1}.jpeg",
-                                        analysis_focus="ocr",
-                                        australian_state=state.get(
-                                            "australian_state", "NSW"
-                                        ),
-                                        contract_type=state.get(
-                                            "contract_type", "purchase_agreement"
-                                        ),
-                                        document_type=state.get(
-                                            "document_type", "contract"
-                                        ),
+                                with llm_call_context(
+                                    node=self.node_name,
+                                    composition="ocr",
+                                    contract_key=state.get("content_hash"),
+                                ):
+                                    llm_result = (
+                                        await gemini_service.extract_text_diagram_insight(
+                                            file_content=jpeg_bytes,
+                                            file_type="jpeg",
+                                            filename=f"page_{page_index+1}.jpeg",
+                                            analysis_focus="ocr",
+                                            australian_state=state.get(
+                                                "australian_state", "NSW"
+                                            ),
+                                            contract_type=state.get(
+                                                "contract_type", "purchase_agreement"
+                                            ),
+                                            document_type=state.get(
+                                                "document_type", "contract"
+                                            ),
+                                        )
                                     )
-                                )
                                 llm_text = (llm_result.text or "") if llm_result else ""
                                 if len(llm_text.strip()) > len(raw_text.strip()):
                                     ocr_text = llm_text
@@ -1512,15 +1518,22 @@ class ExtractTextNode(DocumentProcessingNodeBase):
 
                     service = GeminiOCRService()
                     await service.initialize()
-                    result = await service.extract_text_diagram_insight(
-                        file_content=file_content,
-                        file_type="png",  # treat as image; service just needs a valid image type
-                        filename="image_page.png",
-                        analysis_focus="ocr",
-                        australian_state=state.get("australian_state", "NSW"),
-                        contract_type=state.get("contract_type", "purchase_agreement"),
-                        document_type=state.get("document_type", "contract"),
-                    )
+                    with llm_call_context(
+                        node=self.node_name,
+                        composition="ocr",
+                        contract_key=state.get("content_hash"),
+                    ):
+                        result = await service.extract_text_diagram_insight(
+                            file_content=file_content,
+                            file_type="png",  # treat as image; service just needs a valid image type
+                            filename="image_page.png",
+                            analysis_focus="ocr",
+                            australian_state=state.get("australian_state", "NSW"),
+                            contract_type=state.get(
+                                "contract_type", "purchase_agreement"
+                            ),
+                            document_type=state.get("document_type", "contract"),
+                        )
                     text = result.text if result else ""
                     return text, "ocr_gemini"
                 except Exception as e:
@@ -75,7 +75,9 @@ class LayoutFormatCleanupNode(DocumentProcessingNodeBase):
                 try:
                     contracts_repo = ContractsRepository()
                     existing_contract = (
-                        await contracts_repo.get_contract_by_content_hash(content_hash)
+                        await contracts_repo.get_contract_by_content_hash(
+                            content_hash, columns=("raw_text",)
+                        )
                     )
                     if existing_contract and (existing_contract.raw_text or "").strip():
                         self._log_info(
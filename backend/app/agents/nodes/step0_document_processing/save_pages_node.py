@@ -158,8 +158,8 @@ class SavePagesNode(DocumentProcessingNodeBase):
                 artifact.page_number: artifact.id for artifact in page_artifacts
             }
 
-            # Upsert document pages with artifact references
-            pages_saved = 0
+            # Collect page references, then upsert them in one statement
+            page_rows = []
             document_uuid = uuid.UUID(document_id)
             total_pages = len(pages)
 
@@ -252,16 +252,19 @@ class SavePagesNode(DocumentProcessingNodeBase):
                     "processing_version": algorithm_version,
                 }
 
-                # Upsert document page with artifact reference
-                await self.user_docs_repo.upsert_document_page(
-                    document_id=document_uuid,
-                    page_number=page.page_number,
-                    artifact_page_id=artifact_page_id,
-                    annotations=annotations,
-                    flags=flags,
+                page_rows.append(
+                    {
+                        "page_number": page.page_number,
+                        "artifact_page_id": artifact_page_id,
+                        "annotations": annotations,
+                        "flags": flags,
+                    }
                 )
 
-                pages_saved += 1
+            saved_pages = await self.user_docs_repo.batch_upsert_document_pages(
+                document_uuid, page_rows
+            )
+            pages_saved = len(saved_pages)
 
             duration = (datetime.now(timezone.utc) - start_time).total_seconds()
             self._record_success(duration)
@@ -285,7 +288,7 @@ class SavePagesNode(DocumentProcessingNodeBase):
                 f"Failed to save document pages: {str(e)}",
                 {
                     "document_id": state.get("document_id"),
-                    "operation": "upsert_document_page",
+                    "operation": "batch_upsert_document_pages",
                     "page_count": (
                         len(state.get("text_extraction_result").pages)
                         if state.get("text_extraction_result")
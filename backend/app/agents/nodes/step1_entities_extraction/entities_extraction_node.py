@@ -24,6 +24,8 @@ class EntitiesExtractionNode(ContractLLMNode):
     such as parties, dates, financial amounts, and property details.
     """
 
+    COMPOSITION_NAME = "contract_entities_extraction"
+
     def __init__(self, workflow):
         super().__init__(
             workflow=workflow,
@@ -38,6 +40,17 @@ class EntitiesExtractionNode(ContractLLMNode):
 
     # Short-circuit provided by ContractLLMNode
 
+    def _prompt_inputs(self, state: RealEstateAgentState) -> Dict[str, Any]:
+        return {
+            "contract_type": state.get("contract_type") or "purchase_agreement",
+            "user_type": state.get("user_type") or "general",
+            "user_experience": (
+                state.get("user_experience_level")
+                or state.get("user_experience")
+                or "intermediate"
+            ),
+        }
+
     async def _build_context_and_parser(self, state: RealEstateAgentState):
         from app.core.prompts import PromptContext, ContextType
 
@@ -45,13 +58,6 @@ class EntitiesExtractionNode(ContractLLMNode):
         full_text = await self.get_full_text(state)
 
         document_metadata = state.get("step0_ocr_processing", {})
-        contract_type_value = state.get("contract_type") or "purchase_agreement"
-        user_type_value = state.get("user_type") or "general"
-        user_experience_value = (
-            state.get("user_experience_level")
-            or state.get("user_experience")
-            or "intermediate"
-        )
 
         context = PromptContext(
             context_type=ContextType.ANALYSIS,
@@ -59,15 +65,13 @@ class EntitiesExtractionNode(ContractLLMNode):
                 "contract_text": full_text,
                 "analysis_type": "extracted_entity",
                 "document_metadata": document_metadata,
-                "contract_type": contract_type_value,
-                "user_type": user_type_value,
-                "user_experience": user_experience_value,
+                **self._prompt_inputs(state),
                 "analysis_timestamp": datetime.now(UTC).isoformat(),
             },
         )
         # Use local parser specific to this node
         parser = self._parser
-        return context, parser, "contract_entities_extraction"
+        return context, parser, self.COMPOSITION_NAME
 
     # Coercion handled by base class via result_model
 
@@ -169,6 +173,13 @@ class EntitiesExtractionNode(ContractLLMNode):
                 property_address=property_address,
                 updated_by=self.node_name,
             )
+
+            fingerprint = self.input_fingerprint(state)
+            if fingerprint:
+                await repo.set_analysis_fingerprint(
+                    content_hash, self.contract_attribute, fingerprint
+                )
+            self._refresh_snapshot(state, fingerprint)
         except Exception as repo_err:
             logger.warning(
                 f"{self.__class__.__name__}: Section persist failed (non-fatal): {repo_err}"
@@ -22,6 +22,8 @@ class SectionExtractionNode(ContractLLMNode):
     Extracts only section seeds from the Step 1 prompt output and saves them separately.
     """
 
+    COMPOSITION_NAME = "section_seeds_extraction"
+
     def __init__(self, workflow):
         super().__init__(
             workflow=workflow,
@@ -33,19 +35,23 @@ class SectionExtractionNode(ContractLLMNode):
             SectionExtractionOutput, strict_mode=False, retry_on_failure=True
         )
 
+    def _prompt_inputs(self, state: RealEstateAgentState) -> Dict[str, Any]:
+        return {
+            "contract_type": state.get("contract_type") or "purchase_agreement",
+            "user_type": state.get("user_type") or "general",
+            "user_experience": (
+                state.get("user_experience_level")
+                or state.get("user_experience")
+                or "intermediate"
+            ),
+        }
+
     async def _build_context_and_parser(self, state: RealEstateAgentState):
         from app.core.prompts import PromptContext, ContextType
 
         full_text = await self.get_full_text(state)
 
         document_metadata = state.get("step0_ocr_processing", {})
-        contract_type_value = state.get("contract_type") or "purchase_agreement"
-        user_type_value = state.get("user_type") or "general"
-        user_experience_value = (
-            state.get("user_experience_level")
-            or state.get("user_experience")
-            or "intermediate"
-        )
 
         context = PromptContext(
             context_type=ContextType.ANALYSIS,
@@ -53,11 +59,9 @@ class SectionExtractionNode(ContractLLMNode):
                 "contract_text": full_text,
                 "analysis_type": "section_seeds",
                 "document_metadata": document_metadata,
-                "contract_type": contract_type_value,
-                "user_type": user_type_value,
-                "user_experience": user_experience_value,
+                **self._prompt_inputs(state),
                 "analysis_timestamp": datetime.now(UTC).isoformat(),
             },
         )
         parser = self._parser
-        return context, parser, "section_seeds_extraction"
+        return context, parser, self.COMPOSITION_NAME
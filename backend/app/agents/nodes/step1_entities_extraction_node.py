@@ -11,6 +11,7 @@ import logging
 from datetime import datetime, UTC
 from typing import Any, Dict
 
+from app.agents.run_blobs import has_text
 from app.agents.states.contract_state import RealEstateAgentState
 from .base import BaseNode
 
@@ -37,7 +38,7 @@ class Step1EntitiesExtractionNode(BaseNode):
 
             # Sanity check for input text (produced by Step 0)
             full_text = (state.get("step0_ocr_processing") or {}).get("full_text", "")
-            if not full_text or len(full_text.strip()) == 0:
+            if not has_text(full_text):
                 return self._handle_node_error(
                     state,
                     Exception("No contract text available for Step 1 extraction"),
@@ -6,6 +6,7 @@ from app.agents.subflows.step2_section_analysis_workflow import (
     Step2AnalysisWorkflow,
 )
 from app.agents.nodes.contract_llm_base import ContractLLMNode
+from app.utils.clause_retrieval import section_slice
 
 from app.core.prompts import PromptContext, ContextType
 from app.prompts.schema.step2.conditions_schema import (
@@ -15,6 +16,8 @@ from app.core.prompts.parsers import create_parser
 
 
 class ConditionsNode(ContractLLMNode):
+    COMPOSITION_NAME = "step2_conditions"
+
     def __init__(
         self,
         workflow: Step2AnalysisWorkflow,
@@ -28,33 +31,38 @@ class ConditionsNode(ContractLLMNode):
         )
         self.progress_range = progress_range
 
-    async def _build_context_and_parser(self, state: Step2AnalysisState):
-
+    def _prompt_inputs(self, state: Step2AnalysisState) -> Dict[str, Any]:
         entities = state.get("extracted_entity", {}) or {}
         meta = (entities or {}).get("metadata") or {}
 
+        return {
+            "extracted_entity": entities,
+            "australian_state": state.get("australian_state")
+            or meta.get("state")
+            or "NSW",
+            "contract_type": state.get("contract_type")
+            or meta.get("contract_type")
+            or "purchase_agreement",
+            "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
+            "seed_snippets": (state.get("section_seeds", {}) or {})
+            .get("snippets", {})
+            .get("conditions"),
+            "retrieved_clauses": section_slice(state, "conditions"),
+        }
+
+    async def _build_context_and_parser(self, state: Step2AnalysisState):
         context = PromptContext(
             context_type=ContextType.ANALYSIS,
             variables={
                 "analysis_timestamp": datetime.now(UTC).isoformat(),
-                "extracted_entity": entities,
-                "australian_state": state.get("australian_state")
-                or meta.get("state")
-                or "NSW",
-                "contract_type": state.get("contract_type")
-                or meta.get("contract_type")
-                or "purchase_agreement",
-                "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
-                "seed_snippets": (state.get("section_seeds", {}) or {})
-                .get("snippets", {})
-                .get("conditions"),
+                **self._prompt_inputs(state),
             },
         )
 
         parser = create_parser(
             ConditionsAnalysisResult, strict_mode=False, retry_on_failure=True
         )
-        return context, parser, "step2_conditions"
+        return context, parser, self.COMPOSITION_NAME
 
     # Coercion handled by base class via result_model
 
@@ -8,12 +8,15 @@ if TYPE_CHECKING:
         Step2AnalysisWorkflow,
     )
 from app.agents.nodes.contract_llm_base import ContractLLMNode
+from app.utils.clause_retrieval import section_slice
 from app.prompts.schema.step2.financial_terms_schema import (
     FinancialTermsAnalysisResult,
 )
 
 
 class FinancialTermsNode(ContractLLMNode):
+    COMPOSITION_NAME = "step2_financial_terms"
+
     def __init__(
         self,
         workflow: "Step2AnalysisWorkflow",
@@ -28,35 +31,41 @@ class FinancialTermsNode(ContractLLMNode):
         )
         self.progress_range = progress_range
 
+    def _prompt_inputs(self, state: Step2AnalysisState) -> Dict[str, Any]:
+        entities = state.get("extracted_entity", {}) or {}
+        meta = (entities or {}).get("metadata") or {}
+
+        return {
+            "australian_state": state.get("australian_state")
+            or meta.get("state")
+            or "NSW",
+            "contract_type": state.get("contract_type")
+            or meta.get("contract_type")
+            or "purchase_agreement",
+            "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
+            "seed_snippets": (state.get("section_seeds", {}) or {})
+            .get("snippets", {})
+            .get("financial_terms"),
+            "retrieved_clauses": section_slice(state, "financial_terms"),
+        }
+
     async def _build_context_and_parser(self, state: Step2AnalysisState):
         from app.core.prompts import PromptContext, ContextType
 
         from app.core.prompts.parsers import create_parser
 
-        entities = state.get("extracted_entity", {}) or {}
-        meta = (entities or {}).get("metadata") or {}
-
         context = PromptContext(
             context_type=ContextType.ANALYSIS,
             variables={
                 "analysis_timestamp": datetime.now(UTC).isoformat(),
-                "australian_state": state.get("australian_state")
-                or meta.get("state")
-                or "NSW",
-                "contract_type": state.get("contract_type")
-                or meta.get("contract_type")
-                or "purchase_agreement",
-                "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
-                "seed_snippets": (state.get("section_seeds", {}) or {})
-                .get("snippets", {})
-                .get("financial_terms"),
+                **self._prompt_inputs(state),
             },
         )
 
         parser = create_parser(
             FinancialTermsAnalysisResult, strict_mode=False, retry_on_failure=True
         )
-        return context, parser, "step2_financial_terms"
+        return context, parser, self.COMPOSITION_NAME
 
     # Coercion handled by base class via result_model
 
@@ -8,12 +8,15 @@ if TYPE_CHECKING:
         Step2AnalysisWorkflow,
     )
 from app.agents.nodes.contract_llm_base import ContractLLMNode
+from app.utils.clause_retrieval import section_slice
 from app.prompts.schema.step2.parties_property_schema import (
     PartiesPropertyAnalysisResult,
 )
 
 
 class PartiesPropertyNode(ContractLLMNode):
+    COMPOSITION_NAME = "step2_parties_property"
+
     def __init__(
         self,
         workflow: "Step2AnalysisWorkflow",
@@ -28,37 +31,43 @@ class PartiesPropertyNode(ContractLLMNode):
         # Use BaseNode progress tracking if available in caller context
         self.progress_range = progress_range
 
+    def _prompt_inputs(self, state: Step2AnalysisState) -> Dict[str, Any]:
+        # Prefer metadata from extracted_entity
+        entities = state.get("extracted_entity", {}) or {}
+        meta = (entities or {}).get("metadata") or {}
+
+        return {
+            # Seeds + metadata; avoid passing full text by default
+            "extracted_entity": entities,
+            "australian_state": state.get("australian_state")
+            or meta.get("state")
+            or "NSW",
+            "contract_type": state.get("contract_type")
+            or meta.get("contract_type")
+            or "purchase_agreement",
+            "use_category": state.get("use_category") or meta.get("use_category"),
+            "property_condition": state.get("property_condition")
+            or meta.get("property_condition"),
+            "purchase_method": state.get("purchase_method")
+            or meta.get("purchase_method"),
+            "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
+            "seed_snippets": (state.get("section_seeds", {}) or {})
+            .get("snippets", {})
+            .get("parties_property"),
+            "retrieved_clauses": section_slice(state, "parties_property"),
+        }
+
     async def _build_context_and_parser(self, state: Step2AnalysisState):
         from app.core.prompts import PromptContext, ContextType
         from app.prompts.schema.step2.parties_property_schema import (
             PartiesPropertyAnalysisResult,
         )
 
-        # Prefer metadata from extracted_entity
-        entities = state.get("extracted_entity", {}) or {}
-        meta = (entities or {}).get("metadata") or {}
-
         context = PromptContext(
             context_type=ContextType.ANALYSIS,
             variables={
-                # Seeds + metadata; avoid passing full text by default
                 "analysis_timestamp": datetime.now(UTC).isoformat(),
-                "extracted_entity": entities,
-                "australian_state": state.get("australian_state")
-                or meta.get("state")
-                or "NSW",
-                "contract_type": state.get("contract_type")
-                or meta.get("contract_type")
-                or "purchase_agreement",
-                "use_category": state.get("use_category") or meta.get("use_category"),
-                "property_condition": state.get("property_condition")
-                or meta.get("property_condition"),
-                "purchase_method": state.get("purchase_method")
-                or meta.get("purchase_method"),
-                "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
-                "seed_snippets": (state.get("section_seeds", {}) or {})
-                .get("snippets", {})
-                .get("parties_property"),
+                **self._prompt_inputs(state),
             },
         )
 
@@ -67,7 +76,7 @@ class PartiesPropertyNode(ContractLLMNode):
         parser = create_parser(
             PartiesPropertyAnalysisResult, strict_mode=False, retry_on_failure=True
         )
-        return context, parser, "step2_parties_property"
+        return context, parser, self.COMPOSITION_NAME
 
     async def _update_state_success(
         self, state: Step2AnalysisState, parsed: Any, quality: Dict[str, Any]
@@ -6,12 +6,15 @@ from app.agents.subflows.step2_section_analysis_workflow import (
     Step2AnalysisWorkflow,
 )
 from app.agents.nodes.contract_llm_base import ContractLLMNode
+from app.utils.clause_retrieval import section_slice
 from app.prompts.schema.step2.settlement_schema import (
     SettlementAnalysisResult,
 )
 
 
 class SettlementLogisticsNode(ContractLLMNode):
+    COMPOSITION_NAME = "step2_settlement"
+
     def __init__(
         self,
         workflow: Step2AnalysisWorkflow,
@@ -25,6 +28,20 @@ class SettlementLogisticsNode(ContractLLMNode):
         )
         self.progress_range = progress_range
 
+    def _prompt_inputs(self, state: Step2AnalysisState) -> Dict[str, Any]:
+        return {
+            "australian_state": state.get("australian_state") or "NSW",
+            "contract_type": state.get("contract_type") or "purchase_agreement",
+            "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
+            "seed_snippets": (state.get("section_seeds", {}) or {})
+            .get("snippets", {})
+            .get("settlement"),
+            "retrieved_clauses": section_slice(state, "settlement_logistics"),
+            # Dependencies used by the user prompt for integration sections
+            "financial_terms_result": state.get("financial_terms"),
+            "conditions_result": state.get("conditions"),
+        }
+
     async def _build_context_and_parser(self, state: Step2AnalysisState):
         from app.core.prompts import PromptContext, ContextType
         from app.prompts.schema.step2.settlement_schema import (
@@ -36,22 +53,14 @@ class SettlementLogisticsNode(ContractLLMNode):
             context_type=ContextType.ANALYSIS,
             variables={
                 "analysis_timestamp": datetime.now(UTC).isoformat(),
-                "australian_state": state.get("australian_state") or "NSW",
-                "contract_type": state.get("contract_type") or "purchase_agreement",
-                "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
-                "seed_snippets": (state.get("section_seeds", {}) or {})
-                .get("snippets", {})
-                .get("settlement"),
-                # Dependencies used by the user prompt for integration sections
-                "financial_terms_result": state.get("financial_terms"),
-                "conditions_result": state.get("conditions"),
+                **self._prompt_inputs(state),
             },
         )
 
         parser = create_parser(
             SettlementAnalysisResult, strict_mode=False, retry_on_failure=True
         )
-        return context, parser, "step2_settlement"
+        return context, parser, self.COMPOSITION_NAME
 
     async def _update_state_success(
         self, state: Step2AnalysisState, parsed: Any, quality: Dict[str, Any]
@@ -6,9 +6,12 @@ from app.agents.subflows.step2_section_analysis_workflow import (
     Step2AnalysisWorkflow,
 )
 from app.agents.nodes.contract_llm_base import ContractLLMNode
+from app.utils.clause_retrieval import section_slice
 
 
 class TitleEncumbrancesNode(ContractLLMNode):
+    COMPOSITION_NAME = "step2_title_encumbrances"
+
     def __init__(
         self,
         workflow: Step2AnalysisWorkflow,
@@ -26,6 +29,21 @@ class TitleEncumbrancesNode(ContractLLMNode):
         )
         self.progress_range = progress_range
 
+    def _prompt_inputs(self, state: Step2AnalysisState) -> Dict[str, Any]:
+        return {
+            "australian_state": state.get("australian_state") or "NSW",
+            "contract_type": state.get("contract_type") or "purchase_agreement",
+            "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
+            "seed_snippets": (state.get("section_seeds", {}) or {})
+            .get("snippets", {})
+            .get("title_encumbrances"),
+            "retrieved_clauses": section_slice(state, "title_encumbrances"),
+            # Diagram semantics from Phase 1
+            "image_semantics_result": state.get("image_semantics"),
+            # Parties & property baseline from Phase 1 (Step 2 foundation)
+            "parties_property_result": state.get("parties_property"),
+        }
+
     async def _build_context_and_parser(self, state: Step2AnalysisState):
         from app.core.prompts import PromptContext, ContextType
         from app.core.prompts.parsers import create_parser
@@ -37,23 +55,14 @@ class TitleEncumbrancesNode(ContractLLMNode):
             context_type=ContextType.ANALYSIS,
             variables={
                 "analysis_timestamp": datetime.now(UTC).isoformat(),
-                "australian_state": state.get("australian_state") or "NSW",
-                "contract_type": state.get("contract_type") or "purchase_agreement",
-                "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
-                "seed_snippets": (state.get("section_seeds", {}) or {})
-                .get("snippets", {})
-                .get("title_encumbrances"),
-                # Diagram semantics from Phase 1
-                "image_semantics_result": state.get("image_semantics"),
-                # Parties & property baseline from Phase 1 (Step 2 foundation)
-                "parties_property_result": state.get("parties_property"),
+                **self._prompt_inputs(state),
             },
         )
 
         parser = create_parser(
             TitleEncumbrancesAnalysisResult, strict_mode=False, retry_on_failure=True
         )
-        return context, parser, "step2_title_encumbrances"
+        return context, parser, self.COMPOSITION_NAME
 
     # Coercion handled by base class via result_model
 
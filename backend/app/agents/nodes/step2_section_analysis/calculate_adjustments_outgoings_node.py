@@ -6,9 +6,12 @@ from app.agents.subflows.step2_section_analysis_workflow import (
     Step2AnalysisWorkflow,
 )
 from app.agents.nodes.contract_llm_base import ContractLLMNode
+from app.utils.clause_retrieval import section_slice
 
 
 class AdjustmentsOutgoingsNode(ContractLLMNode):
+    COMPOSITION_NAME = "step2_adjustments"
+
     def __init__(
         self,
         workflow: Step2AnalysisWorkflow,
@@ -26,6 +29,20 @@ class AdjustmentsOutgoingsNode(ContractLLMNode):
         )
         self.progress_range = progress_range
 
+    def _prompt_inputs(self, state: Step2AnalysisState) -> Dict[str, Any]:
+        return {
+            "australian_state": state.get("australian_state") or "NSW",
+            "contract_type": state.get("contract_type") or "purchase_agreement",
+            "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
+            "seed_snippets": (state.get("section_seeds", {}) or {})
+            .get("snippets", {})
+            .get("adjustments"),
+            "retrieved_clauses": section_slice(state, "adjustments_outgoings"),
+            # Dependencies per DAG
+            "financial_terms_result": state.get("financial_terms"),
+            "settlement_logistics_result": state.get("settlement_logistics"),
+        }
+
     async def _build_context_and_parser(self, state: Step2AnalysisState):
         from app.core.prompts import PromptContext, ContextType
         from app.core.prompts.parsers import create_parser
@@ -37,22 +54,14 @@ class AdjustmentsOutgoingsNode(ContractLLMNode):
             context_type=ContextType.ANALYSIS,
             variables={
                 "analysis_timestamp": datetime.now(UTC).isoformat(),
-                "australian_state": state.get("australian_state") or "NSW",
-                "contract_type": state.get("contract_type") or "purchase_agreement",
-                "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
-                "seed_snippets": (state.get("section_seeds", {}) or {})
-                .get("snippets", {})
-                .get("adjustments"),
-                # Dependencies per DAG
-                "financial_terms_result": state.get("financial_terms"),
-                "settlement_logistics_result": state.get("settlement_logistics"),
+                **self._prompt_inputs(state),
             },
         )
 
         parser = create_parser(
             AdjustmentsAnalysisResult, strict_mode=False, retry_on_failure=True
         )
-        return context, parser, "step2_adjustments"
+        return context, parser, self.COMPOSITION_NAME
 
     # Coercion handled by base class via result_model
 
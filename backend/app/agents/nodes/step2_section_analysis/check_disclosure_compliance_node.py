@@ -6,12 +6,15 @@ from app.agents.subflows.step2_section_analysis_workflow import (
     Step2AnalysisWorkflow,
 )
 from app.agents.nodes.contract_llm_base import ContractLLMNode
+from app.utils.clause_retrieval import section_slice
 from app.prompts.schema.step2.disclosure_schema import (
     DisclosureAnalysisResult,
 )
 
 
 class DisclosureComplianceNode(ContractLLMNode):
+    COMPOSITION_NAME = "step2_disclosure"
+
     def __init__(
         self,
         workflow: Step2AnalysisWorkflow,
@@ -26,6 +29,23 @@ class DisclosureComplianceNode(ContractLLMNode):
         )
         self.progress_range = progress_range
 
+    def _prompt_inputs(self, state: Step2AnalysisState) -> Dict[str, Any]:
+        return {
+            "australian_state": state.get("australian_state") or "NSW",
+            "contract_type": state.get("contract_type") or "purchase_agreement",
+            "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
+            "seed_snippets": (state.get("section_seeds", {}) or {})
+            .get("snippets", {})
+            .get("disclosure"),
+            "retrieved_clauses": section_slice(state, "disclosure_compliance"),
+            # DAG dependencies
+            "settlement_logistics_result": state.get("settlement_logistics"),
+            "title_encumbrances_result": state.get("title_encumbrances"),
+            # soft inputs
+            "warranties_result": state.get("warranties"),
+            "default_termination_result": state.get("default_termination"),
+        }
+
     async def _build_context_and_parser(self, state: Step2AnalysisState):
         from app.core.prompts import PromptContext, ContextType
         from app.core.prompts.parsers import create_parser
@@ -34,25 +54,14 @@ class DisclosureComplianceNode(ContractLLMNode):
             context_type=ContextType.ANALYSIS,
             variables={
                 "analysis_timestamp": datetime.now(UTC).isoformat(),
-                "australian_state": state.get("australian_state") or "NSW",
-                "contract_type": state.get("contract_type") or "purchase_agreement",
-                "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
-                "seed_snippets": (state.get("section_seeds", {}) or {})
-                .get("snippets", {})
-                .get("disclosure"),
-                # DAG dependencies
-                "settlement_logistics_result": state.get("settlement_logistics"),
-                "title_encumbrances_result": state.get("title_encumbrances"),
-                # soft inputs
-                "warranties_result": state.get("warranties"),
-                "default_termination_result": state.get("default_termination"),
+                **self._prompt_inputs(state),
             },
         )
 
         parser = create_parser(
             DisclosureAnalysisResult, strict_mode=False, retry_on_failure=True
         )
-        return context, parser, "step2_disclosure"
+        return context, parser, self.COMPOSITION_NAME
 
     # Coercion handled by base class via result_model
 
@@ -6,12 +6,15 @@ from app.agents.subflows.step2_section_analysis_workflow import (
     Step2AnalysisWorkflow,
 )
 from app.agents.nodes.contract_llm_base import ContractLLMNode
+from app.utils.clause_retrieval import section_slice
 from app.prompts.schema.step2.special_risks_schema import (
     SpecialRisksAnalysisResult,
 )
 
 
 class SpecialRisksNode(ContractLLMNode):
+    COMPOSITION_NAME = "step2_special_risks"
+
     def __init__(
         self,
         workflow: Step2AnalysisWorkflow,
@@ -25,13 +28,7 @@ class SpecialRisksNode(ContractLLMNode):
         )
         self.progress_range = progress_range
 
-    async def _build_context_and_parser(self, state: Step2AnalysisState):
-        from app.core.prompts import PromptContext, ContextType
-        from app.core.prompts.parsers import create_parser
-        from app.prompts.schema.step2.special_risks_schema import (
-            SpecialRisksAnalysisResult,
-        )
-
+    def _prompt_inputs(self, state: Step2AnalysisState) -> Dict[str, Any]:
         # Build a compact cross-section bundle instead of full text
         all_section_results = {
             "parties_property": state.get("parties_property"),
@@ -43,24 +40,36 @@ class SpecialRisksNode(ContractLLMNode):
             "title_encumbrances": state.get("title_encumbrances"),
         }
 
+        return {
+            "australian_state": state.get("australian_state") or "NSW",
+            "contract_type": state.get("contract_type") or "purchase_agreement",
+            "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
+            "seed_snippets": (state.get("section_seeds", {}) or {})
+            .get("snippets", {})
+            .get("special_risks"),
+            "retrieved_clauses": section_slice(state, "special_risks"),
+            "all_section_results": all_section_results,
+        }
+
+    async def _build_context_and_parser(self, state: Step2AnalysisState):
+        from app.core.prompts import PromptContext, ContextType
+        from app.core.prompts.parsers import create_parser
+        from app.prompts.schema.step2.special_risks_schema import (
+            SpecialRisksAnalysisResult,
+        )
+
         context = PromptContext(
             context_type=ContextType.ANALYSIS,
             variables={
                 "analysis_timestamp": datetime.now(UTC).isoformat(),
-                "australian_state": state.get("australian_state") or "NSW",
-                "contract_type": state.get("contract_type") or "purchase_agreement",
-                "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
-                "seed_snippets": (state.get("section_seeds", {}) or {})
-                .get("snippets", {})
-                .get("special_risks"),
-                "all_section_results": all_section_results,
+                **self._prompt_inputs(state),
             },
         )
 
         parser = create_parser(
             SpecialRisksAnalysisResult, strict_mode=False, retry_on_failure=True
         )
-        return context, parser, "step2_special_risks"
+        return context, parser, self.COMPOSITION_NAME
 
     async def _update_state_success(
         self, state: Step2AnalysisState, parsed: Any, quality: Dict[str, Any]
@@ -2,6 +2,7 @@ from typing import Dict, Any
 from datetime import datetime, UTC
 
 from app.agents.nodes.base import BaseNode
+from app.agents.nodes.contract_llm_base import load_contract_snapshot
 from app.agents.states.section_analysis_state import Step2AnalysisState
 
 
@@ -23,6 +24,15 @@ class InitializeWorkflowNode(BaseNode):
                 "No entities extraction result provided for Step 2 analysis"
             )
 
+        # One lookup of the populated analysis columns serves every analyzer's
+        # short-circuit check; reuse the parent's snapshot when it has one
+        snapshot = state.get("contract_snapshot")
+        content_hash = state.get("content_hash")
+        if not snapshot or snapshot.get("content_hash") != content_hash:
+            snapshot = await load_contract_snapshot(content_hash)
+            if snapshot:
+                updates["contract_snapshot"] = snapshot
+
         # Emit progress
         await self.emit_progress(
             state, self.progress_range[1], "Starting Step 2 section analysis"
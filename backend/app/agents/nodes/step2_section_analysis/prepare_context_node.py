@@ -1,6 +1,9 @@
 from typing import Dict, Any
 
+from app.agents.run_blobs import resolve_blob
 from app.agents.nodes.base import BaseNode
+from app.core.config import get_settings
+from app.utils.clause_retrieval import build_section_context
 from app.agents.states.section_analysis_state import Step2AnalysisState
 
 
@@ -33,6 +36,32 @@ class PrepareContextNode(BaseNode):
             except Exception as hoist_err:
                 self._log_warning(f"Failed to hoist section seeds: {hoist_err}")
 
+            # Retrieval stage: rank clauses per section so analyzers get a
+            # budgeted slice of the contract instead of the whole text
+            try:
+                settings = get_settings()
+                contract_text = resolve_blob((state or {}).get("contract_text")) or ""
+                if settings.step2_clause_retrieval_enabled and contract_text:
+                    section_context = build_section_context(
+                        contract_text,
+                        updates.get("section_seeds") or state.get("section_seeds"),
+                        max_chars=settings.step2_clause_context_max_chars,
+                    )
+                    if section_context:
+                        updates["section_context"] = section_context
+                        self.logger.info(
+                            "Built Step 2 clause slices",
+                            extra={
+                                "contract_chars": len(contract_text),
+                                "slice_chars": {
+                                    key: sum(len(c["text"]) for c in clauses)
+                                    for key, clauses in section_context.items()
+                                },
+                            },
+                        )
+            except Exception as retrieval_err:
+                self._log_warning(f"Failed to build clause slices: {retrieval_err}")
+
             # Hoist contract metadata from Step 1 entities into Step 2 state
             try:
                 metadata = (extracted_entity or {}).get("metadata") or {}
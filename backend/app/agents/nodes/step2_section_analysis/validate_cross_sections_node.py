@@ -12,6 +12,8 @@ from app.agents.subflows.step2_section_analysis_workflow import (
 
 
 class CrossSectionValidationNode(ContractLLMNode):
+    COMPOSITION_NAME = "step2_cross_validation"
+
     def __init__(
         self,
         workflow: Step2AnalysisWorkflow,
@@ -26,10 +28,7 @@ class CrossSectionValidationNode(ContractLLMNode):
         )
         self.progress_range = progress_range
 
-    async def _build_context_and_parser(self, state: Step2AnalysisState):
-        from app.core.prompts import PromptContext, ContextType
-        from app.core.prompts.parsers import create_parser
-
+    def _prompt_inputs(self, state: Step2AnalysisState) -> Dict[str, Any]:
         all_section_results = {
             "parties_property": state.get("parties_property"),
             "financial_terms": state.get("financial_terms"),
@@ -43,24 +42,32 @@ class CrossSectionValidationNode(ContractLLMNode):
             "special_risks": state.get("special_risks"),
         }
 
+        return {
+            "australian_state": state.get("australian_state") or "NSW",
+            "contract_type": state.get("contract_type") or "purchase_agreement",
+            "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
+            "seed_snippets": (state.get("section_seeds", {}) or {})
+            .get("snippets", {})
+            .get("cross_validation"),
+            "all_section_results": all_section_results,
+        }
+
+    async def _build_context_and_parser(self, state: Step2AnalysisState):
+        from app.core.prompts import PromptContext, ContextType
+        from app.core.prompts.parsers import create_parser
+
         context = PromptContext(
             context_type=ContextType.ANALYSIS,
             variables={
                 "analysis_timestamp": datetime.now(UTC).isoformat(),
-                "australian_state": state.get("australian_state") or "NSW",
-                "contract_type": state.get("contract_type") or "purchase_agreement",
-                "legal_requirements_matrix": state.get("legal_requirements_matrix", {}),
-                "seed_snippets": (state.get("section_seeds", {}) or {})
-                .get("snippets", {})
-                .get("cross_validation"),
-                "all_section_results": all_section_results,
+                **self._prompt_inputs(state),
             },
         )
 
         parser = create_parser(
             CrossValidationResult, strict_mode=False, retry_on_failure=True
         )
-        return context, parser, "step2_cross_validation"
+        return context, parser, self.COMPOSITION_NAME
 
     # Coercion handled by base class via result_model
 
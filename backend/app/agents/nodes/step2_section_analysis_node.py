@@ -9,6 +9,7 @@ import logging
 from datetime import datetime, UTC
 from typing import Dict, Any, Optional
 
+from app.agents.run_blobs import resolve_blob
 from app.agents.states.contract_state import RealEstateAgentState
 from app.agents.subflows.step2_section_analysis_workflow import Step2AnalysisWorkflow
 from .base import BaseNode
@@ -97,6 +98,8 @@ class SectionAnalysisNode(BaseNode):
 
             # Store Step 2 results in state
             state["step2_analysis_result"] = step2_results
+            if step2_results.get("contract_snapshot"):
+                state["contract_snapshot"] = step2_results["contract_snapshot"]
 
             # Back-compat with `contract_terms` removed; downstream should consume `step2_analysis_result`
 
@@ -159,8 +162,8 @@ class SectionAnalysisNode(BaseNode):
         Reuses logic from ContractTermsExtractionNode for consistency.
         """
         # Check document metadata first (Step 0 output in state)
-        document_metadata = state.get("step0_ocr_processing", {})
-        full_text = document_metadata.get("full_text", "")
+        document_metadata = state.get("step0_ocr_processing") or {}
+        full_text = resolve_blob(document_metadata.get("full_text"))
 
         if full_text:
             return full_text
@@ -11,6 +11,8 @@ logger = logging.getLogger(__name__)
 
 
 class BuyerReportNode(ContractLLMNode):
+    COMPOSITION_NAME = "step3_buyer_report"
+
     def __init__(self, workflow, progress_range: tuple[int, int] = (15, 20)):
         super().__init__(
             workflow=workflow,
@@ -20,14 +22,8 @@ class BuyerReportNode(ContractLLMNode):
         )
         self.progress_range = progress_range
 
-    async def _build_context_and_parser(
-        self, state: Step3SynthesisState
-    ) -> Tuple[Any, Any, str]:
-        from app.core.prompts.context import PromptContext
-
-        # Build comprehensive context from ALL Step 2 and Step 3 results
-        context_dict = {
-            "analysis_timestamp": datetime.now(UTC).isoformat(),
+    def _prompt_inputs(self, state: Step3SynthesisState) -> Dict[str, Any]:
+        return {
             "australian_state": state.get("australian_state", "NSW"),
             # Step 3 synthesis results
             "risk_summary_result": state.get("risk_summary_result", {}),
@@ -50,6 +46,17 @@ class BuyerReportNode(ContractLLMNode):
             "special_risks_result": state.get("special_risks_result", {}),
         }
 
+    async def _build_context_and_parser(
+        self, state: Step3SynthesisState
+    ) -> Tuple[Any, Any, str]:
+        from app.core.prompts.context import PromptContext
+
+        # Build comprehensive context from ALL Step 2 and Step 3 results
+        context_dict = {
+            "analysis_timestamp": datetime.now(UTC).isoformat(),
+            **self._prompt_inputs(state),
+        }
+
         # Validate required inputs for buyer report
         step3_inputs = [
             "risk_summary_result",
@@ -83,7 +90,7 @@ class BuyerReportNode(ContractLLMNode):
         parser = create_parser(
             BuyerReportResult, strict_mode=False, retry_on_failure=True
         )
-        composition_name = "step3_buyer_report"
+        composition_name = self.COMPOSITION_NAME
         return context, parser, composition_name
 
     # Coercion handled by base class via result_model
@@ -11,6 +11,8 @@ logger = logging.getLogger(__name__)
 
 
 class ComplianceScoreNode(ContractLLMNode):
+    COMPOSITION_NAME = "step3_compliance_score"
+
     def __init__(self, workflow, progress_range: tuple[int, int] = (10, 15)):
         super().__init__(
             workflow=workflow,
@@ -20,14 +22,8 @@ class ComplianceScoreNode(ContractLLMNode):
         )
         self.progress_range = progress_range
 
-    async def _build_context_and_parser(
-        self, state: Step3SynthesisState
-    ) -> Tuple[Any, Any, str]:
-        from app.core.prompts.context import PromptContext
-
-        # Build comprehensive context from Step 2 results
-        context_dict = {
-            "analysis_timestamp": datetime.now(UTC).isoformat(),
+    def _prompt_inputs(self, state: Step3SynthesisState) -> Dict[str, Any]:
+        return {
             "australian_state": state.get("australian_state", "NSW"),
             "cross_section_validation_result": state.get(
                 "cross_section_validation_result", {}
@@ -39,6 +35,17 @@ class ComplianceScoreNode(ContractLLMNode):
             "settlement_logistics_result": state.get("settlement_logistics_result", {}),
         }
 
+    async def _build_context_and_parser(
+        self, state: Step3SynthesisState
+    ) -> Tuple[Any, Any, str]:
+        from app.core.prompts.context import PromptContext
+
+        # Build comprehensive context from Step 2 results
+        context_dict = {
+            "analysis_timestamp": datetime.now(UTC).isoformat(),
+            **self._prompt_inputs(state),
+        }
+
         # Validate required inputs for compliance analysis
         required_inputs = [
             "cross_section_validation_result",
@@ -63,7 +70,7 @@ class ComplianceScoreNode(ContractLLMNode):
         parser = create_parser(
             ComplianceSummaryResult, strict_mode=False, retry_on_failure=True
         )
-        composition_name = "step3_compliance_score"
+        composition_name = self.COMPOSITION_NAME
         return context, parser, composition_name
 
     # Coercion handled by base class via result_model
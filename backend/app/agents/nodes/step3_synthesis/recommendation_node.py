@@ -11,6 +11,8 @@ logger = logging.getLogger(__name__)
 
 
 class ActionPlanNode(ContractLLMNode):
+    COMPOSITION_NAME = "step3_recommendations"
+
     def __init__(self, workflow, progress_range: tuple[int, int] = (5, 10)):
         super().__init__(
             workflow=workflow,
@@ -20,14 +22,8 @@ class ActionPlanNode(ContractLLMNode):
         )
         self.progress_range = progress_range
 
-    async def _build_context_and_parser(
-        self, state: Step3SynthesisState
-    ) -> Tuple[Any, Any, str]:
-        from app.core.prompts.context import PromptContext
-
-        # Build comprehensive context from Step 2 results
-        context_dict = {
-            "analysis_timestamp": datetime.now(UTC).isoformat(),
+    def _prompt_inputs(self, state: Step3SynthesisState) -> Dict[str, Any]:
+        return {
             "australian_state": state.get("australian_state", "NSW"),
             "cross_section_validation_result": state.get(
                 "cross_section_validation_result", {}
@@ -42,6 +38,17 @@ class ActionPlanNode(ContractLLMNode):
             "conditions_result": state.get("conditions_result", {}),
         }
 
+    async def _build_context_and_parser(
+        self, state: Step3SynthesisState
+    ) -> Tuple[Any, Any, str]:
+        from app.core.prompts.context import PromptContext
+
+        # Build comprehensive context from Step 2 results
+        context_dict = {
+            "analysis_timestamp": datetime.now(UTC).isoformat(),
+            **self._prompt_inputs(state),
+        }
+
         # Validate required inputs for recommendations
         required_inputs = [
             "cross_section_validation_result",
@@ -66,7 +73,7 @@ class ActionPlanNode(ContractLLMNode):
         parser = create_parser(
             ActionPlanResult, strict_mode=False, retry_on_failure=True
         )
-        composition_name = "step3_recommendations"
+        composition_name = self.COMPOSITION_NAME
         return context, parser, composition_name
 
     # Coercion handled by base class via result_model
@@ -11,6 +11,8 @@ logger = logging.getLogger(__name__)
 
 
 class RiskAggregatorNode(ContractLLMNode):
+    COMPOSITION_NAME = "step3_risk_aggregation"
+
     def __init__(self, workflow, progress_range: tuple[int, int] = (0, 5)):
         from app.prompts.schema.step3.risk_summary_schema import RiskSummaryResult
 
@@ -22,13 +24,8 @@ class RiskAggregatorNode(ContractLLMNode):
         )
         self.progress_range = progress_range
 
-    async def _build_context_and_parser(
-        self, state: Step3SynthesisState
-    ) -> Tuple[Any, Any, str]:
-        from app.core.prompts.context import PromptContext
-
-        context_dict = {
-            "analysis_timestamp": datetime.now(UTC).isoformat(),
+    def _prompt_inputs(self, state: Step3SynthesisState) -> Dict[str, Any]:
+        return {
             "australian_state": state.get("australian_state", "NSW"),
             "cross_section_validation_result": state.get(
                 "cross_section_validation_result", {}
@@ -44,6 +41,16 @@ class RiskAggregatorNode(ContractLLMNode):
             ),
         }
 
+    async def _build_context_and_parser(
+        self, state: Step3SynthesisState
+    ) -> Tuple[Any, Any, str]:
+        from app.core.prompts.context import PromptContext
+
+        context_dict = {
+            "analysis_timestamp": datetime.now(UTC).isoformat(),
+            **self._prompt_inputs(state),
+        }
+
         required_inputs = [
             "cross_section_validation_result",
             "special_risks_result",
@@ -69,5 +76,5 @@ class RiskAggregatorNode(ContractLLMNode):
         parser = create_parser(
             RiskSummaryResult, strict_mode=False, retry_on_failure=True
         )
-        composition_name = "step3_risk_aggregation"
+        composition_name = self.COMPOSITION_NAME
         return context, parser, composition_name
@@ -0,0 +1,150 @@
+"""
+Run-scoped blob store for large immutable workflow payloads.
+
+LangGraph copies the state into every node, merges every node's return value
+and, with a checkpointer, serialises the whole state after each superstep.
+The contract's full text (Step 0 `step0_ocr_processing.full_text` and
+`extracted_text`, Step 2 `contract_text`) dominated that state while only a
+few nodes read it. Those payloads are stashed in a `RunBlobStore` for the
+lifetime of one analysis and the state carries a small handle instead:
+
+    {"__blob__": "<sha256 prefix>", "kind": "full_text", "size": 183402}
+
+Readers call `resolve_blob`, which returns the payload for a handle and
+passes any other value through unchanged. A handle that cannot be resolved
+(a checkpointed run resumed in another process) resolves to None, so
+readers fall back to the repository exactly as for trimmed state.
+
+The store is bound to the run through a ContextVar (`run_blob_scope`), which
+LangGraph propagates into every node and nested subflow. Outside a scope,
+`stash_blob` returns the payload itself. `estimate_state_bytes` gives the
+approximate state size recorded on each node's trace span.
+"""
+
+import hashlib
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+BLOB_REF_KEY = "__blob__"
+
+# Payloads smaller than this stay inline; a handle would not save anything
+MIN_BLOB_BYTES = 4096
+
+# Depth bound for the state size walk (results are nested a few levels deep)
+MAX_SIZE_DEPTH = 6
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, dict) and BLOB_REF_KEY in value
+
+
+class RunBlobStore:
+    """Content-addressed payloads of one workflow run."""
+
+    def __init__(self):
+        self._blobs: Dict[str, Union[str, bytes]] = {}
+        self.stashed_bytes = 0
+        self.resolves = 0
+        self.misses = 0
+        self.peak_state_bytes = 0
+        self.peak_state_node: Optional[str] = None
+
+    def put(self, payload: Union[str, bytes], kind: str) -> Dict[str, Any]:
+        raw = payload.encode("utf-8") if isinstance(payload, str) else payload
+        key = hashlib.sha256(raw).hexdigest()[:32]
+        if key not in self._blobs:
+            self._blobs[key] = payload
+            self.stashed_bytes += len(raw)
+        return {BLOB_REF_KEY: key, "kind": kind, "size": len(raw)}
+
+    def get(self, ref: Dict[str, Any]) -> Optional[Union[str, bytes]]:
+        payload = self._blobs.get(ref.get(BLOB_REF_KEY))
+        if payload is None:
+            self.misses += 1
+        else:
+            self.resolves += 1
+        return payload
+
+    def record_state_size(self, node: str, size: int) -> None:
+        if size > self.peak_state_bytes:
+            self.peak_state_bytes = size
+            self.peak_state_node = node
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "blobs": len(self._blobs),
+            "stashed_bytes": self.stashed_bytes,
+            "resolves": self.resolves,
+            "misses": self.misses,
+            "peak_state_bytes": self.peak_state_bytes,
+            "peak_state_node": self.peak_state_node,
+        }
+
+
+_run_store: ContextVar[Optional[RunBlobStore]] = ContextVar(
+    "run_blob_store", default=None
+)
+
+
+@contextmanager
+def run_blob_scope() -> Iterator[RunBlobStore]:
+    """Bind a fresh blob store to the current workflow run."""
+    store = RunBlobStore()
+    token = _run_store.set(store)
+    try:
+        yield store
+    finally:
+        _run_store.reset(token)
+
+
+def get_run_blob_store() -> Optional[RunBlobStore]:
+    return _run_store.get()
+
+
+def stash_blob(payload: Any, kind: str) -> Any:
+    """Replace a large str/bytes payload with a handle inside a run scope."""
+    store = _run_store.get()
+    if (
+        store is None
+        or not isinstance(payload, (str, bytes))
+        or len(payload) < MIN_BLOB_BYTES
+    ):
+        return payload
+    return store.put(payload, kind)
+
+
+def resolve_blob(value: Any) -> Any:
+    """Payload behind a handle (None if unavailable); other values unchanged."""
+    if not is_blob_ref(value):
+        return value
+    store = _run_store.get()
+    if store is None:
+        return None
+    return store.get(value)
+
+
+def has_text(value: Any) -> bool:
+    """Whether a text payload or its handle holds non-blank text."""
+    if is_blob_ref(value):
+        return bool(value.get("size"))
+    return isinstance(value, str) and bool(value.strip())
+
+
+def estimate_state_bytes(value: Any, _depth: int = 0) -> int:
+    """Approximate in-memory payload size of a state (strings, bytes, containers)."""
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if _depth >= MAX_SIZE_DEPTH:
+        return 0
+    if isinstance(value, dict):
+        return sum(
+            len(str(key)) + estimate_state_bytes(item, _depth + 1)
+            for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple, set)):
+        return sum(estimate_state_bytes(item, _depth + 1) for item in value)
+    return 8
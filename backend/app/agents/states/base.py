@@ -1,7 +1,30 @@
-from typing import TypedDict, Optional, Callable, Annotated
+from typing import TypedDict, Optional, Callable, Annotated, Dict, Any
 from typing_extensions import Awaitable
 
 
+def merge_contract_snapshot(
+    current: Optional[Dict[str, Any]], update: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Union populated keys and fingerprints written by parallel branches."""
+    if not update:
+        return current
+    if not current or current.get("content_hash") != update.get("content_hash"):
+        return update
+    populated = set(current.get("populated_keys") or []) | set(
+        update.get("populated_keys") or []
+    )
+    fingerprints = {
+        **(current.get("fingerprints") or {}),
+        **(update.get("fingerprints") or {}),
+    }
+    return {
+        **current,
+        **update,
+        "populated_keys": sorted(populated),
+        "fingerprints": fingerprints,
+    }
+
+
 class LangGraphBaseState(TypedDict):
     # Progress notification callback
     notify_progress: Annotated[
@@ -15,3 +38,7 @@ class LangGraphBaseState(TypedDict):
     content_hmac: Annotated[
         Optional[str], lambda x, y: y
     ]  # Last value wins for concurrent updates
+    # Which analysis columns are already populated on the contracts row
+    # (see contract_llm_base.load_contract_snapshot); lets nodes skip the
+    # per-node contract lookup in their short-circuit check
+    contract_snapshot: Annotated[Optional[Dict[str, Any]], merge_contract_snapshot]
@@ -26,6 +26,10 @@ class Step2AnalysisState(LangGraphBaseState):
 
     # Seeds context
     section_seeds: Annotated[Optional[Dict[str, Any]], lambda x, y: y]
+    # Ranked clause slices per section (see app/utils/clause_retrieval.py)
+    section_context: Annotated[
+        Optional[Dict[str, List[Dict[str, Any]]]], lambda x, y: y
+    ]
 
     # Phase 1 Foundation Results (Parallel)
     parties_property: Annotated[Optional[Dict[str, Any]], lambda x, y: y]
@@ -65,3 +69,5 @@ class Step2AnalysisState(LangGraphBaseState):
     ]
     total_diagrams_processed: Annotated[int, lambda x, y: y]
     diagram_processing_success_rate: Annotated[float, lambda x, y: y]
+    # Analyzer timings and realized critical path (see app/agents/step2_scheduler.py)
+    analyzer_schedule: Annotated[Optional[Dict[str, Any]], lambda x, y: y]
@@ -0,0 +1,241 @@
+"""
+Critical-path scheduling of the Step 2 section analyzers.
+
+The analyzers form a small dependency graph (settlement logistics needs
+financial terms and conditions, adjustments need settlement and financial
+terms, ...). As LangGraph edges every dependent waited for the whole
+superstep before it, so a slow diagram analysis held back settlement
+logistics although settlement never reads it. Here each analyzer starts as
+soon as its own inputs are ready, and model calls are prioritised by
+critical path:
+
+- `NodeLatencyHistory` keeps an in-process moving average of each
+  analyzer's latency (seeded with `DEFAULT_NODE_LATENCY_SECONDS`)
+- `critical_path_ranks` turns the estimates into priorities: a node's rank
+  is its own latency plus the longest chain of dependents behind it
+- `run_dependency_graph` runs the analyzers, releasing dependents as their
+  inputs complete, and returns per-node timings
+- `realized_critical_path` walks the timings back from the last analyzer to
+  finish, giving the chain that actually set the run's duration
+
+The ranks are handed to `app.core.llm_priority`, which orders the waiting
+model calls of one contract.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Analyzer -> analyzers whose results it reads
+STEP2_ANALYZER_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "analyze_parties_property": (),
+    "analyze_financial_terms": (),
+    "analyze_conditions": (),
+    "analyze_warranties": (),
+    "analyze_default_termination": (),
+    "analyze_diagram": (),
+    "analyze_settlement_logistics": ("analyze_financial_terms", "analyze_conditions"),
+    "analyze_title_encumbrances": ("analyze_diagram", "analyze_parties_property"),
+    "calculate_adjustments_outgoings": (
+        "analyze_settlement_logistics",
+        "analyze_financial_terms",
+    ),
+    "check_disclosure_compliance": (
+        "analyze_settlement_logistics",
+        "analyze_title_encumbrances",
+    ),
+    "identify_special_risks": (
+        "analyze_settlement_logistics",
+        "analyze_title_encumbrances",
+    ),
+}
+
+# Prior latency estimates (seconds) until a node has been observed
+DEFAULT_NODE_LATENCY_SECONDS: Dict[str, float] = {
+    "analyze_diagram": 60.0,
+    "analyze_financial_terms": 30.0,
+    "analyze_settlement_logistics": 30.0,
+    "calculate_adjustments_outgoings": 30.0,
+}
+DEFAULT_LATENCY_SECONDS = 25.0
+
+# Weight of the newest observation in the moving average
+LATENCY_EWMA_ALPHA = 0.3
+
+NodeTimings = Dict[str, Tuple[float, float]]
+
+
+class NodeLatencyHistory:
+    """Exponentially weighted moving average of node latencies."""
+
+    def __init__(self, alpha: float = LATENCY_EWMA_ALPHA):
+        self.alpha = alpha
+        self._averages: Dict[str, float] = {}
+        self._samples: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, node: str, seconds: float) -> None:
+        with self._lock:
+            previous = self._averages.get(node)
+            self._averages[node] = (
+                seconds
+                if previous is None
+                else self.alpha * seconds + (1 - self.alpha) * previous
+            )
+            self._samples[node] = self._samples.get(node, 0) + 1
+
+    def estimate(self, node: str) -> float:
+        with self._lock:
+            if node in self._averages:
+                return self._averages[node]
+        return DEFAULT_NODE_LATENCY_SECONDS.get(node, DEFAULT_LATENCY_SECONDS)
+
+    def estimates(self, nodes: Iterable[str]) -> Dict[str, float]:
+        return {node: self.estimate(node) for node in nodes}
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                node: {
+                    "avg_seconds": round(avg, 3),
+                    "samples": self._samples[node],
+                }
+                for node, avg in self._averages.items()
+            }
+
+
+_history = NodeLatencyHistory()
+
+
+def get_node_latency_history() -> NodeLatencyHistory:
+    """Process-wide latency history shared by all Step 2 runs."""
+    return _history
+
+
+def _topological_order(dependencies: Mapping[str, Iterable[str]]) -> List[str]:
+    order: List[str] = []
+    visiting, done = set(), set()
+
+    def visit(node: str) -> None:
+        if node in done:
+            return
+        if node in visiting:
+            raise ValueError(f"Dependency cycle through {node}")
+        visiting.add(node)
+        for upstream in dependencies.get(node, ()):
+            if upstream not in dependencies:
+                raise ValueError(f"{node} depends on unknown node {upstream}")
+            visit(upstream)
+        visiting.discard(node)
+        done.add(node)
+        order.append(node)
+
+    for node in dependencies:
+        visit(node)
+    return order
+
+
+def critical_path_ranks(
+    dependencies: Mapping[str, Iterable[str]], estimates: Mapping[str, float]
+) -> Dict[str, float]:
+    """Estimated time from a node's start to the end of its longest dependent chain."""
+    order = _topological_order(dependencies)
+    dependents: Dict[str, List[str]] = {node: [] for node in dependencies}
+    for node, upstream in dependencies.items():
+        for parent in upstream:
+            dependents[parent].append(node)
+
+    ranks: Dict[str, float] = {}
+    for node in reversed(order):
+        tail = max((ranks[child] for child in dependents[node]), default=0.0)
+        ranks[node] = estimates.get(node, DEFAULT_LATENCY_SECONDS) + tail
+    return ranks
+
+
+def realized_critical_path(
+    dependencies: Mapping[str, Iterable[str]], timings: NodeTimings
+) -> Dict[str, Any]:
+    """The chain of nodes that determined when the run finished.
+
+    Starting from the last node to finish, repeatedly step to the dependency
+    that finished last (the one the node was actually waiting for).
+    """
+    if not timings:
+        return {"nodes": [], "seconds": 0.0, "segments": []}
+
+    node = max(timings, key=lambda name: timings[name][1])
+    path = [node]
+    while True:
+        upstream = [dep for dep in dependencies.get(node, ()) if dep in timings]
+        if not upstream:
+            break
+        node = max(upstream, key=lambda name: timings[name][1])
+        path.append(node)
+    path.reverse()
+
+    return {
+        "nodes": path,
+        "seconds": round(timings[path[-1]][1], 3),
+        "segments": [
+            {
+                "node": name,
+                "start_seconds": round(timings[name][0], 3),
+                "duration_seconds": round(timings[name][1] - timings[name][0], 3),
+            }
+            for name in path
+        ],
+    }
+
+
+async def run_dependency_graph(
+    dependencies: Mapping[str, Iterable[str]],
+    run_node: Callable[[str], Awaitable[None]],
+    ranks: Mapping[str, float] = None,
+) -> NodeTimings:
+    """Run every node once, each as soon as all of its dependencies finished.
+
+    Returns (start, end) offsets in seconds per node. If a node raises, the
+    nodes still running are cancelled and the error propagates.
+    """
+    _topological_order(dependencies)
+    ranks = ranks or {}
+    pending = {node: set(upstream) for node, upstream in dependencies.items()}
+    running: Dict[asyncio.Task, str] = {}
+    timings: NodeTimings = {}
+    origin = time.perf_counter()
+
+    async def timed(node: str) -> None:
+        started = time.perf_counter() - origin
+        try:
+            await run_node(node)
+        finally:
+            timings[node] = (started, time.perf_counter() - origin)
+
+    def start_ready() -> None:
+        ready = [node for node, upstream in pending.items() if not upstream]
+        for node in sorted(ready, key=lambda name: -ranks.get(name, 0.0)):
+            del pending[node]
+            running[asyncio.create_task(timed(node))] = node
+
+    start_ready()
+    try:
+        while running:
+            finished, _ = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in finished:
+                node = running.pop(task)
+                task.result()
+                for upstream in pending.values():
+                    upstream.discard(node)
+            start_ready()
+    except BaseException:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        raise
+    return timings
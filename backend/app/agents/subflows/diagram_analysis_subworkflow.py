@@ -19,6 +19,7 @@ import logging
 
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.state import CompiledStateGraph
+from app.agents.run_blobs import resolve_blob
 from app.agents.states.section_analysis_state import Step2AnalysisState
 from app.agents.nodes.diagram_analysis_subflow.prepare_diagrams_node import (
     PrepareDiagramsNode,
@@ -27,6 +28,7 @@ from app.agents.nodes.diagram_analysis_subflow.diagram_semantics_fanout_node imp
     DiagramSemanticsFanoutNode,
 )
 from app.core.prompts import get_prompt_manager
+from app.core.span_trace import traced
 
 
 logger = logging.getLogger(__name__)
@@ -53,6 +55,7 @@ class DiagramAnalysisSubWorkflow:
 
         self.graph = graph.compile()
 
+    @traced("subflow:diagram")
     async def run(self, state: Step2AnalysisState) -> Step2AnalysisState:
         assert self.graph is not None
         return await self.graph.ainvoke(state)
@@ -215,7 +218,7 @@ class DiagramAnalysisSubWorkflow:
 
         context_vars: Dict[str, Any] = {
             "analysis_timestamp": datetime.now(UTC).isoformat(),
-            "contract_text": state.get("contract_text", ""),
+            "contract_text": resolve_blob(state.get("contract_text")) or "",
             "australian_state": state.get("australian_state")
             or meta.get("state")
             or "NSW",
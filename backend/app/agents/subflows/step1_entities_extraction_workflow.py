@@ -15,7 +15,9 @@ import logging
 from datetime import datetime, UTC
 from typing import Any, Dict, Optional
 
+from app.agents.run_blobs import has_text
 from app.agents.states.contract_state import RealEstateAgentState
+from app.core.span_trace import traced
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,7 @@ class Step1EntitiesExtractionWorkflow:
     def __init__(self, parent_workflow: Any):
         self.parent_workflow = parent_workflow
 
+    @traced("subflow:step1")
     async def execute(self, state: RealEstateAgentState) -> Dict[str, Any]:
         start_time = datetime.now(UTC)
 
@@ -38,7 +41,7 @@ class Step1EntitiesExtractionWorkflow:
             if isinstance(state, dict)
             else None
         )
-        if not full_text or len(full_text.strip()) == 0:
+        if not has_text(full_text):
             logger.warning("Step 1 subflow invoked without available contract text")
             return {
                 "success": False,
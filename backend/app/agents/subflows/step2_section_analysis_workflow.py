@@ -7,23 +7,45 @@ This module implements the comprehensive contract analysis workflow with three p
 - Phase 3: Synthesis Analysis (sequential)
 
 Replaces ContractTermsExtractionNode with specialized section analyzers.
+The analyzers run from their dependency graph rather than LangGraph
+supersteps, with model calls ordered by critical path (see
+app/agents/step2_scheduler.py).
 """
 
 import logging
 from datetime import datetime, UTC
-from typing import Dict, Any
+from operator import add
+from typing import Dict, Any, get_type_hints
 
 
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.state import CompiledStateGraph
 
+from app.agents.run_blobs import stash_blob
 from app.agents.states.contract_state import RealEstateAgentState
 from app.core.langsmith_config import langsmith_trace
 from app.agents.states.section_analysis_state import Step2AnalysisState
 from app.core.prompts import get_prompt_manager
+from app.agents.step2_scheduler import (
+    STEP2_ANALYZER_DEPENDENCIES,
+    critical_path_ranks,
+    get_node_latency_history,
+    realized_critical_path,
+    run_dependency_graph,
+)
+from app.core.config import get_settings
+from app.core.llm_priority import PriorityLLMGate, llm_priority, priority_gate_scope
+from app.core.span_trace import current_span, traced
 
 logger = logging.getLogger(__name__)
 
+# Reducer per Step2AnalysisState key, applied when merging analyzer results
+_STATE_REDUCERS = {
+    key: hint.__metadata__[0]
+    for key, hint in get_type_hints(Step2AnalysisState, include_extras=True).items()
+    if getattr(hint, "__metadata__", None)
+}
+
 
 class Step2AnalysisWorkflow:
     """
@@ -165,26 +187,8 @@ class Step2AnalysisWorkflow:
         graph.add_node("initialize_workflow", self.initialize_workflow)
         graph.add_node("prepare_context", self.prepare_context)
 
-        # Phase 1: Foundation Analysis Nodes (Parallel)
-        graph.add_node("analyze_parties_property", self.analyze_parties_property)
-        graph.add_node("analyze_financial_terms", self.analyze_financial_terms)
-        graph.add_node("analyze_conditions", self.analyze_conditions)
-        graph.add_node("analyze_warranties", self.analyze_warranties)
-        graph.add_node("analyze_default_termination", self.analyze_default_termination)
-        graph.add_node("analyze_diagram", self.analyze_diagram)
-
-        # Dependent Analysis Nodes (DAG sequencing)
-        graph.add_node(
-            "analyze_settlement_logistics", self.analyze_settlement_logistics
-        )
-        graph.add_node("analyze_title_encumbrances", self.analyze_title_encumbrances)
-
-        # Synthesis Analysis Nodes (depend on prior nodes per DAG)
-        graph.add_node(
-            "calculate_adjustments_outgoings", self.calculate_adjustments_outgoings
-        )
-        graph.add_node("check_disclosure_compliance", self.check_disclosure_compliance)
-        graph.add_node("identify_special_risks", self.identify_special_risks)
+        # Section analyzers, scheduled by their own dependencies
+        graph.add_node("run_section_analyzers", self.run_section_analyzers)
 
         # Cross-section validation and finalization
         graph.add_node("validate_cross_sections", self.validate_cross_sections)
@@ -197,61 +201,22 @@ class Step2AnalysisWorkflow:
         return graph.compile()
 
     def _define_workflow_edges(self, graph: StateGraph):
-        """Define the workflow execution edges with dependency management"""
+        """Define the workflow execution edges.
+
+        The section analyzers are not graph edges: LangGraph runs a dependent
+        only after every branch of the previous superstep (and once per
+        incoming edge), so `run_section_analyzers` runs them from
+        STEP2_ANALYZER_DEPENDENCIES instead.
+        """
 
-        # Start with initialization -> prepare
         graph.add_edge(START, "initialize_workflow")
         graph.add_edge("initialize_workflow", "prepare_context")
-
-        # Foundation nodes start after preparation (parallel-capable)
-        foundation_nodes = [
-            "analyze_parties_property",
-            "analyze_financial_terms",
-            "analyze_conditions",
-            "analyze_warranties",
-            "analyze_default_termination",
-            "analyze_diagram",
-        ]
-
-        for node in foundation_nodes:
-            graph.add_edge("prepare_context", node)
-
-        # DAG dependencies for dependent nodes
-        # Settlement logistics depends on financial terms and conditions
-        graph.add_edge("analyze_financial_terms", "analyze_settlement_logistics")
-        graph.add_edge("analyze_conditions", "analyze_settlement_logistics")
-
-        # Title & encumbrances depends on diagram semantics and parties/property
-        graph.add_edge("analyze_diagram", "analyze_title_encumbrances")
-        graph.add_edge("analyze_parties_property", "analyze_title_encumbrances")
-
-        # Synthesis nodes depend on settlement and title outputs
-        # Adjustments requires settlement + financial terms
-        graph.add_edge(
-            "analyze_settlement_logistics", "calculate_adjustments_outgoings"
-        )
-        graph.add_edge("analyze_financial_terms", "calculate_adjustments_outgoings")
-
-        # Disclosure and special risks depend on settlement and title readiness
-        graph.add_edge("analyze_settlement_logistics", "check_disclosure_compliance")
-        graph.add_edge("analyze_title_encumbrances", "check_disclosure_compliance")
-        graph.add_edge("analyze_settlement_logistics", "identify_special_risks")
-        graph.add_edge("analyze_title_encumbrances", "identify_special_risks")
-
-        # Cross-section validation after synthesis nodes complete
-        synthesis_nodes = [
-            "calculate_adjustments_outgoings",
-            "check_disclosure_compliance",
-            "identify_special_risks",
-        ]
-
-        for node in synthesis_nodes:
-            graph.add_edge(node, "validate_cross_sections")
-
-        # Finalize and end
+        graph.add_edge("prepare_context", "run_section_analyzers")
+        graph.add_edge("run_section_analyzers", "validate_cross_sections")
         graph.add_edge("validate_cross_sections", "finalize_results")
         graph.add_edge("finalize_results", END)
 
+    @traced("subflow:step2")
     async def execute(
         self,
         contract_text: str,
@@ -274,14 +239,15 @@ class Step2AnalysisWorkflow:
 
         # Initialize Step 2 state from inputs
         step2_state: Step2AnalysisState = {
-            # Input data
-            "contract_text": contract_text,
+            # Input data (full text as a run blob handle; see app.agents.run_blobs)
+            "contract_text": stash_blob(contract_text, "full_text"),
             "extracted_entity": extracted_entity,
             "legal_requirements_matrix": kwargs.get("legal_requirements_matrix"),
             "uploaded_diagrams": kwargs.get("uploaded_diagrams"),
             # Required base fields propagated from parent
             "content_hash": parent_state.get("content_hash"),
             "content_hmac": parent_state.get("content_hmac"),
+            "contract_snapshot": parent_state.get("contract_snapshot"),
             # Context from parent state
             "australian_state": parent_state.get("australian_state"),
             "contract_type": parent_state.get("contract_type"),
@@ -319,7 +285,7 @@ class Step2AnalysisWorkflow:
 
         try:
             # Execute the workflow
-            result_state = await self.graph.ainvoke(step2_state)
+            result_state = await self._invoke_graph(step2_state)
 
             # Extract and structure results
             return self._extract_final_results(result_state)
@@ -337,6 +303,27 @@ class Step2AnalysisWorkflow:
                 "processing_errors": [str(e)],
             }
 
+    async def _invoke_graph(self, step2_state: Step2AnalysisState) -> Dict[str, Any]:
+        """Run the graph on a subflow checkpoint thread when the parent run has one.
+
+        With a dedicated thread a resumed run skips the steps that already
+        finished; analyzers that already persisted their column short-circuit
+        through the contract snapshot.
+        """
+        from app.agents.checkpointer import (
+            ainvoke_checkpointed,
+            get_workflow_checkpointer,
+            subflow_thread_id,
+        )
+
+        checkpointer = get_workflow_checkpointer()
+        thread_id = subflow_thread_id("step2")
+        if checkpointer is None or thread_id is None:
+            return await self.graph.ainvoke(step2_state)
+        return await ainvoke_checkpointed(
+            self.graph, step2_state, thread_id, checkpointer
+        )
+
     async def _notify_status(
         self, state: Step2AnalysisState, step: str, percent: int, desc: str
     ) -> None:
@@ -391,6 +378,8 @@ class Step2AnalysisWorkflow:
             # No separate top-level risk key; included in section_results
             # Cross-section validation
             "cross_section_validation": state.get("cross_section_validation"),
+            # Populated analysis columns, refreshed by the analyzers' writes
+            "contract_snapshot": state.get("contract_snapshot"),
             # Workflow metadata
             "workflow_metadata": {
                 "phases_completed": {
@@ -406,6 +395,7 @@ class Step2AnalysisWorkflow:
                 "diagram_success_rate": state.get(
                     "diagram_processing_success_rate", 0.0
                 ),
+                "analyzer_schedule": state.get("analyzer_schedule"),
             },
         }
 
@@ -422,6 +412,87 @@ class Step2AnalysisWorkflow:
     async def prepare_context(self, state: Step2AnalysisState) -> Step2AnalysisState:
         return await self.prepare_context_node.execute(state)
 
+    async def run_section_analyzers(
+        self, state: Step2AnalysisState
+    ) -> Step2AnalysisState:
+        """Run the section analyzers, each as soon as its inputs are ready.
+
+        Model calls of analyzers on the estimated critical path get LLM slots
+        first. Returns the merged analyzer updates plus the realized schedule.
+        """
+        history = get_node_latency_history()
+        ranks = critical_path_ranks(
+            STEP2_ANALYZER_DEPENDENCIES,
+            history.estimates(STEP2_ANALYZER_DEPENDENCIES),
+        )
+        gate = PriorityLLMGate(get_settings().step2_max_concurrent_llm_calls)
+        working: Dict[str, Any] = dict(state)
+        update: Dict[str, Any] = {}
+
+        async def run_analyzer(name: str) -> None:
+            seen = dict(working)
+            with llm_priority(ranks[name], name):
+                result = await getattr(self, name)(dict(seen))
+            self._apply_analyzer_update(working, update, seen, result or {})
+
+        with priority_gate_scope(gate):
+            timings = await run_dependency_graph(
+                STEP2_ANALYZER_DEPENDENCIES, run_analyzer, ranks
+            )
+
+        # Short-circuited analyzers make no model calls; keep them out of history
+        for name, (started, finished) in timings.items():
+            if gate.calls.get(name):
+                history.observe(name, finished - started)
+
+        critical_path = realized_critical_path(STEP2_ANALYZER_DEPENDENCIES, timings)
+        current_span().set(critical_path=critical_path["nodes"])
+        logger.info(
+            "Step 2 critical path (%.1fs): %s",
+            critical_path["seconds"],
+            " -> ".join(critical_path["nodes"]),
+        )
+        update["analyzer_schedule"] = {
+            "critical_path": critical_path,
+            "estimated_ranks": {name: round(rank, 3) for name, rank in ranks.items()},
+            "timings": {
+                name: {"start_seconds": round(start, 3), "end_seconds": round(end, 3)}
+                for name, (start, end) in timings.items()
+            },
+            "llm_calls": dict(gate.calls),
+            "max_waiting_llm_calls": gate.max_waiting,
+        }
+        return update
+
+    @staticmethod
+    def _apply_analyzer_update(
+        working: Dict[str, Any],
+        update: Dict[str, Any],
+        seen: Dict[str, Any],
+        result: Dict[str, Any],
+    ) -> None:
+        """Merge one analyzer's returned state with the state reducers.
+
+        Analyzers return a full copy of the state they were given; only keys
+        they changed are applied, so a slow analyzer's stale copy does not
+        overwrite results that finished meanwhile.
+        """
+        for key, value in result.items():
+            if key in seen and value is seen[key]:
+                continue
+            reducer = _STATE_REDUCERS.get(key)
+            if reducer is add and isinstance(value, list):
+                previous = seen.get(key) or []
+                if value[: len(previous)] == previous:
+                    value = value[len(previous) :]
+                working[key] = (working.get(key) or []) + value
+                update[key] = (update.get(key) or []) + value
+            elif reducer is not None and key in working:
+                working[key] = reducer(working[key], value)
+                update[key] = working[key]
+            else:
+                working[key] = update[key] = value
+
     @langsmith_trace(name="analyze_diagram", run_type="tool")
     async def analyze_diagram(self, state: Step2AnalysisState) -> Step2AnalysisState:
         # Delegate to new subworkflow for diagram analysis (prep -> semantics fanout -> risk)
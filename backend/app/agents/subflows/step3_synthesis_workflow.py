@@ -15,6 +15,7 @@ from app.agents.nodes.step3_synthesis.compliance_score_node import (
     ComplianceScoreNode,
 )
 from app.agents.nodes.step3_synthesis.buyer_report_node import BuyerReportNode
+from app.core.span_trace import traced
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,22 @@ class Step3SynthesisWorkflow:
 
         return graph.compile()
 
+    async def _invoke_graph(self, s3_state: Step3SynthesisState) -> Dict[str, Any]:
+        """Run the graph on a subflow checkpoint thread when the parent run has one."""
+        from app.agents.checkpointer import (
+            ainvoke_checkpointed,
+            get_workflow_checkpointer,
+            subflow_thread_id,
+        )
+
+        checkpointer = get_workflow_checkpointer()
+        thread_id = subflow_thread_id("step3")
+        if checkpointer is None or thread_id is None:
+            return await self.graph.ainvoke(s3_state)
+        return await ainvoke_checkpointed(
+            self.graph, s3_state, thread_id, checkpointer
+        )
+
     async def aggregate_risks(self, state: Step3SynthesisState) -> Step3SynthesisState:
         return await self.risk_aggregator_node.execute(state)
 
@@ -68,6 +85,7 @@ class Step3SynthesisWorkflow:
     ) -> Step3SynthesisState:
         return await self.buyer_report_node.execute(state)
 
+    @traced("subflow:step3")
     async def execute(
         self, parent_state: RealEstateAgentState, step2_results: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -105,13 +123,12 @@ class Step3SynthesisWorkflow:
             "processing_errors": [],
             # Contract linkage
             "content_hash": parent_state.get("content_hash"),
-            "ocr_processing": parent_state.get("step0_ocr_processing"),
-            "document_data": parent_state.get("step0_document_data"),
+            "contract_snapshot": parent_state.get("contract_snapshot"),
             "notify_progress": parent_state.get("notify_progress"),
         }
 
         try:
-            result_state = await self.graph.ainvoke(s3_state)
+            result_state = await self._invoke_graph(s3_state)
             return {
                 "success": True,
                 "risk_summary": result_state.get("risk_summary"),
@@ -68,6 +68,18 @@ class ClientServiceUnavailableError(ClientError):
     pass
 
 
+class ClientStreamAbortedError(ClientError):
+    """Raised when a streamed generation is aborted by its consumer.
+
+    Not retried by the client; callers treat it like a parse failure.
+    """
+
+    def __init__(self, message: str, reason: str = None, partial_text: str = "", **kwargs):
+        self.reason = reason
+        self.partial_text = partial_text
+        super().__init__(message, **kwargs)
+
+
 # Property-specific exceptions
 
 class PropertyAPIError(ClientError):
@@ -139,6 +139,16 @@ class ClientFactory:
         self._clients.clear()
         self._client_configs.clear()
         self._initialized = False
+
+        # The pooled OpenAI transport is shared by every OpenAI-compatible client
+        # in the process, so it is released here rather than by any one client
+        try:
+            from .openai.http_pool import close_shared_transport
+
+            await close_shared_transport()
+        except Exception as e:
+            self.logger.error(f"Error closing shared HTTP transport: {e}")
+
         self.logger.info("All clients closed")
 
     async def health_check_all(self) -> Dict[str, Any]:
@@ -2,9 +2,10 @@
 Main Google Gemini client implementation.
 """
 
+import inspect
 import logging
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 from google import genai
 from google.genai.types import (
     Part,
@@ -22,10 +23,12 @@ from ..base.exceptions import (
     ClientAuthenticationError,
     ClientError,
     ClientQuotaExceededError,
+    ClientStreamAbortedError,
 )
 from .config import GeminiClientConfig
 from .ocr_client import GeminiOCRClient
 from ...core.langsmith_config import langsmith_trace
+from ...core.llm_metrics import report_token_usage
 
 logger = logging.getLogger(__name__)
 
@@ -369,6 +372,9 @@ class GeminiClient(BaseClient):
         - system_prompt: Optional[str] - if provided, will be passed as
           system_instruction to guide the model.
         - model: Optional[str] - override configured model name.
+        - on_chunk: Optional[Callable[[str], Any]] - if provided, the response is
+          streamed and each text delta is passed to it (sync or async). Raising
+          from the callback (e.g. ClientStreamAbortedError) stops the stream.
         """
         try:
             # Create content for the prompt
@@ -387,6 +393,15 @@ class GeminiClient(BaseClient):
                 response_schema=kwargs.get("response_schema"),
             )
 
+            on_chunk = kwargs.get("on_chunk")
+            if on_chunk is not None:
+                return await self._stream_generate_content(
+                    model=kwargs.get("model", self.config.model_name),
+                    content=content,
+                    generation_config=generation_config,
+                    on_chunk=on_chunk,
+                )
+
             # Execute in thread pool to avoid blocking
             import asyncio
 
@@ -399,6 +414,8 @@ class GeminiClient(BaseClient):
                 ),
             )
 
+            self._report_usage(response)
+
             if not getattr(response, "candidates", None):
                 # Add more diagnostics to logs to help root-cause
                 self.logger.error(
@@ -416,6 +433,8 @@ class GeminiClient(BaseClient):
             response_text = self._extract_text_from_response(response)
             return response_text
 
+        except ClientStreamAbortedError:
+            raise
         except Exception as e:
             if "QUOTA" in str(e).upper() or "LIMIT" in str(e).upper():
                 raise ClientQuotaExceededError(
@@ -430,6 +449,44 @@ class GeminiClient(BaseClient):
                     original_error=e,
                 )
 
+    async def _stream_generate_content(
+        self,
+        *,
+        model: str,
+        content: Any,
+        generation_config: GenerateContentConfig,
+        on_chunk: Callable[[str], Any],
+    ) -> str:
+        """Stream a completion via the async API, feeding text deltas to on_chunk."""
+        stream = await self.client.aio.models.generate_content_stream(
+            model=model, contents=[content], config=generation_config
+        )
+        parts: List[str] = []
+        last_chunk = None
+        try:
+            async for chunk in stream:
+                last_chunk = chunk
+                delta = getattr(chunk, "text", None) or ""
+                if delta:
+                    parts.append(delta)
+                    result = on_chunk(delta)
+                    if inspect.isawaitable(result):
+                        await result
+        finally:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            # Usage metadata on the last chunk is cumulative for the stream
+            if last_chunk is not None:
+                self._report_usage(last_chunk)
+
+        if not parts:
+            raise ClientError(
+                "No content generated from Gemini (empty stream)",
+                client_name=self.client_name,
+            )
+        return "".join(parts)
+
     async def analyze_document(
         self, content: bytes, content_type: str, **kwargs
     ) -> Dict[str, Any]:
@@ -562,6 +619,8 @@ class GeminiClient(BaseClient):
                 ),
             )
 
+            self._report_usage(response)
+
             if not getattr(response, "candidates", None):
                 raise ClientError(
                     "No analysis candidates returned (batch)",
@@ -583,6 +642,16 @@ class GeminiClient(BaseClient):
     # ------------------------
     # Internal helpers
     # ------------------------
+    def _report_usage(self, response: Any) -> None:
+        """Forward Gemini usage metadata to the LLM metrics registry."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        report_token_usage(
+            getattr(usage, "prompt_token_count", None),
+            getattr(usage, "candidates_token_count", None),
+        )
+
     def _extract_text_from_response(self, response: Any) -> str:
         """Safely extract text from a Gemini response.
 
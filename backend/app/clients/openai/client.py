@@ -4,8 +4,9 @@ Main OpenAI client implementation.
 
 import logging
 import asyncio
-from typing import Any, Dict, Optional, List
-from openai import OpenAI
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Optional, List, Tuple, Union
+from openai import AsyncOpenAI, OpenAI
 from openai import RateLimitError, APIError, AuthenticationError
 from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
@@ -19,12 +20,23 @@ from ..base.exceptions import (
     ClientRateLimitError,
 )
 from .config import OpenAIClientConfig, DEFAULT_MODEL
+from .http_pool import SharedHTTPTransport, get_shared_transport
 from ...core.langsmith_config import langsmith_trace, log_trace_info
+from ...core.llm_metrics import report_token_usage
 from .task_queue import OpenAILLMQueueManager
 
 logger = logging.getLogger(__name__)
 
 
+def _same_transport(cached: Any, current: Any) -> bool:
+    """Whether a cache entry was built on the current pooled http client(s)."""
+    if isinstance(current, tuple):
+        return len(cached) == len(current) and all(
+            a is b for a, b in zip(cached, current)
+        )
+    return cached is current
+
+
 class OpenAIClient(BaseClient):
     """OpenAI client for connection and API management."""
 
@@ -38,10 +50,21 @@ class OpenAIClient(BaseClient):
         self._api_keys: List[str] = []
         self._rr_index: int = 0
         self._rr_lock: asyncio.Lock = asyncio.Lock()
-        # Per-key client caches
-        self._openai_clients_by_key: Dict[str, OpenAI] = {}
-        # Cache LangChain clients by (api_key, model)
-        self._langchain_clients_by_key_model: Dict[str, ChatOpenAI] = {}
+        # Per-key client caches; each entry keeps the pooled http client(s) it
+        # was built on and is replaced when the transport hands out a new one
+        self._openai_clients_by_key: Dict[str, Tuple[Any, OpenAI]] = {}
+        # Async SDK clients by api_key; used for health checks
+        self._async_openai_clients_by_key: Dict[str, Tuple[Any, AsyncOpenAI]] = {}
+        # LangChain clients by (api_key, model)
+        self._langchain_clients_by_key_model: Dict[str, Tuple[Any, ChatOpenAI]] = {}
+        # One keep-alive connection pool shared by every per-key client
+        self._transport: SharedHTTPTransport = get_shared_transport(
+            max_connections=config.http_max_connections,
+            max_keepalive_connections=config.http_max_keepalive_connections,
+            keepalive_expiry=config.http_keepalive_expiry,
+            timeout=config.request_timeout,
+            http2=config.http2_enabled,
+        )
 
     async def _select_next_key(self) -> str:
         """Select the next API key using round-robin."""
@@ -52,11 +75,8 @@ class OpenAIClient(BaseClient):
             self._rr_index = (self._rr_index + 1) % len(self._api_keys)
             return key
 
-    def _get_or_create_openai_client_for(self, api_key: str) -> OpenAI:
-        """Return an OpenAI client for a specific API key, creating it if missing."""
-        if api_key in self._openai_clients_by_key:
-            return self._openai_clients_by_key[api_key]
-
+    def _sdk_client_kwargs(self, api_key: str) -> Dict[str, Any]:
+        """Constructor kwargs shared by the sync and async OpenAI SDK clients."""
         client_kwargs: Dict[str, Any] = {
             "api_key": api_key,
             "timeout": self.config.request_timeout,
@@ -72,11 +92,50 @@ class OpenAIClient(BaseClient):
                 client_kwargs["default_headers"] = default_headers
         except Exception:
             pass
-
-        client = OpenAI(**client_kwargs)
-        self._openai_clients_by_key[api_key] = client
+        return client_kwargs
+
+    @staticmethod
+    def _cached_for_transport(
+        cache: Dict[str, Tuple[Any, Any]],
+        cache_key: str,
+        transport_clients: Any,
+        create: Callable[[], Any],
+    ) -> Any:
+        """Return the cached client for ``cache_key`` if it was built on
+        ``transport_clients``; otherwise build a replacement (evicting the old one).
+
+        The entry holds a reference to the pooled http client(s), so an identity
+        check cannot match a different pool that happens to reuse the address.
+        """
+        entry = cache.get(cache_key)
+        if entry is not None and _same_transport(entry[0], transport_clients):
+            return entry[1]
+        client = create()
+        cache[cache_key] = (transport_clients, client)
         return client
 
+    def _get_or_create_openai_client_for(self, api_key: str) -> OpenAI:
+        """Return an OpenAI client for a specific API key, creating it if missing."""
+        http_client = self._transport.get_sync_client()
+        return self._cached_for_transport(
+            self._openai_clients_by_key,
+            api_key,
+            http_client,
+            lambda: OpenAI(**self._sdk_client_kwargs(api_key), http_client=http_client),
+        )
+
+    def _get_or_create_async_openai_client_for(self, api_key: str) -> AsyncOpenAI:
+        """Return an AsyncOpenAI client for a key, bound to the running loop's pool."""
+        http_client = self._transport.get_async_client()
+        return self._cached_for_transport(
+            self._async_openai_clients_by_key,
+            api_key,
+            http_client,
+            lambda: AsyncOpenAI(
+                **self._sdk_client_kwargs(api_key), http_client=http_client
+            ),
+        )
+
     def _get_or_create_langchain_client_for(
         self,
         api_key: str,
@@ -88,10 +147,18 @@ class OpenAIClient(BaseClient):
         frequency_penalty: Optional[float] = None,
         presence_penalty: Optional[float] = None,
     ) -> ChatOpenAI:
-        """Return a LangChain ChatOpenAI client for a specific (api_key, model)."""
+        """Return a LangChain ChatOpenAI client for a specific (api_key, model).
+
+        All instances share the pooled transport; the async pool is per event
+        loop, so a cached client built on another pool is replaced.
+        """
+        http_client = self._transport.get_sync_client()
+        http_async_client = self._transport.get_async_client()
         cache_key = f"{api_key}|{model}"
-        if cache_key in self._langchain_clients_by_key_model:
-            return self._langchain_clients_by_key_model[cache_key]
+        transport_clients = (http_client, http_async_client)
+        entry = self._langchain_clients_by_key_model.get(cache_key)
+        if entry is not None and _same_transport(entry[0], transport_clients):
+            return entry[1]
 
         langchain_kwargs: Dict[str, Any] = {
             "openai_api_key": api_key,
@@ -115,6 +182,8 @@ class OpenAIClient(BaseClient):
             ),
             "request_timeout": self.config.request_timeout,
             "max_retries": self.config.max_retries,
+            "http_client": http_client,
+            "http_async_client": http_async_client,
         }
         if self.config.api_base:
             langchain_kwargs["openai_api_base"] = self.config.api_base
@@ -123,7 +192,7 @@ class OpenAIClient(BaseClient):
         langchain_kwargs = {k: v for k, v in langchain_kwargs.items() if v is not None}
 
         lc_client = ChatOpenAI(**langchain_kwargs)
-        self._langchain_clients_by_key_model[cache_key] = lc_client
+        self._langchain_clients_by_key_model[cache_key] = (transport_clients, lc_client)
         return lc_client
 
     @property
@@ -176,59 +245,14 @@ class OpenAIClient(BaseClient):
             pool_size = len(self._api_keys)
             self.logger.info(f"Configured OpenAI API key pool size: {pool_size}")
 
-            # Create OpenAI client
-            client_kwargs = {
-                # Use first key for initial client; others are created lazily
-                "api_key": self._api_keys[0],
-                "timeout": self.config.request_timeout,
-                "max_retries": self.config.max_retries,
-            }
-
-            if self.config.api_base:
-                client_kwargs["base_url"] = self.config.api_base
-
-            if self.config.organization:
-                client_kwargs["organization"] = self.config.organization
-
-            # If configured, attach default headers (e.g., for OpenRouter)
-            try:
-                default_headers = self.config.extra_config.get("default_headers")  # type: ignore[attr-defined]
-                if default_headers:
-                    client_kwargs["default_headers"] = default_headers
-            except Exception:
-                pass
-
-            self._openai_client = OpenAI(**client_kwargs)
-            self._openai_clients_by_key[self._api_keys[0]] = self._openai_client
-
-            # Initialize LangChain ChatOpenAI client for LangSmith tracing
-            langchain_kwargs = {
-                "openai_api_key": self._api_keys[0],
-                "model": self.config.model_name,
-                "temperature": self.config.temperature,
-                "max_tokens": self.config.max_tokens,
-                "top_p": self.config.top_p,
-                "frequency_penalty": self.config.frequency_penalty,
-                "presence_penalty": self.config.presence_penalty,
-                "request_timeout": self.config.request_timeout,
-                "max_retries": self.config.max_retries,
-            }
-
-            if self.config.api_base:
-                langchain_kwargs["openai_api_base"] = self.config.api_base
-
-            if self.config.organization:
-                langchain_kwargs["openai_organization"] = self.config.organization
-
-            # Remove None values
-            langchain_kwargs = {
-                k: v for k, v in langchain_kwargs.items() if v is not None
-            }
-
-            self._langchain_client = ChatOpenAI(**langchain_kwargs)
-            self._langchain_clients_by_key_model[
-                f"{self._api_keys[0]}|{self.config.model_name}"
-            ] = self._langchain_client
+            # Create clients for the first key; others are created lazily.
+            # All of them share the pooled transport.
+            self._openai_client = self._get_or_create_openai_client_for(
+                self._api_keys[0]
+            )
+            self._langchain_client = self._get_or_create_langchain_client_for(
+                self._api_keys[0], self.config.model_name
+            )
 
             # Test the connection (optionally, and with timeout)
             should_test = bool(
@@ -278,8 +302,10 @@ class OpenAIClient(BaseClient):
                 key_for_test = (
                     self._api_keys[0] if self._api_keys else self.config.api_key
                 )
-                openai_client = self._get_or_create_openai_client_for(key_for_test)
-                return await queue.run_in_executor(
+                openai_client = self._get_or_create_async_openai_client_for(
+                    key_for_test
+                )
+                return await queue.run_async(
                     lambda: openai_client.chat.completions.create(
                         model=model_to_use,
                         messages=messages,
@@ -355,8 +381,10 @@ class OpenAIClient(BaseClient):
                     key_for_test = (
                         self._api_keys[0] if self._api_keys else self.config.api_key
                     )
-                    openai_client = self._get_or_create_openai_client_for(key_for_test)
-                    _ = await queue.run_in_executor(
+                    openai_client = self._get_or_create_async_openai_client_for(
+                        key_for_test
+                    )
+                    _ = await queue.run_async(
                         lambda: openai_client.chat.completions.create(
                             model=DEFAULT_MODEL,
                             messages=[{"role": "user", "content": "ping"}],
@@ -403,6 +431,7 @@ class OpenAIClient(BaseClient):
                     "temperature": self.config.temperature,
                     "api_base": self.config.api_base or "https://api.openai.com/v1",
                 },
+                "http_pool": self._transport.stats(),
             }
 
         except Exception as e:
@@ -412,6 +441,7 @@ class OpenAIClient(BaseClient):
                 "client_name": self.client_name,
                 "error": str(e),
                 "initialized": self._initialized,
+                "http_pool": self._transport.stats(),
             }
 
     async def close(self) -> None:
@@ -425,8 +455,11 @@ class OpenAIClient(BaseClient):
                 # LangChain client doesn't require explicit closing
                 self._langchain_client = None
 
-            # Clear per-key caches
+            # Clear per-key caches. The pooled transport they were built on is
+            # process-wide and shared with other clients, so it is left open
+            # here and closed with the client factory (close_all).
             self._openai_clients_by_key.clear()
+            self._async_openai_clients_by_key.clear()
             self._langchain_clients_by_key_model.clear()
 
             self._initialized = False
@@ -442,6 +475,28 @@ class OpenAIClient(BaseClient):
                 original_error=e,
             )
 
+    async def _stream_langchain(
+        self,
+        langchain_client: ChatOpenAI,
+        langchain_messages: list,
+        on_chunk: Callable[[str], Union[Any, Awaitable[Any]]],
+    ) -> Any:
+        """Stream a completion, feeding text deltas to on_chunk; returns the merged message."""
+        aggregate = None
+        stream = langchain_client.astream(langchain_messages, stream_usage=True)
+        try:
+            async for chunk in stream:
+                aggregate = chunk if aggregate is None else aggregate + chunk
+                delta = chunk.content if isinstance(chunk.content, str) else ""
+                if delta:
+                    result = on_chunk(delta)
+                    if inspect.isawaitable(result):
+                        await result
+        finally:
+            # Closing the generator closes the HTTP stream when the consumer aborts
+            await stream.aclose()
+        return aggregate
+
     # Core API Methods - Connection Layer Only
 
     @langsmith_trace(name="openai_client_generate_content", run_type="chain")
@@ -459,6 +514,9 @@ class OpenAIClient(BaseClient):
         - messages: Optional[List[Dict[str, Any]]] - if provided, used as-is
         - system_prompt: Optional[str] - if provided and messages not supplied,
           will be prepended as a system message before the user prompt.
+        - on_chunk: Optional[Callable[[str], Any]] - if provided, the response is
+          streamed and each text delta is passed to it (sync or async). Raising
+          from the callback (e.g. ClientStreamAbortedError) stops the stream.
         """
         try:
             # Handle both single prompt and messages format
@@ -510,7 +568,14 @@ class OpenAIClient(BaseClient):
             # Use a per-(model,key) queue to isolate 429 backoffs across keys
             queue_key = f"{model_to_use}|{selected_key[:6]}"
             queue = OpenAILLMQueueManager.get_queue(queue_key)
-            if hasattr(langchain_client, "ainvoke"):
+            on_chunk = kwargs.get("on_chunk")
+            if on_chunk is not None and hasattr(langchain_client, "astream"):
+                response = await queue.run_async(
+                    lambda: self._stream_langchain(
+                        langchain_client, langchain_messages, on_chunk
+                    )
+                )
+            elif hasattr(langchain_client, "ainvoke"):
                 response = await queue.run_async(
                     lambda: langchain_client.ainvoke(langchain_messages)
                 )
@@ -519,7 +584,10 @@ class OpenAIClient(BaseClient):
                     lambda: langchain_client.invoke(langchain_messages)
                 )
 
-            if not response.content:
+            usage = getattr(response, "usage_metadata", None) or {}
+            report_token_usage(usage.get("input_tokens"), usage.get("output_tokens"))
+
+            if response is None or not response.content:
                 raise ClientError(
                     "No content generated from OpenAI", client_name=self.client_name
                 )
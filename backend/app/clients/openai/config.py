@@ -43,6 +43,12 @@ class OpenAIClientConfig(ClientConfig):
     request_timeout: int = 60
     max_retries: int = 0
 
+    # Shared HTTP transport (see http_pool.py)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http2_enabled: bool = True
+
     # Organization settings
     organization: Optional[str] = None
 
@@ -68,6 +74,12 @@ class OpenAISettings(BaseSettings):
     openai_request_timeout: int = 60
     openai_max_retries: int = 0
 
+    # Shared HTTP transport settings
+    openai_http_max_connections: int = 100
+    openai_http_max_keepalive_connections: int = 20
+    openai_http_keepalive_expiry: float = 30.0
+    openai_http2_enabled: bool = True
+
     # Initialization behavior
     openai_init_connection_test: bool = True
     openai_init_test_timeout: int = 12
@@ -171,6 +183,10 @@ class OpenAISettings(BaseSettings):
             presence_penalty=self.openai_presence_penalty,
             # Request settings
             request_timeout=self.openai_request_timeout,
+            http_max_connections=self.openai_http_max_connections,
+            http_max_keepalive_connections=self.openai_http_max_keepalive_connections,
+            http_keepalive_expiry=self.openai_http_keepalive_expiry,
+            http2_enabled=self.openai_http2_enabled,
             # Base client settings
             timeout=self.openai_request_timeout,
             max_retries=self.openai_max_retries,
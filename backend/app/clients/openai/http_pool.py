@@ -0,0 +1,222 @@
+"""
+Shared pooled HTTP transport for OpenAI-compatible clients.
+
+Every (api_key, model) pair used to get its own ChatOpenAI instance, and each
+of those built its own httpx client, so concurrent calls spread across the key
+pool opened separate TCP/TLS connections to the same host. This module keeps
+one connection pool per process (one async client per running event loop,
+since httpx connections are bound to the loop that opened them) and hands it
+to every per-key client. Authentication stays per request: the OpenAI SDK adds
+each key's Authorization header when it builds the request, so sharing the
+transport does not share credentials.
+
+HTTP/2 is enabled when the optional `h2` package is installed, letting
+concurrent requests multiplex over a single connection.
+
+Connection reuse is measured with httpcore trace events: every request is
+counted, and every `connection.connect_tcp.complete` event is a new
+connection, so `reused = requests - new_connections`.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_CONNECTIONS: int = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+DEFAULT_KEEPALIVE_EXPIRY: float = 30.0
+
+_NEW_CONNECTION_EVENT = "connection.connect_tcp.complete"
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+class SharedHTTPTransport:
+    """Process-wide httpx clients with keep-alive, optional HTTP/2 and reuse metrics."""
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        timeout: float = 60.0,
+        http2: bool = True,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = bool(http2) and _h2_available()
+        if http2 and not self.http2:
+            logger.info("h2 not installed; shared OpenAI transport uses HTTP/1.1")
+
+        # Accessed from the main loop and the workflow's background loop thread
+        self._lock = threading.Lock()
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sync_client: Optional[httpx.Client] = None
+        self._requests = 0
+        self._new_connections = 0
+
+    # ------------------------------------------------------------------
+    # Metrics hooks
+    # ------------------------------------------------------------------
+
+    def _count_request(self) -> None:
+        with self._lock:
+            self._requests += 1
+
+    def _count_trace_event(self, event_name: str) -> None:
+        if event_name == _NEW_CONNECTION_EVENT:
+            with self._lock:
+                self._new_connections += 1
+
+    async def _on_async_request(self, request: httpx.Request) -> None:
+        self._count_request()
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            self._count_trace_event(event_name)
+
+        request.extensions.setdefault("trace", trace)
+
+    def _on_sync_request(self, request: httpx.Request) -> None:
+        self._count_request()
+
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            self._count_trace_event(event_name)
+
+        request.extensions.setdefault("trace", trace)
+
+    # ------------------------------------------------------------------
+    # Clients
+    # ------------------------------------------------------------------
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        """Return the pooled async client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    http2=self.http2,
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    event_hooks={"request": [self._on_async_request]},
+                )
+                self._async_clients[loop] = client
+            return client
+
+    def get_sync_client(self) -> httpx.Client:
+        """Return the pooled sync client (used by the blocking OpenAI SDK client)."""
+        with self._lock:
+            if self._sync_client is None or self._sync_client.is_closed:
+                self._sync_client = httpx.Client(
+                    http2=self.http2,
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    event_hooks={"request": [self._on_sync_request]},
+                )
+            return self._sync_client
+
+    @staticmethod
+    def _open_connections(client: Any) -> int:
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        try:
+            return len(pool.connections) if pool is not None else 0
+        except Exception:
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and connection reuse counters."""
+        with self._lock:
+            clients = [c for c in self._async_clients.values() if not c.is_closed]
+            if self._sync_client is not None and not self._sync_client.is_closed:
+                clients.append(self._sync_client)
+            requests = self._requests
+            new_connections = self._new_connections
+        reused = max(requests - new_connections, 0)
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "clients": len(clients),
+            "open_connections": sum(self._open_connections(c) for c in clients),
+            "requests": requests,
+            "new_connections": new_connections,
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / requests, 4) if requests else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        """Close the client for the running loop and the sync client.
+
+        Clients bound to other loops are dropped and closed when their loop
+        is garbage collected.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            async_client = self._async_clients.pop(loop, None) if loop else None
+            sync_client, self._sync_client = self._sync_client, None
+            self._async_clients.clear()
+        if async_client is not None:
+            await async_client.aclose()
+        if sync_client is not None:
+            sync_client.close()
+
+
+_shared_transport: Optional[SharedHTTPTransport] = None
+_shared_transport_lock = threading.Lock()
+
+
+def get_shared_transport(**kwargs: Any) -> SharedHTTPTransport:
+    """Return the process-wide transport, creating it with `kwargs` on first use."""
+    global _shared_transport
+    with _shared_transport_lock:
+        if _shared_transport is None:
+            _shared_transport = SharedHTTPTransport(**kwargs)
+        return _shared_transport
+
+
+def get_shared_transport_stats() -> Optional[Dict[str, Any]]:
+    """Stats for the process-wide transport, or None if it was never created."""
+    transport = _shared_transport
+    return transport.stats() if transport is not None else None
+
+
+async def close_shared_transport() -> None:
+    """Close and forget the process-wide transport."""
+    global _shared_transport
+    with _shared_transport_lock:
+        transport, _shared_transport = _shared_transport, None
+    if transport is not None:
+        await transport.aclose()
+
+
+__all__ = [
+    "SharedHTTPTransport",
+    "close_shared_transport",
+    "get_shared_transport",
+    "get_shared_transport_stats",
+]
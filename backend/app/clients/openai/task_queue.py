@@ -28,6 +28,8 @@ except Exception:  # pragma: no cover - optional import
     RateLimitError = None  # type: ignore
 
 
+from ..base.exceptions import ClientStreamAbortedError
+
 logger = logging.getLogger(__name__)
 
 
@@ -67,6 +69,9 @@ class OpenAILLMTaskQueue:
                 await self._pause_event.wait()
                 try:
                     return await coro_factory()
+                except ClientStreamAbortedError:
+                    # Deliberate consumer abort; retrying would repeat the same output
+                    raise
                 except Exception as exc:  # noqa: BLE001 - we classify below
                     if self._is_rate_limit_error(exc):
                         logger.warning(
@@ -81,4 +81,12 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.cleanup_tasks.verify_storage_consistency",
         "schedule": 21600.0,  # Every 6 hours
     },
+    "cleanup-expired-workflow-checkpoints": {
+        "task": "app.tasks.cleanup_tasks.cleanup_expired_workflow_checkpoints",
+        "schedule": 3600.0,  # Every hour
+    },
+    "refresh-contract-rollups": {
+        "task": "app.tasks.cleanup_tasks.refresh_contract_rollups",
+        "schedule": 3600.0,  # Every hour
+    },
 }
@@ -34,12 +34,35 @@ class Settings(BaseSettings):
 
     # Repository and Connection Pool Settings
     db_use_repositories: bool = True
-    db_pool_mode: str = "shared"  # "shared" or "per_user"
+    db_pool_mode: str = "shared"  # "shared", "per_user" or "adaptive"
     db_user_pool_min_size: int = 1
     db_user_pool_max_size: int = 4
     db_max_active_user_pools: int = 50
     db_user_pool_idle_ttl_seconds: int = 300
     db_pool_eviction_policy: str = "LRU"
+    # Adaptive mode: shared pool pre-warmed to observed concurrency (see app/database/pool_stats.py)
+    db_adaptive_pool_min_size: int = 2
+    db_adaptive_pool_max_size: int = 40
+    db_adaptive_pool_headroom: float = 1.25
+    db_adaptive_pool_idle_seconds: float = 120.0
+    # Verified user token claims reused across acquires (see app/core/verified_claims.py)
+    db_verified_claims_cache_size: int = 1024
+    db_verified_claims_cache_ttl_seconds: int = 300
+    # Query tracing: latency histograms and slow-query log (see app/database/query_trace.py)
+    db_query_tracing_enabled: bool = True
+    db_slow_query_threshold_ms: float = 500.0
+    db_slow_query_log_size: int = 100
+    # Also record every query and pool acquire as a span of the analysis trace
+    db_query_trace_spans: bool = False
+    # Contract read-through cache by content hash (see app/services/contract_cache.py)
+    contract_cache_enabled: bool = True
+    contract_cache_max_entries: int = 256
+    contract_cache_ttl_seconds: int = 600
+    contract_cache_access_ttl_seconds: int = 60
+    # Shared Redis copy of cached contracts (off: process-local LRU only)
+    contract_cache_redis_enabled: bool = False
+    # Broadcast invalidations to the other API/worker processes over Redis pub/sub
+    contract_cache_broadcast: bool = True
 
     # AI Services
     openai_api_key: Optional[str] = None
@@ -159,6 +182,32 @@ class Settings(BaseSettings):
         10000  # Upper bound for ideal rendered prompt length
     )
 
+    # LLM Streaming Settings
+    # Stream structured generations and abort as soon as the output diverges
+    # from the expected schema (prose instead of JSON, wrong top-level key)
+    llm_streaming_enabled: bool = False
+    llm_stream_max_prose_chars: int = 400
+
+    # LLM Record/Replay Settings (offline load testing; see app/core/llm_replay.py)
+    # off | record | replay
+    llm_replay_mode: str = "off"
+    llm_replay_corpus_dir: str = "storage/llm_corpus"
+    # Fixed simulated latency in ms; None replays the recorded latency
+    llm_replay_latency_ms: Optional[float] = None
+    llm_replay_latency_scale: float = 1.0
+    llm_replay_rate_limit_rate: float = 0.0
+    llm_replay_timeout_rate: float = 0.0
+    llm_replay_malformed_rate: float = 0.0
+    llm_replay_seed: Optional[int] = None
+
+    # Batch Analysis (many contracts at once; see app/core/llm_fair_share.py)
+    # Global cap on concurrent model calls across all contracts of a batch
+    llm_batch_max_concurrency: int = 8
+
+    # Step 2 scheduling (critical-path priority; see app/agents/step2_scheduler.py)
+    # Concurrent model calls per contract; waiting calls go to critical-path nodes first
+    step2_max_concurrent_llm_calls: int = 4
+
     # Enhanced Workflow Settings
     enhanced_workflow_validation: bool = True
     enhanced_workflow_quality_checks: bool = True
@@ -170,6 +219,16 @@ class Settings(BaseSettings):
     enhanced_workflow_min_doc_quality: float = 0.5
     enhanced_workflow_min_extraction_confidence: float = 0.4
 
+    # Workflow Checkpointing (node-granular resume; see app/agents/checkpointer.py)
+    workflow_checkpointing_enabled: bool = True
+    workflow_checkpoint_ttl_hours: int = 72
+
+    # Step 2 Clause Retrieval (see app/utils/clause_retrieval.py)
+    # Analyzers receive a ranked, budgeted slice of clauses for their section,
+    # in place of the seed snippets / full contract text
+    step2_clause_retrieval_enabled: bool = True
+    step2_clause_context_max_chars: int = 12000
+
     # Paragraph Processing Settings
     paragraphs_enabled: bool = True
     paragraph_algo_version: int = 1
@@ -209,6 +268,9 @@ class Settings(BaseSettings):
     # Analysis Progress Settings
     enable_document_quality_validation: bool = True
     enable_per_page_progress: bool = True
+    # Progress/step writes are coalesced per key and flushed at most this often
+    # (terminal states are written immediately; see app/services/progress_write_buffer.py)
+    progress_flush_interval_seconds: float = 2.0
     enhanced_workflow_log_fallback_usage: bool = True
 
     @property
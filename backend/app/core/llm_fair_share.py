@@ -0,0 +1,194 @@
+"""
+Fair-share LLM work queue for multi-contract batch analysis.
+
+When many contracts are analysed together (a brokerage uploading a folder of
+contracts), every contract's Step 2 fan-out would otherwise hit the provider
+at once, trip rate limits and trigger the global pause in
+`OpenAILLMTaskQueue`. In batch mode all provider calls of the batch are
+admitted through one `FairShareLLMQueue`:
+
+- a global cap bounds the calls in flight across the whole batch
+- when a slot frees up it goes to the contract with the fewest calls in
+  flight (fair share), then to the contract that has progressed furthest
+  (most completed calls, so contracts finish instead of all crawling
+  forward together), then round-robin by least recently served
+
+The queue is bound to a batch with `fair_share_scope` and each contract's
+coroutine tags itself with `contract_lane`; both are ContextVars, so they
+reach the calls made inside nodes and subflows. `fair_share_slot` is what
+LLMService wraps around every provider call, and is a no-op outside a batch.
+Batches are driven by the `batch_document_analysis` task
+(app/tasks/background_tasks.py), which the bulk-analyze endpoint queues.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional
+
+from app.core.llm_metrics import get_call_context
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_MAX_CONCURRENCY = 8
+
+# Lane for calls made outside any contract (e.g. shared setup)
+SHARED_LANE = "__shared__"
+
+
+@dataclass
+class _Lane:
+    key: str
+    admitted: int
+    in_flight: int = 0
+    completed: int = 0
+    last_served: int = 0
+    waiters: Deque[asyncio.Future] = field(default_factory=deque)
+    wait_seconds: float = 0.0
+
+
+class FairShareLLMQueue:
+    """Admits LLM calls of many contracts under one global concurrency cap."""
+
+    def __init__(self, max_concurrent: int = DEFAULT_BATCH_MAX_CONCURRENCY):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self._active = 0
+        self._lanes: Dict[str, _Lane] = {}
+        self._admissions = count(1)
+        self._grants = count(1)
+        self.max_waiting = 0
+
+    def _lane(self, key: str) -> _Lane:
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = _Lane(key=key, admitted=next(self._admissions))
+            self._lanes[key] = lane
+        return lane
+
+    def _waiting(self) -> int:
+        return sum(len(lane.waiters) for lane in self._lanes.values())
+
+    def _grant(self, lane: _Lane) -> None:
+        self._active += 1
+        lane.in_flight += 1
+        lane.last_served = next(self._grants)
+
+    def _next_lane(self) -> Optional[_Lane]:
+        candidates = [lane for lane in self._lanes.values() if lane.waiters]
+        if not candidates:
+            return None
+        return min(
+            candidates,
+            key=lambda lane: (
+                lane.in_flight,
+                -lane.completed,
+                lane.last_served,
+                lane.admitted,
+            ),
+        )
+
+    def _dispatch(self) -> None:
+        while self._active < self.max_concurrent:
+            lane = self._next_lane()
+            if lane is None:
+                return
+            waiter = lane.waiters.popleft()
+            if waiter.done():  # cancelled while queued
+                continue
+            self._grant(lane)
+            waiter.set_result(None)
+
+    def _release(self, lane: _Lane, completed: bool) -> None:
+        self._active -= 1
+        lane.in_flight -= 1
+        if completed:
+            lane.completed += 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, contract_key: Optional[str] = None) -> AsyncIterator[None]:
+        """Hold one of the batch's LLM slots for the duration of a call."""
+        lane = self._lane(contract_key or SHARED_LANE)
+        if self._active < self.max_concurrent and not self._waiting():
+            self._grant(lane)
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            lane.waiters.append(waiter)
+            self.max_waiting = max(self.max_waiting, self._waiting())
+            queued_at = time.perf_counter()
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Granted in the same tick the caller was cancelled
+                    self._release(lane, completed=False)
+                else:
+                    waiter.cancel()
+                raise
+            finally:
+                lane.wait_seconds += time.perf_counter() - queued_at
+
+        try:
+            yield
+        finally:
+            self._release(lane, completed=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self._active,
+            "waiting": self._waiting(),
+            "max_waiting": self.max_waiting,
+            "contracts": {
+                key: {
+                    "completed_calls": lane.completed,
+                    "wait_seconds": round(lane.wait_seconds, 3),
+                }
+                for key, lane in self._lanes.items()
+            },
+        }
+
+
+_batch_queue: ContextVar[Optional[FairShareLLMQueue]] = ContextVar(
+    "llm_fair_share_queue", default=None
+)
+_contract_lane: ContextVar[Optional[str]] = ContextVar(
+    "llm_fair_share_lane", default=None
+)
+
+
+@contextmanager
+def fair_share_scope(queue: FairShareLLMQueue) -> Iterator[FairShareLLMQueue]:
+    """Route the LLM calls made in this context through ``queue``."""
+    token = _batch_queue.set(queue)
+    try:
+        yield queue
+    finally:
+        _batch_queue.reset(token)
+
+
+@contextmanager
+def contract_lane(contract_key: Optional[str]) -> Iterator[None]:
+    """Attribute the LLM calls made in this context to one contract."""
+    token = _contract_lane.set(contract_key)
+    try:
+        yield
+    finally:
+        _contract_lane.reset(token)
+
+
+@asynccontextmanager
+async def fair_share_slot() -> AsyncIterator[None]:
+    """Wait for a batch slot when running in batch mode; otherwise a no-op."""
+    queue = _batch_queue.get()
+    if queue is None:
+        yield
+        return
+    key = _contract_lane.get() or get_call_context().contract_key
+    async with queue.slot(key):
+        yield
@@ -0,0 +1,556 @@
+"""
+In-process LLM/OCR call metrics.
+
+Every model call made through LLMService (and the direct Gemini OCR call in
+GeminiOCRService) is recorded here with:
+
+- latency, input-token and output-token histograms labelled by
+  node, composition, model and outcome (success / parse_fail / fallback / error)
+- per-contract rollups (tokens, estimated cost, latency) keyed by content_hash,
+  which the analysis task attaches to the persisted analysis result
+
+Labels are supplied by callers through `llm_call_context` (nodes set node and
+composition; fallback loops set is_fallback). Provider clients report exact
+token usage through `report_token_usage`; when a provider does not return
+usage, tokens are estimated from character counts.
+
+The registry renders the Prometheus text exposition format so it can be
+scraped without a prometheus_client dependency.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.span_trace import current_span, span
+
+logger = logging.getLogger(__name__)
+
+
+# Histogram buckets
+LATENCY_BUCKETS_SECONDS: Tuple[float, ...] = (
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    20.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+)
+TOKEN_BUCKETS: Tuple[float, ...] = (
+    100,
+    500,
+    1_000,
+    2_500,
+    5_000,
+    10_000,
+    25_000,
+    50_000,
+    100_000,
+    250_000,
+    500_000,
+)
+
+# Rough chars-per-token ratio used when a provider does not return usage
+CHARS_PER_TOKEN_ESTIMATE: int = 4
+
+# Bound memory used by per-contract rollups that are never collected
+MAX_TRACKED_CONTRACTS: int = 1000
+
+UNKNOWN_LABEL = "unknown"
+
+# List prices in USD per 1M tokens as (input, output). First matching prefix wins,
+# so more specific model names must come before their family prefix.
+MODEL_PRICING_USD_PER_MILLION: List[Tuple[str, float, float]] = [
+    ("gemini-2.5-pro", 1.25, 10.00),
+    ("gemini-2.5-flash-lite", 0.10, 0.40),
+    ("gemini-2.5-flash", 0.30, 2.50),
+    ("gemini-2.0-flash", 0.10, 0.40),
+    ("gpt-4o-mini", 0.15, 0.60),
+    ("gpt-4o", 2.50, 10.00),
+    ("gpt-4.1-mini", 0.40, 1.60),
+    ("gpt-4.1-nano", 0.10, 0.40),
+    ("gpt-4.1", 2.00, 8.00),
+    ("gpt-5-mini", 0.25, 2.00),
+    ("gpt-5-nano", 0.05, 0.40),
+    ("gpt-5", 1.25, 10.00),
+]
+
+
+class CallOutcome:
+    """Outcome label values for recorded calls."""
+
+    SUCCESS = "success"
+    PARSE_FAIL = "parse_fail"
+    FALLBACK = "fallback"
+    ERROR = "error"
+
+
+@dataclass(frozen=True)
+class LLMCallContext:
+    """Labels describing who is making the current LLM call."""
+
+    node: Optional[str] = None
+    composition: Optional[str] = None
+    contract_key: Optional[str] = None
+    is_fallback: bool = False
+
+
+@dataclass
+class TokenUsage:
+    """Mutable sink that provider clients report token usage into."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    reported: bool = False
+
+
+_call_context: ContextVar[Optional[LLMCallContext]] = ContextVar(
+    "llm_call_context", default=None
+)
+_token_usage: ContextVar[Optional[TokenUsage]] = ContextVar(
+    "llm_token_usage", default=None
+)
+
+
+def get_call_context() -> LLMCallContext:
+    """Return the current call labels (empty context if none are set)."""
+    return _call_context.get() or LLMCallContext()
+
+
+def get_token_usage() -> Optional[TokenUsage]:
+    """Return the usage sink of the call currently being tracked, if any."""
+    return _token_usage.get()
+
+
+@contextmanager
+def llm_call_context(
+    node: Optional[str] = None,
+    composition: Optional[str] = None,
+    contract_key: Optional[str] = None,
+    is_fallback: Optional[bool] = None,
+) -> Iterator[LLMCallContext]:
+    """Set call labels for LLM calls made within the block.
+
+    Unset arguments inherit from the enclosing context, so a fallback loop can
+    wrap calls with `llm_call_context(is_fallback=True)` and keep the node labels.
+    """
+    parent = get_call_context()
+    updates: Dict[str, Any] = {}
+    if node is not None:
+        updates["node"] = node
+    if composition is not None:
+        updates["composition"] = composition
+    if contract_key is not None:
+        updates["contract_key"] = contract_key
+    if is_fallback is not None:
+        updates["is_fallback"] = is_fallback
+    ctx = replace(parent, **updates)
+    token = _call_context.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _call_context.reset(token)
+
+
+def report_token_usage(
+    input_tokens: Optional[int], output_tokens: Optional[int]
+) -> None:
+    """Report provider token usage for the call currently being tracked.
+
+    Safe to call when nothing is tracking; usage is accumulated so client-level
+    retries inside a single tracked call are all counted.
+    """
+    usage = _token_usage.get()
+    if usage is None:
+        return
+    try:
+        usage.input_tokens += int(input_tokens or 0)
+        usage.output_tokens += int(output_tokens or 0)
+        usage.reported = True
+    except (TypeError, ValueError):
+        pass
+
+
+def estimate_tokens(text_length: int) -> int:
+    """Estimate a token count from a character count."""
+    if text_length <= 0:
+        return 0
+    return max(1, text_length // CHARS_PER_TOKEN_ESTIMATE)
+
+
+def estimate_cost_usd(
+    model: Optional[str], input_tokens: int, output_tokens: int
+) -> float:
+    """Estimate call cost from the pricing table; 0.0 for unknown models."""
+    if not model:
+        return 0.0
+    name = model.lower()
+    if name.startswith("models/"):
+        name = name[len("models/") :]
+    # OpenRouter style names carry a vendor prefix (e.g. "openai/gpt-4o")
+    name = name.rsplit("/", 1)[-1]
+    for prefix, input_price, output_price in MODEL_PRICING_USD_PER_MILLION:
+        if name.startswith(prefix):
+            return (
+                input_tokens * input_price + output_tokens * output_price
+            ) / 1_000_000
+    return 0.0
+
+
+class _Histogram:
+    """Cumulative-bucket histogram matching Prometheus semantics."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for idx, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[idx] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else 0.0,
+            "buckets": {str(b): c for b, c in zip(self.buckets, self.counts)},
+        }
+
+
+# (operation, node, composition, model, outcome)
+_LabelKey = Tuple[str, str, str, str, str]
+_LABEL_NAMES = ("operation", "node", "composition", "model", "outcome")
+
+
+def _new_rollup() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "estimated_cost_usd": 0.0,
+        "latency_seconds": 0.0,
+        "outcomes": {},
+    }
+
+
+def _add_to_rollup(
+    rollup: Dict[str, Any],
+    outcome: str,
+    latency: float,
+    input_tokens: int,
+    output_tokens: int,
+    cost: float,
+) -> None:
+    rollup["calls"] += 1
+    rollup["input_tokens"] += input_tokens
+    rollup["output_tokens"] += output_tokens
+    rollup["estimated_cost_usd"] += cost
+    rollup["latency_seconds"] += latency
+    rollup["outcomes"][outcome] = rollup["outcomes"].get(outcome, 0) + 1
+
+
+class LLMMetricsRegistry:
+    """Thread-safe registry of LLM call histograms and per-contract rollups.
+
+    Nodes may run on the workflow background loop thread while the health
+    router reads from the API loop, so all mutation happens under a lock.
+    """
+
+    def __init__(self, max_tracked_contracts: int = MAX_TRACKED_CONTRACTS):
+        self._lock = threading.Lock()
+        self._max_tracked_contracts = max_tracked_contracts
+        self._latency: Dict[_LabelKey, _Histogram] = {}
+        self._input_tokens: Dict[_LabelKey, _Histogram] = {}
+        self._output_tokens: Dict[_LabelKey, _Histogram] = {}
+        self._cost_usd: Dict[_LabelKey, float] = {}
+        self._contract_rollups: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def observe_call(
+        self,
+        *,
+        model: Optional[str],
+        latency_seconds: float,
+        input_tokens: int,
+        output_tokens: int,
+        outcome: str,
+        operation: str = "llm",
+        context: Optional[LLMCallContext] = None,
+    ) -> float:
+        """Record a completed call and return its estimated cost in USD."""
+        ctx = context or get_call_context()
+        model_label = model or UNKNOWN_LABEL
+        key: _LabelKey = (
+            operation,
+            ctx.node or UNKNOWN_LABEL,
+            ctx.composition or UNKNOWN_LABEL,
+            model_label,
+            outcome,
+        )
+        cost = estimate_cost_usd(model, input_tokens, output_tokens)
+
+        with self._lock:
+            self._latency.setdefault(key, _Histogram(LATENCY_BUCKETS_SECONDS)).observe(
+                latency_seconds
+            )
+            self._input_tokens.setdefault(key, _Histogram(TOKEN_BUCKETS)).observe(
+                input_tokens
+            )
+            self._output_tokens.setdefault(key, _Histogram(TOKEN_BUCKETS)).observe(
+                output_tokens
+            )
+            self._cost_usd[key] = self._cost_usd.get(key, 0.0) + cost
+
+            if ctx.contract_key:
+                rollup = self._contract_rollups.get(ctx.contract_key)
+                if rollup is None:
+                    rollup = {**_new_rollup(), "by_node": {}, "by_model": {}}
+                    self._contract_rollups[ctx.contract_key] = rollup
+                    while len(self._contract_rollups) > self._max_tracked_contracts:
+                        self._contract_rollups.popitem(last=False)
+                else:
+                    self._contract_rollups.move_to_end(ctx.contract_key)
+                args = (outcome, latency_seconds, input_tokens, output_tokens, cost)
+                _add_to_rollup(rollup, *args)
+                _add_to_rollup(
+                    rollup["by_node"].setdefault(
+                        ctx.node or UNKNOWN_LABEL, _new_rollup()
+                    ),
+                    *args,
+                )
+                _add_to_rollup(
+                    rollup["by_model"].setdefault(model_label, _new_rollup()), *args
+                )
+
+        return cost
+
+    def get_contract_rollup(self, contract_key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the usage rollup for a contract, if any calls were seen."""
+        with self._lock:
+            rollup = self._contract_rollups.get(contract_key)
+            return _copy_rollup(rollup) if rollup else None
+
+    def pop_contract_rollup(self, contract_key: str) -> Optional[Dict[str, Any]]:
+        """Return and forget the usage rollup for a contract."""
+        with self._lock:
+            rollup = self._contract_rollups.pop(contract_key, None)
+            return _copy_rollup(rollup) if rollup else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable view of all series."""
+        with self._lock:
+            series = []
+            for key, latency in self._latency.items():
+                series.append(
+                    {
+                        **dict(zip(_LABEL_NAMES, key)),
+                        "latency_seconds": latency.to_dict(),
+                        "input_tokens": self._input_tokens[key].to_dict(),
+                        "output_tokens": self._output_tokens[key].to_dict(),
+                        "estimated_cost_usd": round(self._cost_usd.get(key, 0.0), 6),
+                    }
+                )
+            return {
+                "series": series,
+                "tracked_contracts": len(self._contract_rollups),
+            }
+
+    def render_prometheus(self) -> str:
+        """Render all series in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for metric, help_text, table in (
+                (
+                    "llm_call_latency_seconds",
+                    "LLM/OCR call latency in seconds",
+                    self._latency,
+                ),
+                (
+                    "llm_call_input_tokens",
+                    "Input tokens per LLM/OCR call",
+                    self._input_tokens,
+                ),
+                (
+                    "llm_call_output_tokens",
+                    "Output tokens per LLM/OCR call",
+                    self._output_tokens,
+                ),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for key, hist in table.items():
+                    labels = _format_labels(key)
+                    for upper, count in zip(hist.buckets, hist.counts):
+                        lines.append(
+                            f'{metric}_bucket{{{labels},le="{_format_number(upper)}"}} {count}'
+                        )
+                    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {hist.count}')
+                    lines.append(f"{metric}_sum{{{labels}}} {_format_number(hist.sum)}")
+                    lines.append(f"{metric}_count{{{labels}}} {hist.count}")
+
+            lines.append(
+                "# HELP llm_call_estimated_cost_usd_total Estimated LLM/OCR spend in USD"
+            )
+            lines.append("# TYPE llm_call_estimated_cost_usd_total counter")
+            for key, cost in self._cost_usd.items():
+                lines.append(
+                    f"llm_call_estimated_cost_usd_total{{{_format_labels(key)}}} {_format_number(cost)}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop all recorded series and rollups."""
+        with self._lock:
+            self._latency.clear()
+            self._input_tokens.clear()
+            self._output_tokens.clear()
+            self._cost_usd.clear()
+            self._contract_rollups.clear()
+
+
+def _copy_rollup(rollup: Dict[str, Any]) -> Dict[str, Any]:
+    def _copy(r: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            **r,
+            "estimated_cost_usd": round(r["estimated_cost_usd"], 6),
+            "latency_seconds": round(r["latency_seconds"], 3),
+            "outcomes": dict(r["outcomes"]),
+        }
+
+    copied = _copy(rollup)
+    copied["by_node"] = {k: _copy(v) for k, v in rollup["by_node"].items()}
+    copied["by_model"] = {k: _copy(v) for k, v in rollup["by_model"].items()}
+    return copied
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: _LabelKey) -> str:
+    return ",".join(
+        f'{name}="{_escape_label(value)}"' for name, value in zip(_LABEL_NAMES, key)
+    )
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class TrackedCall:
+    """Handle for a single in-flight call; see `track_llm_call`."""
+
+    def __init__(
+        self,
+        registry: LLMMetricsRegistry,
+        model: Optional[str],
+        operation: str,
+        prompt_chars: int,
+    ):
+        self._registry = registry
+        self.model = model
+        self.operation = operation
+        self.prompt_chars = prompt_chars
+        self.output_chars = 0
+        self.outcome: Optional[str] = None
+        self.usage = TokenUsage()
+        self._started = time.perf_counter()
+        self._responded: Optional[float] = None
+
+    def mark_response(self, text: Optional[str]) -> None:
+        """Stop the latency clock once the provider response has arrived."""
+        self._responded = time.perf_counter()
+        self.output_chars = len(text or "")
+
+    def set_outcome(self, outcome: str) -> None:
+        self.outcome = outcome
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        ended = self._responded or time.perf_counter()
+        ctx = get_call_context()
+        if error is not None:
+            outcome = CallOutcome.ERROR
+        else:
+            outcome = self.outcome or CallOutcome.SUCCESS
+            if outcome == CallOutcome.SUCCESS and ctx.is_fallback:
+                outcome = CallOutcome.FALLBACK
+
+        if self.usage.reported:
+            input_tokens = self.usage.input_tokens
+            output_tokens = self.usage.output_tokens
+        else:
+            input_tokens = estimate_tokens(self.prompt_chars)
+            output_tokens = estimate_tokens(self.output_chars)
+
+        current_span().set(
+            model=self.model,
+            outcome=outcome,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            tokens_estimated=not self.usage.reported,
+        )
+
+        try:
+            self._registry.observe_call(
+                model=self.model,
+                latency_seconds=ended - self._started,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                outcome=outcome,
+                operation=self.operation,
+                context=ctx,
+            )
+        except Exception as metrics_error:
+            # Metrics must never break a model call
+            logger.debug(f"Failed to record LLM call metrics: {metrics_error}")
+
+
+@contextmanager
+def track_llm_call(
+    model: Optional[str],
+    *,
+    operation: str = "llm",
+    prompt_chars: int = 0,
+    registry: Optional[LLMMetricsRegistry] = None,
+) -> Iterator[TrackedCall]:
+    """Time a model call and record it in the registry on exit.
+
+    Usage:
+        with track_llm_call(model, prompt_chars=len(prompt)) as call:
+            text = await client.generate_content(prompt)
+            call.mark_response(text)
+            call.set_outcome(CallOutcome.SUCCESS if ok else CallOutcome.PARSE_FAIL)
+    """
+    call = TrackedCall(registry or llm_metrics, model, operation, prompt_chars)
+    token = _token_usage.set(call.usage)
+    try:
+        with span(f"{operation}_call"):
+            try:
+                yield call
+            except BaseException as e:
+                call.finish(error=e)
+                raise
+            else:
+                call.finish()
+    finally:
+        _token_usage.reset(token)
+
+
+# Global registry
+llm_metrics = LLMMetricsRegistry()
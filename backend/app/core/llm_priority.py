@@ -0,0 +1,123 @@
+"""
+Priority-ordered LLM slots within one contract analysis.
+
+Step 2 runs its analyzers as a dependency graph; the run finishes when the
+longest chain of dependent analyzers finishes, not when the total work is
+done. `PriorityLLMGate` bounds the model calls in flight for one contract and,
+when a slot frees up, hands it to the waiting call with the highest priority
+(the node with the longest estimated remaining chain), FIFO among equals.
+
+The gate is bound to a run with `priority_gate_scope` and each node tags its
+calls with `llm_priority`; both are ContextVars, so they reach the calls made
+inside nodes and subflows. `priority_slot` is what LLMService wraps around
+every provider call, and is a no-op outside a scoped run.
+"""
+
+import asyncio
+import heapq
+import logging
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from itertools import count
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_CALLS = 4
+
+
+class PriorityLLMGate:
+    """Admits the LLM calls of one run, highest priority first."""
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT_CALLS):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self._active = 0
+        self._waiters: List[Tuple[float, int, asyncio.Future]] = []
+        self._sequence = count()
+        self.calls: Counter = Counter()
+        self.max_waiting = 0
+
+    def _dispatch(self) -> None:
+        while self._active < self.max_concurrent and self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():  # cancelled while queued
+                continue
+            self._active += 1
+            waiter.set_result(None)
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: float = 0.0, label: str = "") -> AsyncIterator[None]:
+        """Hold one LLM slot for the duration of a call."""
+        self.calls[label] += 1
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (-priority, next(self._sequence), waiter))
+            self.max_waiting = max(self.max_waiting, len(self._waiters))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Granted in the same tick the caller was cancelled
+                    self._release()
+                else:
+                    waiter.cancel()
+                raise
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self._active,
+            "waiting": sum(1 for *_, w in self._waiters if not w.done()),
+            "max_waiting": self.max_waiting,
+            "calls": dict(self.calls),
+        }
+
+
+_gate: ContextVar[Optional[PriorityLLMGate]] = ContextVar(
+    "llm_priority_gate", default=None
+)
+_priority: ContextVar[Tuple[float, str]] = ContextVar("llm_priority", default=(0.0, ""))
+
+
+@contextmanager
+def priority_gate_scope(gate: PriorityLLMGate) -> Iterator[PriorityLLMGate]:
+    """Route the LLM calls made in this context through ``gate``."""
+    token = _gate.set(gate)
+    try:
+        yield gate
+    finally:
+        _gate.reset(token)
+
+
+@contextmanager
+def llm_priority(priority: float, label: str) -> Iterator[None]:
+    """Give the LLM calls made in this context ``priority`` (higher runs first)."""
+    token = _priority.set((priority, label))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@asynccontextmanager
+async def priority_slot() -> AsyncIterator[None]:
+    """Wait for a prioritised slot inside a scoped run; otherwise a no-op."""
+    gate = _gate.get()
+    if gate is None:
+        yield
+        return
+    priority, label = _priority.get()
+    async with gate.slot(priority, label):
+        yield
@@ -0,0 +1,398 @@
+"""
+Deterministic record/replay stand-in for LLM calls.
+
+Load-testing the analysis workflows against live Gemini/OpenRouter measures
+the providers more than the orchestration. This module lets `LLMService` and
+`GeminiOCRService` run in one of three modes (settings.llm_replay_mode):
+
+- ``off``: calls go to the provider unchanged
+- ``record``: calls go to the provider and each response is appended to a
+  local corpus keyed by a request fingerprint
+- ``replay``: no provider is contacted; responses are served from the corpus
+  with simulated latency and optional fault injection (429, timeout,
+  malformed JSON)
+
+A fingerprint is a SHA-256 of the operation, model, prompt and the call
+parameters that change the output. Repeated calls with the same fingerprint
+(e.g. parse retries) are recorded in order and replayed in the same order, so
+a replayed run takes the same retry/repair paths as the recorded one.
+
+The corpus is one JSON file per fingerprint, so recordings from several runs
+can be merged by copying directories.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.clients.base.exceptions import (
+    ClientError,
+    ClientRateLimitError,
+    ClientTimeoutError,
+)
+from app.core.llm_metrics import get_token_usage, report_token_usage
+
+logger = logging.getLogger(__name__)
+
+
+# Size of the text deltas fed to streaming callbacks during replay
+REPLAY_STREAM_CHUNK_CHARS: int = 64
+# Latency used when replaying a response recorded without timing
+DEFAULT_REPLAY_LATENCY_MS: float = 500.0
+
+
+class ReplayMode:
+    """Values accepted by settings.llm_replay_mode."""
+
+    OFF = "off"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class ReplayMissError(ClientError):
+    """Raised in replay mode when the corpus has no response for a request."""
+
+
+@dataclass
+class FaultInjection:
+    """Simulated latency and failure rates applied to replayed responses."""
+
+    latency_ms: Optional[float] = None
+    latency_scale: float = 1.0
+    rate_limit_rate: float = 0.0
+    timeout_rate: float = 0.0
+    malformed_rate: float = 0.0
+    seed: Optional[int] = None
+
+
+def _param_value(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return "sha256:" + hashlib.sha256(value).hexdigest()
+    if isinstance(value, type):
+        return value.__name__
+    if isinstance(value, (list, tuple)):
+        return [_param_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _param_value(v) for k, v in value.items()}
+    return value
+
+
+def request_fingerprint(
+    operation: str,
+    model: Optional[str],
+    prompt: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Stable hash of everything that determines an LLM response."""
+    relevant = {
+        k: _param_value(v)
+        for k, v in (params or {}).items()
+        if v is not None and (isinstance(v, type) or not callable(v))
+    }
+    payload = json.dumps(
+        {
+            "operation": operation,
+            "model": model,
+            "prompt": prompt,
+            "params": relevant,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCorpus:
+    """Directory of recorded responses, one JSON file per fingerprint."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, f"{fingerprint}.json")
+
+    def load(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if fingerprint not in self._cache:
+                try:
+                    with open(self._path(fingerprint), "r", encoding="utf-8") as f:
+                        self._cache[fingerprint] = json.load(f)
+                except FileNotFoundError:
+                    self._cache[fingerprint] = None
+            return self._cache[fingerprint]
+
+    def append(
+        self,
+        fingerprint: str,
+        *,
+        operation: str,
+        model: Optional[str],
+        response: Dict[str, Any],
+    ) -> None:
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(fingerprint)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                record = {
+                    "fingerprint": fingerprint,
+                    "operation": operation,
+                    "model": model,
+                    "responses": [],
+                }
+            record["responses"].append(response)
+            # Write-then-rename so a concurrent reader never sees a partial file
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self._cache[fingerprint] = record
+
+    def count(self) -> int:
+        """Number of recorded fingerprints."""
+        try:
+            return sum(1 for n in os.listdir(self.directory) if n.endswith(".json"))
+        except FileNotFoundError:
+            return 0
+
+
+class LLMReplay:
+    """Routes LLM calls to the provider, the recorder, or the replay backend."""
+
+    def __init__(
+        self,
+        mode: str = ReplayMode.OFF,
+        corpus: Optional[LLMCorpus] = None,
+        faults: Optional[FaultInjection] = None,
+    ):
+        if mode not in (ReplayMode.OFF, ReplayMode.RECORD, ReplayMode.REPLAY):
+            raise ValueError(f"Unknown LLM replay mode: {mode}")
+        if mode != ReplayMode.OFF and corpus is None:
+            raise ValueError("A corpus is required to record or replay LLM calls")
+        self.mode = mode
+        self.corpus = corpus
+        self.faults = faults or FaultInjection()
+        self._rng = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._occurrences: Dict[str, int] = {}
+        self._stats: Dict[str, int] = {
+            "recorded": 0,
+            "replayed": 0,
+            "misses": 0,
+            "injected_rate_limits": 0,
+            "injected_timeouts": 0,
+            "injected_malformed": 0,
+        }
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == ReplayMode.REPLAY
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": self.mode, **self._stats}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    async def call(
+        self,
+        operation: str,
+        model: Optional[str],
+        prompt: str,
+        call_factory: Callable[[], Awaitable[Any]],
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        on_chunk: Optional[Callable[[str], Any]] = None,
+        extract_text: Optional[Callable[[Any], str]] = None,
+        wrap_text: Optional[Callable[[str], Any]] = None,
+    ) -> Any:
+        """Run `call_factory` according to the mode.
+
+        `extract_text` turns a provider result into the text to record and
+        `wrap_text` turns replayed text back into the result shape the caller
+        expects; both default to the identity for plain-text calls.
+        """
+        if self.mode == ReplayMode.OFF:
+            return await call_factory()
+
+        fingerprint = request_fingerprint(operation, model, prompt, params)
+        if self.mode == ReplayMode.REPLAY:
+            text = await self._replay(fingerprint, on_chunk)
+            return wrap_text(text) if wrap_text else text
+
+        usage = get_token_usage()
+        usage_before = (usage.input_tokens, usage.output_tokens) if usage else (0, 0)
+        started = time.perf_counter()
+        result = await call_factory()
+        latency_ms = (time.perf_counter() - started) * 1000
+        try:
+            text = extract_text(result) if extract_text else result
+            response: Dict[str, Any] = {
+                "text": text if isinstance(text, str) else str(text or ""),
+                "latency_ms": round(latency_ms, 1),
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+            }
+            if usage is not None and usage.reported:
+                response["input_tokens"] = usage.input_tokens - usage_before[0]
+                response["output_tokens"] = usage.output_tokens - usage_before[1]
+            self.corpus.append(
+                fingerprint, operation=operation, model=model, response=response
+            )
+            self._count("recorded")
+        except Exception as e:
+            # Recording must never break a live call
+            logger.warning(f"Failed to record LLM response {fingerprint[:12]}: {e}")
+        return result
+
+    def _next_response(self, fingerprint: str) -> Dict[str, Any]:
+        record = self.corpus.load(fingerprint)
+        responses: List[Dict[str, Any]] = (record or {}).get("responses") or []
+        if not responses:
+            self._count("misses")
+            raise ReplayMissError(
+                f"No recorded LLM response for fingerprint {fingerprint[:12]}",
+                client_name="LLMReplay",
+            )
+        with self._lock:
+            index = self._occurrences.get(fingerprint, 0)
+            self._occurrences[fingerprint] = index + 1
+        # Serve repeated requests in recorded order, wrapping around
+        return responses[index % len(responses)]
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < rate
+
+    async def _replay(
+        self, fingerprint: str, on_chunk: Optional[Callable[[str], Any]]
+    ) -> str:
+        response = self._next_response(fingerprint)
+        faults = self.faults
+
+        latency_ms = (
+            faults.latency_ms
+            if faults.latency_ms is not None
+            else response.get("latency_ms", DEFAULT_REPLAY_LATENCY_MS)
+        )
+        latency_s = max(float(latency_ms) * faults.latency_scale, 0.0) / 1000
+
+        if self._roll(faults.rate_limit_rate):
+            self._count("injected_rate_limits")
+            raise ClientRateLimitError(
+                "Simulated 429 rate limit (LLM replay)", client_name="LLMReplay"
+            )
+        if self._roll(faults.timeout_rate):
+            self._count("injected_timeouts")
+            await asyncio.sleep(latency_s)
+            raise ClientTimeoutError(
+                "Simulated request timeout (LLM replay)", client_name="LLMReplay"
+            )
+
+        text = response.get("text") or ""
+        if self._roll(faults.malformed_rate):
+            self._count("injected_malformed")
+            # Truncation is the most common real-world malformation
+            text = text[: len(text) // 2]
+
+        if on_chunk is None:
+            await asyncio.sleep(latency_s)
+        else:
+            chunks = [
+                text[i : i + REPLAY_STREAM_CHUNK_CHARS]
+                for i in range(0, len(text), REPLAY_STREAM_CHUNK_CHARS)
+            ] or [""]
+            per_chunk_s = latency_s / len(chunks)
+            for chunk in chunks:
+                await asyncio.sleep(per_chunk_s)
+                result = on_chunk(chunk)
+                if inspect.isawaitable(result):
+                    await result
+
+        if "input_tokens" in response or "output_tokens" in response:
+            report_token_usage(
+                response.get("input_tokens"), response.get("output_tokens")
+            )
+        self._count("replayed")
+        return text
+
+
+_llm_replay: Optional[LLMReplay] = None
+_llm_replay_lock = threading.Lock()
+
+
+def configure_llm_replay(
+    mode: str,
+    corpus_dir: Optional[str] = None,
+    faults: Optional[FaultInjection] = None,
+) -> LLMReplay:
+    """Install the process-wide replay router (overrides settings)."""
+    global _llm_replay
+    replay = LLMReplay(
+        mode=mode,
+        corpus=LLMCorpus(corpus_dir) if corpus_dir else None,
+        faults=faults,
+    )
+    with _llm_replay_lock:
+        _llm_replay = replay
+    if mode != ReplayMode.OFF:
+        logger.info(f"LLM replay mode '{mode}' using corpus {corpus_dir}")
+    return replay
+
+
+def get_llm_replay() -> LLMReplay:
+    """Return the process-wide replay router, configured from settings on first use."""
+    global _llm_replay
+    replay = _llm_replay
+    if replay is not None:
+        return replay
+
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    mode = (getattr(settings, "llm_replay_mode", None) or ReplayMode.OFF).lower()
+    if mode == ReplayMode.OFF:
+        replay = LLMReplay()
+        with _llm_replay_lock:
+            _llm_replay = _llm_replay or replay
+            return _llm_replay
+    return configure_llm_replay(
+        mode,
+        corpus_dir=settings.llm_replay_corpus_dir,
+        faults=FaultInjection(
+            latency_ms=settings.llm_replay_latency_ms,
+            latency_scale=settings.llm_replay_latency_scale,
+            rate_limit_rate=settings.llm_replay_rate_limit_rate,
+            timeout_rate=settings.llm_replay_timeout_rate,
+            malformed_rate=settings.llm_replay_malformed_rate,
+            seed=settings.llm_replay_seed,
+        ),
+    )
+
+
+__all__ = [
+    "FaultInjection",
+    "LLMCorpus",
+    "LLMReplay",
+    "ReplayMissError",
+    "ReplayMode",
+    "configure_llm_replay",
+    "get_llm_replay",
+    "request_fingerprint",
+]
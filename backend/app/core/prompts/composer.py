@@ -2,7 +2,7 @@
 
 import logging
 import yaml
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 from datetime import datetime, UTC
@@ -92,20 +92,7 @@ class PromptComposer:
             )
 
             # Create metadata with version info
-            system_versions: Dict[str, str] = {}
-            user_versions: Dict[str, str] = {}
-            try:
-                for sp_obj in rule.system_prompts:
-                    sp_name = (
-                        sp_obj["name"] if isinstance(sp_obj, dict) else str(sp_obj)
-                    )
-                    t = self._load_template(sp_name, "system")
-                    system_versions[sp_name] = getattr(t.metadata, "version", "")
-                for up_name in rule.user_prompts:
-                    t = self._load_template(up_name, "user")
-                    user_versions[up_name] = getattr(t.metadata, "version", "")
-            except Exception:
-                pass
+            system_versions, user_versions = self._prompt_versions(rule)
 
             metadata = self._create_composition_metadata(
                 rule, context, system_versions, user_versions
@@ -413,14 +400,26 @@ class PromptComposer:
             logger.warning(f"Unknown merge strategy: {strategy}, using sequential")
             return "\n\n---\n\n".join(parts)
 
-    def _create_composition_metadata(
-        self,
-        rule: CompositionRule,
-        context: PromptContext,
-        system_versions: Dict[str, str],
-        user_versions: Dict[str, str],
-    ) -> Dict[str, Any]:
-        """Create metadata for composed prompt"""
+    def _prompt_versions(
+        self, rule: CompositionRule
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Template versions of a rule's system and user prompts"""
+        system_versions: Dict[str, str] = {}
+        user_versions: Dict[str, str] = {}
+        try:
+            for sp_obj in rule.system_prompts:
+                sp_name = sp_obj["name"] if isinstance(sp_obj, dict) else str(sp_obj)
+                t = self._load_template(sp_name, "system")
+                system_versions[sp_name] = getattr(t.metadata, "version", "")
+            for up_name in rule.user_prompts:
+                t = self._load_template(up_name, "user")
+                user_versions[up_name] = getattr(t.metadata, "version", "")
+        except Exception:
+            pass
+        return system_versions, user_versions
+
+    def _composition_models(self, rule: CompositionRule) -> Dict[str, Any]:
+        """Explicit, primary and fallback models of a rule"""
         # Aggregate model compatibility from user prompts (in order, unique)
         model_compatibility: List[str] = []
         try:
@@ -444,14 +443,25 @@ class PromptComposer:
         fallback_models: List[str] = [
             m for m in model_compatibility if m != primary_model
         ]
-
         return {
-            "composition_rule": rule.name,
-            "composition_version": getattr(rule, "version", ""),
             "model": explicit_model,
             "primary_model": primary_model,
             "fallback_models": fallback_models,
             "model_compatibility": model_compatibility,
+        }
+
+    def _create_composition_metadata(
+        self,
+        rule: CompositionRule,
+        context: PromptContext,
+        system_versions: Dict[str, str],
+        user_versions: Dict[str, str],
+    ) -> Dict[str, Any]:
+        """Create metadata for composed prompt"""
+        return {
+            "composition_rule": rule.name,
+            "composition_version": getattr(rule, "version", ""),
+            **self._composition_models(rule),
             "system_prompts": rule.system_prompts,
             "user_prompts": rule.user_prompts,
             "system_prompt_versions": system_versions,
@@ -578,6 +588,33 @@ class PromptComposer:
             self.fragment_manager.clear_cache()
         logger.info("Template cache cleared")
 
+    def get_composition_signature(self, composition_name: str) -> Dict[str, Any]:
+        """Versions and models that determine a composition's output, without rendering
+
+        Args:
+            composition_name: Name of the composition
+
+        Returns:
+            Composition version, prompt template versions and models
+        """
+        if composition_name not in self.composition_rules:
+            raise PromptCompositionError(
+                f"Unknown composition rule: {composition_name}",
+                details={"available_compositions": list(self.composition_rules.keys())},
+            )
+
+        rule = self.composition_rules[composition_name]
+        system_versions, user_versions = self._prompt_versions(rule)
+        models = self._composition_models(rule)
+        return {
+            "composition": composition_name,
+            "composition_version": getattr(rule, "version", ""),
+            "system_prompt_versions": system_versions,
+            "user_prompt_versions": user_versions,
+            "primary_model": models["primary_model"],
+            "fallback_models": models["fallback_models"],
+        }
+
     def get_composition_model(self, composition_name: str) -> Optional[str]:
         """Get the model specified for a composition
 
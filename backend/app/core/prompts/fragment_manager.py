@@ -230,10 +230,15 @@ class FragmentManager:
                 fragment_vars[group_name] = ""
 
         # Render template with fragment content
-        from jinja2 import Environment, BaseLoader, Undefined
+        from jinja2 import Environment, BaseLoader, FileSystemLoader, Undefined
+
+        # Includes resolve against the prompts directory (as for PromptTemplate)
+        prompts_loader = FileSystemLoader(str(self.fragments_dir.parent))
 
         class StringLoader(BaseLoader):
             def get_source(self, environment, template):
+                if template:
+                    return prompts_loader.get_source(environment, template)
                 return base_template, None, lambda: True
 
         env = Environment(
@@ -0,0 +1,416 @@
+"""
+Incremental repair of malformed or truncated JSON model output.
+
+Most structured-output parse failures are not wrong answers but damaged
+envelopes: a markdown fence, a sentence of prose after the object, or a
+response cut off at the token limit. Regenerating the whole answer for those
+costs a full LLM round trip, so the parser runs this repair stage first:
+
+1. strip markdown fences and leading/trailing prose
+2. scan the JSON with a small streaming tokenizer and, when the input ends
+   inside a structure, cut back to the last complete value and close every
+   open string/array/object
+3. coerce near-miss scalar types against the target Pydantic model
+   (e.g. "1,200" -> 1200 for int fields, "Yes" -> True, scalar -> [scalar])
+
+Each step that changed the text or data is recorded in `repair_path` so
+callers can report how the output was recovered.
+"""
+
+import enum
+import json
+import logging
+import re
+import types
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class RepairPath:
+    """Names of repair steps reported in `JsonRepairResult.repair_path`."""
+
+    FENCES_STRIPPED = "fences_stripped"
+    LEADING_PROSE_STRIPPED = "leading_prose_stripped"
+    TRAILING_PROSE_STRIPPED = "trailing_prose_stripped"
+    STRUCTURE_CLOSED = "structure_closed"
+    TRAILING_COMMAS_REMOVED = "trailing_commas_removed"
+    TYPES_COERCED = "types_coerced"
+    MISSING_FIELDS_REASKED = "missing_fields_reasked"
+
+
+_FENCE_OPEN_RE = re.compile(r"```[a-zA-Z0-9_-]*[ \t]*\n?")
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+_NUMERIC_CLEAN_RE = re.compile(r"[,\s$%]|AUD|USD", re.IGNORECASE)
+_TRUE_STRINGS = {"true", "yes", "y", "1"}
+_FALSE_STRINGS = {"false", "no", "n", "0"}
+
+
+@dataclass
+class JsonRepairResult:
+    """Outcome of `repair_json`; `data` is None when nothing could be recovered."""
+
+    data: Optional[Any] = None
+    repair_path: List[str] = field(default_factory=list)
+    repaired_text: Optional[str] = None
+
+
+def strip_fences(text: str) -> Tuple[str, bool]:
+    """Return the content of the first markdown code fence, if any.
+
+    An unterminated fence (truncated output) yields everything after the
+    opening fence.
+    """
+    start = text.find("```")
+    if start == -1:
+        return text, False
+    opening = _FENCE_OPEN_RE.match(text, start)
+    body_start = opening.end() if opening else start + 3
+    end = text.find("```", body_start)
+    body = text[body_start:] if end == -1 else text[body_start:end]
+    return body, True
+
+
+def _find_json_start(text: str) -> int:
+    positions = [p for p in (text.find("{"), text.find("[")) if p != -1]
+    return min(positions) if positions else -1
+
+
+def close_unterminated_json(text: str) -> Tuple[str, bool, bool]:
+    """Scan a JSON document and make it syntactically complete.
+
+    `text` must start at the opening `{` or `[`. Returns
+    `(json_text, closed_structures, trailing_text_dropped)`.
+
+    When the first top-level value closes before the end of the input, the
+    remainder is dropped. When the input ends inside a structure, the text is
+    cut back to the last complete value (a dangling key, comma or partial
+    literal is discarded), an unterminated string value is closed, and all
+    open arrays/objects are closed in order.
+    """
+    # Stack of open containers; for objects we also track whether the next
+    # string is a key ("key") or a value ("value").
+    stack: List[str] = []
+    object_state: List[str] = []
+    in_string = False
+    string_is_key = False
+    escape = False
+    token_start = -1
+
+    safe_end = 0
+    safe_stack: List[str] = []
+
+    def mark_safe(pos: int) -> None:
+        nonlocal safe_end, safe_stack
+        safe_end = pos
+        safe_stack = list(stack)
+
+    i = 0
+    n = len(text)
+    while i < n:
+        ch = text[i]
+
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+                if not string_is_key:
+                    mark_safe(i + 1)
+            i += 1
+            continue
+
+        if token_start != -1:
+            # Inside a bare literal/number token
+            if ch.isalnum() or ch in "+-.":
+                i += 1
+                continue
+            token_start = -1
+            mark_safe(i)
+
+        if ch == '"':
+            in_string = True
+            string_is_key = bool(stack) and stack[-1] == "{" and object_state[-1] == "key"
+        elif ch in "{[":
+            stack.append(ch)
+            object_state.append("key" if ch == "{" else "value")
+            mark_safe(i + 1)
+        elif ch in "}]":
+            if not stack:
+                break
+            stack.pop()
+            object_state.pop()
+            mark_safe(i + 1)
+            if not stack:
+                remainder = text[i + 1 :]
+                return text[: i + 1], False, bool(remainder.strip())
+        elif ch == ":":
+            if object_state:
+                object_state[-1] = "value"
+        elif ch == ",":
+            if stack and stack[-1] == "{":
+                object_state[-1] = "key"
+        elif not ch.isspace():
+            token_start = i
+        i += 1
+
+    # Input ended inside the document
+    if in_string and not string_is_key:
+        body = text[:n]
+        if escape:
+            body = body[:-1]
+        closers = "".join("}" if c == "{" else "]" for c in reversed(stack))
+        return body + '"' + closers, True, False
+
+    closers = "".join("}" if c == "{" else "]" for c in reversed(safe_stack))
+    return text[:safe_end].rstrip().rstrip(",") + closers, True, False
+
+
+def _loads(text: str) -> Any:
+    return json.loads(text, strict=False)
+
+
+def repair_json(text: Optional[str]) -> JsonRepairResult:
+    """Recover a JSON value from malformed model output.
+
+    Returns a result whose `repair_path` lists the steps that were applied
+    (empty when the text was already valid JSON).
+    """
+    result = JsonRepairResult()
+    if not text or not text.strip():
+        return result
+
+    try:
+        result.data = _loads(text.strip())
+        result.repaired_text = text.strip()
+        return result
+    except json.JSONDecodeError:
+        pass
+
+    working, had_fence = text, False
+    fence = text.find("```")
+    json_start = _find_json_start(text)
+    # A fence that only appears after the JSON starts is a closing fence
+    if fence != -1 and (json_start == -1 or fence < json_start):
+        working, had_fence = strip_fences(text)
+    if had_fence:
+        result.repair_path.append(RepairPath.FENCES_STRIPPED)
+
+    start = _find_json_start(working)
+    if start == -1:
+        return result
+    if working[:start].strip():
+        result.repair_path.append(RepairPath.LEADING_PROSE_STRIPPED)
+
+    candidate, closed, dropped_trailing = close_unterminated_json(working[start:])
+    if dropped_trailing:
+        result.repair_path.append(RepairPath.TRAILING_PROSE_STRIPPED)
+    if closed:
+        result.repair_path.append(RepairPath.STRUCTURE_CLOSED)
+
+    for attempt in (candidate, _TRAILING_COMMA_RE.sub(r"\1", candidate)):
+        try:
+            result.data = _loads(attempt)
+            result.repaired_text = attempt
+            if attempt is not candidate:
+                result.repair_path.append(RepairPath.TRAILING_COMMAS_REMOVED)
+            return result
+        except json.JSONDecodeError:
+            continue
+
+    logger.debug(f"JSON repair failed after steps {result.repair_path}")
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Schema-guided type coercion
+# ---------------------------------------------------------------------------
+
+
+def _unwrap_optional(annotation: Any) -> Tuple[Any, bool]:
+    origin = get_origin(annotation)
+    if origin is Union or (
+        hasattr(types, "UnionType") and origin is getattr(types, "UnionType")
+    ):
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        optional = len(args) != len(get_args(annotation))
+        if len(args) == 1:
+            return args[0], optional
+        return annotation, optional
+    return annotation, False
+
+
+def _parse_number(value: str) -> Optional[float]:
+    cleaned = _NUMERIC_CLEAN_RE.sub("", value)
+    if not cleaned:
+        return None
+    try:
+        return float(cleaned)
+    except ValueError:
+        return None
+
+
+def _normalise_choice(value: str) -> str:
+    return re.sub(r"[\s\-]+", "_", value.strip()).lower()
+
+
+def _coerce_value(value: Any, annotation: Any, path: str, changes: List[str]) -> Any:
+    target, _ = _unwrap_optional(annotation)
+    if value is None or target is Any:
+        return value
+
+    origin = get_origin(target)
+    args = get_args(target)
+
+    if isinstance(target, type) and issubclass(target, BaseModel):
+        if isinstance(value, dict):
+            return coerce_to_model(value, target, path, changes)
+        return value
+
+    if origin in (list, List, set, tuple):
+        item_type = args[0] if args else Any
+        if not isinstance(value, list):
+            if isinstance(value, dict) and not (
+                isinstance(item_type, type) and issubclass(item_type, BaseModel)
+            ):
+                return value
+            changes.append(f"{path}: wrapped scalar in list")
+            value = [value]
+        return [
+            _coerce_value(item, item_type, f"{path}[{idx}]", changes)
+            for idx, item in enumerate(value)
+        ]
+
+    if origin is Literal:
+        if isinstance(value, str) and value not in args:
+            for choice in args:
+                if isinstance(choice, str) and _normalise_choice(
+                    choice
+                ) == _normalise_choice(value):
+                    changes.append(f"{path}: matched literal {choice!r}")
+                    return choice
+        return value
+
+    if isinstance(target, type) and issubclass(target, enum.Enum):
+        if isinstance(value, str) and not any(m.value == value for m in target):
+            wanted = _normalise_choice(value)
+            for member in target:
+                if wanted in (
+                    _normalise_choice(str(member.value)),
+                    _normalise_choice(member.name),
+                ):
+                    changes.append(f"{path}: matched enum {member.value!r}")
+                    return member.value
+        return value
+
+    if target is bool:
+        if isinstance(value, str):
+            lowered = value.strip().lower()
+            if lowered in _TRUE_STRINGS or lowered in _FALSE_STRINGS:
+                changes.append(f"{path}: str -> bool")
+                return lowered in _TRUE_STRINGS
+        elif isinstance(value, (int, float)) and value in (0, 1):
+            changes.append(f"{path}: number -> bool")
+            return bool(value)
+        return value
+
+    if target is int:
+        if isinstance(value, str):
+            number = _parse_number(value)
+            if number is not None and number.is_integer():
+                changes.append(f"{path}: str -> int")
+                return int(number)
+        elif isinstance(value, float) and value.is_integer():
+            changes.append(f"{path}: float -> int")
+            return int(value)
+        return value
+
+    if target is float:
+        if isinstance(value, str):
+            number = _parse_number(value)
+            if number is not None:
+                changes.append(f"{path}: str -> float")
+                return number
+        return value
+
+    if target is str:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            changes.append(f"{path}: number -> str")
+            return str(value)
+        if isinstance(value, list) and len(value) == 1 and isinstance(value[0], str):
+            changes.append(f"{path}: single-item list -> str")
+            return value[0]
+        return value
+
+    return value
+
+
+def coerce_to_model(
+    data: Dict[str, Any],
+    model: Type[BaseModel],
+    path: str = "",
+    changes: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Return a copy of `data` with near-miss values coerced to `model` field types.
+
+    Only values that are clearly the wrong shape are touched; anything that
+    cannot be coerced confidently is left for Pydantic validation to report.
+    Explicit nulls on non-optional fields that have a default are dropped so
+    the default applies. Descriptions of every change are appended to
+    `changes` when provided.
+    """
+    if changes is None:
+        changes = []
+    if not isinstance(data, dict):
+        return data
+
+    coerced = dict(data)
+    model_fields = getattr(model, "model_fields", {}) or {}
+    for name, field_info in model_fields.items():
+        key = name
+        if key not in coerced:
+            alias = getattr(field_info, "alias", None)
+            if alias and alias in coerced:
+                key = alias
+            else:
+                continue
+        field_path = f"{path + '.' if path else ''}{key}"
+        value = coerced[key]
+        _, optional = _unwrap_optional(field_info.annotation)
+        if value is None and not optional and not field_info.is_required():
+            changes.append(f"{field_path}: dropped null to use default")
+            del coerced[key]
+            continue
+        try:
+            coerced[key] = _coerce_value(
+                value, field_info.annotation, field_path, changes
+            )
+        except Exception as e:
+            logger.debug(f"Type coercion skipped for {field_path}: {e}")
+    return coerced
+
+
+__all__ = [
+    "JsonRepairResult",
+    "RepairPath",
+    "close_unterminated_json",
+    "coerce_to_model",
+    "repair_json",
+    "strip_fences",
+]
@@ -504,6 +504,12 @@ class PromptManager:
             return {"valid": False, "error": "Composition system not enabled"}
         return self.composer.validate_composition(composition_name)
 
+    def get_composition_signature(self, composition_name: str) -> Dict[str, Any]:
+        """Versions and models of a composition (used for node input fingerprints)"""
+        if not self.composer:
+            raise PromptCompositionError("Composition system not enabled")
+        return self.composer.get_composition_signature(composition_name)
+
     # Workflow Execution Methods
 
     # Service Integration Methods
@@ -1,6 +1,10 @@
 """
 Adapters around LangChain's PydanticOutputParser to provide retry parsing
 and a stable ParsingResult interface for consumers.
+
+When plain extraction fails, parse_with_retry runs the incremental repair
+stage in json_repair (fence/prose stripping, closing truncated structures,
+schema-guided type coercion) before the caller falls back to regenerating.
 """
 
 import json
@@ -13,6 +17,8 @@ from typing import Any, Dict, List, Optional, Type, TypeVar, get_args, get_origi
 from pydantic import BaseModel, ValidationError, PrivateAttr
 from langchain_core.output_parsers import PydanticOutputParser as LCPydanticOutputParser
 
+from .json_repair import RepairPath, coerce_to_model, repair_json
+
 
 logger = logging.getLogger(__name__)
 
@@ -36,19 +42,30 @@ class ParsingResult:
     validation_errors: List[str] = None
     parsing_errors: List[str] = None
     confidence_score: float = 0.0
+    # Repair steps applied to recover the output (empty when parsed as-is)
+    repair_path: List[str] = None
+    # Set when repaired JSON validated except for missing required fields
+    partial_data: Optional[Dict[str, Any]] = None
+    missing_fields: List[str] = None
 
     def __post_init__(self):
         if self.validation_errors is None:
             self.validation_errors = []
         if self.parsing_errors is None:
             self.parsing_errors = []
+        if self.repair_path is None:
+            self.repair_path = []
+        if self.missing_fields is None:
+            self.missing_fields = []
 
 
 class RetryingPydanticOutputParser(LCPydanticOutputParser):
     """
     Child class of LangChain's PydanticOutputParser that adds:
     - parse() returning a ParsingResult
-    - parse_with_retry() with light-weight text cleanup attempts
+    - parse_with_retry() with light-weight text cleanup attempts followed by
+      incremental JSON repair and schema-guided type coercion
+    - helpers to re-ask for only the required fields missing from a repaired result
     - confidence scoring based on required field presence
     """
 
@@ -202,12 +219,157 @@ class RetryingPydanticOutputParser(LCPydanticOutputParser):
                     continue
                 attempt_result = self.parse(fixed)
                 if attempt_result.success:
+                    attempt_result.repair_path.append(f"text_fix_{attempt}")
                     return attempt_result
                 working_text = fixed
             except Exception as e:
                 logger.warning(f"Retry attempt {attempt} failed: {e}")
+
+        repaired = self._attempt_incremental_repair(text)
+        if repaired is not None:
+            if not repaired.success:
+                repaired.validation_errors = (
+                    repaired.validation_errors or result.validation_errors
+                )
+                repaired.parsing_errors = result.parsing_errors + (
+                    repaired.parsing_errors or []
+                )
+            return repaired
+        return result
+
+    def _attempt_incremental_repair(self, text: str) -> Optional[ParsingResult]:
+        """Repair truncated/malformed JSON and coerce it against the schema.
+
+        Returns None when no JSON object could be recovered. On validation
+        failure caused only by missing required fields, the returned result
+        carries `partial_data` and `missing_fields` so the caller can re-ask
+        for just those fields instead of regenerating everything.
+        """
+        try:
+            repair = repair_json(text)
+        except Exception as e:
+            logger.warning(f"Incremental JSON repair failed: {e}")
+            return None
+
+        data = repair.data
+        if isinstance(data, list) and len(data) == 1 and isinstance(data[0], dict):
+            data = data[0]
+        if not isinstance(data, dict):
+            return None
+
+        result = ParsingResult(
+            success=False, raw_output=text, repair_path=list(repair.repair_path)
+        )
+        coercions: List[str] = []
+        data = coerce_to_model(data, self._model, changes=coercions)
+        if coercions:
+            result.repair_path.append(RepairPath.TYPES_COERCED)
+            logger.debug(
+                f"Coerced {len(coercions)} value(s) for {self._model.__name__}: {coercions[:10]}"
+            )
+
+        try:
+            parsed_model = self._model(**data)
+        except ValidationError as ve:
+            errors = ve.errors()
+            result.validation_errors = [str(error) for error in errors]
+            missing = self._missing_fields_from_errors(errors)
+            if not missing and not self.strict_mode:
+                lenient_model = self._attempt_lenient_parsing(data)
+                if lenient_model is not None:
+                    result.success = True
+                    result.parsed_data = lenient_model
+                    result.confidence_score = 0.7
+                    return result
+            result.partial_data = data
+            result.missing_fields = missing
+            return result
+
+        result.success = True
+        result.parsed_data = parsed_model
+        result.confidence_score = self._calculate_confidence_score(parsed_model)
+        logger.info(
+            f"Recovered {self._model.__name__} output via repair path {result.repair_path}"
+        )
         return result
 
+    def build_missing_fields_prompt(self, missing_fields: List[str]) -> str:
+        """Instructions asking the model to return only the missing top-level fields."""
+        top_level = self._top_level_field_names(missing_fields)
+        try:
+            schema = self._model.model_json_schema()
+        except Exception:
+            schema = {}
+        properties = schema.get("properties", {}) or {}
+        field_schemas = {name: properties.get(name, {}) for name in top_level}
+        definitions = schema.get("$defs")
+        schema_payload: Dict[str, Any] = {"properties": field_schemas}
+        if definitions:
+            schema_payload["$defs"] = definitions
+        return (
+            "Your previous response was incomplete. The following required "
+            f"fields were missing or incomplete: {', '.join(top_level)}.\n"
+            "Return ONLY a JSON object containing exactly these keys, following "
+            "this schema. Do not repeat any other fields.\n"
+            f"```json\n{json.dumps(schema_payload, indent=2)}\n```"
+        )
+
+    def merge_missing_fields(
+        self, partial_data: Dict[str, Any], text: str, repair_path: List[str]
+    ) -> ParsingResult:
+        """Merge a re-asked response for missing fields into previously repaired data."""
+        result = ParsingResult(
+            success=False,
+            raw_output=text,
+            repair_path=list(repair_path) + [RepairPath.MISSING_FIELDS_REASKED],
+        )
+        repair = repair_json(text)
+        if not isinstance(repair.data, dict):
+            result.parsing_errors.append("No JSON object found in missing-fields response")
+            result.partial_data = partial_data
+            return result
+
+        merged = {**partial_data, **repair.data}
+        merged = coerce_to_model(merged, self._model)
+        try:
+            parsed_model = self._model(**merged)
+        except ValidationError as ve:
+            errors = ve.errors()
+            result.validation_errors = [str(error) for error in errors]
+            result.partial_data = merged
+            result.missing_fields = self._missing_fields_from_errors(errors)
+            return result
+
+        result.success = True
+        result.parsed_data = parsed_model
+        result.confidence_score = self._calculate_confidence_score(parsed_model)
+        return result
+
+    @staticmethod
+    def _missing_fields_from_errors(errors: List[Dict[str, Any]]) -> List[str]:
+        """Dotted paths of missing fields, or [] if any error is not a missing field."""
+        if not errors or any(err.get("type") != "missing" for err in errors):
+            return []
+        paths: List[str] = []
+        for err in errors:
+            path = ""
+            for part in err.get("loc", ()):
+                if isinstance(part, int):
+                    path += f"[{part}]"
+                else:
+                    path += f".{part}" if path else str(part)
+            paths.append(path)
+        return paths
+
+    @staticmethod
+    def _top_level_field_names(field_paths: List[str]) -> List[str]:
+        names: List[str] = []
+        for path in field_paths:
+            name = re.split(r"[.\[]", path, maxsplit=1)[0]
+            if name and name not in names:
+                names.append(name)
+        return names
+
     # Utilities
     def _attempt_text_fix(self, text: str, attempt: int) -> str:
         cleaned = text
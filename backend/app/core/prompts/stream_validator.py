@@ -0,0 +1,190 @@
+"""
+Incremental validation of streamed structured output.
+
+`StreamingSchemaValidator` is fed text deltas as a model streams its response
+and decides, as early as possible, whether the output has diverged from the
+shape the target Pydantic model expects:
+
+- prose instead of JSON (more than `max_prose_chars` of non-fence text
+  before the first `{`)
+- a top-level array when an object is expected
+- a first top-level key that is not a field of the model
+
+When divergence is detected the caller aborts the stream and goes straight to
+its retry/fallback path instead of paying for the rest of the completion.
+Each time another top-level field completes, `feed` returns the partial data
+recovered so far so progress UIs can show results as they arrive.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Set, Type
+
+from pydantic import BaseModel
+
+from .json_repair import close_unterminated_json, repair_json
+
+logger = logging.getLogger(__name__)
+
+
+# Allow a short preamble ("Here is the analysis:") before the JSON starts
+DEFAULT_MAX_PROSE_CHARS: int = 400
+
+_FENCE_MARKER_RE = re.compile(r"```[a-zA-Z0-9_-]*")
+
+
+class StreamDivergence:
+    """Reasons reported in `StreamingSchemaValidator.divergence`."""
+
+    PROSE_INSTEAD_OF_JSON = "prose_instead_of_json"
+    TOP_LEVEL_ARRAY = "top_level_array"
+    UNEXPECTED_TOP_LEVEL_KEY = "unexpected_top_level_key"
+
+
+def _model_field_names(model: Type[BaseModel]) -> Set[str]:
+    names: Set[str] = set()
+    for name, field_info in (getattr(model, "model_fields", {}) or {}).items():
+        names.add(name)
+        alias = getattr(field_info, "alias", None)
+        if alias:
+            names.add(alias)
+    return names
+
+
+class StreamingSchemaValidator:
+    """Incrementally scan streamed JSON against a Pydantic model's top-level shape."""
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        *,
+        max_prose_chars: int = DEFAULT_MAX_PROSE_CHARS,
+    ):
+        self.model = model
+        self.max_prose_chars = max_prose_chars
+        self.divergence: Optional[str] = None
+        self.completed_fields: List[str] = []
+
+        self._allowed_keys = _model_field_names(model)
+        self._buffer = ""
+        self._pos = 0
+        self._json_start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._expect_key = False
+        self._current_key: Optional[str] = None
+        self._seen_known_key = False
+        self._done = False
+
+    @property
+    def text(self) -> str:
+        return self._buffer
+
+    def feed(self, delta: str) -> Optional[Dict[str, Any]]:
+        """Consume a text delta.
+
+        Returns the partial data recovered so far when at least one new
+        top-level field completed in this delta, otherwise None. Check
+        `divergence` after each call.
+        """
+        if not delta or self.divergence or self._done:
+            self._buffer += delta or ""
+            return None
+        self._buffer += delta
+        completed_before = len(self.completed_fields)
+
+        if self._json_start == -1 and not self._find_json_start():
+            return None
+        self._scan()
+
+        if self.divergence is None and len(self.completed_fields) > completed_before:
+            return self.partial_data()
+        return None
+
+    def partial_data(self) -> Optional[Dict[str, Any]]:
+        """Best-effort parse of everything received so far."""
+        if self._json_start == -1:
+            return None
+        candidate, _, _ = close_unterminated_json(self._buffer[self._json_start :])
+        data = repair_json(candidate).data
+        return data if isinstance(data, dict) else None
+
+    def _find_json_start(self) -> bool:
+        brace = self._buffer.find("{")
+        bracket = self._buffer.find("[")
+        if bracket != -1 and (brace == -1 or bracket < brace):
+            # Only a bracket that opens the response counts as a top-level array;
+            # brackets inside a prose preamble are just text
+            if not _FENCE_MARKER_RE.sub("", self._buffer[:bracket]).strip():
+                self.divergence = StreamDivergence.TOP_LEVEL_ARRAY
+                return False
+        preamble_end = brace if brace != -1 else len(self._buffer)
+        prose = _FENCE_MARKER_RE.sub("", self._buffer[:preamble_end]).strip()
+        if len(prose) > self.max_prose_chars:
+            self.divergence = StreamDivergence.PROSE_INSTEAD_OF_JSON
+            return False
+        if brace == -1:
+            return False
+        self._json_start = brace
+        self._pos = brace
+        return True
+
+    def _complete_current_field(self) -> None:
+        if self._current_key is not None:
+            self.completed_fields.append(self._current_key)
+            self._current_key = None
+
+    def _scan(self) -> None:
+        buf = self._buffer
+        while self._pos < len(buf):
+            ch = buf[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        self._on_top_level_key(buf[self._string_start + 1 : self._pos])
+                        if self.divergence:
+                            return
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_current_field()
+                    self._done = True
+                    self._pos += 1
+                    return
+            elif ch == "," and self._depth == 1:
+                self._complete_current_field()
+                self._expect_key = True
+            elif ch == ":" and self._depth == 1:
+                self._expect_key = False
+            self._pos += 1
+
+    def _on_top_level_key(self, key: str) -> None:
+        self._current_key = key
+        if key in self._allowed_keys:
+            self._seen_known_key = True
+        elif not self._seen_known_key and self._allowed_keys:
+            self.divergence = f"{StreamDivergence.UNEXPECTED_TOP_LEVEL_KEY}:{key}"
+            logger.debug(
+                f"Stream for {self.model.__name__} diverged at first key '{key}'"
+            )
+
+
+__all__ = [
+    "DEFAULT_MAX_PROSE_CHARS",
+    "StreamDivergence",
+    "StreamingSchemaValidator",
+]
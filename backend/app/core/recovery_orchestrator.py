@@ -605,6 +605,9 @@ class RecoveryOrchestrator:
         # Sort by priority
         validated_plans.sort(key=lambda x: x[0].recovery_priority, reverse=True)
 
+        # Load args/kwargs for every task up front: one query, not one per task
+        await self._load_full_task_data_many([task for task, _ in validated_plans])
+
         # Process in small batches to avoid overwhelming system
         batch_size = 3
         for i in range(0, len(validated_plans), batch_size):
@@ -645,10 +648,7 @@ class RecoveryOrchestrator:
     ) -> RecoveryResult:
         """Recover a single task using specified strategy"""
         try:
-            # Load full task data
-            task = await self._load_full_task_data(task)
-
-            # Execute recovery strategy
+            # Execute recovery strategy (full task data loaded by the caller)
             result = await strategy.recover_task(task)
 
             # Update recovery queue if this was queued
@@ -666,11 +666,25 @@ class RecoveryOrchestrator:
 
     async def _load_full_task_data(self, task: RecoverableTask) -> RecoverableTask:
         """Load full task data including args and kwargs"""
+        await self._load_full_task_data_many([task])
+        return task
+
+    async def _load_full_task_data_many(self, tasks: List[RecoverableTask]) -> None:
+        """Load args, kwargs and context key for ``tasks`` in one query"""
         try:
             repo = RecoveryRepository()
-            row = await repo.get_task_registry_row(task.registry_id)
+            rows = await repo.get_task_registry_rows(
+                [task.registry_id for task in tasks]
+            )
+        except Exception as e:
+            logger.error(f"Failed to load full task data for {len(tasks)} tasks: {e}")
+            return
 
-            if row:
+        for task in tasks:
+            row = rows.get(str(task.registry_id))
+            if not row:
+                continue
+            try:
                 task.task_args = tuple(
                     json.loads(row["task_args"]) if row["task_args"] else []
                 )
@@ -678,12 +692,8 @@ class RecoveryOrchestrator:
                     json.loads(row["task_kwargs"]) if row["task_kwargs"] else {}
                 )
                 task.context_key = row["context_key"]
-
-            return task
-
-        except Exception as e:
-            logger.error(f"Failed to load full task data for {task.task_id}: {e}")
-            return task
+            except Exception as e:
+                logger.error(f"Failed to load full task data for {task.task_id}: {e}")
 
     async def _update_recovery_queue_success(
         self, task: RecoverableTask, result: RecoveryResult
@@ -0,0 +1,301 @@
+"""
+Lightweight span recorder for per-analysis timing traces.
+
+A trace is bound to one contract analysis with `trace_scope`; code inside it
+opens nested spans with `span(name, **attributes)`. Nesting follows the
+ContextVar that LangGraph propagates into every node, subflow and parallel
+branch, so each branch's spans hang off the node that started it.
+
+Spans are recorded by:
+
+- BaseNode: one span per node `execute` (`node:<name>`)
+- LLMNode: its stages (short-circuit / cache hit, context, prompt
+  rendering, generation, fallbacks, persistence)
+- track_llm_call: one span per provider call with model, tokens and outcome
+- the Step 2 / Step 3 / diagram subflow `execute` methods
+
+Outside a trace scope `span` is a no-op, and nothing here depends on
+LangSmith. Finished traces are kept briefly under a per-run key (content hash
+plus a random suffix, so concurrent runs on one contract stay apart); the
+analysis task reserves the key with `trace_run` and persists the trace
+through RunsRepository; `chrome_trace` converts a stored trace to Chrome
+trace-event JSON (chrome://tracing, Perfetto).
+"""
+
+import functools
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, UTC
+from itertools import count
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+# Bound memory for pathological runs (e.g. retry storms)
+MAX_SPANS_PER_TRACE = 5000
+
+# Finished traces waiting to be persisted by the analysis task
+MAX_PENDING_TRACES = 200
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start_us", "end_us", "attributes")
+
+    def __init__(
+        self,
+        name: str,
+        span_id: int,
+        parent_id: Optional[int],
+        start_us: int,
+        attributes: Dict[str, Any],
+    ):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_us = start_us
+        self.end_us: Optional[int] = None
+        self.attributes = attributes
+
+    def set(self, **attributes: Any) -> None:
+        """Attach attributes (model, tokens, cache_hit, ...) to the span."""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_us": self.start_us,
+            "end_us": self.end_us,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+    name = None
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class TraceRecorder:
+    """Collects the spans of one analysis."""
+
+    def __init__(self, trace_id: Optional[str] = None, run_key: Optional[str] = None):
+        self.trace_id = trace_id
+        self.run_key = run_key
+        self.started_at = datetime.now(UTC)
+        self.spans: List[Span] = []
+        self.dropped_spans = 0
+        self._origin = time.perf_counter()
+        self._ids = count(1)
+
+    def _now_us(self) -> int:
+        return int((time.perf_counter() - self._origin) * 1_000_000)
+
+    def start_span(
+        self, name: str, parent_id: Optional[int], attributes: Dict[str, Any]
+    ) -> Optional[Span]:
+        if len(self.spans) >= MAX_SPANS_PER_TRACE:
+            self.dropped_spans += 1
+            return None
+        span_ = Span(name, next(self._ids), parent_id, self._now_us(), attributes)
+        self.spans.append(span_)
+        return span_
+
+    def end_span(self, span_: Span) -> None:
+        span_.end_us = self._now_us()
+
+    def to_dict(self) -> Dict[str, Any]:
+        finished = [s for s in self.spans if s.end_us is not None]
+        return {
+            "trace_id": self.trace_id,
+            "run_key": self.run_key,
+            "started_at": self.started_at.isoformat(),
+            "duration_us": max((s.end_us for s in finished), default=0),
+            "span_count": len(finished),
+            "dropped_spans": self.dropped_spans,
+            "spans": [s.to_dict() for s in finished],
+        }
+
+
+_recorder: ContextVar[Optional[TraceRecorder]] = ContextVar(
+    "span_trace_recorder", default=None
+)
+_current_span: ContextVar[Optional[Span]] = ContextVar(
+    "span_trace_current", default=None
+)
+
+# Key reserved by `trace_run` for the next trace_scope in this context
+_run_key: ContextVar[Optional[str]] = ContextVar("span_trace_run_key", default=None)
+
+_finished_traces: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def new_run_key(trace_id: str) -> str:
+    return f"{trace_id}:{uuid4().hex}"
+
+
+@contextmanager
+def trace_run(trace_id: str) -> Iterator[str]:
+    """Reserve the key a trace recorded inside this block is kept under.
+
+    Yields the key to pass to `pop_finished_trace` once the run is done.
+    """
+    key = new_run_key(trace_id)
+    token = _run_key.set(key)
+    try:
+        yield key
+    finally:
+        _run_key.reset(token)
+
+
+def current_span():
+    """The innermost open span, or a no-op span outside a trace."""
+    return _current_span.get() or NOOP_SPAN
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Record a nested span; a no-op when no trace is active."""
+    recorder = _recorder.get()
+    if recorder is None:
+        yield NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    span_ = recorder.start_span(
+        name, parent.span_id if parent else None, dict(attributes)
+    )
+    if span_ is None:
+        yield NOOP_SPAN
+        return
+
+    token = _current_span.set(span_)
+    try:
+        yield span_
+    except BaseException as e:
+        span_.set(error=type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        recorder.end_span(span_)
+
+
+def traced(name: str):
+    """Decorator recording every call of an async function as a span."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+@contextmanager
+def trace_scope(trace_id: Optional[str] = None) -> Iterator[TraceRecorder]:
+    """Bind a new trace to the current analysis.
+
+    On exit the trace is kept until `pop_finished_trace`, under the key
+    reserved by an enclosing `trace_run` or else under a fresh run key
+    (``recorder.run_key``).
+    """
+    run_key = (_run_key.get() or new_run_key(trace_id)) if trace_id else None
+    recorder = TraceRecorder(trace_id, run_key)
+    recorder_token = _recorder.set(recorder)
+    span_token = _current_span.set(None)
+    try:
+        yield recorder
+    finally:
+        _current_span.reset(span_token)
+        _recorder.reset(recorder_token)
+        if run_key:
+            _finished_traces[run_key] = recorder.to_dict()
+            _finished_traces.move_to_end(run_key)
+            while len(_finished_traces) > MAX_PENDING_TRACES:
+                _finished_traces.popitem(last=False)
+
+
+def pop_finished_trace(run_key: str) -> Optional[Dict[str, Any]]:
+    """Take the finished trace recorded under ``run_key``."""
+    return _finished_traces.pop(run_key, None)
+
+
+def _assign_lanes(spans: List[Dict[str, Any]]) -> Dict[int, int]:
+    """Give every span a lane (Chrome thread) in which spans nest strictly.
+
+    Parallel branches overlap in time, so they are spread over extra lanes;
+    a span stays in its parent's lane whenever it fits there.
+    """
+    lanes: List[List[Dict[str, Any]]] = []  # stacks of open spans per lane
+    lane_of: Dict[int, int] = {}
+
+    def fits(stack: List[Dict[str, Any]], s: Dict[str, Any]) -> bool:
+        while stack and stack[-1]["end_us"] <= s["start_us"]:
+            stack.pop()
+        return not stack or stack[-1]["end_us"] >= s["end_us"]
+
+    for s in sorted(spans, key=lambda x: (x["start_us"], -x["end_us"])):
+        preferred = lane_of.get(s["parent_id"])
+        order = ([preferred] if preferred is not None else []) + [
+            i for i in range(len(lanes)) if i != preferred
+        ]
+        lane = next((i for i in order if fits(lanes[i], s)), None)
+        if lane is None:
+            lanes.append([])
+            lane = len(lanes) - 1
+        lanes[lane].append(s)
+        lane_of[s["span_id"]] = lane
+    return lane_of
+
+
+def chrome_trace(trace: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a stored trace (`TraceRecorder.to_dict`) to Chrome trace events."""
+    spans = trace.get("spans") or []
+    lane_of = _assign_lanes(spans)
+    events: List[Dict[str, Any]] = [
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": 1,
+            "args": {"name": f"analysis {trace.get('trace_id') or ''}".strip()},
+        }
+    ]
+    for s in spans:
+        events.append(
+            {
+                "name": s["name"],
+                "cat": s["name"].split(":", 1)[0],
+                "ph": "X",
+                "ts": s["start_us"],
+                "dur": s["end_us"] - s["start_us"],
+                "pid": 1,
+                "tid": lane_of[s["span_id"]] + 1,
+                "args": {
+                    **(s.get("attributes") or {}),
+                    "span_id": s["span_id"],
+                    "parent_id": s["parent_id"],
+                },
+            }
+        )
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {
+            "trace_id": trace.get("trace_id"),
+            "started_at": trace.get("started_at"),
+            "dropped_spans": trace.get("dropped_spans", 0),
+        },
+    }
@@ -338,6 +338,18 @@ async def task_auth_context(context_key: str, extend_ttl: bool = True):
         success = True
 
     finally:
+        # Write buffered progress while the user's auth context is still set
+        try:
+            user_id = AuthContext.get_user_id()
+            if user_id:
+                from app.services.progress_write_buffer import (
+                    get_progress_write_buffer,
+                )
+
+                await get_progress_write_buffer().flush_user(user_id)
+        except Exception as e:
+            logger.warning(f"Failed to flush buffered progress: {e}")
+
         # Clean up context
         AuthContext.clear_auth_context()
         if success:
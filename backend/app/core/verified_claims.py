@@ -0,0 +1,148 @@
+"""
+Process-local cache of verified user token claims.
+
+Every user connection acquire used to classify, verify and decode the
+request's JWT and serialise its claims for the RLS session GUCs. A Step 2
+fan-out acquires dozens of connections with the same token within seconds,
+so `_setup_user_session` now keeps the verified claims, already serialised,
+keyed by a digest of the token (the raw token is never stored).
+
+An entry lives for at most `db_verified_claims_cache_ttl_seconds` and never
+past the token's own `exp` minus `EXPIRY_MARGIN_SECONDS`, so the expiry and
+refresh handling in `_setup_user_session` still runs before a token lapses.
+Logout and token refresh call `invalidate_verified_claims`.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Entries stop being served this long before the token expires (the
+# Supabase expiry warning and backend refresh windows are 10 and 5 minutes)
+EXPIRY_MARGIN_SECONDS = 600
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 300
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass(frozen=True)
+class VerifiedClaims:
+    claims: Dict[str, Any]
+    claims_json: str
+    # Wall-clock time after which the claims must be verified again
+    expires_at: float
+
+
+class VerifiedClaimsCache:
+    """Bounded LRU of verified claims keyed by token digest."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, VerifiedClaims]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, token: str) -> Optional[VerifiedClaims]:
+        key = token_digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() >= entry.expires_at:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, token: str, claims: Dict[str, Any]) -> VerifiedClaims:
+        """Serialise freshly verified claims and cache them if still valid."""
+        now = time.time()
+        exp = claims.get("exp")
+        expires_at = now + self.ttl_seconds
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp - EXPIRY_MARGIN_SECONDS)
+        entry = VerifiedClaims(claims, json.dumps(claims), expires_at)
+        if self.ttl_seconds <= 0 or expires_at <= now:
+            return entry
+
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, token: str) -> bool:
+        with self._lock:
+            removed = self._entries.pop(token_digest(token), None) is not None
+            if removed:
+                self.invalidations += 1
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+_cache: Optional[VerifiedClaimsCache] = None
+
+
+def get_verified_claims_cache() -> VerifiedClaimsCache:
+    global _cache
+    if _cache is None:
+        try:
+            from app.core.config import get_settings
+
+            settings = get_settings()
+            _cache = VerifiedClaimsCache(
+                settings.db_verified_claims_cache_size,
+                settings.db_verified_claims_cache_ttl_seconds,
+            )
+        except Exception as e:
+            logger.warning(f"Using default verified claims cache settings: {e}")
+            _cache = VerifiedClaimsCache()
+    return _cache
+
+
+def reset_verified_claims_cache() -> None:
+    """Drop the process-wide cache (settings are re-read on next use)."""
+    global _cache
+    _cache = None
+
+
+def invalidate_verified_claims(*tokens: Optional[str]) -> None:
+    """Drop cached claims for tokens that were revoked or replaced."""
+    cache = get_verified_claims_cache()
+    for token in tokens:
+        if token:
+            cache.invalidate(token)
@@ -14,11 +14,135 @@ import logging
 
 from app.core.config import get_settings
 from app.core.auth_context import AuthContext
+from app.core.verified_claims import get_verified_claims_cache, token_digest
+from app.database import query_trace
+from app.database.pool_stats import AdaptivePoolSizer, PoolStats, pool_is_saturated
 from app.services.backend_token_service import BackendTokenService
 from app.clients.factory import get_service_supabase_client
 
 logger = logging.getLogger(__name__)
 
+# All RLS session GUCs in one round trip: claims, role, claim.sub
+SET_SESSION_CONTEXT_SQL = (
+    "SELECT set_config('request.jwt.claims', $1, false), "
+    "set_config('role', $2, false), "
+    "set_config('request.jwt.claim.sub', $3, false)"
+)
+SERVICE_ROLE_IDENTITY = "service_role"
+SERVICE_ROLE_CLAIMS_JSON = json.dumps({"role": "service_role"})
+ANON_IDENTITY = "anon"
+
+
+class RLSConnection(asyncpg.Connection):
+    """Pool connection that remembers which RLS identity its session carries.
+
+    Every acquire either finds the identity it needs already in place or
+    re-applies all session GUCs, so releasing the connection no longer has to
+    RESET ALL (the other release cleanup - advisory locks, cursors, LISTEN -
+    is kept).
+    """
+
+    rls_identity: Optional[str] = None
+    rls_identity_expires_at: Optional[float] = None
+
+    @property
+    def prepared_statements(self) -> Dict[str, Any]:
+        """Registered statements prepared on this connection (app/database/statements.py)."""
+        try:
+            return self._prepared_statements
+        except AttributeError:
+            self._prepared_statements: Dict[str, Any] = {}
+            return self._prepared_statements
+
+    # Every query is timed by app/database/query_trace.py
+
+    async def execute(self, query: str, *args, timeout: Optional[float] = None):
+        return await query_trace.observe(
+            query, args, "execute", super().execute(query, *args, timeout=timeout)
+        )
+
+    async def executemany(
+        self, command: str, args, *, timeout: Optional[float] = None
+    ):
+        return await query_trace.observe(
+            command,
+            (),
+            "executemany",
+            super().executemany(command, args, timeout=timeout),
+        )
+
+    async def fetch(self, query: str, *args, timeout=None, record_class=None):
+        return await query_trace.observe(
+            query,
+            args,
+            "fetch",
+            super().fetch(query, *args, timeout=timeout, record_class=record_class),
+        )
+
+    async def fetchrow(self, query: str, *args, timeout=None, record_class=None):
+        return await query_trace.observe(
+            query,
+            args,
+            "fetchrow",
+            super().fetchrow(query, *args, timeout=timeout, record_class=record_class),
+        )
+
+    async def fetchval(self, query: str, *args, column=0, timeout=None):
+        return await query_trace.observe(
+            query,
+            args,
+            "fetchval",
+            super().fetchval(query, *args, column=column, timeout=timeout),
+        )
+
+    def _get_reset_query(self):
+        if self._reset_query is None:
+            reset = super()._get_reset_query()
+            self._reset_query = "\n".join(
+                line for line in reset.splitlines() if line != "RESET ALL;"
+            )
+        return self._reset_query
+
+
+def unwrap_rls_connection(connection: Any) -> Optional[RLSConnection]:
+    """The RLSConnection behind a pool proxy (None for other connections)."""
+    raw = getattr(connection, "_con", connection)
+    return raw if isinstance(raw, RLSConnection) else None
+
+
+def _session_identity_matches(connection: Any, identity: str) -> bool:
+    raw = unwrap_rls_connection(connection)
+    if raw is None or raw.rls_identity != identity:
+        return False
+    expires_at = raw.rls_identity_expires_at
+    return expires_at is None or time.time() < expires_at
+
+
+def _user_session_identity(user_id: Any, user_token: str) -> str:
+    return f"authenticated:{user_id}:{token_digest(user_token)}"
+
+
+async def _apply_session_context(
+    connection: asyncpg.Connection,
+    identity: str,
+    role: str,
+    claims_json: Optional[str] = None,
+    sub: Optional[str] = None,
+    expires_at: Optional[float] = None,
+) -> None:
+    """Set claims, role and sub in a single statement and record the identity."""
+    raw = unwrap_rls_connection(connection)
+    if raw is not None:
+        # Unknown until the statement succeeds
+        raw.rls_identity = None
+    await connection.execute(
+        SET_SESSION_CONTEXT_SQL, claims_json, role, sub
+    )
+    if raw is not None:
+        raw.rls_identity = identity
+        raw.rls_identity_expires_at = expires_at
+    ConnectionPoolManager._metrics["session_setups"] += 1
+
 
 class UserPoolInfo:
     """Information about a user-specific connection pool"""
@@ -39,16 +163,35 @@ class ConnectionPoolManager:
 
     _service_pool: Optional[asyncpg.Pool] = None
     _user_pools: OrderedDict[UUID, UserPoolInfo] = OrderedDict()
-    # Pools must be used only with the event loop they were created with.
-    # We bind pools to a specific loop id and recreate them if the loop changes.
+    # Loop affinity contract: pools must be used only with the event loop they
+    # were created with. Callers (API handlers, Celery tasks, the analysis
+    # workflow) run all DB work on a single loop per process/task; pools are
+    # bound to that loop id and recreated if the loop changes. A rebind closes
+    # every pool, so it should only happen between tasks - `_loop_rebinds`
+    # makes unexpected loop hops visible in get_metrics().
     _loop_id: Optional[int] = None
+    _loop_rebinds: int = 0
     _pool_lock: Optional[asyncio.Lock] = None
     _metrics: Dict[str, int] = {
         "active_user_pools": 0,
         "evictions": 0,
         "pool_hits": 0,
         "pool_misses": 0,
+        "session_setups": 0,
+        "session_reuses": 0,
     }
+    # Acquire/saturation/churn statistics per pool kind (see pool_stats.py)
+    _pool_stats: Dict[str, PoolStats] = {
+        "service": PoolStats("service"),
+        "per_user": PoolStats("per_user"),
+    }
+    _adaptive_sizer: Optional[AdaptivePoolSizer] = None
+
+    @classmethod
+    def _reset_metrics(cls) -> None:
+        cls._metrics = {key: 0 for key in cls._metrics}
+        cls._pool_stats = {name: PoolStats(name) for name in cls._pool_stats}
+        cls._adaptive_sizer = None
 
     @classmethod
     def _ensure_loop_bound(cls) -> None:
@@ -67,18 +210,18 @@ class ConnectionPoolManager:
             return
 
         if cls._loop_id != current_loop_id:
+            cls._loop_rebinds += 1
+            logger.warning(
+                "Connection pools rebinding to a new event loop "
+                f"(rebind #{cls._loop_rebinds}); existing pools will be closed"
+            )
             # Event loop changed; make existing pools unavailable immediately to avoid races
             # Capture references for background close, then null out class refs synchronously
             old_service_pool = cls._service_pool
             old_user_pools = list(cls._user_pools.values())
             cls._service_pool = None
             cls._user_pools.clear()
-            cls._metrics = {
-                "active_user_pools": 0,
-                "evictions": 0,
-                "pool_hits": 0,
-                "pool_misses": 0,
-            }
+            cls._reset_metrics()
 
             async def _close_captured():
                 try:
@@ -119,11 +262,33 @@ class ConnectionPoolManager:
             settings = get_settings()
             dsn = cls._get_database_dsn()
 
+            stats = cls._pool_stats["service"]
+            sizing: Dict[str, Any] = {"min_size": 1, "max_size": 10}
+            if settings.db_pool_mode == "adaptive":
+                cls._adaptive_sizer = AdaptivePoolSizer(
+                    settings.db_adaptive_pool_min_size,
+                    settings.db_adaptive_pool_max_size,
+                    settings.db_adaptive_pool_headroom,
+                )
+                sizing = {
+                    "min_size": cls._adaptive_sizer.min_size,
+                    "max_size": cls._adaptive_sizer.max_size,
+                    "max_inactive_connection_lifetime": settings.db_adaptive_pool_idle_seconds,
+                }
+
             try:
                 cls._service_pool = await asyncpg.create_pool(
-                    dsn, min_size=1, max_size=10, command_timeout=60
+                    dsn,
+                    command_timeout=60,
+                    connection_class=RLSConnection,
+                    init=stats.on_connection_opened,
+                    **sizing,
+                )
+                stats.pools_created += 1
+                logger.info(
+                    "Service role connection pool created",
+                    extra={"pool_mode": settings.db_pool_mode, **sizing},
                 )
-                logger.info("Service role connection pool created")
             except Exception as e:
                 logger.error(f"Failed to create service role connection pool: {e}")
                 raise
@@ -174,7 +339,10 @@ class ConnectionPoolManager:
                     min_size=settings.db_user_pool_min_size,
                     max_size=settings.db_user_pool_max_size,
                     command_timeout=60,
+                    connection_class=RLSConnection,
+                    init=cls._pool_stats["per_user"].on_connection_opened,
                 )
+                cls._pool_stats["per_user"].pools_created += 1
 
                 pool_info = UserPoolInfo(pool, user_id)
                 cls._user_pools[user_id] = pool_info
@@ -221,6 +389,7 @@ class ConnectionPoolManager:
             pool_info = cls._user_pools.pop(user_id)
             try:
                 await pool_info.pool.close()
+                cls._pool_stats["per_user"].pools_closed += 1
                 cls._metrics["evictions"] += 1
                 cls._metrics["active_user_pools"] = len(cls._user_pools)
                 logger.info(f"Evicted connection pool for user {user_id}")
@@ -294,12 +463,7 @@ class ConnectionPoolManager:
             if pools_to_close:
                 await asyncio.gather(*pools_to_close, return_exceptions=True)
 
-            cls._metrics = {
-                "active_user_pools": 0,
-                "evictions": 0,
-                "pool_hits": 0,
-                "pool_misses": 0,
-            }
+            cls._reset_metrics()
             # Reset loop binding to allow rebind on next use
             cls._loop_id = None
             logger.info("All connection pools closed")
@@ -308,7 +472,71 @@ class ConnectionPoolManager:
     def get_metrics(cls) -> Dict[str, int]:
         """Get connection pool metrics"""
         cls._metrics["active_user_pools"] = len(cls._user_pools)
-        return cls._metrics.copy()
+        metrics = cls._metrics.copy()
+        metrics["loop_rebinds"] = cls._loop_rebinds
+        return metrics
+
+    @classmethod
+    def _stats_for(cls, pool: asyncpg.Pool) -> PoolStats:
+        if pool is cls._service_pool:
+            return cls._pool_stats["service"]
+        return cls._pool_stats["per_user"]
+
+    @classmethod
+    async def acquire(cls, pool: asyncpg.Pool) -> asyncpg.Connection:
+        """Acquire from ``pool``, recording wait time, saturation and concurrency."""
+        stats = cls._stats_for(pool)
+        saturated = pool_is_saturated(pool)
+        started = time.perf_counter()
+        try:
+            with query_trace.acquire_span(stats.name):
+                connection = await pool.acquire()
+        except Exception:
+            stats.acquire_errors += 1
+            raise
+        stats.record_acquire(time.perf_counter() - started, saturated)
+        if cls._adaptive_sizer is not None and pool is cls._service_pool:
+            cls._adaptive_sizer.observe(stats.in_use)
+            cls._adaptive_sizer.maybe_prewarm(pool)
+        return connection
+
+    @classmethod
+    async def release(cls, pool: asyncpg.Pool, connection: asyncpg.Connection):
+        """Release a connection obtained with `acquire`."""
+        cls._stats_for(pool).record_release()
+        await pool.release(connection)
+
+    @classmethod
+    def get_pool_stats(cls) -> Dict[str, Any]:
+        """Acquire wait, saturation, concurrency and churn per pool kind."""
+        service = cls._pool_stats["service"].snapshot()
+        if cls._service_pool is not None:
+            service["pool"] = {
+                "size": cls._service_pool.get_size(),
+                "idle": cls._service_pool.get_idle_size(),
+                "max_size": cls._service_pool.get_max_size(),
+            }
+        per_user = cls._pool_stats["per_user"].snapshot()
+        per_user["pool"] = {
+            "pools": len(cls._user_pools),
+            "size": sum(info.pool.get_size() for info in cls._user_pools.values()),
+            "idle": sum(
+                info.pool.get_idle_size() for info in cls._user_pools.values()
+            ),
+        }
+        stats: Dict[str, Any] = {
+            "pool_mode": get_settings().db_pool_mode,
+            "service": service,
+            "per_user": per_user,
+        }
+        if cls._adaptive_sizer is not None:
+            stats["adaptive"] = cls._adaptive_sizer.snapshot()
+        return stats
+
+    @classmethod
+    def bound_loop_id(cls) -> Optional[int]:
+        """Id of the event loop the pools are currently bound to, if any."""
+        return cls._loop_id
 
 
 async def _setup_user_session(
@@ -339,7 +567,26 @@ async def _setup_user_session(
                 logger.warning(
                     f"No user token available for user {user_id} - setting anonymous role"
                 )
-                await connection.execute("SELECT set_config('role', $1, false)", "anon")
+                await _apply_session_context(connection, ANON_IDENTITY, "anon")
+                return
+
+            # The connection already carries this user's verified claims
+            identity = _user_session_identity(user_id, user_token)
+            if _session_identity_matches(connection, identity):
+                ConnectionPoolManager._metrics["session_reuses"] += 1
+                return
+
+            # Claims verified by an earlier acquire with the same token
+            verified = get_verified_claims_cache().get(user_token)
+            if verified is not None:
+                await _apply_session_context(
+                    connection,
+                    identity,
+                    "authenticated",
+                    claims_json=verified.claims_json,
+                    sub=str(user_id),
+                    expires_at=verified.expires_at,
+                )
                 return
 
             # Enhanced token analysis and logging
@@ -680,14 +927,15 @@ async def _setup_user_session(
                     "connection_id": id(connection),
                 },
             )
-            await connection.execute(
-                "SELECT set_config('request.jwt.claims', $1, false)", json.dumps(claims)
-            )
-            await connection.execute(
-                "SELECT set_config('role', $1, false)", "authenticated"
-            )
-            await connection.execute(
-                "SELECT set_config('request.jwt.claim.sub', $1, false)", str(user_id)
+            verified = get_verified_claims_cache().put(user_token, claims)
+            await _apply_session_context(
+                connection,
+                # Keyed by the token actually verified (it may have been refreshed)
+                _user_session_identity(user_id, user_token),
+                "authenticated",
+                claims_json=verified.claims_json,
+                sub=str(user_id),
+                expires_at=verified.expires_at,
             )
 
             logger.debug(f"Set user session context for user {user_id}")
@@ -723,35 +971,43 @@ async def _setup_user_session(
             ):
                 raise
 
-            # Safe fallback: attempt anon role; ignore any failures, then re-raise
-            try:
-                await connection.execute("SELECT set_config('role', $1, false)", "anon")
-            except Exception:
-                pass
+            # Safe fallback: drop to anon; failures are logged, then re-raise
+            await _reset_session_gucs(connection)
             # Re-raise to let caller handle/retry
             raise
     else:
         # No user context - set anonymous role
+        if _session_identity_matches(connection, ANON_IDENTITY):
+            ConnectionPoolManager._metrics["session_reuses"] += 1
+            return
         try:
-            await connection.execute("SELECT set_config('role', $1, false)", "anon")
-        except Exception:
-            pass
+            await _apply_session_context(connection, ANON_IDENTITY, "anon")
+        except Exception as e:
+            logger.error(
+                f"Failed to set anon session context: {e}",
+                extra={
+                    "connection_id": id(connection),
+                    "error_type": type(e).__name__,
+                },
+            )
+            await _reset_session_gucs(connection)
+            # Whatever the reset did, the session must be re-applied on reuse
+            raw = unwrap_rls_connection(connection)
+            if raw is not None:
+                raw.rls_identity = None
+            raise
 
 
 async def _reset_session_gucs(connection: asyncpg.Connection):
     """
-    Reset session GUCs to prevent claim bleed-over in shared pools.
+    Drop the session to anon with no claims (after a failed session setup).
 
     Args:
         connection: Database connection
     """
     try:
         logger.debug("[DB] Resetting session GUCs to anon")
-        await connection.execute("SELECT set_config('request.jwt.claims', NULL, false)")
-        await connection.execute("SELECT set_config('role', 'anon', false)")
-        await connection.execute(
-            "SELECT set_config('request.jwt.claim.sub', NULL, false)"
-        )
+        await _apply_session_context(connection, ANON_IDENTITY, "anon")
     except Exception as e:
         logger.error(f"Failed to reset session GUCs: {e}")
 
@@ -762,14 +1018,18 @@ async def _setup_service_session(connection: asyncpg.Connection):
 
     Supabase RLS policies often check auth.jwt()->>'role' = 'service_role'. When
     connecting directly to Postgres (asyncpg), we must set the same GUCs that
-    PostgREST would set.
+    PostgREST would set. Skipped when the connection already carries them.
     """
+    if _session_identity_matches(connection, SERVICE_ROLE_IDENTITY):
+        ConnectionPoolManager._metrics["session_reuses"] += 1
+        return
     try:
-        claims = {"role": "service_role"}
-        await connection.execute(
-            "SELECT set_config('request.jwt.claims', $1, false)", json.dumps(claims)
+        await _apply_session_context(
+            connection,
+            SERVICE_ROLE_IDENTITY,
+            "service_role",
+            claims_json=SERVICE_ROLE_CLAIMS_JSON,
         )
-        await connection.execute("SELECT set_config('role', $1, false)", "service_role")
         logger.debug("Set service-role session context for connection")
     except Exception as e:
         logger.error(f"Failed to set service session context: {e}")
@@ -784,7 +1044,7 @@ async def get_service_role_connection() -> AsyncGenerator[asyncpg.Connection, No
         AsyncContextManager[asyncpg.Connection] with service role privileges
     """
     pool = await ConnectionPoolManager.get_service_pool()
-    connection = await pool.acquire()
+    connection = await ConnectionPoolManager.acquire(pool)
     logger.debug("[DB] Acquired service-role connection from pool")
 
     try:
@@ -793,7 +1053,7 @@ async def get_service_role_connection() -> AsyncGenerator[asyncpg.Connection, No
         yield connection
     finally:
         try:
-            await pool.release(connection)
+            await ConnectionPoolManager.release(pool, connection)
             logger.debug("[DB] Released service-role connection back to pool")
         except (RuntimeError, Exception) as e:
             logger.error(f"Failed to release service role connection: {e}")
@@ -833,7 +1093,7 @@ async def get_user_connection(
             raise ValueError("No user ID provided and none in auth context")
 
     pool = await ConnectionPoolManager.get_user_pool(user_id)
-    connection = await pool.acquire()
+    connection = await ConnectionPoolManager.acquire(pool)
     logger.debug(
         "[DB] Acquired user connection",
         extra={"user_id": str(user_id), "pool_mode": settings.db_pool_mode},
@@ -850,21 +1110,11 @@ async def get_user_connection(
         )
         raise
     finally:
-        try:
-            # Check if we can still run async operations
-            try:
-                # Reset GUCs in shared mode to prevent bleed-over
-                if settings.db_pool_mode == "shared":
-                    await _reset_session_gucs(connection)
-            except (RuntimeError, Exception) as e:
-                # Event loop might be closed or other async context issues
-                logger.warning(f"Failed to reset session GUCs for user {user_id}: {e}")
-        except Exception as e:
-            logger.warning(f"Error in GUC cleanup for user {user_id}: {e}")
-
+        # No GUC reset on release: every acquire re-establishes (or verifies)
+        # the identity it needs, so claims cannot bleed into the next caller
         try:
             # Attempt to release connection gracefully
-            await pool.release(connection)
+            await ConnectionPoolManager.release(pool, connection)
             logger.debug(
                 "[DB] Released user connection",
                 extra={"user_id": str(user_id), "pool_mode": settings.db_pool_mode},
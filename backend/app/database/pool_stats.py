@@ -0,0 +1,221 @@
+"""
+Connection pool statistics and adaptive shared-pool sizing.
+
+`PoolStats` is kept per pool kind by `ConnectionPoolManager` ("service" for
+the shared/service-role pool, "per_user" aggregated over all per-user pools):
+
+- acquire wait time (running max/mean plus a recent window for percentiles)
+- saturation: acquires that found no idle connection in a pool already at
+  its max size, i.e. had to queue behind other requests
+- concurrency: connections currently checked out and the peak
+- churn: pools created/closed and physical connections opened
+
+`AdaptivePoolSizer` backs `db_pool_mode = "adaptive"`. The shared pool is
+created with `db_adaptive_pool_max_size` as its hard cap and closes idle
+connections after `db_adaptive_pool_idle_seconds`; the sizer keeps a sliding
+window of observed concurrency and, when its p95 plus headroom exceeds the
+connections the pool has open, pre-warms the difference in the background so
+a burst does not pay connection setup on the request path.
+
+Pre-warming only runs while the pool has no idle connection, so every
+connection it holds is a freshly opened one rather than one a request could
+have used, and it opens at most `PREWARM_MAX_CONNECTIONS` per check.
+Connections it opens are counted separately from request-driven churn.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Recent acquire waits kept for percentiles
+WAIT_WINDOW = 512
+
+# Concurrency samples older than this do not influence the target size
+CONCURRENCY_WINDOW_SECONDS = 60.0
+# Minimum spacing between pre-warm checks
+PREWARM_CHECK_INTERVAL_SECONDS = 5.0
+PREWARM_ACQUIRE_TIMEOUT_SECONDS = 5.0
+# Connections opened per pre-warm check at most
+PREWARM_MAX_CONNECTIONS = 2
+
+# Set while a pre-warm is opening connections (read by the init hook)
+_prewarming: ContextVar[bool] = ContextVar("pool_prewarming", default=False)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class PoolStats:
+    """Acquire, saturation and churn counters for one kind of pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.acquires = 0
+        self.acquire_errors = 0
+        self.saturated_acquires = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.pools_created = 0
+        self.pools_closed = 0
+        self.connections_opened = 0
+        self.prewarmed_connections = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._waits: Deque[float] = deque(maxlen=WAIT_WINDOW)
+
+    def record_acquire(self, wait_seconds: float, saturated: bool) -> None:
+        self.acquires += 1
+        self.saturated_acquires += int(saturated)
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        self._waits.append(wait_seconds)
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def record_release(self) -> None:
+        self.in_use = max(0, self.in_use - 1)
+
+    async def on_connection_opened(self, connection: Any) -> None:
+        """asyncpg `init` hook: runs once per new physical connection."""
+        if _prewarming.get():
+            self.prewarmed_connections += 1
+        else:
+            self.connections_opened += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+        return {
+            "acquires": self.acquires,
+            "acquire_errors": self.acquire_errors,
+            "saturated_acquires": self.saturated_acquires,
+            "saturation_ratio": round(
+                self.saturated_acquires / self.acquires if self.acquires else 0.0, 3
+            ),
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "acquire_wait_ms": {
+                "mean": round(
+                    (self.total_wait_seconds / self.acquires if self.acquires else 0.0)
+                    * 1000,
+                    3,
+                ),
+                "p50": round(_percentile(waits, 0.5) * 1000, 3),
+                "p95": round(_percentile(waits, 0.95) * 1000, 3),
+                "max": round(self.max_wait_seconds * 1000, 3),
+            },
+            "pools_created": self.pools_created,
+            "pools_closed": self.pools_closed,
+            "connections_opened": self.connections_opened,
+            "prewarmed_connections": self.prewarmed_connections,
+        }
+
+
+def pool_is_saturated(pool: Any) -> bool:
+    """No idle connection and no room to open one: the acquire will queue."""
+    try:
+        return pool.get_idle_size() == 0 and pool.get_size() >= pool.get_max_size()
+    except Exception:
+        return False
+
+
+class AdaptivePoolSizer:
+    """Keeps the shared pool warm at the concurrency it has recently seen."""
+
+    def __init__(self, min_size: int, max_size: int, headroom: float = 1.25):
+        self.min_size = max(1, int(min_size))
+        self.max_size = max(self.min_size, int(max_size))
+        self.headroom = max(1.0, float(headroom))
+        self._samples: Deque[Tuple[float, int]] = deque()
+        self._last_check = 0.0
+        self._prewarm_task: Optional[asyncio.Task] = None
+        self.prewarms = 0
+        self.prewarmed_connections = 0
+
+    def observe(self, in_use: int, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._samples.append((now, in_use))
+        cutoff = now - CONCURRENCY_WINDOW_SECONDS
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+    def target_size(self) -> int:
+        observed = sorted(in_use for _, in_use in self._samples)
+        p95 = _percentile(observed, 0.95)
+        target = math.ceil(p95 * self.headroom)
+        return min(self.max_size, max(self.min_size, target))
+
+    def maybe_prewarm(self, pool: Any) -> None:
+        """Schedule a background pre-warm if the pool is below target."""
+        now = time.monotonic()
+        if now - self._last_check < PREWARM_CHECK_INTERVAL_SECONDS:
+            return
+        self._last_check = now
+        if self._prewarm_task is not None and not self._prewarm_task.done():
+            return
+        try:
+            open_connections = pool.get_size()
+            idle_connections = pool.get_idle_size()
+        except Exception:
+            return
+        target = self.target_size()
+        if target > open_connections and idle_connections == 0:
+            self._prewarm_task = asyncio.get_running_loop().create_task(
+                self._prewarm(pool, target)
+            )
+
+    async def _prewarm(self, pool: Any, target: int) -> None:
+        # With no idle connection every acquire opens a new one; holding them
+        # together makes the pool grow, then they go back as idle connections
+        before = pool.get_size()
+        if pool.get_idle_size():
+            return
+        holding = min(
+            PREWARM_MAX_CONNECTIONS, target - before, pool.get_max_size() - before
+        )
+        if holding <= 0:
+            return
+        token = _prewarming.set(True)
+        try:
+            results = await asyncio.gather(
+                *(
+                    pool.acquire(timeout=PREWARM_ACQUIRE_TIMEOUT_SECONDS)
+                    for _ in range(holding)
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            _prewarming.reset(token)
+        for result in results:
+            if isinstance(result, BaseException):
+                continue
+            try:
+                await pool.release(result)
+            except Exception as e:
+                logger.warning(f"Failed to release pre-warmed connection: {e}")
+        opened = max(0, pool.get_size() - before)
+        self.prewarms += 1
+        self.prewarmed_connections += opened
+        logger.debug(
+            f"Pre-warmed shared pool to {pool.get_size()} connections "
+            f"(target {target}, opened {opened})"
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "headroom": self.headroom,
+            "target_size": self.target_size(),
+            "samples": len(self._samples),
+            "prewarms": self.prewarms,
+            "prewarmed_connections": self.prewarmed_connections,
+        }
@@ -0,0 +1,257 @@
+"""
+Query tracing for pooled database connections.
+
+Every query run on an `RLSConnection` (repository calls on
+`get_user_connection`/`get_service_role_connection`, the `*_raw_sql`
+helpers) and every registered statement (app/database/statements.py) is
+observed here:
+
+- per-fingerprint latency histogram, call/error counts and rows returned;
+  the fingerprint is the query text with literals replaced by `?` and
+  whitespace collapsed, so one query shape is one entry
+- a ring buffer of the most recent queries slower than
+  `db_slow_query_threshold_ms`, with parameters redacted to their types
+- with `db_query_trace_spans`, a `db:query` span (and `db:acquire` for pool
+  waits) on the active per-analysis trace (app/core/span_trace.py), so a
+  stored trace shows which repository calls dominate an analysis
+
+Served at /metrics/database/queries and /metrics/database/slow-queries.
+"""
+
+import functools
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, UTC
+from typing import Any, Awaitable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.span_trace import NOOP_SPAN, span
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    1,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    float("inf"),
+)
+
+# Distinct fingerprints tracked; later shapes are counted under OTHER_FINGERPRINT
+MAX_FINGERPRINTS = 500
+OTHER_FINGERPRINT = "<other>"
+
+# Query text kept in slow-query entries and span attributes
+MAX_QUERY_TEXT = 500
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*(?:\?|\$\d+)(?:\s*,\s*(?:\?|\$\d+))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(query: str) -> str:
+    """Normalise ``query`` so that calls differing only in literals match."""
+    text = _COMMENT.sub(" ", query)
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _IN_LIST.sub("(?)", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _redact(value: Any) -> str:
+    """Type (and size) of a parameter, never its value."""
+    kind = type(value).__name__
+    if value is None:
+        return "null"
+    if isinstance(value, (str, bytes, list, tuple, dict)):
+        return f"{kind}[{len(value)}]"
+    return kind
+
+
+def _row_count(method: str, result: Any) -> int:
+    if result is None:
+        return 0
+    if method == "fetch":
+        return len(result)
+    if method == "execute" and isinstance(result, str):
+        # Command status, e.g. "UPDATE 3" / "INSERT 0 1"
+        last = result.rsplit(" ", 1)[-1]
+        return int(last) if last.isdigit() else 0
+    if method in ("fetchrow", "fetchval"):
+        return 1
+    return 0
+
+
+class QueryStats:
+    """Latency histogram and counters for one query fingerprint."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+        self.statement: Optional[str] = None
+
+    def record(self, seconds: float, rows: int, failed: bool) -> None:
+        self.calls += 1
+        self.errors += int(failed)
+        self.rows += rows
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        elapsed_ms = seconds * 1000
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[index] += 1
+                break
+
+    def _quantile_ms(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the quantile (max for the last)."""
+        target = fraction * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= target and count:
+                return bound if bound != float("inf") else self.max_seconds * 1000
+        return self.max_seconds * 1000
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "statement": self.statement,
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "mean_ms": round(
+                (self.total_seconds / self.calls if self.calls else 0.0) * 1000, 3
+            ),
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "p50_ms": round(self._quantile_ms(0.5), 3),
+            "p95_ms": round(self._quantile_ms(0.95), 3),
+            "p99_ms": round(self._quantile_ms(0.99), 3),
+            "histogram_ms": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)
+            },
+        }
+
+
+_lock = threading.Lock()
+_stats: Dict[str, QueryStats] = {}
+_slow_queries: Deque[Dict[str, Any]] = deque(
+    maxlen=get_settings().db_slow_query_log_size
+)
+
+
+def _stats_for(key: str) -> QueryStats:
+    stats = _stats.get(key)
+    if stats is None:
+        if len(_stats) >= MAX_FINGERPRINTS:
+            key = OTHER_FINGERPRINT
+        stats = _stats.setdefault(key, QueryStats())
+    return stats
+
+
+def record_query(
+    query: str,
+    args: tuple,
+    seconds: float,
+    rows: int,
+    error: Optional[BaseException] = None,
+    statement: Optional[str] = None,
+) -> None:
+    """Add one execution to its fingerprint and, if slow, to the slow-query log."""
+    settings = get_settings()
+    key = fingerprint(query)
+    with _lock:
+        stats = _stats_for(key)
+        stats.statement = statement or stats.statement
+        stats.record(seconds, rows, error is not None)
+        if seconds * 1000 >= settings.db_slow_query_threshold_ms:
+            _slow_queries.append(
+                {
+                    "at": datetime.now(UTC).isoformat(),
+                    "fingerprint": key[:MAX_QUERY_TEXT],
+                    "statement": statement,
+                    "duration_ms": round(seconds * 1000, 3),
+                    "rows": rows,
+                    "params": [_redact(arg) for arg in args],
+                    "error": type(error).__name__ if error else None,
+                }
+            )
+
+
+def _trace_span(name: str, **attributes: Any):
+    if get_settings().db_query_trace_spans:
+        return span(name, **attributes)
+    return nullcontext(NOOP_SPAN)
+
+
+@contextmanager
+def acquire_span(pool: str) -> Iterator[Any]:
+    """`db:acquire` span around a pool acquire (when trace spans are enabled)."""
+    with _trace_span("db:acquire", pool=pool) as span_:
+        yield span_
+
+
+async def observe(
+    query: str,
+    args: tuple,
+    method: str,
+    call: Awaitable[Any],
+    statement: Optional[str] = None,
+) -> Any:
+    """Await ``call`` (the query execution) and record its timing and rows."""
+    if not get_settings().db_query_tracing_enabled:
+        return await call
+
+    with _trace_span(
+        "db:query", fingerprint=fingerprint(query)[:MAX_QUERY_TEXT], statement=statement
+    ) as span_:
+        started = time.perf_counter()
+        try:
+            result = await call
+        except BaseException as e:
+            record_query(query, args, time.perf_counter() - started, 0, e, statement)
+            raise
+        rows = _row_count(method, result)
+        record_query(query, args, time.perf_counter() - started, rows, None, statement)
+        span_.set(rows=rows)
+        return result
+
+
+def get_query_stats(limit: int = 50) -> List[Dict[str, Any]]:
+    """Fingerprints by total time spent, heaviest first."""
+    with _lock:
+        ranked = sorted(
+            _stats.items(), key=lambda item: item[1].total_seconds, reverse=True
+        )[:limit]
+        return [
+            {"fingerprint": key[:MAX_QUERY_TEXT], **stats.snapshot()}
+            for key, stats in ranked
+        ]
+
+
+def get_slow_queries() -> List[Dict[str, Any]]:
+    """Recent slow queries, newest first."""
+    with _lock:
+        return list(reversed(_slow_queries))
+
+
+def reset_query_stats() -> None:
+    with _lock:
+        _stats.clear()
+        _slow_queries.clear()
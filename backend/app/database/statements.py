@@ -0,0 +1,140 @@
+"""
+Registered hot queries, prepared once per pooled connection.
+
+Repositories register their hot queries under a stable name
+(`register_statement`) and run them with `fetch`/`fetchrow`/`fetchval`. On a
+pooled `RLSConnection` the statement is prepared on first use and the
+`PreparedStatement` is kept on the connection, so later calls skip both the
+parse/plan round trip and asyncpg's statement-cache lookup by query text.
+Queries must therefore be fixed strings: one registered name per shape
+rather than SQL assembled per call.
+
+If the schema changes under a prepared statement, Postgres rejects it
+(`InvalidCachedStatementError`); the statement is re-prepared once and the
+call retried. Other connections (mocks, plain asyncpg connections) run the
+registered SQL directly.
+
+Each registered name keeps execution counts and timings
+(`get_statement_stats`, served at /metrics/database/statements); executions
+are also traced by app/database/query_trace.py under the statement name.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import asyncpg
+
+from app.database import query_trace
+from app.database.connection import unwrap_rls_connection
+
+logger = logging.getLogger(__name__)
+
+_statements: Dict[str, str] = {}
+
+
+class StatementStats:
+    """Execution counters for one registered statement."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.prepares = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float, failed: bool) -> None:
+        self.calls += 1
+        self.errors += int(failed)
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "prepares": self.prepares,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "mean_ms": round(
+                (self.total_seconds / self.calls if self.calls else 0.0) * 1000, 3
+            ),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+_stats: Dict[str, StatementStats] = {}
+
+
+def register_statement(name: str, sql: str) -> str:
+    """Register ``sql`` under ``name`` (idempotent); returns the name."""
+    existing = _statements.get(name)
+    if existing is not None and existing != sql:
+        raise ValueError(f"Statement {name} is already registered with other SQL")
+    _statements[name] = sql
+    _stats.setdefault(name, StatementStats())
+    return name
+
+
+def get_statement_sql(name: str) -> str:
+    try:
+        return _statements[name]
+    except KeyError:
+        raise ValueError(f"Unknown statement: {name}") from None
+
+
+async def _prepared(connection: Any, name: str, refresh: bool = False) -> Optional[Any]:
+    raw = unwrap_rls_connection(connection)
+    if raw is None:
+        return None
+    cache = raw.prepared_statements
+    statement = None if refresh else cache.get(name)
+    if statement is None:
+        statement = await raw.prepare(get_statement_sql(name))
+        cache[name] = statement
+        _stats[name].prepares += 1
+    return statement
+
+
+async def _run(connection: Any, name: str, method: str, args: tuple) -> Any:
+    sql = get_statement_sql(name)
+    started = time.perf_counter()
+    failed = True
+    try:
+        statement = await _prepared(connection, name)
+        target = connection if statement is None else statement
+        call_args = args if statement is not None else (sql, *args)
+        try:
+            result = await query_trace.observe(
+                sql, args, method, getattr(target, method)(*call_args), statement=name
+            )
+        except asyncpg.exceptions.InvalidCachedStatementError:
+            if statement is None:
+                raise
+            logger.info(f"Re-preparing statement {name} after schema change")
+            statement = await _prepared(connection, name, refresh=True)
+            result = await query_trace.observe(
+                sql, args, method, getattr(statement, method)(*args), statement=name
+            )
+        failed = False
+        return result
+    finally:
+        _stats[name].record(time.perf_counter() - started, failed)
+
+
+async def fetch(connection: Any, name: str, *args: Any) -> list:
+    return await _run(connection, name, "fetch", args)
+
+
+async def fetchrow(connection: Any, name: str, *args: Any) -> Any:
+    return await _run(connection, name, "fetchrow", args)
+
+
+async def fetchval(connection: Any, name: str, *args: Any) -> Any:
+    return await _run(connection, name, "fetchval", args)
+
+
+def get_statement_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-statement execution counts and timings (only statements that ran)."""
+    return {
+        name: stats.snapshot() for name, stats in sorted(_stats.items()) if stats.calls
+    }
@@ -13,6 +13,7 @@ from app.schema.auth import (
 )
 from app.core.error_handler import handle_api_error, create_error_context, ErrorCategory
 from app.core.config import get_settings
+from app.core.verified_claims import invalidate_verified_claims
 from app.services.backend_token_service import BackendTokenService
 
 logger = logging.getLogger(__name__)
@@ -226,6 +227,11 @@ async def logout_user(
     try:
         logger.info("User logout attempt")
 
+        # Stop reusing the session's verified claims for DB connections
+        from app.core.auth_context import AuthContext
+
+        invalidate_verified_claims(current_token, AuthContext.get_user_token())
+
         # Sign out from Supabase (this invalidates the refresh token)
         db_client.auth.sign_out()
 
@@ -1,6 +1,6 @@
 """Contract analysis router with cache-first strategy and enhanced error handling."""
 
-from typing import Dict, List, Optional, Union, TypedDict, Any
+from typing import Dict, List, Optional, Union, TypedDict, Any, Awaitable, Callable
 from uuid import UUID
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Body, Query
 from fastapi.responses import JSONResponse
@@ -25,6 +25,7 @@ from app.clients.supabase.client import SupabaseClient
 from app.services.repositories.analyses_repository import AnalysesRepository
 from app.services.repositories.documents_repository import DocumentsRepository
 from app.services.repositories.contracts_repository import ContractsRepository
+from app.utils.pagination import MAX_PAGE_SIZE, page_response
 from app.services.repositories.user_contract_views_repository import (
     UserContractViewsRepository,
 )
@@ -174,6 +175,26 @@ async def start_contract_analysis(
         - content_hash: Optional pre-computed content hash
         - analysis_options: Analysis configuration options
     """
+    return await _start_contract_analysis(
+        request, user, document_service, cache_service
+    )
+
+
+async def _start_contract_analysis(
+    request: Dict[str, Any],
+    user: User,
+    document_service: DocumentService,
+    cache_service: CacheService,
+    launch_analysis: Optional[Callable[..., Awaitable[Optional[str]]]] = None,
+) -> ContractAnalysisResponse:
+    """Validate, serve from cache or create records, then launch the analysis.
+
+    ``launch_analysis`` takes the arguments of
+    `_start_background_analysis_with_cache` (the default) and returns the
+    task id; the bulk endpoint passes a collector so all misses run in one
+    batch task.
+    """
+    launch_analysis = launch_analysis or _start_background_analysis_with_cache
 
     # Enhanced request validation
     document_id = request.get("document_id")
@@ -328,7 +349,7 @@ async def start_contract_analysis(
         )
 
         # Start background analysis with cache integration
-        task_id = await _start_background_analysis_with_cache(
+        task_id = await launch_analysis(
             contract_id,
             analysis_id,
             str(user.id),
@@ -436,6 +457,51 @@ async def get_contract_history(
         raise handle_api_error(e, context, ErrorCategory.DATABASE)
 
 
+@router.get("")
+async def list_contracts(
+    limit: int = Query(
+        50,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f"Page size (minimum 1, maximum {MAX_PAGE_SIZE})",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page"
+    ),
+    contract_type: Optional[str] = Query(None),
+    state: Optional[str] = Query(None, description="Australian state"),
+    purchase_method: Optional[str] = Query(None),
+    use_category: Optional[str] = Query(None),
+    user: User = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """
+    List the contracts the user has documents for, newest first.
+
+    Keyset-paginated: pass `next_cursor` back as `cursor` for the next page.
+    """
+    context = create_error_context(
+        user_id=str(user.id), operation="list_contracts", limit=limit
+    )
+
+    try:
+        contracts_repo = ContractsRepository(user_id=user.id)
+        items, next_cursor = await contracts_repo.list_contracts_page(
+            contract_type=contract_type,
+            state=state,
+            purchase_method=purchase_method,
+            use_category=use_category,
+            limit=limit,
+            cursor=cursor,
+        )
+        return {"status": "success", "data": page_response(items, next_cursor)}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error listing contracts: {str(e)}")
+        raise handle_api_error(e, context, ErrorCategory.DATABASE)
+
+
 @router.post("/check-cache")
 async def check_contract_cache(
     request: Dict[str, Any] = Body(...),
@@ -526,6 +592,30 @@ async def bulk_contract_analysis(
         cache_hits = 0
         cache_misses = 0
 
+        # Cache misses are collected and analyzed together in one batch task,
+        # so their LLM calls share one fair-share budget
+        batch: List[Dict[str, Any]] = []
+
+        async def queue_for_batch(
+            contract_id: str,
+            analysis_id: str,
+            user_id: str,
+            document: DocumentRecord,
+            analysis_options: Dict[str, Any],
+            content_hash: Optional[str],
+            cache_service: CacheService,
+        ) -> None:
+            batch.append(
+                {
+                    "document_id": document["id"],
+                    "analysis_id": analysis_id,
+                    "contract_id": contract_id,
+                    "analysis_options": _analysis_task_options(
+                        analysis_options, content_hash
+                    ),
+                }
+            )
+
         for i, request_data in enumerate(requests):
             try:
                 document_id = request_data.get("document_id")
@@ -547,15 +637,16 @@ async def bulk_contract_analysis(
                     "analysis_options": request_data.get("analysis_options", {}),
                 }
 
-                response = await start_contract_analysis(
-                    background_tasks,
+                response = await _start_contract_analysis(
                     enhanced_request,
                     user,
                     await get_user_document_service(user),
                     cache_service,
+                    launch_analysis=queue_for_batch,
                 )
 
-                if response.get("cache_hit"):
+                cache_hit = response.status == "completed"
+                if cache_hit:
                     cache_hits += 1
                 else:
                     cache_misses += 1
@@ -564,11 +655,12 @@ async def bulk_contract_analysis(
                     {
                         "index": i,
                         "document_id": document_id,
-                        "contract_id": response["contract_id"],
-                        "analysis_id": response["analysis_id"],
-                        "status": response["status"],
-                        "cached": response.get("cached", False),
-                        "cache_hit": response.get("cache_hit", False),
+                        "contract_id": response.contract_id,
+                        "analysis_id": response.analysis_id,
+                        "status": response.status,
+                        "task_id": response.task_id,
+                        "cached": cache_hit,
+                        "cache_hit": cache_hit,
                     }
                 )
 
@@ -583,6 +675,17 @@ async def bulk_contract_analysis(
                     }
                 )
 
+        if batch:
+            batched = {entry["analysis_id"] for entry in batch}
+            try:
+                task_id = await _start_batch_analysis(batch, str(user.id))
+                update = {"task_id": task_id}
+            except Exception as batch_error:
+                update = {"status": "error", "error": str(batch_error)}
+            for result in results:
+                if result.get("analysis_id") in batched:
+                    result.update(update)
+
         return JSONResponse(
             content={
                 "status": "success",
@@ -751,6 +854,52 @@ async def _create_analysis_record_with_cache(
         raise ValueError(f"Failed to create analysis record: {str(e)}")
 
 
+def _analysis_task_options(
+    analysis_options: Dict[str, Any], content_hash: Optional[str]
+) -> Dict[str, Any]:
+    """Analysis options as passed to the analysis tasks."""
+    return {
+        **analysis_options,
+        "content_hash": content_hash,
+        "enable_caching": True,
+        "progress_tracking": True,
+        "comprehensive_processing": True,
+    }
+
+
+@retry_api_call(max_attempts=2)
+async def _start_batch_analysis(
+    analyses: List[Dict[str, Any]], user_id: str
+) -> str:
+    """Queue one batch task that analyzes several documents together."""
+    try:
+        from app.tasks.background_tasks import batch_document_analysis
+        from app.core.task_context import task_manager
+
+        await task_manager.initialize()
+        task = await task_manager.launch_user_task(
+            batch_document_analysis,
+            f"batch_{analyses[0]['analysis_id']}",
+            analyses,
+            user_id,
+        )
+
+        if not task or not task.id:
+            raise ValueError("Failed to queue batch analysis")
+
+        logger.info(
+            f"Batch analysis task queued with ID: {task.id} "
+            f"for {len(analyses)} contracts"
+        )
+        return task.id
+
+    except Exception as e:
+        logger.error(f"Batch analysis task creation failed: {str(e)}")
+        raise ValueError(
+            "Our AI service is temporarily busy. Please try again in a few minutes"
+        )
+
+
 @retry_api_call(max_attempts=2)
 async def _start_background_analysis_with_cache(
     contract_id: str,
@@ -771,13 +920,7 @@ async def _start_background_analysis_with_cache(
             "analysis_id": analysis_id,
             "contract_id": contract_id,
             "user_id": user_id,
-            "analysis_options": {
-                **analysis_options,
-                "content_hash": content_hash,
-                "enable_caching": True,
-                "progress_tracking": True,
-                "comprehensive_processing": True,
-            },
+            "analysis_options": _analysis_task_options(analysis_options, content_hash),
         }
 
         logger.info(
@@ -900,12 +1043,12 @@ async def get_contract_analysis(
 
         # Also check documents table for additional access
         docs_repo = DocumentsRepository()
-        user_documents = await docs_repo.list_user_documents(limit=1000)
+        user_documents, _ = await docs_repo.list_user_documents_page(limit=1000)
 
         if user_documents:
             logger.info(f"documents rows for user {user.id}: {len(user_documents)}")
             doc_content_hashes = [
-                doc.content_hash for doc in user_documents if doc.content_hash
+                doc["content_hash"] for doc in user_documents if doc["content_hash"]
             ]
             user_content_hashes.extend(doc_content_hashes)
 
@@ -1087,11 +1230,11 @@ async def delete_contract_analysis(
 
         # Also check documents table for additional access
         docs_repo = DocumentsRepository()
-        user_documents = await docs_repo.list_user_documents(limit=1000)
+        user_documents, _ = await docs_repo.list_user_documents_page(limit=1000)
 
         if user_documents:
             doc_content_hashes = [
-                doc.content_hash for doc in user_documents if doc.content_hash
+                doc["content_hash"] for doc in user_documents if doc["content_hash"]
             ]
             user_content_hashes.extend(doc_content_hashes)
 
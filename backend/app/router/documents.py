@@ -7,6 +7,7 @@ from fastapi import (
     UploadFile,
     File,
     BackgroundTasks,
+    Query,
     Request,
 )
 from typing import Optional, Dict, Any, List
@@ -26,6 +27,8 @@ from app.services.communication.websocket_singleton import websocket_manager
 from app.services.repositories.analysis_progress_repository import (
     AnalysisProgressRepository,
 )
+from app.services.repositories.documents_repository import DocumentsRepository
+from app.utils.pagination import MAX_PAGE_SIZE, page_response
 from app.schema.document import (
     DocumentUploadResponse,
     UploadRecordResult,
@@ -304,6 +307,43 @@ async def upload_document(
         raise handle_api_error(e, context, ErrorCategory.FILE_PROCESSING)
 
 
+@router.get("")
+async def list_documents(
+    limit: int = Query(
+        50,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f"Page size (minimum 1, maximum {MAX_PAGE_SIZE})",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page"
+    ),
+    status: Optional[str] = Query(None, description="Processing status filter"),
+    user: User = Depends(get_current_user),
+):
+    """
+    List the user's documents, newest first.
+
+    Keyset-paginated with a slim projection: pass `next_cursor` back as
+    `cursor` for the next page.
+    """
+    context = create_error_context(
+        user_id=str(user.id), operation="list_documents", metadata={"limit": limit}
+    )
+
+    try:
+        docs_repo = DocumentsRepository()
+        items, next_cursor = await docs_repo.list_user_documents_page(
+            limit=limit, cursor=cursor, status_filter=status
+        )
+        return page_response(items, next_cursor)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise handle_api_error(e, context, ErrorCategory.DATABASE)
+
+
 @router.get("/{document_id}")
 async def get_document(
     document_id: str,
@@ -1,6 +1,7 @@
 """Health check and WebSocket router."""
 
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 from datetime import datetime, timezone
 import logging
 from typing import Dict, Any
@@ -10,6 +11,11 @@ from app.core.langsmith_init import get_langsmith_status
 from app.services.communication.redis_pubsub import redis_pubsub_service
 from app.clients.factory import get_supabase_client
 from app.database.connection import ConnectionPoolManager
+from app.database.statements import get_statement_stats
+from app.database.query_trace import get_query_stats, get_slow_queries
+from app.services.contract_cache import get_contract_cache
+from app.core.llm_metrics import llm_metrics
+from app.clients.openai.http_pool import get_shared_transport_stats
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["health"])
@@ -222,6 +228,13 @@ async def database_health_check() -> Dict[str, Any]:
         
         if metrics["evictions"] > 100:  # High eviction count
             issues.append(f"High eviction count: {metrics['evictions']}")
+
+        pool_stats = ConnectionPoolManager.get_pool_stats()
+        for kind in ("service", "per_user"):
+            saturation = pool_stats[kind]["saturation_ratio"]
+            if pool_stats[kind]["acquires"] >= 100 and saturation > 0.2:
+                status = "degraded"
+                issues.append(f"{kind} pool saturated on {saturation:.1%} of acquires")
         
         health_info = {
             "status": status,
@@ -242,7 +255,8 @@ async def database_health_check() -> Dict[str, Any]:
                 "evictions": metrics["evictions"],
                 "hit_rate": f"{hit_rate:.1%}",
                 "hit_rate_decimal": round(hit_rate, 3)
-            }
+            },
+            "pools": pool_stats,
         }
         
         if issues:
@@ -294,3 +308,95 @@ async def database_metrics() -> Dict[str, Any]:
             "error": str(e),
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
+
+
+@router.get("/metrics/database/pools")
+async def database_pool_stats() -> Dict[str, Any]:
+    """Acquire wait time, saturation and churn per connection pool kind"""
+    try:
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            **ConnectionPoolManager.get_pool_stats(),
+        }
+    except Exception as e:
+        logger.exception("Database pool stats collection failed")
+        return {
+            "error": str(e),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+
+
+@router.get("/metrics/database/statements")
+async def database_statement_stats() -> Dict[str, Any]:
+    """Execution counts and timings per registered repository statement"""
+    try:
+        contract_cache = get_contract_cache()
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "statements": get_statement_stats(),
+            "contract_cache": contract_cache.stats() if contract_cache else None,
+        }
+    except Exception as e:
+        logger.exception("Database statement stats collection failed")
+        return {
+            "error": str(e),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+
+
+@router.get("/metrics/database/queries")
+async def database_query_stats(limit: int = 50) -> Dict[str, Any]:
+    """Latency histograms and rows returned per query fingerprint, by total time"""
+    try:
+        pool_stats = ConnectionPoolManager.get_pool_stats()
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "queries": get_query_stats(limit=limit),
+            "acquire_wait": {
+                kind: pool_stats[kind]["acquire_wait_ms"]
+                for kind in ("service", "per_user")
+            },
+        }
+    except Exception as e:
+        logger.exception("Database query stats collection failed")
+        return {
+            "error": str(e),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+
+
+@router.get("/metrics/database/slow-queries")
+async def database_slow_queries() -> Dict[str, Any]:
+    """Most recent slow queries (parameters redacted to their types)"""
+    settings = get_settings()
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "threshold_ms": settings.db_slow_query_threshold_ms,
+        "slow_queries": get_slow_queries(),
+    }
+
+
+@router.get("/metrics/llm", response_class=PlainTextResponse)
+async def llm_metrics_prometheus() -> PlainTextResponse:
+    """LLM latency, token and cost metrics in Prometheus text format"""
+    return PlainTextResponse(
+        llm_metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@router.get("/metrics/llm/summary")
+async def llm_metrics_summary() -> Dict[str, Any]:
+    """LLM metrics aggregated per operation, node, composition and model"""
+    try:
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            **llm_metrics.snapshot(),
+            "http_pool": get_shared_transport_stats(),
+        }
+    except Exception as e:
+        logger.exception("LLM metrics collection failed")
+        return {
+            "error": str(e),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
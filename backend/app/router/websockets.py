@@ -130,7 +130,7 @@ async def check_document_cache_status(document_id: str, user_id: str) -> Dict[st
 
         # Now check for contracts - the RLS policy should allow access since user has documents with this content_hash
         contracts_repo = ContractsRepository()
-        contract = await contracts_repo.get_contract_by_content_hash(content_hash)
+        contract = await contracts_repo.get_contract_status(content_hash)
 
         if not contract:
             # CACHE MISS - No contract found for this content_hash
@@ -146,7 +146,7 @@ async def check_document_cache_status(document_id: str, user_id: str) -> Dict[st
                 "message": "New document - analysis will start shortly",
             }
 
-        contract_id = str(contract.id)
+        contract_id = str(contract["id"])
 
         # Check analysis status using AnalysesRepository
         analyses_repo = AnalysesRepository(use_service_role=True)
@@ -12,6 +12,8 @@ from fastapi import HTTPException
 from app.core.config import get_settings
 from app.core.prompts.service_mixin import PromptEnabledService
 from app.core.langsmith_config import langsmith_trace, get_langsmith_config
+from app.core.llm_metrics import report_token_usage, track_llm_call
+from app.core.llm_replay import get_llm_replay
 from langsmith.run_helpers import trace
 from app.core.prompts.parsers import create_parser, ParsingResult
 from app.services.base.user_aware_service import UserAwareService
@@ -27,6 +29,7 @@ from app.clients.base.exceptions import (
 )
 from google.genai.types import Content, Part, GenerateContentConfig, SafetySetting
 import asyncio
+from types import SimpleNamespace
 
 from app.prompts.schema.text_diagram_insight_schema import TextDiagramInsightList
 
@@ -118,6 +121,11 @@ class GeminiOCRService(PromptEnabledService, UserAwareService):
             return True
 
         except ClientConnectionError as e:
+            if get_llm_replay().replaying:
+                logger.warning(
+                    f"Gemini unavailable ({e}); continuing with replayed OCR responses"
+                )
+                return True
             logger.error(f"Failed to connect to Gemini service: {e}")
             raise HTTPException(
                 status_code=HTTP_503_SERVICE_UNAVAILABLE,
@@ -763,9 +771,75 @@ Focus on accuracy and completeness. Extract all visible text content."""
                 system_instruction=system_prompt if system_prompt else None,
             )
 
+            # Safely extract text from response; avoid direct indexing
+            def _safe_extract_text(resp: Any) -> str:
+                try:
+                    text_attr = getattr(resp, "text", None)
+                    if isinstance(text_attr, str) and text_attr.strip():
+                        return text_attr
+                    candidates = getattr(resp, "candidates", None) or []
+                    for cand in candidates:
+                        content_obj = getattr(cand, "content", None)
+                        if not content_obj:
+                            continue
+                        parts = getattr(content_obj, "parts", None) or []
+                        texts: list[str] = []
+                        for p in parts:
+                            t = getattr(p, "text", None)
+                            if isinstance(t, str) and t:
+                                texts.append(t)
+                        if texts:
+                            return "\n".join(texts)
+                    return ""
+                except Exception:
+                    return ""
+
             # Execute model call (single LLM call) with detailed LangSmith nested trace
             config = get_langsmith_config()
-            model_name = self.gemini_service.gemini_client.config.model_name
+            replay = get_llm_replay()
+            if replay.replaying and self.gemini_service._gemini_client is None:
+                model_name = get_settings().gemini_model_name
+            else:
+                model_name = self.gemini_service.gemini_client.config.model_name
+
+            async def _generate() -> Any:
+                with track_llm_call(
+                    model_name,
+                    operation="ocr",
+                    prompt_chars=len(rendered_prompt) + len(system_prompt or ""),
+                ) as call:
+                    result = await replay.call(
+                        "ocr",
+                        model_name,
+                        rendered_prompt,
+                        lambda: asyncio.get_event_loop().run_in_executor(
+                            None,
+                            lambda: self.gemini_service.gemini_client.client.models.generate_content(
+                                model=model_name,
+                                contents=[content],
+                                config=generate_config,
+                            ),
+                        ),
+                        params={
+                            "system_prompt": system_prompt,
+                            "file_content": file_content,
+                            "mime_type": mime_type,
+                            "response_schema": TextDiagramInsightList,
+                        },
+                        extract_text=_safe_extract_text,
+                        wrap_text=lambda text: SimpleNamespace(
+                            text=text, usage_metadata=None, candidates=[]
+                        ),
+                    )
+                    usage_meta = getattr(result, "usage_metadata", None)
+                    if usage_meta is not None:
+                        report_token_usage(
+                            getattr(usage_meta, "prompt_token_count", None),
+                            getattr(usage_meta, "candidates_token_count", None),
+                        )
+                    # Output size comes from usage metadata; text is extracted below
+                    call.mark_response(None)
+                return result
             if config.enabled:
                 with trace(
                     name="gemini_generate_content",
@@ -798,14 +872,7 @@ Focus on accuracy and completeness. Extract all visible text content."""
                         },
                     }
 
-                    response = await asyncio.get_event_loop().run_in_executor(
-                        None,
-                        lambda: self.gemini_service.gemini_client.client.models.generate_content(
-                            model=model_name,
-                            contents=[content],
-                            config=generate_config,
-                        ),
-                    )
+                    response = await _generate()
 
                     # Extract usage metadata if present
                     usage = getattr(response, "usage_metadata", None) or getattr(
@@ -839,37 +906,7 @@ Focus on accuracy and completeness. Extract all visible text content."""
                         }
                     # We'll fill outputs after parsing text below using ai_text
             else:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.gemini_service.gemini_client.client.models.generate_content(
-                        model=model_name,
-                        contents=[content],
-                        config=generate_config,
-                    ),
-                )
-
-            # Safely extract text from response; avoid direct indexing
-            def _safe_extract_text(resp: Any) -> str:
-                try:
-                    text_attr = getattr(resp, "text", None)
-                    if isinstance(text_attr, str) and text_attr.strip():
-                        return text_attr
-                    candidates = getattr(resp, "candidates", None) or []
-                    for cand in candidates:
-                        content_obj = getattr(cand, "content", None)
-                        if not content_obj:
-                            continue
-                        parts = getattr(content_obj, "parts", None) or []
-                        texts: list[str] = []
-                        for p in parts:
-                            t = getattr(p, "text", None)
-                            if isinstance(t, str) and t:
-                                texts.append(t)
-                        if texts:
-                            return "\n".join(texts)
-                    return ""
-                except Exception:
-                    return ""
+                response = await _generate()
 
             ai_text = _safe_extract_text(response)
 
@@ -955,6 +992,7 @@ Focus on accuracy and completeness. Extract all visible text content."""
                             "parsing_errors": parsing_result.parsing_errors,
                             "validation_errors": parsing_result.validation_errors,
                             "recovery_method": "manual_extraction",
+                            "repair_path": parsing_result.repair_path,
                         },
                     }
             except Exception as e:
@@ -986,7 +1024,17 @@ Focus on accuracy and completeness. Extract all visible text content."""
         import json
         import re
 
+        from app.core.prompts.json_repair import repair_json
+
         try:
+            # Repair fenced/truncated JSON before falling back to regex scanning
+            repaired = repair_json(raw_output)
+            if isinstance(repaired.data, dict) and repaired.data:
+                logger.info(
+                    f"Recovered image analysis JSON via repair path {repaired.repair_path}"
+                )
+                return repaired.data
+
             # Try to find JSON-like structures in the text
             json_pattern = r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}"
             matches = re.findall(json_pattern, raw_output, re.DOTALL)
@@ -6,22 +6,29 @@ optional structured output parsing.
 
 import logging
 import re
-from typing import Any, Dict, Optional, List, Tuple, Union
+from typing import Any, Awaitable, Callable, Dict, Optional, List, Tuple, Union
 
 from app.services.base.user_aware_service import UserAwareService
 from app.clients import get_openai_client, get_gemini_client
 from app.clients.openai.client import OpenAIClient
 from app.clients.gemini.client import GeminiClient
+from app.core.config import get_settings
 from app.core.langsmith_config import log_trace_info, langsmith_trace
+from app.core.llm_fair_share import fair_share_slot
+from app.core.llm_metrics import CallOutcome, track_llm_call
+from app.core.llm_priority import priority_slot
+from app.core.llm_replay import get_llm_replay
 from app.clients.base.exceptions import (
     ClientError,
     ClientQuotaExceededError,
     ClientRateLimitError,
+    ClientStreamAbortedError,
 )
 from app.core.prompts.parsers import (
     RetryingPydanticOutputParser as BaseOutputParser,
     ParsingResult,
 )
+from app.core.prompts.stream_validator import StreamingSchemaValidator
 from typing import Union
 
 
@@ -35,6 +42,9 @@ DEFAULT_TOP_P: float = 1.0
 DEFAULT_PARSE_GENERATION_MAX_ATTEMPTS: int = 3
 # Max characters of raw model output to include in warning logs when parsing fails
 PARSE_ERROR_OUTPUT_PREVIEW_CHARS: int = 256
+# Re-ask for only the missing fields (instead of regenerating everything) when a
+# repaired response is missing at most this many top-level required fields
+PARTIAL_REASK_MAX_FIELDS: int = 8
 
 
 class LLMService(UserAwareService):
@@ -59,6 +69,9 @@ class LLMService(UserAwareService):
         )
 
     async def initialize(self) -> None:
+        if get_llm_replay().replaying:
+            logger.info("LLMService in replay mode; provider clients not initialized")
+            return
         try:
             # Lazy-initialize clients on demand, but pre-warm both for reliability
             self._openai_client = await get_openai_client()
@@ -80,6 +93,37 @@ class LLMService(UserAwareService):
             raise ClientError("Gemini client not initialized", "LLMService")
         return self._gemini_client
 
+    def _client_for(self, client_key: str) -> Optional[Any]:
+        """Return the provider client; None in replay mode when it was never initialized."""
+        client = self._openai_client if client_key == "openai" else self._gemini_client
+        if client is None and get_llm_replay().replaying:
+            return None
+        return self.openai if client_key == "openai" else self.gemini
+
+    async def _call_client(
+        self,
+        client: Any,
+        prompt: str,
+        client_kwargs: Dict[str, Any],
+        *,
+        model_name: Optional[str],
+        operation: str = "llm",
+    ) -> str:
+        """Call the provider client, or the record/replay stand-in when enabled.
+
+        Inside Step 2 the call waits for a critical-path-ordered slot, and in
+        batch analysis it then waits for a fair-share slot.
+        """
+        async with priority_slot(), fair_share_slot():
+            return await get_llm_replay().call(
+                operation,
+                model_name,
+                prompt,
+                lambda: client.generate_content(prompt=prompt, **client_kwargs),
+                params=client_kwargs,
+                on_chunk=client_kwargs.get("on_chunk"),
+            )
+
     def _load_model_client_rules(self) -> List[Tuple[str, str]]:
         """Return hard-coded model->client rules (no env loading)."""
         # Common model name prefixes/patterns
@@ -160,6 +204,8 @@ class LLMService(UserAwareService):
         system_message: Optional[str] = None,
         output_parser: Optional[BaseOutputParser[Any]] = None,
         parse_generation_max_attempts: int = DEFAULT_PARSE_GENERATION_MAX_ATTEMPTS,
+        stream: Optional[bool] = None,
+        on_partial: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
         **kwargs,
     ) -> Union[str, ParsingResult]:
         """
@@ -167,16 +213,25 @@ class LLMService(UserAwareService):
 
         If output_parser is provided, returns ParsingResult. On parsing failure,
         the method will retry the LLM generation up to parse_generation_max_attempts.
-        Otherwise, returns raw string content.
+        When the parser could repair the output but required fields are missing,
+        the retry asks only for those fields and merges them into the repaired
+        data. Otherwise, returns raw string content.
+
+        With stream=True (default: settings.llm_streaming_enabled) and a parser,
+        the response is streamed and validated incrementally; an attempt whose
+        output diverges from the schema is aborted and retried immediately.
+        on_partial, if given, receives the partial data each time another
+        top-level field completes.
         """
         try:
             client_key = self._resolve_client_key_for_model(model)
-            client = self.openai if client_key == "openai" else self.gemini
+            client = self._client_for(client_key)
 
             log_trace_info(
                 "llm_generate_content",
                 prompt_length=len(prompt),
-                model=model or getattr(client.config, "model_name", None),
+                model=model
+                or getattr(getattr(client, "config", None), "model_name", None),
                 temperature=temperature,
                 max_tokens=max_tokens,
                 top_p=top_p,
@@ -250,9 +305,19 @@ class LLMService(UserAwareService):
                         f"Failed Gemini structured-output preparation; proceeding with raw prompt: {strip_error}"
                     )
 
+            model_name = model or getattr(
+                getattr(client, "config", None), "model_name", None
+            )
+
             # If no parser, single shot call
             if output_parser is None:
-                response = await client.generate_content(prompt=prompt, **client_kwargs)
+                with track_llm_call(
+                    model_name, prompt_chars=len(prompt) + len(system_message or "")
+                ) as call:
+                    response = await self._call_client(
+                        client, prompt, client_kwargs, model_name=model_name
+                    )
+                    call.mark_response(response)
                 logger.debug(f"Generated {len(response)} characters")
                 return response
 
@@ -260,20 +325,96 @@ class LLMService(UserAwareService):
             last_result: Optional[ParsingResult] = None
             attempts = max(1, parse_generation_max_attempts + 1)
 
-            for attempt in range(1, attempts + 1):
-                response = await client.generate_content(
-                    prompt=(prompt_to_send if client_key == "gemini" else prompt),
-                    **client_kwargs,
-                )
-                logger.debug(
-                    f"Attempt {attempt}: generated {len(response)} characters; parsing..."
-                )
+            use_stream = (
+                get_settings().llm_streaming_enabled if stream is None else stream
+            )
+            attempt = 0
+            while attempt < attempts:
+                attempt += 1
+                attempt_prompt = prompt_to_send if client_key == "gemini" else prompt
+                attempt_kwargs = client_kwargs
+                validator: Optional[StreamingSchemaValidator] = None
+                if use_stream and getattr(output_parser, "pydantic_model", None):
+                    validator = StreamingSchemaValidator(
+                        output_parser.pydantic_model,
+                        max_prose_chars=get_settings().llm_stream_max_prose_chars,
+                    )
+                    attempt_kwargs = {
+                        **client_kwargs,
+                        "on_chunk": self._make_stream_chunk_handler(
+                            validator, on_partial
+                        ),
+                    }
+                with track_llm_call(
+                    model_name,
+                    prompt_chars=len(attempt_prompt) + len(system_message or ""),
+                ) as call:
+                    try:
+                        response = await self._call_client(
+                            client,
+                            attempt_prompt,
+                            attempt_kwargs,
+                            model_name=model_name,
+                        )
+                    except ClientStreamAbortedError as abort:
+                        response = abort.partial_text or ""
+                        call.mark_response(response)
+                        call.set_outcome(CallOutcome.PARSE_FAIL)
+                        last_result = ParsingResult(
+                            success=False,
+                            raw_output=response,
+                            parsing_errors=[f"Stream aborted: {abort.reason}"],
+                        )
+                        logger.warning(
+                            f"Aborted streamed generation on attempt {attempt}/{attempts} "
+                            f"after {len(response)} characters "
+                            f"(model={model_name}, reason={abort.reason})"
+                        )
+                        continue
+                    call.mark_response(response)
+                    logger.debug(
+                        f"Attempt {attempt}: generated {len(response)} characters; parsing..."
+                    )
 
-                parsing_result = output_parser.parse_with_retry(response)
+                    parsing_result = output_parser.parse_with_retry(response)
+                    call.set_outcome(
+                        CallOutcome.SUCCESS
+                        if parsing_result.success
+                        else CallOutcome.PARSE_FAIL
+                    )
                 if parsing_result.success:
-                    logger.debug("Parsing succeeded")
+                    if parsing_result.repair_path:
+                        logger.info(
+                            f"Parsing succeeded after repair {parsing_result.repair_path} "
+                            f"(model={model_name}); regeneration avoided"
+                        )
+                    else:
+                        logger.debug("Parsing succeeded")
                     return parsing_result
 
+                if attempt < attempts and self._should_reask_missing_fields(
+                    output_parser, parsing_result
+                ):
+                    # The partial re-ask takes the place of the next full generation
+                    attempt += 1
+                    reask_result = await self._reask_missing_fields(
+                        client=client,
+                        client_kwargs=client_kwargs,
+                        prompt=attempt_prompt,
+                        system_message=system_message,
+                        model_name=model_name,
+                        output_parser=output_parser,
+                        parsing_result=parsing_result,
+                    )
+                    if reask_result is not None:
+                        if reask_result.success:
+                            logger.info(
+                                f"Recovered missing fields {parsing_result.missing_fields} "
+                                f"via partial re-ask (model={model_name})"
+                            )
+                            return reask_result
+                        parsing_result = reask_result
+
                 last_result = parsing_result
                 # Collect rich diagnostics for easier troubleshooting
                 validation_errors = (
@@ -281,9 +422,6 @@ class LLMService(UserAwareService):
                 )
                 parsing_errors = getattr(parsing_result, "parsing_errors", []) or []
                 raw_preview = (response or "")[:PARSE_ERROR_OUTPUT_PREVIEW_CHARS]
-                model_name = model or getattr(
-                    getattr(client, "config", None), "model_name", None
-                )
 
                 logger.warning(
                     f"Parsing failed on attempt {attempt}/{attempts} "
@@ -310,6 +448,90 @@ class LLMService(UserAwareService):
                 original_error=e,
             )
 
+    @staticmethod
+    def _make_stream_chunk_handler(
+        validator: StreamingSchemaValidator,
+        on_partial: Optional[Callable[[Dict[str, Any]], Awaitable[None]]],
+    ) -> Callable[[str], Awaitable[None]]:
+        """Build the client on_chunk callback that validates and publishes partials."""
+
+        async def _on_chunk(delta: str) -> None:
+            partial = validator.feed(delta)
+            if validator.divergence:
+                raise ClientStreamAbortedError(
+                    f"Streamed output diverged from schema: {validator.divergence}",
+                    reason=validator.divergence,
+                    partial_text=validator.text,
+                    client_name="LLMService",
+                )
+            if partial is not None and on_partial is not None:
+                try:
+                    await on_partial(partial)
+                except Exception as e:
+                    logger.debug(f"Partial result callback failed: {e}")
+
+        return _on_chunk
+
+    def _should_reask_missing_fields(
+        self, output_parser: BaseOutputParser, parsing_result: ParsingResult
+    ) -> bool:
+        missing = getattr(parsing_result, "missing_fields", None) or []
+        if not missing or not getattr(parsing_result, "partial_data", None):
+            return False
+        if not hasattr(output_parser, "merge_missing_fields"):
+            return False
+        top_level = {re.split(r"[.\[]", path, maxsplit=1)[0] for path in missing}
+        return len(top_level) <= PARTIAL_REASK_MAX_FIELDS
+
+    async def _reask_missing_fields(
+        self,
+        *,
+        client: Any,
+        client_kwargs: Dict[str, Any],
+        prompt: str,
+        system_message: Optional[str],
+        model_name: Optional[str],
+        output_parser: BaseOutputParser,
+        parsing_result: ParsingResult,
+    ) -> Optional[ParsingResult]:
+        """Ask the model for only the fields missing from a repaired response."""
+        try:
+            reask_prompt = (
+                f"{prompt}\n\n"
+                f"{output_parser.build_missing_fields_prompt(parsing_result.missing_fields)}"
+            )
+            # The full-model response schema would force every field again
+            reask_kwargs = {
+                k: v for k, v in client_kwargs.items() if k != "response_schema"
+            }
+            with track_llm_call(
+                model_name,
+                operation="llm_reask",
+                prompt_chars=len(reask_prompt) + len(system_message or ""),
+            ) as call:
+                response = await self._call_client(
+                    client,
+                    reask_prompt,
+                    reask_kwargs,
+                    model_name=model_name,
+                    operation="llm_reask",
+                )
+                call.mark_response(response)
+                merged = output_parser.merge_missing_fields(
+                    parsing_result.partial_data,
+                    response,
+                    parsing_result.repair_path,
+                )
+                call.set_outcome(
+                    CallOutcome.SUCCESS if merged.success else CallOutcome.PARSE_FAIL
+                )
+            return merged
+        except (ClientRateLimitError, ClientQuotaExceededError):
+            raise
+        except Exception as e:
+            logger.warning(f"Missing-field re-ask failed; regenerating instead: {e}")
+            return None
+
     @langsmith_trace(name="generate_image_semantics", run_type="llm")
     async def generate_image_semantics(
         self,
@@ -327,26 +549,56 @@ class LLMService(UserAwareService):
         """
         try:
             # For now, route images to Gemini.
-            ai_response = await self.gemini.analyze_image_semantics_batch(
-                contents=contents,
-                analysis_context={
-                    "prompt": analysis_prompt,
-                    "system_prompt": system_prompt,
-                    "expects_structured_output": output_parser is not None,
-                    "output_format": "json" if output_parser is not None else "text",
-                    # also pass filenames list for traceability if provided
-                    "filenames": [
-                        c.get("filename")
-                        for c in (contents or [])
-                        if isinstance(c, dict)
-                    ],
-                },
-            )
+            gemini = self._client_for("gemini")
+            model_name = getattr(getattr(gemini, "config", None), "model_name", None)
+            analysis_context = {
+                "prompt": analysis_prompt,
+                "system_prompt": system_prompt,
+                "expects_structured_output": output_parser is not None,
+                "output_format": ("json" if output_parser is not None else "text"),
+                # also pass filenames list for traceability if provided
+                "filenames": [
+                    c.get("filename") for c in (contents or []) if isinstance(c, dict)
+                ],
+            }
+            with track_llm_call(
+                model_name,
+                operation="image_semantics",
+                prompt_chars=len(analysis_prompt or "") + len(system_prompt or ""),
+            ) as call:
+                ai_response = await get_llm_replay().call(
+                    "image_semantics",
+                    model_name,
+                    analysis_prompt or "",
+                    lambda: gemini.analyze_image_semantics_batch(
+                        contents=contents, analysis_context=analysis_context
+                    ),
+                    params={
+                        "system_prompt": system_prompt,
+                        "images": [
+                            c.get("content")
+                            for c in (contents or [])
+                            if isinstance(c, dict)
+                        ],
+                        "output_format": analysis_context["output_format"],
+                    },
+                    extract_text=lambda r: (r or {}).get("content", ""),
+                    wrap_text=lambda text: {"content": text},
+                )
+                call.mark_response(ai_response.get("content", ""))
 
-            if output_parser is None:
-                return ai_response.get("content", "")
+                if output_parser is None:
+                    return ai_response.get("content", "")
 
-            return output_parser.parse_with_retry(ai_response.get("content", ""))
+                parsing_result = output_parser.parse_with_retry(
+                    ai_response.get("content", "")
+                )
+                call.set_outcome(
+                    CallOutcome.SUCCESS
+                    if parsing_result.success
+                    else CallOutcome.PARSE_FAIL
+                )
+            return parsing_result
         except (ClientRateLimitError, ClientQuotaExceededError) as e:
             logger.warning(f"Image semantics quota/limit: {e}")
             raise
@@ -5,20 +5,31 @@ Provides analytics and tracking for the contract type taxonomy system:
 - Contract type distribution and trends
 - OCR inference accuracy tracking
 - Purchase method and lease category analytics
-- Confidence score analysis
 """
 
+import asyncio
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
 
 from app.services.repositories.contracts_repository import ContractsRepository
-from app.database.connection import get_service_role_connection
 
 
 logger = logging.getLogger(__name__)
 
+# Taxonomy field inferred by OCR for each contract type
+INFERRED_CATEGORY_BY_CONTRACT_TYPE = {
+    "purchase_agreement": "purchase_method",
+    "lease_agreement": "use_category",
+}
+IMPROVEMENT_INFERENCE_RATE = 0.8
+HIGH_PERFORMING_INFERENCE_RATE = 0.9
+
+
+async def _no_section() -> None:
+    return None
+
 
 class ContractAnalyticsService:
     """Service for contract type taxonomy analytics and tracking"""
@@ -32,6 +43,11 @@ class ContractAnalyticsService:
         """
         Get comprehensive analytics for contract type taxonomy.
 
+        Counts are read from the contract_daily_rollups table (day granularity,
+        maintained by a trigger on contracts) rather than aggregating contracts
+        on every call. Independent sections run concurrently; a section that
+        fails is logged and returned empty instead of failing the whole report.
+
         Args:
             start_date: Optional start date for filtering
             end_date: Optional end date for filtering
@@ -40,29 +56,45 @@ class ContractAnalyticsService:
             Dictionary with comprehensive taxonomy analytics
         """
         try:
-            # Get basic contract stats (already includes taxonomy fields)
-            basic_stats = await self.contracts_repo.get_contract_stats()
-
-            # Get OCR inference analytics
-            ocr_analytics = await self._get_ocr_inference_analytics(
-                start_date, end_date
+            ranged = bool(start_date and end_date)
+            sections = await asyncio.gather(
+                self.contracts_repo.get_rollup_buckets(),
+                (
+                    self.contracts_repo.get_rollup_buckets(
+                        start_date.date(), end_date.date()
+                    )
+                    if ranged
+                    else _no_section()
+                ),
+                self._get_trend_analytics(start_date, end_date),
+                return_exceptions=True,
             )
-
-            # Get confidence score analytics
-            confidence_analytics = await self._get_confidence_analytics()
-
-            # Get trend analytics
-            trend_analytics = await self._get_trend_analytics(start_date, end_date)
-
-            # Get geographic distribution
-            geographic_analytics = await self._get_geographic_distribution()
+            all_buckets = self._section_result("rollup_buckets", sections[0], [])
+            ranged_buckets = self._section_result(
+                "ranged_rollup_buckets", sections[1], []
+            )
+            trends = self._section_result("trends", sections[2], {})
+            if not ranged:
+                ranged_buckets = all_buckets
 
             return {
-                "basic_stats": basic_stats,
-                "ocr_inference": ocr_analytics,
-                "confidence_metrics": confidence_analytics,
-                "trends": trend_analytics,
-                "geographic_distribution": geographic_analytics,
+                "basic_stats": self._basic_stats(all_buckets),
+                "ocr_inference": {
+                    "by_contract_type": self._inference_by_contract_type(
+                        ranged_buckets
+                    ),
+                    "overall_inference_success_rate": self._overall_inference_rate(
+                        all_buckets
+                    ),
+                    # OCR confidence scores are no longer persisted on contracts
+                    "low_confidence_alerts": [],
+                },
+                "confidence_metrics": {
+                    "purchase_method_confidence": [],
+                    "use_category_confidence": [],
+                },
+                "trends": trends,
+                "geographic_distribution": self._geographic_distribution(all_buckets),
                 "generated_at": datetime.utcnow().isoformat(),
             }
 
@@ -70,297 +102,162 @@ class ContractAnalyticsService:
             logger.error(f"Failed to generate taxonomy analytics: {e}")
             raise
 
-    async def _get_ocr_inference_analytics(
-        self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
-    ) -> Dict[str, Any]:
-        """Get analytics on OCR inference accuracy and usage"""
-        async with get_service_role_connection() as conn:
-            date_filter = ""
-            params = []
-
-            if start_date and end_date:
-                date_filter = "WHERE created_at >= $1 AND created_at <= $2"
-                params = [start_date, end_date]
-
-            # OCR inference success rates
-            result = await conn.fetch(
-                f"""
-                SELECT 
-                    contract_type,
-                    COUNT(*) as total_contracts,
-                    COUNT(purchase_method) as with_purchase_method,
-                    COUNT(use_category) as with_use_category,
-                    COUNT(CASE WHEN ocr_confidence IS NOT NULL AND ocr_confidence != '{{}}'::jsonb 
-                          THEN 1 END) as with_confidence_scores
-                FROM contracts 
-                {date_filter}
-                GROUP BY contract_type
-                ORDER BY total_contracts DESC
-            """,
-                *params,
-            )
-
-            inference_stats = {}
-            for row in result:
-                contract_type = row["contract_type"]
-                total = row["total_contracts"]
-
-                if contract_type == "purchase_agreement":
-                    inference_rate = (
-                        row["with_purchase_method"] / total if total > 0 else 0
-                    )
-                elif contract_type == "lease_agreement":
-                    inference_rate = (
-                        row["with_use_category"] / total if total > 0 else 0
-                    )
-                else:
-                    inference_rate = 0
-
-                inference_stats[contract_type] = {
-                    "total_contracts": total,
-                    "with_inference": (
-                        row["with_purchase_method"]
-                        if contract_type == "purchase_agreement"
-                        else row["with_use_category"]
-                    ),
-                    "inference_success_rate": inference_rate,
-                    "with_confidence_scores": row["with_confidence_scores"],
-                    "confidence_rate": (
-                        row["with_confidence_scores"] / total if total > 0 else 0
-                    ),
-                }
-
-            return {
-                "by_contract_type": inference_stats,
-                "overall_inference_success_rate": await self._calculate_overall_inference_rate(),
-                "low_confidence_alerts": await self._get_low_confidence_contracts(),
-            }
-
-    async def _get_confidence_analytics(self) -> Dict[str, Any]:
-        """Get analytics on OCR confidence scores"""
-        async with get_service_role_connection() as conn:
-            # Confidence score distribution for purchase methods
-            purchase_confidence = await conn.fetch(
-                """
-                SELECT 
-                    purchase_method,
-                    AVG((ocr_confidence->>'purchase_method')::float) as avg_confidence,
-                    MIN((ocr_confidence->>'purchase_method')::float) as min_confidence,
-                    MAX((ocr_confidence->>'purchase_method')::float) as max_confidence,
-                    COUNT(*) as count
-                FROM contracts 
-                WHERE contract_type = 'purchase_agreement' 
-                AND purchase_method IS NOT NULL
-                AND ocr_confidence ? 'purchase_method'
-                GROUP BY purchase_method
-                ORDER BY avg_confidence DESC
-            """
+    @staticmethod
+    def _section_result(name: str, result: Any, default: Any) -> Any:
+        """Unwrap an asyncio.gather result, degrading a failed section to default"""
+        if isinstance(result, BaseException):
+            logger.warning(f"Taxonomy analytics section {name} failed: {result}")
+            return default
+        return result
+
+    @staticmethod
+    def _basic_stats(buckets: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Contract counts by type, purchase method, use category and state"""
+        by_dimension = {
+            dimension: defaultdict(int)
+            for dimension in (
+                "contract_type",
+                "purchase_method",
+                "use_category",
+                "state",
             )
+        }
+        total = 0
+        for bucket in buckets:
+            total += bucket["count"]
+            for dimension, counts in by_dimension.items():
+                value = bucket[dimension]
+                if value is not None or dimension == "contract_type":
+                    counts[value] += bucket["count"]
+
+        def ranked(counts: Dict[Any, int]) -> Dict[Any, int]:
+            return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+        return {
+            "total_contracts": total,
+            "by_type": ranked(by_dimension["contract_type"]),
+            "by_purchase_method": ranked(by_dimension["purchase_method"]),
+            "by_use_category": ranked(by_dimension["use_category"]),
+            "by_state": ranked(by_dimension["state"]),
+        }
 
-            # Confidence score distribution for lease categories
-            lease_confidence = await conn.fetch(
-                """
-                SELECT 
-                    use_category,
-                    AVG((ocr_confidence->>'use_category')::float) as avg_confidence,
-                    MIN((ocr_confidence->>'use_category')::float) as min_confidence,
-                    MAX((ocr_confidence->>'use_category')::float) as max_confidence,
-                    COUNT(*) as count
-                FROM contracts 
-                WHERE contract_type = 'lease_agreement' 
-                AND use_category IS NOT NULL
-                AND ocr_confidence ? 'use_category'
-                GROUP BY use_category
-                ORDER BY avg_confidence DESC
-            """
+    @staticmethod
+    def _inference_by_contract_type(
+        buckets: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """OCR inference success rates per contract type"""
+        totals = defaultdict(lambda: defaultdict(int))
+        for bucket in buckets:
+            type_totals = totals[bucket["contract_type"]]
+            type_totals["total_contracts"] += bucket["count"]
+            if bucket["purchase_method"] is not None:
+                type_totals["with_purchase_method"] += bucket["count"]
+            if bucket["use_category"] is not None:
+                type_totals["with_use_category"] += bucket["count"]
+
+        inference_stats = {}
+        for contract_type, type_totals in sorted(
+            totals.items(), key=lambda item: item[1]["total_contracts"], reverse=True
+        ):
+            total = type_totals["total_contracts"]
+            with_inference = (
+                type_totals["with_purchase_method"]
+                if contract_type == "purchase_agreement"
+                else type_totals["with_use_category"]
             )
-
-            return {
-                "purchase_method_confidence": [
-                    {
-                        "method": row["purchase_method"],
-                        "avg_confidence": float(row["avg_confidence"]),
-                        "min_confidence": float(row["min_confidence"]),
-                        "max_confidence": float(row["max_confidence"]),
-                        "sample_count": row["count"],
-                    }
-                    for row in purchase_confidence
-                ],
-                "use_category_confidence": [
-                    {
-                        "category": row["use_category"],
-                        "avg_confidence": float(row["avg_confidence"]),
-                        "min_confidence": float(row["min_confidence"]),
-                        "max_confidence": float(row["max_confidence"]),
-                        "sample_count": row["count"],
-                    }
-                    for row in lease_confidence
-                ],
+            if contract_type in ("purchase_agreement", "lease_agreement"):
+                inference_rate = with_inference / total if total > 0 else 0
+            else:
+                inference_rate = 0
+
+            # OCR confidence scores are no longer persisted on contracts
+            inference_stats[contract_type] = {
+                "total_contracts": total,
+                "with_inference": with_inference,
+                "inference_success_rate": inference_rate,
+                "with_confidence_scores": 0,
+                "confidence_rate": 0,
             }
 
+        return inference_stats
+
     async def _get_trend_analytics(
         self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """Get trend analytics for contract types over time"""
-        async with get_service_role_connection() as conn:
-            # Default to last 30 days if no dates provided
-            if not start_date:
-                start_date = datetime.utcnow() - timedelta(days=30)
-            if not end_date:
-                end_date = datetime.utcnow()
-
-            # Daily contract type trends
-            daily_trends = await conn.fetch(
-                """
-                SELECT 
-                    DATE(created_at) as date,
-                    contract_type,
-                    purchase_method,
-                    use_category,
-                    COUNT(*) as count
-                FROM contracts 
-                WHERE created_at >= $1 AND created_at <= $2
-                GROUP BY DATE(created_at), contract_type, purchase_method, use_category
-                ORDER BY date DESC, count DESC
-            """,
-                start_date,
-                end_date,
-            )
-
-            # Organize trends by date
-            trends_by_date = defaultdict(lambda: defaultdict(int))
-            for row in daily_trends:
-                date_str = row["date"].isoformat()
-                trends_by_date[date_str]["total"] += row["count"]
-                trends_by_date[date_str][row["contract_type"]] += row["count"]
-
-                if row["purchase_method"]:
-                    trends_by_date[date_str][
-                        f"purchase_{row['purchase_method']}"
-                    ] += row["count"]
-                if row["use_category"]:
-                    trends_by_date[date_str][f"lease_{row['use_category']}"] += row[
-                        "count"
-                    ]
-
-            return {
-                "daily_trends": dict(trends_by_date),
-                "period": {
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat(),
-                    "days": (end_date - start_date).days,
-                },
-            }
+        # Default to last 30 days if no dates provided
+        if not start_date:
+            start_date = datetime.utcnow() - timedelta(days=30)
+        if not end_date:
+            end_date = datetime.utcnow()
+
+        daily_trends = await self.contracts_repo.get_daily_rollups(
+            start_date.date(), end_date.date()
+        )
+
+        # Organize trends by date
+        trends_by_date = defaultdict(lambda: defaultdict(int))
+        for row in daily_trends:
+            date_str = row["day"].isoformat()
+            trends_by_date[date_str]["total"] += row["count"]
+            trends_by_date[date_str][row["contract_type"]] += row["count"]
+
+            if row["purchase_method"]:
+                trends_by_date[date_str][f"purchase_{row['purchase_method']}"] += row[
+                    "count"
+                ]
+            if row["use_category"]:
+                trends_by_date[date_str][f"lease_{row['use_category']}"] += row["count"]
+
+        return {
+            "daily_trends": {
+                date_str: dict(counts) for date_str, counts in trends_by_date.items()
+            },
+            "period": {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "days": (end_date - start_date).days,
+            },
+        }
 
-    async def _get_geographic_distribution(self) -> Dict[str, Any]:
+    @staticmethod
+    def _geographic_distribution(buckets: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Get geographic distribution of contract types"""
-        async with get_service_role_connection() as conn:
-            geo_distribution = await conn.fetch(
-                """
-                SELECT 
-                    australian_state,
-                    contract_type,
-                    purchase_method,
-                    use_category,
-                    COUNT(*) as count
-                FROM contracts 
-                GROUP BY australian_state, contract_type, purchase_method, use_category
-                ORDER BY australian_state, count DESC
-            """
-            )
-
-            # Organize by state
-            by_state = defaultdict(lambda: defaultdict(int))
-            for row in geo_distribution:
-                state = row["australian_state"]
-                by_state[state]["total"] += row["count"]
-                by_state[state][row["contract_type"]] += row["count"]
-
-                if row["purchase_method"]:
-                    by_state[state][f"purchase_{row['purchase_method']}"] += row[
-                        "count"
-                    ]
-                if row["use_category"]:
-                    by_state[state][f"lease_{row['use_category']}"] += row["count"]
-
-            return dict(by_state)
-
-    async def _calculate_overall_inference_rate(self) -> float:
+        by_state = defaultdict(lambda: defaultdict(int))
+        for bucket in buckets:
+            state = bucket["state"]
+            by_state[state]["total"] += bucket["count"]
+            by_state[state][bucket["contract_type"]] += bucket["count"]
+
+            if bucket["purchase_method"]:
+                by_state[state][f"purchase_{bucket['purchase_method']}"] += bucket[
+                    "count"
+                ]
+            if bucket["use_category"]:
+                by_state[state][f"lease_{bucket['use_category']}"] += bucket["count"]
+
+        return {state: dict(counts) for state, counts in by_state.items()}
+
+    @staticmethod
+    def _overall_inference_rate(buckets: List[Dict[str, Any]]) -> float:
         """Calculate overall OCR inference success rate"""
-        async with get_service_role_connection() as conn:
-            result = await conn.fetchrow(
-                """
-                SELECT 
-                    COUNT(*) as total,
-                    COUNT(CASE WHEN contract_type = 'purchase_agreement' AND purchase_method IS NOT NULL 
-                              THEN 1 END) as purchase_with_method,
-                    COUNT(CASE WHEN contract_type = 'lease_agreement' AND use_category IS NOT NULL 
-                              THEN 1 END) as lease_with_category,
-                    COUNT(CASE WHEN contract_type = 'purchase_agreement' THEN 1 END) as total_purchase,
-                    COUNT(CASE WHEN contract_type = 'lease_agreement' THEN 1 END) as total_lease
-                FROM contracts
-            """
-            )
-
-            if result["total_purchase"] + result["total_lease"] == 0:
-                return 0.0
-
-            successful_inferences = (
-                result["purchase_with_method"] + result["lease_with_category"]
-            )
-            total_requiring_inference = result["total_purchase"] + result["total_lease"]
-
-            return (
-                successful_inferences / total_requiring_inference
-                if total_requiring_inference > 0
-                else 0.0
-            )
-
-    async def _get_low_confidence_contracts(
-        self, threshold: float = 0.7
-    ) -> List[Dict[str, Any]]:
-        """Get contracts with low OCR confidence scores"""
-        async with get_service_role_connection() as conn:
-            low_confidence = await conn.fetch(
-                """
-                SELECT 
-                    id,
-                    content_hash,
-                    contract_type,
-                    purchase_method,
-                    use_category,
-                    ocr_confidence,
-                    created_at
-                FROM contracts 
-                WHERE (
-                    (contract_type = 'purchase_agreement' 
-                     AND (ocr_confidence->>'purchase_method')::float < $1)
-                    OR 
-                    (contract_type = 'lease_agreement' 
-                     AND (ocr_confidence->>'use_category')::float < $1)
-                )
-                ORDER BY created_at DESC
-                LIMIT 100
-            """,
-                threshold,
-            )
-
-            return [
-                {
-                    "contract_id": str(row["id"]),
-                    "content_hash": row["content_hash"],
-                    "contract_type": row["contract_type"],
-                    "purchase_method": row["purchase_method"],
-                    "use_category": row["use_category"],
-                    "confidence_score": (
-                        row["ocr_confidence"].get("purchase_method")
-                        if row["contract_type"] == "purchase_agreement"
-                        else row["ocr_confidence"].get("use_category")
-                    ),
-                    "created_at": row["created_at"].isoformat(),
-                }
-                for row in low_confidence
-            ]
+        successful_inferences = 0
+        total_requiring_inference = 0
+        for bucket in buckets:
+            if bucket["contract_type"] == "purchase_agreement":
+                total_requiring_inference += bucket["count"]
+                if bucket["purchase_method"] is not None:
+                    successful_inferences += bucket["count"]
+            elif bucket["contract_type"] == "lease_agreement":
+                total_requiring_inference += bucket["count"]
+                if bucket["use_category"] is not None:
+                    successful_inferences += bucket["count"]
+
+        return (
+            successful_inferences / total_requiring_inference
+            if total_requiring_inference > 0
+            else 0.0
+        )
 
     async def track_inference_performance(
         self,
@@ -434,9 +331,14 @@ class ContractAnalyticsService:
         return accuracy
 
     async def get_performance_insights(self) -> Dict[str, Any]:
-        """Get insights for improving OCR inference performance"""
-        confidence_analytics = await self._get_confidence_analytics()
-        low_confidence = await self._get_low_confidence_contracts(threshold=0.8)
+        """
+        Get insights for improving OCR inference performance.
+
+        OCR confidence scores are no longer persisted, so categories are
+        judged by their inference success rate from the daily rollups.
+        """
+        buckets = await self.contracts_repo.get_rollup_buckets()
+        inference_stats = self._inference_by_contract_type(buckets)
 
         insights = {
             "improvement_opportunities": [],
@@ -444,61 +346,28 @@ class ContractAnalyticsService:
             "low_confidence_patterns": [],
         }
 
-        # Analyze purchase method performance
-        for method_data in confidence_analytics["purchase_method_confidence"]:
-            if method_data["avg_confidence"] < 0.8:
-                insights["improvement_opportunities"].append(
-                    {
-                        "category": "purchase_method",
-                        "value": method_data["method"],
-                        "avg_confidence": method_data["avg_confidence"],
-                        "sample_count": method_data["sample_count"],
-                        "recommendation": f"Improve OCR patterns for {method_data['method']} detection",
-                    }
-                )
-            elif method_data["avg_confidence"] > 0.9:
-                insights["high_performing_categories"].append(
-                    {
-                        "category": "purchase_method",
-                        "value": method_data["method"],
-                        "avg_confidence": method_data["avg_confidence"],
-                    }
-                )
-
-        # Analyze lease category performance
-        for category_data in confidence_analytics["use_category_confidence"]:
-            if category_data["avg_confidence"] < 0.8:
+        for contract_type, category in INFERRED_CATEGORY_BY_CONTRACT_TYPE.items():
+            stats = inference_stats.get(contract_type)
+            if not stats or not stats["total_contracts"]:
+                continue
+            rate = stats["inference_success_rate"]
+            if rate < IMPROVEMENT_INFERENCE_RATE:
                 insights["improvement_opportunities"].append(
                     {
-                        "category": "use_category",
-                        "value": category_data["category"],
-                        "avg_confidence": category_data["avg_confidence"],
-                        "sample_count": category_data["sample_count"],
-                        "recommendation": f"Improve OCR patterns for {category_data['category']} detection",
+                        "category": category,
+                        "value": contract_type,
+                        "inference_success_rate": rate,
+                        "sample_count": stats["total_contracts"],
+                        "recommendation": f"Improve OCR patterns for {category} detection",
                     }
                 )
-            elif category_data["avg_confidence"] > 0.9:
+            elif rate > HIGH_PERFORMING_INFERENCE_RATE:
                 insights["high_performing_categories"].append(
                     {
-                        "category": "use_category",
-                        "value": category_data["category"],
-                        "avg_confidence": category_data["avg_confidence"],
+                        "category": category,
+                        "value": contract_type,
+                        "inference_success_rate": rate,
                     }
                 )
 
-        # Analyze low confidence patterns
-        if low_confidence:
-            contract_types = defaultdict(int)
-            for contract in low_confidence:
-                contract_types[contract["contract_type"]] += 1
-
-            insights["low_confidence_patterns"] = [
-                {
-                    "contract_type": contract_type,
-                    "count": count,
-                    "percentage": count / len(low_confidence) * 100,
-                }
-                for contract_type, count in contract_types.items()
-            ]
-
         return insights
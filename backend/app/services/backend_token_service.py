@@ -16,6 +16,7 @@ import jwt
 import redis.asyncio as redis
 
 from app.core.config import get_settings
+from app.core.verified_claims import invalidate_verified_claims
 from app.clients.factory import get_service_supabase_client
 import base64
 
@@ -102,6 +103,7 @@ class BackendTokenService:
     @classmethod
     async def _delete_token_data(cls, backend_token: str) -> bool:
         """Delete token data from Redis."""
+        invalidate_verified_claims(backend_token)
         try:
             client = await cls._get_redis_client()
             key = f"{cls._redis_prefix}{backend_token}"
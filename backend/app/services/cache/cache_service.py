@@ -194,9 +194,10 @@ class CacheService:
 
                 # Get contract_id from shared contracts table using repository
                 contracts_repo = ContractsRepository()
-                contract = await contracts_repo.get_contract_by_content_hash(content_hash)
-                
-                contract_id = str(contract.id) if contract else None
+                contract_id = await contracts_repo.get_contract_id_by_content_hash(
+                    content_hash
+                )
+                contract_id = str(contract_id) if contract_id else None
 
                 logger.info(
                     f"Created user records from cache hit: doc={document_id}, contract={contract_id}, analysis={analysis_id}"
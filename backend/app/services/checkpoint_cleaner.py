@@ -75,6 +75,17 @@ class CheckpointCleaner:
                 logger.warning(f"Failed to clear progress records: {progress_error}")
                 cleanup_results["progress_clear_error"] = str(progress_error)
             
+            # Clear LangGraph workflow checkpoints so the next run starts fresh
+            try:
+                cleanup_results["checkpoints_cleared"] = (
+                    await self._clear_workflow_thread(content_hash, user_id)
+                )
+            except Exception as checkpoint_error:
+                logger.warning(
+                    f"Failed to clear workflow checkpoints: {checkpoint_error}"
+                )
+                cleanup_results["checkpoint_clear_error"] = str(checkpoint_error)
+
             # Note: Task recovery checkpoints are typically handled by the task recovery system
             # We'll add a marker in the cleanup results to indicate checkpoint clearing is needed
             cleanup_results["checkpoint_clear_recommended"] = True
@@ -148,6 +159,71 @@ class CheckpointCleaner:
                 "success": False
             }
     
+    async def clear_expired_workflow_checkpoints(
+        self,
+        max_age_hours: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Delete LangGraph workflow checkpoint threads that have not been updated
+        within the TTL (``workflow_checkpoint_ttl_hours`` by default).
+        
+        Completed analyses delete their own threads; this removes the ones
+        left behind by runs that were never resumed.
+        
+        Args:
+            max_age_hours: Override for the checkpoint TTL in hours
+            
+        Returns:
+            Dict containing cleanup statistics
+        """
+        from app.agents.checkpointer import get_workflow_checkpointer
+        from app.core.config import get_settings
+
+        ttl_hours = max_age_hours or get_settings().workflow_checkpoint_ttl_hours
+        checkpointer = get_workflow_checkpointer()
+        if checkpointer is None:
+            return {
+                "cleared_at": datetime.now(timezone.utc).isoformat(),
+                "threads_cleared": 0,
+                "skipped": "workflow checkpointing disabled",
+                "success": True
+            }
+
+        try:
+            threads_cleared = await checkpointer.adelete_expired(ttl_hours)
+            logger.info(
+                f"Cleared {threads_cleared} workflow checkpoint threads older than {ttl_hours} hours"
+            )
+            return {
+                "cleared_at": datetime.now(timezone.utc).isoformat(),
+                "max_age_hours": ttl_hours,
+                "threads_cleared": threads_cleared,
+                "success": True
+            }
+        except Exception as e:
+            logger.error(f"Failed to clear expired workflow checkpoints: {e}", exc_info=True)
+            return {
+                "cleared_at": datetime.now(timezone.utc).isoformat(),
+                "error": str(e),
+                "success": False
+            }
+
+    async def _clear_workflow_thread(self, content_hash: str, user_id: str) -> int:
+        """Delete the workflow checkpoint thread for a document; returns threads cleared."""
+        from app.agents.checkpointer import (
+            get_workflow_checkpointer,
+            workflow_thread_id,
+        )
+
+        checkpointer = get_workflow_checkpointer()
+        thread_id = workflow_thread_id(
+            {"user_id": user_id, "content_hash": content_hash}
+        )
+        if checkpointer is None or thread_id is None:
+            return 0
+        await checkpointer.adelete_thread(thread_id)
+        return 1
+
     async def validate_processing_can_restart(
         self,
         content_hash: str,
@@ -0,0 +1,374 @@
+"""
+Read-through cache of contracts by content hash.
+
+The same hot content hashes are read by the websocket cache checks, every
+step's LLM nodes, the background tasks and the routers. `ContractsRepository`
+serves those reads from a process-local LRU (optionally backed by a shared
+Redis copy) and invalidates an entry from each of its write methods.
+
+Entries hold the full contract as the service role reads it, which is more
+than a given user may see. A user-scoped repository is only served a cached
+contract after `has_access` confirms, on the user's own connection and so
+under the contracts RLS policy, that the user can see that content hash;
+positive answers are kept for `contract_cache_access_ttl_seconds`.
+
+Version stamps keep a read that raced a write from caching the old row:
+every invalidation advances a process-wide epoch and records it for the
+hash, and `put` drops a result whose stamp predates the last invalidation.
+The Redis copy carries a per-hash version that writers INCR, so a copy
+written by a slower reader is ignored once the version has moved on.
+
+`invalidate` also publishes the hash on INVALIDATION_CHANNEL; a listener
+thread in every API and worker process drops its local entry. Redis errors
+never fail a read or a write, and `contract_cache_ttl_seconds` bounds the
+staleness of anything a lost message leaves behind.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from app.models.supabase_models import Contract
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "contract_cache:invalidate"
+REDIS_KEY_PREFIX = "contract_cache:"
+REDIS_SOCKET_TIMEOUT_SECONDS = 0.5
+LISTENER_RETRY_SECONDS = 5.0
+
+# Invalidation epochs remembered per hash (older ones are folded into a floor)
+MAX_TRACKED_INVALIDATIONS = 4096
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_SECONDS = 600
+DEFAULT_ACCESS_TTL_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class CacheStamp:
+    """Cache state observed before a database read (see `ContractCache.put`)."""
+
+    epoch: int
+    remote_version: Optional[int] = None
+
+
+class ContractCache:
+    """Bounded LRU of contracts keyed by content hash."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        access_ttl_seconds: float = DEFAULT_ACCESS_TTL_SECONDS,
+        redis_enabled: bool = False,
+        broadcast: bool = False,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = ttl_seconds
+        self.access_ttl_seconds = access_ttl_seconds
+        self.redis_enabled = redis_enabled
+        self.broadcast = broadcast
+        self._entries: "OrderedDict[str, Tuple[Contract, float]]" = OrderedDict()
+        self._access: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._epoch = 0
+        self._forgotten_epoch = 0
+        self._lock = threading.Lock()
+        self._origin = uuid.uuid4().hex
+        self._redis: Any = None
+        self._redis_pid: Optional[int] = None
+        self._listener_pid: Optional[int] = None
+        self.hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def lookup(self, content_hash: str) -> Tuple[Optional[Contract], CacheStamp]:
+        """
+        Cached contract for ``content_hash``, plus the stamp to `put` a
+        freshly read one with on a miss. Returned contracts are copies.
+        """
+        self._ensure_listener()
+        with self._lock:
+            contract = self._get_local(content_hash)
+            stamp = CacheStamp(self._epoch)
+            if contract is not None:
+                self.hits += 1
+                return contract.model_copy(deep=True), stamp
+
+        if self.redis_enabled:
+            try:
+                contract, version = await asyncio.to_thread(
+                    self._remote_get, content_hash
+                )
+            except Exception as e:
+                logger.warning(f"Contract cache Redis read failed: {e}")
+            else:
+                stamp = CacheStamp(stamp.epoch, version)
+                if contract is not None:
+                    with self._lock:
+                        self.remote_hits += 1
+                        self._store_local(content_hash, contract, stamp)
+                    return contract.model_copy(deep=True), stamp
+
+        with self._lock:
+            self.misses += 1
+        return None, stamp
+
+    async def put(
+        self, content_hash: str, contract: Contract, stamp: CacheStamp
+    ) -> bool:
+        """Cache a contract read after `lookup` returned ``stamp``."""
+        with self._lock:
+            if not self._store_local(content_hash, contract, stamp):
+                self.stale_puts += 1
+                return False
+        if self.redis_enabled and stamp.remote_version is not None:
+            try:
+                await asyncio.to_thread(
+                    self._remote_set, content_hash, contract, stamp.remote_version
+                )
+            except Exception as e:
+                logger.warning(f"Contract cache Redis write failed: {e}")
+        return True
+
+    def has_access(self, user_id: Any, content_hash: str) -> bool:
+        key = (str(user_id), content_hash)
+        with self._lock:
+            expires_at = self._access.get(key)
+            if expires_at is None:
+                return False
+            if time.monotonic() >= expires_at:
+                del self._access[key]
+                return False
+            self._access.move_to_end(key)
+            return True
+
+    def grant_access(self, user_id: Any, content_hash: str) -> None:
+        """Remember that ``user_id`` passed the RLS check for ``content_hash``."""
+        if self.access_ttl_seconds <= 0:
+            return
+        key = (str(user_id), content_hash)
+        with self._lock:
+            self._access[key] = time.monotonic() + self.access_ttl_seconds
+            self._access.move_to_end(key)
+            while len(self._access) > self.max_entries * 4:
+                self._access.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    async def invalidate(self, content_hash: str) -> None:
+        """Drop ``content_hash`` here, in Redis and (via pub/sub) in other processes."""
+        self.invalidate_local(content_hash)
+        if not (self.redis_enabled or self.broadcast):
+            return
+        try:
+            await asyncio.to_thread(self._remote_invalidate, content_hash)
+        except Exception as e:
+            logger.warning(
+                f"Contract cache invalidation not propagated: {e}",
+                extra={"content_hash": content_hash},
+            )
+
+    def invalidate_local(self, content_hash: str) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._invalidated[content_hash] = self._epoch
+            self._invalidated.move_to_end(content_hash)
+            while len(self._invalidated) > MAX_TRACKED_INVALIDATIONS:
+                _, epoch = self._invalidated.popitem(last=False)
+                self._forgotten_epoch = max(self._forgotten_epoch, epoch)
+            if self._entries.pop(content_hash, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._forgotten_epoch = self._epoch
+            self._invalidated.clear()
+            self._entries.clear()
+            self._access.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.remote_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "remote_hits": self.remote_hits,
+                "misses": self.misses,
+                "hit_rate": round(
+                    (self.hits + self.remote_hits) / lookups if lookups else 0.0, 3
+                ),
+                "invalidations": self.invalidations,
+                "stale_puts": self.stale_puts,
+                "access_grants": len(self._access),
+                "redis_enabled": self.redis_enabled,
+                "broadcast": self.broadcast,
+            }
+
+    # ------------------------------------------------------------------
+    # Local LRU (callers hold the lock)
+    # ------------------------------------------------------------------
+
+    def _get_local(self, content_hash: str) -> Optional[Contract]:
+        entry = self._entries.get(content_hash)
+        if entry is None:
+            return None
+        contract, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[content_hash]
+            return None
+        self._entries.move_to_end(content_hash)
+        return contract
+
+    def _store_local(
+        self, content_hash: str, contract: Contract, stamp: CacheStamp
+    ) -> bool:
+        last_invalidated = self._invalidated.get(content_hash, self._forgotten_epoch)
+        if last_invalidated > stamp.epoch:
+            return False
+        if self.ttl_seconds <= 0:
+            return True
+        self._entries[content_hash] = (
+            contract.model_copy(deep=True),
+            time.monotonic() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(content_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    # ------------------------------------------------------------------
+    # Redis (blocking client, run in a thread so any event loop can use it)
+    # ------------------------------------------------------------------
+
+    def _client(self) -> Any:
+        if self._redis is None or self._redis_pid != os.getpid():
+            import redis
+
+            from app.core.config import get_settings
+
+            self._redis = redis.Redis.from_url(
+                get_settings().redis_url,
+                decode_responses=True,
+                socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+            )
+            self._redis_pid = os.getpid()
+        return self._redis
+
+    def _remote_get(self, content_hash: str) -> Tuple[Optional[Contract], int]:
+        payload, version = self._client().mget(
+            REDIS_KEY_PREFIX + content_hash, f"{REDIS_KEY_PREFIX}v:{content_hash}"
+        )
+        version = int(version or 0)
+        if payload:
+            data = json.loads(payload)
+            if data.get("v") == version:
+                return Contract.model_validate(data["contract"]), version
+        return None, version
+
+    def _remote_set(self, content_hash: str, contract: Contract, version: int) -> None:
+        payload = json.dumps(
+            {"v": version, "contract": contract.model_dump(mode="json")}
+        )
+        self._client().set(
+            REDIS_KEY_PREFIX + content_hash, payload, ex=int(self.ttl_seconds) or None
+        )
+
+    def _remote_invalidate(self, content_hash: str) -> None:
+        pipe = self._client().pipeline(transaction=False)
+        if self.redis_enabled:
+            version_key = f"{REDIS_KEY_PREFIX}v:{content_hash}"
+            pipe.incr(version_key)
+            # Outlives any payload stamped with an older version
+            pipe.expire(version_key, int(self.ttl_seconds) + 60)
+            pipe.delete(REDIS_KEY_PREFIX + content_hash)
+        if self.broadcast:
+            pipe.publish(INVALIDATION_CHANNEL, f"{self._origin}:{content_hash}")
+        pipe.execute()
+
+    def _ensure_listener(self) -> None:
+        if not self.broadcast or self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+        threading.Thread(
+            target=self._listen, name="contract-cache-invalidation", daemon=True
+        ).start()
+
+    def _listen(self) -> None:
+        """Apply invalidations published by other processes (runs forever)."""
+        import redis
+
+        from app.core.config import get_settings
+
+        subscribed_before = False
+        while True:
+            try:
+                client = redis.Redis.from_url(
+                    get_settings().redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                )
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                if subscribed_before:
+                    # Messages may have been missed while disconnected
+                    self.clear()
+                subscribed_before = True
+                for message in pubsub.listen():
+                    origin, _, content_hash = str(message.get("data", "")).partition(
+                        ":"
+                    )
+                    if content_hash and origin != self._origin:
+                        self.invalidate_local(content_hash)
+            except Exception as e:
+                logger.warning(f"Contract cache invalidation listener error: {e}")
+                time.sleep(LISTENER_RETRY_SECONDS)
+
+
+_cache: Optional[ContractCache] = None
+
+
+def get_contract_cache() -> Optional[ContractCache]:
+    """Process-wide contract cache, or None when `contract_cache_enabled` is off."""
+    global _cache
+    if _cache is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+        if not settings.contract_cache_enabled:
+            return None
+        _cache = ContractCache(
+            settings.contract_cache_max_entries,
+            settings.contract_cache_ttl_seconds,
+            settings.contract_cache_access_ttl_seconds,
+            redis_enabled=settings.contract_cache_redis_enabled,
+            broadcast=settings.contract_cache_broadcast,
+        )
+    return _cache
+
+
+def reset_contract_cache(cache: Optional[ContractCache] = None) -> None:
+    """Replace the process-wide cache (None: rebuilt from settings on next use)."""
+    global _cache
+    _cache = cache
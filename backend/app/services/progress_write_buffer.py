@@ -0,0 +1,234 @@
+"""
+Coalescing write-behind buffer for analysis progress.
+
+`update_analysis_progress` used to upsert `analysis_progress` on every
+progress tick. During a Step 2 fan-out that is dozens of small writes per
+second per analysis, almost all of them overwritten within the same second.
+
+The buffer keeps only the latest update per (content_hash, user_id) and
+writes it when the key was last flushed more than
+`progress_flush_interval_seconds` ago:
+
+- the first progress update for a key is written immediately, so a new
+  analysis shows up as soon as it is queued
+- an update that is not due yet arms a per-user deadline timer that writes
+  the user's pending progress once the interval has passed, so the latest
+  value lands even if no further update arrives
+- terminal progress ("completed"/"failed") is written synchronously,
+  retried, and kept pending if every attempt fails
+- `flush_user` writes everything still pending for a user; background tasks
+  call it when they leave their auth context (see `task_auth_context`)
+
+Writes go through the user-scoped repository, so a key is only ever flushed
+from a context authenticated as that key's user.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.services.repositories.analysis_progress_repository import (
+    AnalysisProgressRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_PROGRESS_STATUSES = ("completed", "failed")
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 2.0
+# Terminal writes must land: retried before being left pending for flush_user
+TERMINAL_WRITE_ATTEMPTS = 3
+TERMINAL_RETRY_DELAY_SECONDS = 0.5
+
+ProgressKey = Tuple[str, str]
+
+
+class ProgressWriteBuffer:
+    """Latest-value-per-key buffer in front of progress upserts."""
+
+    def __init__(self, flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS):
+        self.flush_interval_seconds = max(0.0, float(flush_interval_seconds))
+        self._lock = threading.Lock()
+        self._progress: Dict[ProgressKey, Dict[str, Any]] = {}
+        self._progress_flushed_at: Dict[ProgressKey, float] = {}
+        # Highest percent recorded per key (pending or written)
+        self._last_percent: Dict[ProgressKey, int] = {}
+        # Deadline flush per user with pending progress
+        self._progress_timers: Dict[str, asyncio.TimerHandle] = {}
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self.updates = 0
+        self.writes = 0
+        self.failed_writes = 0
+
+    # ------------------------------------------------------------------
+    # Analysis progress
+    # ------------------------------------------------------------------
+
+    async def record_progress(
+        self, content_hash: str, user_id: str, progress_data: Dict[str, Any]
+    ) -> bool:
+        """Buffer a progress update; returns False only if a due write failed."""
+        key = (content_hash, str(user_id))
+        now = time.monotonic()
+        with self._lock:
+            self.updates += 1
+            percent = int(progress_data.get("progress_percent") or 0)
+            pending = self._progress.get(key)
+            if pending is not None:
+                # Same monotonic rule as the upsert (GREATEST on progress_percent)
+                percent = max(percent, int(pending.get("progress_percent") or 0))
+                progress_data = {**progress_data, "progress_percent": percent}
+            self._progress[key] = progress_data
+            self._last_percent[key] = max(percent, self._last_percent.get(key, 0))
+            flushed_at = self._progress_flushed_at.get(key)
+            due = (
+                progress_data.get("status") in TERMINAL_PROGRESS_STATUSES
+                or flushed_at is None
+                or now - flushed_at >= self.flush_interval_seconds
+            )
+        if not due:
+            self._schedule_progress_flush(key[1])
+            return True
+        return await self.flush_progress(content_hash, user_id)
+
+    def _schedule_progress_flush(self, user_id: str) -> None:
+        """Arm the user's deadline flush unless one is already pending.
+
+        The timer callback runs in the context captured here, so the write is
+        made authenticated as the user who recorded the update.
+        """
+        with self._lock:
+            if user_id in self._progress_timers:
+                return
+            self._progress_timers[user_id] = asyncio.get_running_loop().call_later(
+                self.flush_interval_seconds, self._on_progress_deadline, user_id
+            )
+
+    def _on_progress_deadline(self, user_id: str) -> None:
+        with self._lock:
+            self._progress_timers.pop(user_id, None)
+            keys = [key for key in self._progress if key[1] == user_id]
+        if not keys:
+            return
+        task = asyncio.get_running_loop().create_task(self._flush_progress_keys(keys))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    def latest_percent(self, content_hash: str, user_id: str) -> Optional[int]:
+        """Highest progress recorded through this buffer (None if not seen)."""
+        with self._lock:
+            return self._last_percent.get((content_hash, str(user_id)))
+
+    async def flush_progress(self, content_hash: str, user_id: str) -> bool:
+        return await self._flush_progress_keys([(content_hash, str(user_id))])
+
+    async def _flush_progress_keys(self, keys: List[ProgressKey]) -> bool:
+        """Write the pending updates for ``keys``; several go in one statement."""
+        now = time.monotonic()
+        with self._lock:
+            batch: Dict[ProgressKey, Dict[str, Any]] = {}
+            for key in keys:
+                data = self._progress.pop(key, None)
+                if data is not None:
+                    batch[key] = data
+                    self._progress_flushed_at[key] = now
+        if not batch:
+            return True
+        terminal = any(
+            data.get("status") in TERMINAL_PROGRESS_STATUSES for data in batch.values()
+        )
+
+        records = [(key[0], key[1], data) for key, data in batch.items()]
+
+        async def write():
+            repo = AnalysisProgressRepository()
+            if len(records) == 1:
+                return await repo.upsert_progress(*records[0])
+            return await repo.upsert_progress_many(records)
+
+        ok = await self._write(
+            write, attempts=TERMINAL_WRITE_ATTEMPTS if terminal else 1
+        )
+        with self._lock:
+            for key, data in batch.items():
+                if not ok:
+                    # Keep it for the next flush unless a newer update replaced it
+                    self._progress.setdefault(key, data)
+                    logger.warning(
+                        f"Progress write for content_hash {key[0]} failed; "
+                        f"kept pending (status={data.get('status')})"
+                    )
+                elif (
+                    data.get("status") in TERMINAL_PROGRESS_STATUSES
+                    and key not in self._progress
+                ):
+                    self._progress_flushed_at.pop(key, None)
+                    self._last_percent.pop(key, None)
+        return ok
+
+    # ------------------------------------------------------------------
+    # Shared
+    # ------------------------------------------------------------------
+
+    async def flush_user(self, user_id: str) -> bool:
+        """Write everything pending for ``user_id``."""
+        with self._lock:
+            timer = self._progress_timers.pop(str(user_id), None)
+            progress_keys: List[ProgressKey] = [
+                key for key in self._progress if key[1] == str(user_id)
+            ]
+        if timer is not None:
+            timer.cancel()
+        return await self._flush_progress_keys(progress_keys)
+
+    async def _write(self, write, attempts: int) -> bool:
+        for attempt in range(attempts):
+            try:
+                # upsert_progress reports failure by returning False
+                result = await write()
+                if result is not False:
+                    with self._lock:
+                        self.writes += 1
+                    return True
+            except Exception as e:
+                logger.warning(f"Buffered progress write failed: {e}")
+            with self._lock:
+                self.failed_writes += 1
+            if attempt + 1 < attempts:
+                await asyncio.sleep(TERMINAL_RETRY_DELAY_SECONDS)
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "updates": self.updates,
+                "writes": self.writes,
+                "failed_writes": self.failed_writes,
+                "pending_progress": len(self._progress),
+            }
+
+
+_buffer: Optional[ProgressWriteBuffer] = None
+
+
+def get_progress_write_buffer() -> ProgressWriteBuffer:
+    global _buffer
+    if _buffer is None:
+        try:
+            from app.core.config import get_settings
+
+            _buffer = ProgressWriteBuffer(
+                get_settings().progress_flush_interval_seconds
+            )
+        except Exception as e:
+            logger.warning(f"Using default progress buffer settings: {e}")
+            _buffer = ProgressWriteBuffer()
+    return _buffer
+
+
+def reset_progress_write_buffer() -> None:
+    """Drop the process-wide buffer (settings are re-read on next use)."""
+    global _buffer
+    _buffer = None
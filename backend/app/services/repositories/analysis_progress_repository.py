@@ -6,7 +6,7 @@ Progress records are user-scoped and this repository provides CRUD operations
 with integrated JWT-based authentication.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from uuid import UUID
 from dataclasses import dataclass
 from datetime import datetime
@@ -17,6 +17,16 @@ from app.database.connection import get_user_connection
 logger = logging.getLogger(__name__)
 
 
+def _normalize_started_at(value: Any) -> Optional[datetime]:
+    """Coerce an ISO string ``step_started_at`` to a datetime (None if invalid)."""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except Exception:
+            return None
+    return value
+
+
 @dataclass
 class AnalysisProgress:
     """Analysis Progress model aligned with current `analysis_progress` schema."""
@@ -87,17 +97,9 @@ class AnalysisProgressRepository:
                     },
                 )
                 # Normalize datetime: ensure step_started_at is a datetime instance
-                norm_step_started_at = progress_data.get("step_started_at")
-                if isinstance(norm_step_started_at, str):
-                    try:
-                        norm_step_started_at = norm_step_started_at.replace(
-                            "Z", "+00:00"
-                        )
-                        norm_step_started_at = datetime.fromisoformat(
-                            norm_step_started_at
-                        )
-                    except Exception:
-                        norm_step_started_at = None
+                norm_step_started_at = _normalize_started_at(
+                    progress_data.get("step_started_at")
+                )
 
                 await conn.execute(
                     """
@@ -150,6 +152,80 @@ class AnalysisProgressRepository:
                 )
                 return False
 
+    async def upsert_progress_many(
+        self, records: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> bool:
+        """
+        Upsert several progress records in one statement.
+
+        Same conflict handling as `upsert_progress` (progress_percent never
+        moves backwards); rows are unnested from parallel arrays so the write
+        is one round trip under the caller's RLS context.
+
+        Args:
+            records: (content_hash, user_id, progress_data) tuples; for a
+                repeated key the last record wins
+
+        Returns:
+            True if upsert successful, False otherwise
+        """
+        latest: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for content_hash, user_id, progress_data in records:
+            # ON CONFLICT cannot touch the same row twice in one statement
+            latest[(content_hash, str(user_id))] = progress_data
+        if not latest:
+            return True
+
+        columns: Tuple[List[Any], ...] = tuple([] for _ in range(9))
+        for (content_hash, user_id), data in latest.items():
+            values = (
+                content_hash,
+                UUID(user_id),
+                data.get("current_step"),
+                data.get("progress_percent"),
+                data.get("step_description"),
+                _normalize_started_at(data.get("step_started_at")),
+                data.get("estimated_completion_minutes"),
+                data.get("status", "in_progress"),
+                data.get("error_message"),
+            )
+            for column, value in zip(columns, values):
+                column.append(value)
+
+        async with get_user_connection(self.user_id) as conn:
+            try:
+                await conn.execute(
+                    """
+                    INSERT INTO analysis_progress (
+                        content_hash, user_id, current_step, progress_percent,
+                        step_description, step_started_at, estimated_completion_minutes,
+                        status, error_message, updated_at
+                    )
+                    SELECT r.*, NOW()
+                    FROM unnest(
+                        $1::text[], $2::uuid[], $3::text[], $4::int[], $5::text[],
+                        $6::timestamptz[], $7::int[], $8::text[], $9::text[]
+                    ) AS r
+                    ON CONFLICT (content_hash, user_id)
+                    DO UPDATE SET
+                        current_step = EXCLUDED.current_step,
+                        progress_percent = GREATEST(analysis_progress.progress_percent, EXCLUDED.progress_percent),
+                        step_description = EXCLUDED.step_description,
+                        step_started_at = EXCLUDED.step_started_at,
+                        estimated_completion_minutes = EXCLUDED.estimated_completion_minutes,
+                        status = EXCLUDED.status,
+                        error_message = EXCLUDED.error_message,
+                        updated_at = NOW()
+                    """,
+                    *columns,
+                )
+                return True
+            except Exception as e:
+                logger.error(
+                    f"Failed to upsert {len(latest)} analysis progress records: {e}"
+                )
+                return False
+
     async def get_latest_progress(
         self, content_hash: str, user_id: str, columns: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
@@ -7,17 +7,224 @@ consistently by the Supabase stack, avoiding direct Postgres permission
 discrepancies across environments.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 import json
 from uuid import UUID
 from datetime import datetime, date
 import logging
 
+from app.database import statements
 from app.database.connection import get_service_role_connection, get_user_connection
 from app.models.supabase_models import Contract
+from app.services.contract_cache import ContractCache, get_contract_cache
+from app.utils.pagination import decode_cursor, keyset_page
 
 logger = logging.getLogger(__name__)
 
+# Per-section JSONB columns that `get_contract_by_content_hash` exposes on the
+# Contract model, i.e. the ones a node can short-circuit from
+SECTION_ANALYSIS_SNAPSHOT_KEYS = (
+    "extracted_entity",
+    "extracted_sections",
+    "parties_property",
+    "financial_terms",
+    "conditions",
+    "warranties",
+    "default_termination",
+    "image_semantics",
+    "settlement_logistics",
+    "title_encumbrances",
+    "adjustments_outgoings",
+    "disclosure_compliance",
+    "special_risks",
+    "cross_section_validation",
+    "diagram_risks",
+    # Step 3 synthesis
+    "risk_summary",
+    "action_plan",
+    "compliance_summary",
+    "buyer_report",
+)
+
+# Non-JSONB columns `get_contract_by_content_hash(columns=...)` can project
+CONTRACT_SCALAR_COLUMNS = (
+    "contract_type",
+    "purchase_method",
+    "use_category",
+    "state",
+    "raw_text",
+    "property_address",
+    "updated_by",
+)
+# Always selected: required by the Contract model
+_CONTRACT_KEY_COLUMNS = ("id", "content_hash", "created_at", "updated_at")
+
+# Names of the non-empty per-section columns, evaluated server-side
+_POPULATED_KEYS_SQL = "array_remove(ARRAY[{}]::text[], NULL)".format(
+    ", ".join(
+        f"CASE WHEN jsonb_typeof({key}) = 'object' AND {key} <> '{{}}'::jsonb "
+        f"THEN '{key}' END"
+        for key in SECTION_ANALYSIS_SNAPSHOT_KEYS
+    )
+)
+
+CONTRACT_ID_BY_HASH = statements.register_statement(
+    "contracts.id_by_content_hash", "SELECT id FROM contracts WHERE content_hash = $1"
+)
+# Evaluated on the user's connection, i.e. under the contracts RLS policy
+CONTRACT_VISIBLE_BY_HASH = statements.register_statement(
+    "contracts.visible_by_content_hash",
+    "SELECT EXISTS (SELECT 1 FROM contracts WHERE content_hash = $1)",
+)
+CONTRACT_STATUS_BY_HASH = statements.register_statement(
+    "contracts.status_by_content_hash",
+    f"""
+    SELECT id, content_hash, contract_type, state, updated_at,
+           raw_text IS NOT NULL AND raw_text <> '' AS has_raw_text,
+           {_POPULATED_KEYS_SQL} AS populated
+    FROM contracts
+    WHERE content_hash = $1
+    """,
+)
+CONTRACT_ANALYSIS_SNAPSHOT = statements.register_statement(
+    "contracts.analysis_snapshot",
+    f"""
+    SELECT {_POPULATED_KEYS_SQL} AS populated,
+           COALESCE(analysis_fingerprints, '{{}}'::jsonb) AS fingerprints
+    FROM contracts
+    WHERE content_hash = $1
+    """,
+)
+
+
+def _contract_statement(columns: Optional[Sequence[str]]) -> str:
+    """Registered by-content-hash statement selecting ``columns`` (None: all)."""
+    if columns is None:
+        selected = CONTRACT_SCALAR_COLUMNS + SECTION_ANALYSIS_SNAPSHOT_KEYS
+        name = "contracts.by_content_hash"
+    else:
+        unknown = set(columns) - set(CONTRACT_SCALAR_COLUMNS) - set(
+            SECTION_ANALYSIS_SNAPSHOT_KEYS
+        )
+        if unknown:
+            raise ValueError(f"Unsupported contract columns: {sorted(unknown)}")
+        selected = tuple(sorted(set(columns)))
+        name = f"contracts.by_content_hash[{','.join(selected)}]"
+    select_list = ", ".join(_CONTRACT_KEY_COLUMNS + tuple(selected))
+    return statements.register_statement(
+        name, f"SELECT {select_list} FROM contracts WHERE content_hash = $1"
+    )
+
+
+# Slim projection for list views, paged by keyset on (created_at, id); the
+# (filter, created_at, id) indexes INCLUDE these columns for index-only scans
+CONTRACT_LIST_ITEM_COLUMNS = (
+    "id",
+    "content_hash",
+    "contract_type",
+    "purchase_method",
+    "use_category",
+    "state",
+    "created_at",
+    "updated_at",
+)
+CONTRACT_LIST_FILTERS = ("contract_type", "state", "purchase_method", "use_category")
+
+
+# contract_daily_rollups (maintained by trigger; see migration 20240101000015)
+_ROLLUP_DIMENSIONS = "contract_type, state, purchase_method, use_category"
+CONTRACT_ROLLUP_BUCKETS = statements.register_statement(
+    "contracts.rollup_buckets",
+    f"""
+    SELECT {_ROLLUP_DIMENSIONS}, SUM(contract_count)::bigint AS count
+    FROM contract_daily_rollups
+    GROUP BY {_ROLLUP_DIMENSIONS}
+    HAVING SUM(contract_count) > 0
+    """,
+)
+CONTRACT_ROLLUP_BUCKETS_IN_RANGE = statements.register_statement(
+    "contracts.rollup_buckets_in_range",
+    f"""
+    SELECT {_ROLLUP_DIMENSIONS}, SUM(contract_count)::bigint AS count
+    FROM contract_daily_rollups
+    WHERE day BETWEEN $1 AND $2
+    GROUP BY {_ROLLUP_DIMENSIONS}
+    HAVING SUM(contract_count) > 0
+    """,
+)
+CONTRACT_DAILY_ROLLUPS = statements.register_statement(
+    "contracts.daily_rollups",
+    f"""
+    SELECT day, {_ROLLUP_DIMENSIONS}, contract_count AS count
+    FROM contract_daily_rollups
+    WHERE day BETWEEN $1 AND $2 AND contract_count > 0
+    ORDER BY day DESC, contract_count DESC
+    """,
+)
+
+
+def _contract_page_statement(
+    filters: Sequence[str], after_cursor: bool, user_scoped: bool = False
+) -> str:
+    """Registered keyset page statement for a combination of equality filters.
+
+    User-scoped pages take the user id as $2 and are driven from that user's
+    documents (idx_documents_user_content_hash) instead of walking the global
+    (created_at, id) index and leaving RLS to discard other users' contracts.
+    """
+    first = 3 if user_scoped else 2
+    conditions = [f"{column} = ${i}" for i, column in enumerate(filters, start=first)]
+    if user_scoped:
+        conditions.insert(
+            0, "content_hash IN (SELECT content_hash FROM documents WHERE user_id = $2)"
+        )
+    if after_cursor:
+        n = len(filters) + first
+        conditions.append(f"(created_at, id) < (${n}, ${n + 1})")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    name = "contracts.page{}[{}]{}".format(
+        ".user" if user_scoped else "",
+        ",".join(filters),
+        ".after" if after_cursor else "",
+    )
+    return statements.register_statement(
+        name,
+        f"""
+        SELECT {", ".join(CONTRACT_LIST_ITEM_COLUMNS)}
+        FROM contracts
+        {where}
+        ORDER BY created_at DESC, id DESC
+        LIMIT $1
+        """,
+    )
+
+
+def _normalize_json(value: Optional[Any]) -> Dict[str, Any]:
+    if value is None:
+        return {}
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+            return parsed if isinstance(parsed, dict) else {}
+        except Exception:
+            return {}
+    return {}
+
+
+def _contract_from_row(row: Any) -> Contract:
+    """Build a Contract from a (possibly projected) contracts row."""
+    present = set(row.keys())
+    fields: Dict[str, Any] = {key: row[key] for key in _CONTRACT_KEY_COLUMNS}
+    for key in CONTRACT_SCALAR_COLUMNS:
+        if key in present:
+            fields[key] = row[key]
+    for key in SECTION_ANALYSIS_SNAPSHOT_KEYS:
+        if key in present:
+            fields[key] = _normalize_json(row[key])
+    return Contract(**fields)
+
 
 class ContractsRepository:
     """Repository for contract operations.
@@ -333,6 +540,8 @@ class ContractsRepository:
                 )
                 raise
 
+        await self._invalidate_cached(content_hash)
+
         # Normalize JSON fields in case the driver returns strings instead of dicts
         def _normalize_json(value: Optional[Any]) -> Dict[str, Any]:
             if value is None:
@@ -402,10 +611,13 @@ class ContractsRepository:
         key: str,  # must be one of the per-section column names
         value: Dict[str, Any],
         updated_by: Optional[str] = None,
+        fingerprint: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """Concurrent-safe upsert/replace of a single per-section JSONB column on contracts.
 
         Uses pg_advisory_xact_lock(content_hash) to serialize concurrent writers for same contract.
+        The input fingerprint of the producing node is stored under the same key in
+        analysis_fingerprints; without one, any stale fingerprint for the key is dropped.
         """
 
         def _json_default(v: Any):
@@ -462,6 +674,15 @@ class ContractsRepository:
                     UPDATE contracts
                     SET {key} = $2::jsonb,
                         updated_by = COALESCE($3, updated_by),
+                        analysis_fingerprints = CASE
+                            WHEN $4::jsonb IS NULL
+                                THEN COALESCE(analysis_fingerprints, '{{}}'::jsonb) - $5::text
+                            ELSE jsonb_set(
+                                COALESCE(analysis_fingerprints, '{{}}'::jsonb),
+                                ARRAY[$5::text],
+                                $4::jsonb
+                            )
+                        END,
                         updated_at = now()
                     WHERE content_hash = $1
                 """
@@ -484,8 +705,46 @@ class ContractsRepository:
                     content_hash,
                     json_value,
                     updated_by,
+                    json.dumps(fingerprint) if fingerprint else None,
+                    key,
                 )
-                return result.split()[-1] == "1"
+        await self._invalidate_cached(content_hash)
+        return result.split()[-1] == "1"
+
+    async def set_analysis_fingerprint(
+        self, content_hash: str, key: str, fingerprint: Dict[str, Any]
+    ) -> bool:
+        """
+        Record the input fingerprint of an analysis column written elsewhere
+        (e.g. extracted_entity, which is persisted through the contract upsert).
+
+        Args:
+            content_hash: SHA-256 hash of contract content
+            key: One of SECTION_ANALYSIS_SNAPSHOT_KEYS
+            fingerprint: Fingerprint from app.agents.node_fingerprint
+
+        Returns:
+            True if the contract row was updated
+        """
+        if key not in SECTION_ANALYSIS_SNAPSHOT_KEYS:
+            raise ValueError(f"Unsupported section key: {key}")
+
+        async with get_service_role_connection() as conn:
+            result = await conn.execute(
+                """
+                UPDATE contracts
+                SET analysis_fingerprints = jsonb_set(
+                    COALESCE(analysis_fingerprints, '{}'::jsonb),
+                    ARRAY[$2::text],
+                    $3::jsonb
+                )
+                WHERE content_hash = $1
+                """,
+                content_hash,
+                key,
+                json.dumps(fingerprint),
+            )
+        return result.split()[-1] == "1"
 
     async def update_image_semantics_for_diagram_type(
         self,
@@ -540,7 +799,34 @@ class ContractsRepository:
                     json.dumps(merge_data, default=_json_default),
                     updated_by,
                 )
-                return result.split()[-1] == "1"
+        await self._invalidate_cached(content_hash)
+        return result.split()[-1] == "1"
+
+    async def _invalidate_cached(self, content_hash: str) -> None:
+        """Drop a written contract from the read-through cache (all processes)."""
+        cache = get_contract_cache()
+        if cache is not None:
+            await cache.invalidate(content_hash)
+
+    async def _user_can_read(self, cache: ContractCache, content_hash: str) -> bool:
+        """
+        Whether this repository's user may see ``content_hash`` under RLS
+        (always true for service-role repositories). Positive answers are
+        remembered by the cache; errors count as no access.
+        """
+        if self.user_id is None or cache.has_access(self.user_id, content_hash):
+            return True
+        try:
+            async with get_user_connection(self.user_id) as conn:
+                visible = await statements.fetchval(
+                    conn, CONTRACT_VISIBLE_BY_HASH, content_hash
+                )
+        except Exception as e:
+            logger.warning(f"Contract access check failed: {e}")
+            return False
+        if visible:
+            cache.grant_access(self.user_id, content_hash)
+        return bool(visible)
 
     async def get_contract_id_by_content_hash(
         self, content_hash: str
@@ -554,149 +840,110 @@ class ContractsRepository:
         Returns:
             Contract ID or None if not found
         """
+        cache = get_contract_cache()
+        if cache is not None:
+            contract, _ = await cache.lookup(content_hash)
+            if contract is not None and await self._user_can_read(cache, content_hash):
+                return contract.id
+
         # Prefer user-scoped read if user_id was provided (RLS enforced)
         if self.user_id is not None:
             async with get_user_connection(self.user_id) as conn:
-                row = await conn.fetchrow(
-                    """
-                    SELECT id FROM contracts WHERE content_hash = $1
-                    """,
-                    content_hash,
+                return await statements.fetchval(
+                    conn, CONTRACT_ID_BY_HASH, content_hash
+                )
+        async with get_service_role_connection() as conn:
+            return await statements.fetchval(conn, CONTRACT_ID_BY_HASH, content_hash)
+
+    async def get_contract_status(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Lightweight existence/status check for a contract.
+
+        No JSONB payload is transferred: analysis columns are reduced to the
+        names of the populated ones server-side.
+
+        Args:
+            content_hash: SHA-256 hash of contract content
+
+        Returns:
+            Dict with id, content_hash, contract_type, state, updated_at,
+            has_raw_text and populated_keys, or None if not found
+        """
+        if self.user_id is not None:
+            async with get_user_connection(self.user_id) as conn:
+                row = await statements.fetchrow(
+                    conn, CONTRACT_STATUS_BY_HASH, content_hash
                 )
         else:
             async with get_service_role_connection() as conn:
-                row = await conn.fetchrow(
-                    "SELECT id FROM contracts WHERE content_hash = $1", content_hash
+                row = await statements.fetchrow(
+                    conn, CONTRACT_STATUS_BY_HASH, content_hash
                 )
-        return row["id"] if row else None
+        if not row:
+            return None
+        return {
+            "id": row["id"],
+            "content_hash": row["content_hash"],
+            "contract_type": row["contract_type"],
+            "state": row["state"],
+            "updated_at": row["updated_at"],
+            "has_raw_text": bool(row["has_raw_text"]),
+            "populated_keys": list(row["populated"] or []),
+        }
 
     async def get_contract_by_content_hash(
-        self, content_hash: str
+        self, content_hash: str, columns: Optional[Sequence[str]] = None
     ) -> Optional[Contract]:
         """
         Get contract by content hash.
 
+        Full reads go through the read-through contract cache
+        (app/services/contract_cache.py); projected reads are served from it
+        on a hit and otherwise read only the requested columns. User-scoped
+        repositories only see contracts visible to their user under RLS, so
+        they use the cache only after `_user_can_read`.
+
         Args:
             content_hash: SHA-256 hash of contract content
+            columns: Optional projection from CONTRACT_SCALAR_COLUMNS and
+                SECTION_ANALYSIS_SNAPSHOT_KEYS; other fields keep their model
+                defaults. Pass only what the caller reads to avoid pulling
+                every analysis JSONB column.
 
         Returns:
             Contract or None if not found
         """
-        row = None
+        cache = get_contract_cache()
+        if cache is not None and await self._user_can_read(cache, content_hash):
+            contract, stamp = await cache.lookup(content_hash)
+            if contract is not None:
+                return contract
+            if columns is None:
+                async with get_service_role_connection() as conn:
+                    row = await statements.fetchrow(
+                        conn, _contract_statement(None), content_hash
+                    )
+                if not row:
+                    return None
+                contract = _contract_from_row(row)
+                await cache.put(content_hash, contract, stamp)
+                return contract
+
+        statement = _contract_statement(columns)
         if self.user_id is not None:
             try:
                 async with get_user_connection(self.user_id) as conn:
-                    row = await conn.fetchrow(
-                        """
-                        SELECT id, content_hash, contract_type, purchase_method, use_category,
-                               COALESCE(ocr_confidence, '{}'::jsonb) as ocr_confidence,
-                               state,
-                               COALESCE(extracted_entity, '{}'::jsonb) as extracted_entity,
-                               COALESCE(extracted_sections, '{}'::jsonb) as extracted_sections,
-                               COALESCE(parties_property, '{}'::jsonb) as parties_property,
-                               COALESCE(financial_terms, '{}'::jsonb) as financial_terms,
-                               COALESCE(conditions, '{}'::jsonb) as conditions,
-                               COALESCE(warranties, '{}'::jsonb) as warranties,
-                               COALESCE(default_termination, '{}'::jsonb) as default_termination,
-                               COALESCE(image_semantics, '{}'::jsonb) as image_semantics,
-                               COALESCE(settlement_logistics, '{}'::jsonb) as settlement_logistics,
-                               COALESCE(title_encumbrances, '{}'::jsonb) as title_encumbrances,
-                               COALESCE(adjustments_outgoings, '{}'::jsonb) as adjustments_outgoings,
-                               COALESCE(disclosure_compliance, '{}'::jsonb) as disclosure_compliance,
-                               COALESCE(special_risks, '{}'::jsonb) as special_risks,
-                               COALESCE(cross_section_validation, '{}'::jsonb) as cross_section_validation,
-                               COALESCE(risk_summary, '{}'::jsonb) as risk_summary,
-                               COALESCE(action_plan, '{}'::jsonb) as action_plan,
-                               COALESCE(compliance_summary, '{}'::jsonb) as compliance_summary,
-                               COALESCE(buyer_report, '{}'::jsonb) as buyer_report,
-                               raw_text, 
-                               property_address, updated_by, created_at, updated_at
-                        FROM contracts
-                        WHERE content_hash = $1
-                        """,
-                        content_hash,
-                    )
-            except Exception:
+                    row = await statements.fetchrow(conn, statement, content_hash)
+            except Exception as e:
+                logger.warning(f"User-scoped contract read failed: {e}")
                 row = None
-        if row is None:
+        else:
             async with get_service_role_connection() as conn:
-                row = await conn.fetchrow(
-                    """
-                SELECT id, content_hash, contract_type, purchase_method, use_category,
-                       state,
-                       COALESCE(extracted_entity, '{}'::jsonb) as extracted_entity,
-                       COALESCE(extracted_sections, '{}'::jsonb) as extracted_sections,
-                       COALESCE(parties_property, '{}'::jsonb) as parties_property,
-                       COALESCE(financial_terms, '{}'::jsonb) as financial_terms,
-                       COALESCE(conditions, '{}'::jsonb) as conditions,
-                       COALESCE(warranties, '{}'::jsonb) as warranties,
-                       COALESCE(default_termination, '{}'::jsonb) as default_termination,
-                       COALESCE(image_semantics, '{}'::jsonb) as image_semantics,
-                       COALESCE(settlement_logistics, '{}'::jsonb) as settlement_logistics,
-                       COALESCE(title_encumbrances, '{}'::jsonb) as title_encumbrances,
-                       COALESCE(adjustments_outgoings, '{}'::jsonb) as adjustments_outgoings,
-                       COALESCE(disclosure_compliance, '{}'::jsonb) as disclosure_compliance,
-                       COALESCE(special_risks, '{}'::jsonb) as special_risks,
-                       COALESCE(cross_section_validation, '{}'::jsonb) as cross_section_validation,
-                       COALESCE(risk_summary, '{}'::jsonb) as risk_summary,
-                       COALESCE(action_plan, '{}'::jsonb) as action_plan,
-                       COALESCE(compliance_summary, '{}'::jsonb) as compliance_summary,
-                       COALESCE(buyer_report, '{}'::jsonb) as buyer_report,
-                       raw_text, 
-                       property_address, updated_by, created_at, updated_at
-                FROM contracts
-                WHERE content_hash = $1
-                """,
-                    content_hash,
-                )
+                row = await statements.fetchrow(conn, statement, content_hash)
 
         if not row:
             return None
-
-        def _normalize_json(value: Optional[Any]) -> Dict[str, Any]:
-            if value is None:
-                return {}
-            if isinstance(value, dict):
-                return value
-            if isinstance(value, str):
-                try:
-                    parsed = json.loads(value)
-                    return parsed if isinstance(parsed, dict) else {}
-                except Exception:
-                    return {}
-            return {}
-
-        return Contract(
-            id=row["id"],
-            content_hash=row["content_hash"],
-            contract_type=row["contract_type"],
-            purchase_method=row.get("purchase_method"),
-            use_category=row.get("use_category"),
-            state=row.get("state") or row.get("australian_state"),
-            extracted_entity=_normalize_json(row.get("extracted_entity")),
-            extracted_sections=_normalize_json(row.get("extracted_sections")),
-            ocr_confidence=_normalize_json(row.get("ocr_confidence")),
-            parties_property=_normalize_json(row.get("parties_property")),
-            financial_terms=_normalize_json(row.get("financial_terms")),
-            conditions=_normalize_json(row.get("conditions")),
-            warranties=_normalize_json(row.get("warranties")),
-            default_termination=_normalize_json(row.get("default_termination")),
-            contract_terms=_normalize_json(row.get("contract_terms")),
-            image_semantics=_normalize_json(row.get("image_semantics")),
-            settlement_logistics=_normalize_json(row.get("settlement_logistics")),
-            title_encumbrances=_normalize_json(row.get("title_encumbrances")),
-            adjustments_outgoings=_normalize_json(row.get("adjustments_outgoings")),
-            disclosure_compliance=_normalize_json(row.get("disclosure_compliance")),
-            special_risks=_normalize_json(row.get("special_risks")),
-            cross_section_validation=_normalize_json(
-                row.get("cross_section_validation")
-            ),
-            raw_text=row.get("raw_text"),
-            property_address=row.get("property_address"),
-            updated_by=row.get("updated_by"),
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
+        return _contract_from_row(row)
 
     async def get_contracts_by_content_hash(
         self, content_hash: str, limit: int = 1
@@ -717,6 +964,75 @@ class ContractsRepository:
         contract = await self.get_contract_by_content_hash(content_hash)
         return ([contract] if contract else [])[: max(0, limit)]
 
+    async def get_populated_analysis_keys(self, content_hash: str) -> List[str]:
+        """
+        List which per-section analysis columns hold a non-empty object.
+
+        Only evaluates the columns server-side; no JSONB payload is transferred.
+
+        Args:
+            content_hash: SHA-256 hash of contract content
+
+        Returns:
+            Populated keys from SECTION_ANALYSIS_SNAPSHOT_KEYS (empty if the
+            contract does not exist)
+        """
+        snapshot = await self.get_analysis_snapshot(content_hash)
+        return snapshot["populated_keys"]
+
+    async def get_analysis_snapshot(self, content_hash: str) -> Dict[str, Any]:
+        """
+        Populated per-section analysis columns plus their input fingerprints.
+
+        Args:
+            content_hash: SHA-256 hash of contract content
+
+        Returns:
+            Dict with "populated_keys" (list) and "fingerprints" (key -> fingerprint)
+        """
+        async with get_service_role_connection() as conn:
+            row = await statements.fetchrow(
+                conn, CONTRACT_ANALYSIS_SNAPSHOT, content_hash
+            )
+        if not row:
+            return {"populated_keys": [], "fingerprints": {}}
+        fingerprints = row.get("fingerprints") or {}
+        if isinstance(fingerprints, str):
+            fingerprints = json.loads(fingerprints)
+        return {
+            "populated_keys": list(row["populated"] or []),
+            "fingerprints": fingerprints,
+        }
+
+    async def get_section_analysis_value(
+        self, content_hash: str, key: str
+    ) -> Dict[str, Any]:
+        """
+        Fetch a single per-section analysis column.
+
+        Args:
+            content_hash: SHA-256 hash of contract content
+            key: One of SECTION_ANALYSIS_SNAPSHOT_KEYS
+
+        Returns:
+            The stored object, or an empty dict when absent
+        """
+        if key not in SECTION_ANALYSIS_SNAPSHOT_KEYS:
+            raise ValueError(f"Unsupported section key: {key}")
+
+        statement = statements.register_statement(
+            f"contracts.section_value[{key}]",
+            f"SELECT {key} FROM contracts WHERE content_hash = $1",
+        )
+        async with get_service_role_connection() as conn:
+            value = await statements.fetchval(conn, statement, content_hash)
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except Exception:
+                return {}
+        return value if isinstance(value, dict) else {}
+
     async def get_contract_by_id(self, contract_id: UUID) -> Optional[Contract]:
         """
         Get contract by ID.
@@ -790,6 +1106,68 @@ class ContractsRepository:
 
     # update_contract_terms removed; contract_terms deprecated
 
+    async def list_contracts_page(
+        self,
+        contract_type: Optional[str] = None,
+        state: Optional[str] = None,
+        purchase_method: Optional[str] = None,
+        use_category: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Page through contracts, newest first, with optional taxonomy filters.
+        With a user_id, only contracts the user holds a document for are
+        listed, found through the user's documents rather than by scanning
+        all contracts.
+
+        Keyset pagination on (created_at, id) with the slim
+        CONTRACT_LIST_ITEM_COLUMNS projection; replaces the OFFSET-based
+        `list_contracts_by_type`, `list_contracts_by_state` and
+        `list_contracts_by_taxonomy` for list views.
+
+        Args:
+            contract_type: Optional contract type filter
+            state: Optional Australian state filter
+            purchase_method: Optional purchase method filter
+            use_category: Optional use category filter
+            limit: Page size
+            cursor: `next_cursor` of the previous page (None for the first)
+
+        Returns:
+            (contracts of this page, cursor of the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        values = {
+            "contract_type": contract_type,
+            "state": state,
+            "purchase_method": purchase_method,
+            "use_category": use_category,
+        }
+        filters = [column for column in CONTRACT_LIST_FILTERS if values[column]]
+        user_scoped = self.user_id is not None
+        params: List[Any] = [limit + 1]
+        if user_scoped:
+            params.append(self.user_id)
+        params.extend(values[column] for column in filters)
+        if cursor:
+            params.extend(decode_cursor(cursor))
+        statement = _contract_page_statement(filters, bool(cursor), user_scoped)
+
+        # User-scoped listings only see contracts the user holds a document
+        # for; the statement selects them and RLS still applies
+        if user_scoped:
+            async with get_user_connection(self.user_id) as conn:
+                rows = await statements.fetch(conn, statement, *params)
+        else:
+            async with get_service_role_connection() as conn:
+                rows = await statements.fetch(conn, statement, *params)
+
+        page, next_cursor = keyset_page(rows, limit)
+        return [dict(row) for row in page], next_cursor
+
     async def list_contracts_by_type(
         self, contract_type: str, limit: int = 50, offset: int = 0
     ) -> List[Contract]:
@@ -947,10 +1325,14 @@ class ContractsRepository:
             True if deletion successful, False otherwise
         """
         async with get_service_role_connection() as conn:
-            result = await conn.execute(
-                "DELETE FROM contracts WHERE id = $1", contract_id
+            content_hash = await conn.fetchval(
+                "DELETE FROM contracts WHERE id = $1 RETURNING content_hash",
+                contract_id,
             )
-            return result.split()[-1] == "1"
+        if content_hash is None:
+            return False
+        await self._invalidate_cached(content_hash)
+        return True
 
     async def list_contracts_by_taxonomy(
         self,
@@ -1121,3 +1503,65 @@ class ContractsRepository:
                     for row in state_rows
                 },
             }
+
+    # ================================
+    # ANALYTICS ROLLUPS
+    # ================================
+
+    async def get_rollup_buckets(
+        self, start_day: Optional[date] = None, end_day: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Contract counts per taxonomy bucket from contract_daily_rollups.
+
+        Args:
+            start_day: Optional first day (inclusive, UTC)
+            end_day: Optional last day (inclusive, UTC)
+
+        Returns:
+            Rows of contract_type, state, purchase_method, use_category and
+            count, summed over the days in range
+        """
+        async with get_service_role_connection() as conn:
+            if start_day is None and end_day is None:
+                rows = await statements.fetch(conn, CONTRACT_ROLLUP_BUCKETS)
+            else:
+                rows = await statements.fetch(
+                    conn,
+                    CONTRACT_ROLLUP_BUCKETS_IN_RANGE,
+                    start_day or date.min,
+                    end_day or date.max,
+                )
+        return [dict(row) for row in rows]
+
+    async def get_daily_rollups(
+        self, start_day: date, end_day: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-day contract counts per taxonomy bucket (zero buckets omitted).
+
+        Args:
+            start_day: First day (inclusive, UTC)
+            end_day: Last day (inclusive, UTC)
+
+        Returns:
+            Rows of day, contract_type, state, purchase_method, use_category
+            and count
+        """
+        async with get_service_role_connection() as conn:
+            rows = await statements.fetch(
+                conn, CONTRACT_DAILY_ROLLUPS, start_day, end_day
+            )
+        return [dict(row) for row in rows]
+
+    async def refresh_daily_rollups(self, since: Optional[date] = None) -> int:
+        """
+        Recompute rollup buckets for days >= since (None: all days).
+
+        Returns:
+            Number of buckets written
+        """
+        async with get_service_role_connection() as conn:
+            return await conn.fetchval(
+                "SELECT refresh_contract_daily_rollups($1)", since
+            )
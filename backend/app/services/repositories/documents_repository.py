@@ -4,21 +4,141 @@ Documents Repository - User-scoped document operations
 This repository handles document operations with user context and RLS enforcement.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import json
 import logging
 from uuid import UUID
 from datetime import datetime
 
+from app.database import statements
 from app.database.connection import get_user_connection
 from app.models.supabase_models import Document
 from app.utils.json_utils import safe_json_loads
+from app.utils.pagination import decode_cursor, keyset_page
 
 logger = logging.getLogger(__name__)
 
 
 # Document model is now imported from app.models.supabase_models
 
+_DOCUMENT_LIST_SQL = """
+    SELECT id, user_id, original_filename, storage_path, file_type, file_size,
+           content_hash, processing_status, processing_started_at,
+           processing_completed_at, processing_errors, artifact_text_id,
+           total_pages, total_word_count, total_text_length, overall_quality_score,
+           extraction_confidence, text_extraction_method, has_diagrams, diagram_count,
+           document_type, australian_state, contract_type, processing_notes,
+           upload_metadata, processing_results, created_at, updated_at
+    FROM documents
+    {where}
+    ORDER BY created_at DESC
+    LIMIT $1 OFFSET $2
+"""
+# One fixed statement per filter shape so each is prepared once per connection
+LIST_USER_DOCUMENTS = statements.register_statement(
+    "documents.list_user", _DOCUMENT_LIST_SQL.format(where="")
+)
+LIST_USER_DOCUMENTS_BY_STATUS = statements.register_statement(
+    "documents.list_user_by_status",
+    _DOCUMENT_LIST_SQL.format(where="WHERE processing_status = $3"),
+)
+
+# Slim projection for list views (no JSONB payloads), paged by keyset on
+# (created_at, id); served by idx_documents_user_created_id and
+# idx_documents_user_status_created_id
+DOCUMENT_LIST_ITEM_COLUMNS = (
+    "id",
+    "original_filename",
+    "file_type",
+    "file_size",
+    "content_hash",
+    "processing_status",
+    "document_type",
+    "australian_state",
+    "contract_type",
+    "total_pages",
+    "has_diagrams",
+    "created_at",
+    "updated_at",
+)
+_DOCUMENT_PAGE_SQL = """
+    SELECT {columns}
+    FROM documents
+    {{where}}
+    ORDER BY created_at DESC, id DESC
+    LIMIT $1
+""".format(
+    columns=", ".join(DOCUMENT_LIST_ITEM_COLUMNS)
+)
+_DOCUMENT_PAGE_STATEMENTS = {
+    (False, False): statements.register_statement(
+        "documents.page", _DOCUMENT_PAGE_SQL.format(where="")
+    ),
+    (False, True): statements.register_statement(
+        "documents.page_after",
+        _DOCUMENT_PAGE_SQL.format(where="WHERE (created_at, id) < ($2, $3)"),
+    ),
+    (True, False): statements.register_statement(
+        "documents.page_by_status",
+        _DOCUMENT_PAGE_SQL.format(where="WHERE processing_status = $2"),
+    ),
+    (True, True): statements.register_statement(
+        "documents.page_by_status_after",
+        _DOCUMENT_PAGE_SQL.format(
+            where="WHERE processing_status = $2 AND (created_at, id) < ($3, $4)"
+        ),
+    ),
+}
+
+
+GET_DOCUMENTS_BY_IDS = statements.register_statement(
+    "documents.get_many",
+    """
+    SELECT id, user_id, original_filename, storage_path, file_type, file_size,
+           content_hash, processing_status, processing_started_at,
+           processing_completed_at, processing_errors, artifact_text_id,
+           total_pages, total_word_count, total_text_length, overall_quality_score,
+           extraction_confidence, text_extraction_method, has_diagrams, diagram_count,
+           document_type, australian_state, contract_type, processing_notes,
+           upload_metadata, processing_results, created_at, updated_at
+    FROM documents
+    WHERE id = ANY($1::uuid[])
+    """,
+)
+
+
+def _row_to_document(row: Any) -> Document:
+    return Document(
+        id=row["id"],
+        user_id=row["user_id"],
+        original_filename=row["original_filename"],
+        storage_path=row["storage_path"],
+        file_size=row["file_size"],
+        file_type=row["file_type"],
+        content_hash=row["content_hash"],
+        processing_status=row["processing_status"],
+        processing_started_at=row["processing_started_at"],
+        processing_completed_at=row["processing_completed_at"],
+        processing_errors=safe_json_loads(row["processing_errors"]),
+        artifact_text_id=row["artifact_text_id"],
+        total_pages=row["total_pages"],
+        total_word_count=row["total_word_count"],
+        total_text_length=row.get("total_text_length", 0),
+        overall_quality_score=row.get("overall_quality_score", 0.0),
+        extraction_confidence=row.get("extraction_confidence", 0.0),
+        text_extraction_method=row.get("text_extraction_method"),
+        has_diagrams=row.get("has_diagrams", False),
+        diagram_count=row.get("diagram_count", 0),
+        document_type=row.get("document_type"),
+        australian_state=row.get("australian_state"),
+        contract_type=row.get("contract_type"),
+        processing_notes=row.get("processing_notes"),
+        upload_metadata=safe_json_loads(row.get("upload_metadata"), {}),
+        processing_results=safe_json_loads(row.get("processing_results"), {}),
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
 
 class DocumentsRepository:
     """Repository for user-scoped document operations"""
@@ -153,36 +273,27 @@ class DocumentsRepository:
                 "[DocumentsRepository] get_document: row fetched",
                 extra={"document_id": str(document_id)},
             )
-            return Document(
-                id=row["id"],
-                user_id=row["user_id"],
-                original_filename=row["original_filename"],
-                storage_path=row["storage_path"],
-                file_size=row["file_size"],
-                file_type=row["file_type"],
-                content_hash=row["content_hash"],
-                processing_status=row["processing_status"],
-                processing_started_at=row["processing_started_at"],
-                processing_completed_at=row["processing_completed_at"],
-                processing_errors=safe_json_loads(row["processing_errors"]),
-                artifact_text_id=row["artifact_text_id"],
-                total_pages=row["total_pages"],
-                total_word_count=row["total_word_count"],
-                total_text_length=row.get("total_text_length", 0),
-                overall_quality_score=row.get("overall_quality_score", 0.0),
-                extraction_confidence=row.get("extraction_confidence", 0.0),
-                text_extraction_method=row.get("text_extraction_method"),
-                has_diagrams=row.get("has_diagrams", False),
-                diagram_count=row.get("diagram_count", 0),
-                document_type=row.get("document_type"),
-                australian_state=row.get("australian_state"),
-                contract_type=row.get("contract_type"),
-                processing_notes=row.get("processing_notes"),
-                upload_metadata=safe_json_loads(row.get("upload_metadata"), {}),
-                processing_results=safe_json_loads(row.get("processing_results"), {}),
-                created_at=row["created_at"],
-                updated_at=row["updated_at"],
-            )
+            return _row_to_document(row)
+
+    async def get_documents(self, document_ids: List[UUID]) -> Dict[UUID, Document]:
+        """
+        Get several documents by ID in one query.
+
+        Args:
+            document_ids: Document IDs
+
+        Returns:
+            Documents keyed by ID; IDs that do not exist or are not visible
+            to the user (RLS) are absent
+        """
+        ids = list(dict.fromkeys(document_ids))
+        if not ids:
+            return {}
+
+        async with get_user_connection(self.user_id) as conn:
+            rows = await statements.fetch(conn, GET_DOCUMENTS_BY_IDS, ids)
+
+        return {row["id"]: _row_to_document(row) for row in rows}
 
     async def update_document_status(
         self,
@@ -311,66 +422,51 @@ class DocumentsRepository:
             List of Document objects
         """
         async with get_user_connection(self.user_id) as conn:
-            where_clause = ""
-            params = [limit, offset]
-            param_count = 2
-
             if status_filter:
-                param_count += 1
-                where_clause = f"WHERE processing_status = ${param_count}"
-                params.append(status_filter)
+                rows = await statements.fetch(
+                    conn, LIST_USER_DOCUMENTS_BY_STATUS, limit, offset, status_filter
+                )
+            else:
+                rows = await statements.fetch(conn, LIST_USER_DOCUMENTS, limit, offset)
 
-            query = f"""
-                SELECT id, user_id, original_filename, storage_path, file_type, file_size, 
-                       content_hash, processing_status, processing_started_at,
-                       processing_completed_at, processing_errors, artifact_text_id,
-                       total_pages, total_word_count, total_text_length, overall_quality_score,
-                       extraction_confidence, text_extraction_method, has_diagrams, diagram_count,
-                       document_type, australian_state, contract_type, processing_notes,
-                       upload_metadata, processing_results, created_at, updated_at
-                FROM documents
-                {where_clause}
-                ORDER BY created_at DESC
-                LIMIT $1 OFFSET $2
-            """
+            return [_row_to_document(row) for row in rows]
 
-            rows = await conn.fetch(query, *params)
-
-            return [
-                Document(
-                    id=row["id"],
-                    user_id=row["user_id"],
-                    original_filename=row["original_filename"],
-                    storage_path=row["storage_path"],
-                    file_size=row["file_size"],
-                    file_type=row["file_type"],
-                    content_hash=row["content_hash"],
-                    processing_status=row["processing_status"],
-                    processing_started_at=row["processing_started_at"],
-                    processing_completed_at=row["processing_completed_at"],
-                    processing_errors=safe_json_loads(row["processing_errors"]),
-                    artifact_text_id=row["artifact_text_id"],
-                    total_pages=row["total_pages"],
-                    total_word_count=row["total_word_count"],
-                    total_text_length=row.get("total_text_length", 0),
-                    overall_quality_score=row.get("overall_quality_score", 0.0),
-                    extraction_confidence=row.get("extraction_confidence", 0.0),
-                    text_extraction_method=row.get("text_extraction_method"),
-                    has_diagrams=row.get("has_diagrams", False),
-                    diagram_count=row.get("diagram_count", 0),
-                    document_type=row.get("document_type"),
-                    australian_state=row.get("australian_state"),
-                    contract_type=row.get("contract_type"),
-                    processing_notes=row.get("processing_notes"),
-                    upload_metadata=safe_json_loads(row.get("upload_metadata"), {}),
-                    processing_results=safe_json_loads(
-                        row.get("processing_results"), {}
-                    ),
-                    created_at=row["created_at"],
-                    updated_at=row["updated_at"],
-                )
-                for row in rows
-            ]
+    async def list_user_documents_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status_filter: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Page through the user's documents, newest first.
+
+        Keyset pagination on (created_at, id): every page costs the same
+        regardless of depth, unlike `list_user_documents`' OFFSET. Rows carry
+        the slim DOCUMENT_LIST_ITEM_COLUMNS projection.
+
+        Args:
+            limit: Page size
+            cursor: `next_cursor` of the previous page (None for the first)
+            status_filter: Optional processing status filter
+
+        Returns:
+            (documents of this page, cursor of the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        params: List[Any] = [limit + 1]
+        if status_filter:
+            params.append(status_filter)
+        if cursor:
+            params.extend(decode_cursor(cursor))
+        statement = _DOCUMENT_PAGE_STATEMENTS[(bool(status_filter), bool(cursor))]
+
+        async with get_user_connection(self.user_id) as conn:
+            rows = await statements.fetch(conn, statement, *params)
+
+        page, next_cursor = keyset_page(rows, limit)
+        return [dict(row) for row in page], next_cursor
 
     async def delete_document(self, document_id: UUID) -> bool:
         """
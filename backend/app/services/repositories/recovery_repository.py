@@ -92,6 +92,38 @@ class RecoveryRepository:
             logger.warning(f"Failed to load task_registry id={registry_id}: {e}")
             return None
 
+    async def get_task_registry_rows(
+        self, registry_ids: List[UUID]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch task_registry rows keyed by str(id), in one query (service-role)."""
+        ids = list(dict.fromkeys(registry_ids))
+        if not ids:
+            return {}
+        try:
+            rows = await fetch_raw_sql(
+                """
+                SELECT id,
+                       task_id,
+                       task_name,
+                       user_id,
+                       current_state,
+                       last_heartbeat,
+                       recovery_priority,
+                       progress_percent,
+                       current_step,
+                       task_args,
+                       task_kwargs,
+                       context_key
+                FROM task_registry
+                WHERE id = ANY($1::uuid[])
+                """,
+                ids,
+            )
+            return {str(row["id"]): dict(row) for row in rows}
+        except Exception as e:
+            logger.warning(f"Failed to load {len(ids)} task_registry rows: {e}")
+            return {}
+
     # -----------------------------
     # Aggregate counts for health
     # -----------------------------
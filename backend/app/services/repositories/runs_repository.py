@@ -5,6 +5,7 @@ This version properly uses context managers for connection management
 instead of storing connections, preventing pool misuse.
 """
 
+import json
 from typing import Dict, List, Optional, Any
 from uuid import UUID, uuid4
 from dataclasses import dataclass
@@ -159,6 +160,46 @@ class RunsRepository:
                 updated_at=row['updated_at']
             )
 
+    async def get_runs(self, run_ids: List[UUID]) -> Dict[UUID, ProcessingRun]:
+        """
+        Get several processing runs by ID in one query.
+        
+        Args:
+            run_ids: Run IDs
+            
+        Returns:
+            Runs keyed by run_id; IDs not found (or not visible under RLS)
+            are absent
+        """
+        ids = list(dict.fromkeys(run_ids))
+        if not ids:
+            return {}
+
+        async with get_user_connection(self.user_id) as conn:
+            rows = await conn.fetch(
+                """
+                SELECT run_id, document_id, user_id, status, last_step,
+                       error, created_at, updated_at
+                FROM document_processing_runs
+                WHERE run_id = ANY($1::uuid[])
+                """,
+                ids
+            )
+
+        return {
+            row['run_id']: ProcessingRun(
+                run_id=row['run_id'],
+                document_id=row['document_id'],
+                user_id=row['user_id'],
+                status=RunStatus(row['status']),
+                last_step=row['last_step'],
+                error=row['error'],
+                created_at=row['created_at'],
+                updated_at=row['updated_at']
+            )
+            for row in rows
+        }
+
     async def get_document_runs(
         self,
         document_id: UUID,
@@ -568,4 +609,59 @@ class RunsRepository:
             )
             
             deleted_count = int(result.split()[-1])
-            return deleted_count
\ No newline at end of file
+            return deleted_count
+
+    # ================================
+    # ANALYSIS TRACES
+    # ================================
+
+    async def save_analysis_trace(
+        self,
+        analysis_id: UUID,
+        content_hash: str,
+        trace: Dict[str, Any]
+    ) -> None:
+        """
+        Store the span trace of an analysis run (latest run wins).
+        
+        Args:
+            analysis_id: Analysis ID
+            content_hash: Contract content hash
+            trace: Trace dict from app.core.span_trace
+        """
+        async with get_user_connection(self.user_id) as conn:
+            await conn.execute(
+                """
+                INSERT INTO analysis_traces (
+                    analysis_id, user_id, content_hash, trace, span_count, duration_ms
+                ) VALUES ($1, $2, $3, $4::jsonb, $5, $6)
+                ON CONFLICT (analysis_id) DO UPDATE SET
+                    user_id = EXCLUDED.user_id,
+                    content_hash = EXCLUDED.content_hash,
+                    trace = EXCLUDED.trace,
+                    span_count = EXCLUDED.span_count,
+                    duration_ms = EXCLUDED.duration_ms,
+                    created_at = NOW()
+                """,
+                analysis_id, self.user_id, content_hash, json.dumps(trace, default=str),
+                trace.get('span_count', 0), trace.get('duration_us', 0) // 1000
+            )
+
+    async def get_analysis_trace(self, analysis_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored span trace of an analysis.
+        
+        Args:
+            analysis_id: Analysis ID
+            
+        Returns:
+            Trace dict or None
+        """
+        async with get_user_connection(self.user_id) as conn:
+            trace = await conn.fetchval(
+                "SELECT trace FROM analysis_traces WHERE analysis_id = $1",
+                analysis_id
+            )
+            if isinstance(trace, str):
+                trace = json.loads(trace)
+            return trace
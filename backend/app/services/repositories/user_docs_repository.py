@@ -346,23 +346,62 @@ class UserDocsRepository:
                       page_number, artifact_page_id, annotations (optional), flags (optional)
 
         Returns:
-            List of DocumentPage objects
+            List of DocumentPage objects, ordered by page number
         """
         if not page_data:
             return []
 
-        results = []
-        for page in page_data:
-            result = await self.upsert_document_page(
-                document_id=document_id,
-                page_number=page["page_number"],
-                artifact_page_id=page["artifact_page_id"],
-                annotations=page.get("annotations"),
-                flags=page.get("flags"),
+        # One row per page (last wins): ON CONFLICT cannot touch a row twice
+        pages = {page["page_number"]: page for page in page_data}
+
+        async with get_user_connection(self.user_id) as conn:
+            # Same conflict handling as upsert_document_page, in one statement
+            rows = await conn.fetch(
+                """
+                INSERT INTO user_document_pages (
+                    document_id, page_number, artifact_page_id, annotations, flags
+                )
+                SELECT $1, p.page_number, p.artifact_page_id,
+                       p.annotations::jsonb, p.flags::jsonb
+                FROM unnest($2::int[], $3::uuid[], $4::text[], $5::text[])
+                    AS p(page_number, artifact_page_id, annotations, flags)
+                ON CONFLICT (document_id, page_number) DO UPDATE SET
+                    artifact_page_id = EXCLUDED.artifact_page_id,
+                    annotations = COALESCE(user_document_pages.annotations, EXCLUDED.annotations),
+                    flags = COALESCE(user_document_pages.flags, EXCLUDED.flags),
+                    updated_at = now()
+                RETURNING document_id, page_number, artifact_page_id,
+                          annotations, flags, created_at, updated_at
+                """,
+                document_id,
+                list(pages),
+                [page["artifact_page_id"] for page in pages.values()],
+                [
+                    (
+                        json.dumps(page["annotations"])
+                        if page.get("annotations") is not None
+                        else None
+                    )
+                    for page in pages.values()
+                ],
+                [
+                    json.dumps(page["flags"]) if page.get("flags") is not None else None
+                    for page in pages.values()
+                ],
             )
-            results.append(result)
 
-        return results
+        return [
+            DocumentPage(
+                document_id=row["document_id"],
+                page_number=row["page_number"],
+                artifact_page_id=row["artifact_page_id"],
+                annotations=row["annotations"],
+                flags=row["flags"],
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
+            )
+            for row in sorted(rows, key=lambda row: row["page_number"])
+        ]
 
     async def batch_upsert_document_diagrams(
         self, document_id: UUID, diagram_data: List[Dict[str, Any]]
@@ -14,17 +14,23 @@ import datetime as dt
 from app.core.celery import celery_app
 from app.core.task_context import user_aware_task
 from app.core.auth_context import AuthContext
+from app.core.config import get_settings
+from app.core.llm_fair_share import FairShareLLMQueue, contract_lane, fair_share_scope
+from app.core.llm_metrics import llm_metrics
+from app.core.span_trace import pop_finished_trace, trace_run
 from app.services.contract_analysis_service import ContractAnalysisService
 from app.services.document_service import DocumentService
 from app.services.communication.websocket_service import WebSocketEvents
 from app.services.communication.websocket_singleton import websocket_manager
 from app.services.communication.redis_pubsub import publish_progress_sync
-from app.core.task_recovery import CheckpointData
+from app.core.task_recovery import CheckpointData, NoOpRecoveryContext
 from app.services.repositories.analyses_repository import AnalysesRepository
 from app.services.repositories.analysis_progress_repository import (
     AnalysisProgressRepository,
 )
 from app.services.repositories.documents_repository import DocumentsRepository
+from app.services.repositories.runs_repository import RunsRepository
+from app.services.progress_write_buffer import get_progress_write_buffer
 from app.services.backend_token_service import BackendTokenService
 
 logger = logging.getLogger(__name__)
@@ -177,36 +183,19 @@ async def update_analysis_progress(
                 "step_started_at_type": type(progress_data["step_started_at"]).__name__,
             },
         )
-        progress_repo = AnalysisProgressRepository()
-        result = await progress_repo.upsert_progress(
+        # Coalesced with other ticks for this key; terminal states are written
+        # immediately and anything pending is flushed when the task finishes
+        result = await get_progress_write_buffer().record_progress(
             content_hash, user_id, progress_data
         )
         logger.debug(
-            "[update_analysis_progress] Upsert result",
+            "[update_analysis_progress] Buffered progress",
             extra={"content_hash": content_hash, "user_id": user_id, "result": result},
         )
 
         # IMPORTANT: Do not emit per-step analysis_progress over the document WebSocket channel.
         # The unified ContractAnalysisService already emits ordered progress over the contract/session channel.
         # Emitting here causes duplicate, out-of-order updates interleaving across channels which regresses the UI.
-        # We still persist to DB and publish to Redis below for internal consumers.
-        try:
-            # We intentionally skip WebSocket fan-out on the document channel to prevent UI regressions.
-            docs_repo = DocumentsRepository()
-            documents = await docs_repo.get_documents_by_content_hash(
-                content_hash, user_id, columns="id"
-            )
-            logger.debug(
-                "[update_analysis_progress] Skipping WS broadcast on document channel",
-                extra={
-                    "content_hash": content_hash,
-                    "user_id": user_id,
-                    "doc_count": len(documents) if documents is not None else 0,
-                    "broadcast_skipped": True,
-                },
-            )
-        except Exception as ws_error:
-            logger.warning(f"WS progress routing introspection failed: {ws_error}")
 
         # Do not publish progress to Redis here to avoid duplicate/out-of-order UI updates.
         # The ContractAnalysisService is the single source of truth for real-time progress
@@ -222,6 +211,20 @@ async def update_analysis_progress(
         )
 
 
+class _BatchMemberRecoveryContext(NoOpRecoveryContext):
+    """Recovery context for one document of a batch analysis task.
+
+    Checkpoints and registry progress belong to the batch task, so they are
+    skipped per document; only the context TTL refresh is forwarded.
+    """
+
+    def __init__(self, batch_ctx):
+        self._batch_ctx = batch_ctx
+
+    async def refresh_context_ttl(self) -> bool:
+        return await self._batch_ctx.refresh_context_ttl()
+
+
 @celery_app.task(
     bind=True,
     autoretry_for=(Exception,),
@@ -235,6 +238,89 @@ async def comprehensive_document_analysis(
     contract_id: str,
     user_id: str,
     analysis_options: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Analyze one uploaded document (see `_analyze_document`)."""
+    return await _analyze_document(
+        recovery_ctx,
+        document_id,
+        analysis_id,
+        contract_id,
+        user_id,
+        analysis_options,
+    )
+
+
+@celery_app.task(bind=True)
+@user_aware_task(recovery_enabled=True, checkpoint_frequency=25, recovery_priority=2)
+async def batch_document_analysis(
+    recovery_ctx,
+    analyses: List[Dict[str, Any]],
+    user_id: str,
+) -> List[Dict[str, Any]]:
+    """
+    Analyze several documents in one worker under a shared LLM budget.
+
+    The analyses run concurrently, but their model calls are admitted through
+    one `FairShareLLMQueue` (see app/core/llm_fair_share.py) capped at
+    settings.llm_batch_max_concurrency, with one lane per content_hash. The
+    queue is in-process, which is why the batch is a single task rather than
+    one `comprehensive_document_analysis` per document.
+
+    Args:
+        recovery_ctx: Recovery context of the batch task
+        analyses: One entry per document with document_id, analysis_id,
+            contract_id and analysis_options (as for the single task)
+        user_id: User ID for authentication
+
+    Returns:
+        Per-analysis outcome in input order
+    """
+    queue = FairShareLLMQueue(get_settings().llm_batch_max_concurrency)
+    member_ctx = _BatchMemberRecoveryContext(recovery_ctx)
+
+    with fair_share_scope(queue):
+        results = await asyncio.gather(
+            *(
+                _analyze_document(
+                    member_ctx,
+                    entry["document_id"],
+                    entry["analysis_id"],
+                    entry["contract_id"],
+                    user_id,
+                    entry.get("analysis_options") or {},
+                )
+                for entry in analyses
+            ),
+            return_exceptions=True,
+        )
+
+    outcomes = [
+        {
+            "analysis_id": entry["analysis_id"],
+            "status": "failed" if isinstance(result, BaseException) else "completed",
+            "error": str(result) if isinstance(result, BaseException) else None,
+        }
+        for entry, result in zip(analyses, results)
+    ]
+    logger.info(
+        "Batch document analysis finished",
+        extra={
+            "user_id": user_id,
+            "analyses": len(analyses),
+            "failed": sum(o["status"] == "failed" for o in outcomes),
+            "llm_queue": queue.stats(),
+        },
+    )
+    return outcomes
+
+
+async def _analyze_document(
+    recovery_ctx,
+    document_id: str,
+    analysis_id: str,
+    contract_id: str,
+    user_id: str,
+    analysis_options: Dict[str, Any],
 ) -> Dict[str, Any]:
     """
     Comprehensive document analysis with enhanced token management.
@@ -570,17 +656,22 @@ async def comprehensive_document_analysis(
                 # Persist to Supabase, then emit WS/Redis notification with monotonic guard.
                 # Also update recovery registry, create checkpoint, and refresh task TTL.
                 try:
-                    # Monotonic gating using latest persisted progress
+                    # Monotonic gating using latest recorded progress (the write
+                    # buffer knows it once this task has recorded any; DB otherwise)
                     try:
-                        progress_repo = AnalysisProgressRepository()
-                        latest = await progress_repo.get_latest_progress(
-                            content_hash,
-                            user_id,
-                            columns="progress_percent,current_step",
-                        )
-                        last_percent = (
-                            int(latest.get("progress_percent", 0)) if latest else 0
+                        last_percent = get_progress_write_buffer().latest_percent(
+                            content_hash, user_id
                         )
+                        if last_percent is None:
+                            progress_repo = AnalysisProgressRepository()
+                            latest = await progress_repo.get_latest_progress(
+                                content_hash,
+                                user_id,
+                                columns="progress_percent,current_step",
+                            )
+                            last_percent = (
+                                int(latest.get("progress_percent", 0)) if latest else 0
+                            )
                     except Exception as _lp_err:
                         last_percent = 0
                         logger.debug(
@@ -669,15 +760,17 @@ async def comprehensive_document_analysis(
                     except Exception:
                         pass
 
-            analysis_response = await contract_service.start_analysis(
-                user_id=user_id,
-                session_id=content_hash,  # Use content_hash as session_id
-                document_data=document_data,
-                australian_state=state_to_use,
-                user_preferences=analysis_options,
-                user_type="buyer",  # Default user type
-                progress_callback=persist_progress,
-            )
+            # Per-run key for the workflow's timing trace (persisted below)
+            with trace_run(content_hash) as trace_key, contract_lane(content_hash):
+                analysis_response = await contract_service.start_analysis(
+                    user_id=user_id,
+                    session_id=content_hash,  # Use content_hash as session_id
+                    document_data=document_data,
+                    australian_state=state_to_use,
+                    user_preferences=analysis_options,
+                    user_type="buyer",  # Default user type
+                    progress_callback=persist_progress,
+                )
 
             # Unified error handling for None or unsuccessful responses
             unified_error_msg = None
@@ -693,6 +786,9 @@ async def comprehensive_document_analysis(
                 # Enriched diagnostics for tracing root cause (single code path)
                 latest_snapshot = None
                 try:
+                    await get_progress_write_buffer().flush_progress(
+                        content_hash, user_id
+                    )
                     progress_repo = AnalysisProgressRepository()
                     latest_snapshot = await progress_repo.get_latest_progress(
                         content_hash,
@@ -787,6 +883,23 @@ async def comprehensive_document_analysis(
             # Save analysis results using AnalysesRepository
             analyses_repo = AnalysesRepository(use_service_role=True)
 
+            # Attach per-contract LLM usage (tokens, cost, latency) gathered by the workflow
+            llm_usage = llm_metrics.pop_contract_rollup(content_hash)
+            if llm_usage and isinstance(analysis_result, dict):
+                analysis_result["llm_usage"] = llm_usage
+
+            # Persist the per-node timing trace recorded by the workflow
+            analysis_trace = pop_finished_trace(trace_key)
+            if analysis_trace:
+                try:
+                    await RunsRepository(user_id).save_analysis_trace(
+                        analysis_id, content_hash, analysis_trace
+                    )
+                except Exception as trace_error:
+                    logger.warning(
+                        f"Failed to persist analysis trace for {analysis_id}: {trace_error}"
+                    )
+
             # Validate analysis results before marking as completed
             has_meaningful_results = _validate_analysis_results(analysis_result)
 
@@ -918,6 +1031,9 @@ async def comprehensive_document_analysis(
                 last_progress_percent = 0
                 last_step = "unknown"
                 try:
+                    await get_progress_write_buffer().flush_progress(
+                        content_hash, user_id
+                    )
                     progress_repo = AnalysisProgressRepository()
                     latest_progress = await progress_repo.get_latest_progress(
                         content_hash, user_id, columns="current_step, progress_percent"
@@ -1176,6 +1292,15 @@ async def batch_ocr_processing_background(
             },
         )
 
+        # Load every document and mark the batch as in progress up front:
+        # two round trips for the batch instead of two per document
+        docs_repo = DocumentsRepository()
+        documents = await docs_repo.get_documents(
+            [UUID(doc_id) for doc_id in document_ids]
+        )
+        if documents:
+            await docs_repo.batch_update_status(list(documents), "processing_ocr")
+
         # Process documents with intelligent batching
         if processing_options["parallel_processing"] and total_docs > 1:
             # Parallel processing for multiple documents
@@ -1185,9 +1310,7 @@ async def batch_ocr_processing_background(
                 nonlocal processed_docs
                 async with semaphore:
                     try:
-                        # Get document details
-                        docs_repo = DocumentsRepository()
-                        document = await docs_repo.get_document(UUID(doc_id))
+                        document = documents.get(UUID(doc_id))
 
                         if not document:
                             logger.warning(
@@ -1201,11 +1324,6 @@ async def batch_ocr_processing_background(
                             "file_type": document.file_type,
                         }
 
-                        # Update document status
-                        await docs_repo.update_document_status(
-                            UUID(doc_id), "processing_ocr"
-                        )
-
                         # Process with OCR
                         extraction_result = (
                             await document_service.extract_text_with_ocr(
@@ -1242,18 +1360,11 @@ async def batch_ocr_processing_background(
             # Sequential processing
             for i, doc_id in enumerate(document_ids):
                 try:
-                    # Get document details
-                    docs_repo = DocumentsRepository()
-                    document = await docs_repo.get_document(UUID(doc_id))
+                    document = documents.get(UUID(doc_id))
 
                     if not document:
                         continue
 
-                    # Update document status
-                    await docs_repo.update_document_status(
-                        UUID(doc_id), "processing_ocr"
-                    )
-
                     # Process with OCR
                     extraction_result = await document_service.extract_text_with_ocr(
                         document.storage_path,
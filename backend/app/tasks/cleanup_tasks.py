@@ -176,3 +176,36 @@ def verify_storage_consistency(self):
             raise
 
     return asyncio.run(_async_verify())
+
+
+@celery_app.task(bind=True)
+def cleanup_expired_workflow_checkpoints(self):
+    """Delete LangGraph workflow checkpoints past their TTL"""
+
+    async def _async_cleanup_checkpoints():
+        from app.services.checkpoint_cleaner import CheckpointCleaner
+
+        return await CheckpointCleaner().clear_expired_workflow_checkpoints()
+
+    return asyncio.run(_async_cleanup_checkpoints())
+
+
+# Trailing days re-derived from contracts on each rollup refresh
+ROLLUP_REFRESH_WINDOW_DAYS = 2
+
+
+@celery_app.task(bind=True)
+def refresh_contract_rollups(self):
+    """Reconcile recent contract_daily_rollups buckets with the contracts table"""
+
+    async def _async_refresh_rollups():
+        from app.services.repositories.contracts_repository import (
+            ContractsRepository,
+        )
+
+        since = (datetime.now(UTC) - timedelta(days=ROLLUP_REFRESH_WINDOW_DAYS)).date()
+        buckets = await ContractsRepository().refresh_daily_rollups(since)
+        logger.info(f"Refreshed {buckets} contract rollup buckets since {since}")
+        return {"since": since.isoformat(), "buckets": buckets}
+
+    return asyncio.run(_async_refresh_rollups())
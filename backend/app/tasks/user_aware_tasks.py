@@ -231,7 +231,7 @@ async def run_document_processing_subflow(
         }
 
         # Run just the document processing node
-        result = workflow.process_document(state)
+        result = await workflow.process_document(state)
 
         # Update progress based on updated state
         parsing_completed = (
@@ -0,0 +1,290 @@
+"""
+Clause retrieval for Step 2 section analyzers.
+
+Splits the contract text into clauses (per `--- Page N ---` page, on clause
+headings and paragraph breaks), builds an in-memory BM25 index over them and
+ranks clauses per section. Queries combine fixed section vocabulary with the
+Step 1 section seeds (snippet text and any `retrieval_instructions`). Each
+section gets the top clauses that fit its character budget, followed by the
+clauses those hits cross-reference ("subject to clause 12.3").
+
+The index is local and short-lived: it is built once per Step 2 run and only
+the per-section slices are kept in state. In the prompt a section's slice
+replaces its seed snippets and any full contract text rather than adding to
+them (prompts/user/analysis/step2/partials/section_evidence.md).
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Okapi BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Clause sizing (characters)
+MIN_CLAUSE_CHARS = 200
+MAX_CLAUSE_CHARS = 2000
+
+DEFAULT_SECTION_BUDGET_CHARS = 12000
+
+# Drop weak matches: clauses scoring below this fraction of the best hit
+MIN_RELATIVE_SCORE = 0.2
+
+PAGE_DELIMITER = re.compile(r"^--- Page (\d+)[^\n]*---[ \t]*$", re.MULTILINE)
+CLAUSE_HEADING = re.compile(
+    r"^\s*(?:#+\s*)?(?:(?:special\s+)?(?:condition|clause)\s+)?"
+    r"(\d{1,3}(?:\.\d{1,3}){0,3})[.)]?\s+\S",
+    re.IGNORECASE,
+)
+CROSS_REFERENCE = re.compile(
+    r"\b(?:special\s+)?(?:clauses?|conditions?)\s+(\d{1,3}(?:\.\d{1,3}){0,3})",
+    re.IGNORECASE,
+)
+TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    """a an and any are as at be by for from has have in is it its of on or
+    such that the this to under was were which will with""".split()
+)
+
+# Baseline vocabulary per section, extended at query time by the section seeds
+SECTION_QUERIES: Dict[str, str] = {
+    "parties_property": (
+        "vendor purchaser buyer seller party solicitor conveyancer agent land "
+        "property address lot plan title folio strata inclusions exclusions"
+    ),
+    "financial_terms": (
+        "purchase price deposit balance payment gst stamp duty adjustment "
+        "instalment release interest bank guarantee deposit bond"
+    ),
+    "conditions": (
+        "condition subject finance approval building pest inspection cooling "
+        "off period rescind special conditions satisfaction waiver"
+    ),
+    "warranties": (
+        "warranty warrants representation vendor disclosure no warranty "
+        "defects condition of property fit for purpose"
+    ),
+    "default_termination": (
+        "default terminate termination notice to complete breach damages "
+        "forfeit deposit rescission remedy penalty interest late completion"
+    ),
+    "settlement_logistics": (
+        "settlement completion date completion day time place possession keys "
+        "vacant possession transfer discharge mortgage electronic pexa"
+    ),
+    "title_encumbrances": (
+        "title encumbrance easement covenant restriction caveat mortgage "
+        "right of way registered plan survey boundary zoning certificate"
+    ),
+    "adjustments_outgoings": (
+        "adjustment outgoings rates water council land tax strata levies "
+        "apportion adjustment date rent"
+    ),
+    "disclosure_compliance": (
+        "disclosure statement certificate section 32 planning certificate "
+        "zoning compliance swimming pool smoke alarm asbestos prescribed documents"
+    ),
+    "special_risks": (
+        "risk flood bushfire contamination heritage subsidence asbestos "
+        "unapproved works sunset clause off the plan"
+    ),
+}
+
+
+@dataclass
+class Clause:
+    clause_id: Optional[str]
+    page_number: Optional[int]
+    text: str
+
+    def to_dict(self, score: float, via: str) -> Dict[str, Any]:
+        return {
+            "clause_id": self.clause_id,
+            "page_number": self.page_number,
+            "text": self.text,
+            "score": round(score, 3),
+            "via": via,
+        }
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        token
+        for token in TOKEN.findall((text or "").lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def _pages(text: str) -> Iterable[tuple]:
+    matches = list(PAGE_DELIMITER.finditer(text))
+    if not matches:
+        yield None, text
+        return
+    if matches[0].start() > 0:
+        yield None, text[: matches[0].start()]
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        yield int(match.group(1)), text[match.end() : end]
+
+
+def split_clauses(text: str) -> List[Clause]:
+    """Split contract text into clause-sized chunks tagged with page and clause id."""
+    clauses: List[Clause] = []
+    for page_number, page_text in _pages(text or ""):
+        current: List[str] = []
+        current_id: Optional[str] = None
+        size = 0
+
+        def flush():
+            body = "\n".join(current).strip()
+            if body:
+                clauses.append(Clause(current_id, page_number, body))
+
+        for line in page_text.splitlines():
+            heading = CLAUSE_HEADING.match(line)
+            paragraph_break = not line.strip() and size >= MIN_CLAUSE_CHARS
+            if heading or paragraph_break or size + len(line) > MAX_CLAUSE_CHARS:
+                flush()
+                current, size = [], 0
+                if heading:
+                    current_id = heading.group(1)
+            if line.strip():
+                current.append(line)
+                size += len(line) + 1
+        flush()
+    return clauses
+
+
+class ClauseIndex:
+    """Okapi BM25 over clauses."""
+
+    def __init__(self, clauses: List[Clause]):
+        self.clauses = clauses
+        self._term_freqs = [Counter(tokenize(c.text)) for c in clauses]
+        self._lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) or 1.0
+        doc_freq: Counter = Counter()
+        for tf in self._term_freqs:
+            doc_freq.update(tf.keys())
+        total = len(clauses)
+        self._idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in doc_freq.items()
+        }
+        self._by_id: Dict[str, int] = {}
+        for position, clause in enumerate(clauses):
+            if clause.clause_id and clause.clause_id not in self._by_id:
+                self._by_id[clause.clause_id] = position
+
+    def rank(self, query: str) -> List[tuple]:
+        """(position, score) pairs with a positive score, best first."""
+        terms = set(tokenize(query))
+        scored = []
+        for position, tf in enumerate(self._term_freqs):
+            norm = BM25_K1 * (
+                1 - BM25_B + BM25_B * self._lengths[position] / self._avg_length
+            )
+            score = sum(
+                self._idf[t] * tf[t] * (BM25_K1 + 1) / (tf[t] + norm)
+                for t in terms
+                if t in tf
+            )
+            if score > 0:
+                scored.append((position, score))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored
+
+    def cross_references(self, position: int) -> List[int]:
+        """Positions of clauses referenced by number from the given clause."""
+        own_id = self.clauses[position].clause_id
+        referenced = []
+        for ref in CROSS_REFERENCE.findall(self.clauses[position].text):
+            target = self._by_id.get(ref)
+            if target is not None and ref != own_id and target not in referenced:
+                referenced.append(target)
+        return referenced
+
+
+def _seed_query(section_seeds: Dict[str, Any], section_key: str) -> str:
+    """Seed snippet text and retrieval instructions for a section as query text."""
+    parts: List[str] = []
+    snippets = ((section_seeds or {}).get("snippets") or {}).get(section_key) or []
+    for snippet in snippets:
+        if isinstance(snippet, dict):
+            parts.append(snippet.get("snippet_text") or "")
+    instructions = ((section_seeds or {}).get("retrieval_instructions") or {}).get(
+        section_key
+    )
+    if isinstance(instructions, str):
+        parts.append(instructions)
+    elif isinstance(instructions, dict):
+        parts.extend(str(v) for v in instructions.values())
+    elif isinstance(instructions, list):
+        parts.extend(str(v) for v in instructions)
+    return " ".join(parts)
+
+
+def select_clauses(
+    index: ClauseIndex, query: str, max_chars: int
+) -> List[Dict[str, Any]]:
+    """Top-ranked clauses within ``max_chars``, then their cross-references."""
+    selected: List[Dict[str, Any]] = []
+    hits: List[int] = []
+    used = 0
+    ranked = index.rank(query)
+    floor = ranked[0][1] * MIN_RELATIVE_SCORE if ranked else 0.0
+    for position, score in ranked:
+        length = len(index.clauses[position].text)
+        if score < floor or used + length > max_chars:
+            continue
+        selected.append(index.clauses[position].to_dict(score, "bm25"))
+        hits.append(position)
+        used += length
+
+    scores = dict(ranked)
+    chosen = set(hits)
+    for position in hits:
+        for target in index.cross_references(position):
+            length = len(index.clauses[target].text)
+            if target in chosen or used + length > max_chars:
+                continue
+            selected.append(
+                index.clauses[target].to_dict(
+                    scores.get(target, 0.0), "cross_reference"
+                )
+            )
+            chosen.add(target)
+            used += length
+    return selected
+
+
+def build_section_context(
+    contract_text: str,
+    section_seeds: Optional[Dict[str, Any]] = None,
+    max_chars: int = DEFAULT_SECTION_BUDGET_CHARS,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Ranked clause slice per Step 2 section (empty when there is no text)."""
+    clauses = split_clauses(contract_text)
+    if not clauses:
+        return {}
+    index = ClauseIndex(clauses)
+    return {
+        section_key: select_clauses(
+            index,
+            f"{base_query} {_seed_query(section_seeds or {}, section_key)}",
+            max_chars,
+        )
+        for section_key, base_query in SECTION_QUERIES.items()
+    }
+
+
+def section_slice(state: Dict[str, Any], section_key: str) -> Optional[List[Dict]]:
+    """The retrieved clauses for one section, if the retrieval stage ran."""
+    return ((state or {}).get("section_context") or {}).get(section_key) or None
@@ -0,0 +1,54 @@
+"""
+Opaque cursors for keyset (created_at, id) pagination.
+
+List endpoints page with `WHERE (created_at, id) < (cursor_created_at,
+cursor_id) ORDER BY created_at DESC, id DESC` instead of OFFSET, so a page
+costs the same at any depth. The cursor is the position of the last row of
+the previous page, base64url-encoded so clients treat it as opaque.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(row_id)})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), UUID(payload["i"])
+    except Exception:
+        raise ValueError("Invalid pagination cursor") from None
+
+
+def keyset_page(rows: List[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Split a `limit + 1` fetch into the page and the cursor for the next one.
+
+    Returns:
+        (rows of this page, next cursor or None on the last page)
+    """
+    page = rows[:limit]
+    if len(rows) <= limit or not page:
+        return page, None
+    last = page[-1]
+    return page, encode_cursor(last["created_at"], last["id"])
+
+
+def page_response(items: List[Dict[str, Any]], next_cursor: Optional[str]) -> Dict:
+    return {"items": items, "next_cursor": next_cursor, "has_more": bool(next_cursor)}
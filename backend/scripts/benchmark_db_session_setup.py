@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+RLS session setup benchmark for repository calls.
+
+A repository call acquires a pooled connection, applies the RLS session
+context, runs its query and releases the connection. Compares:
+
+- legacy: one `set_config` statement per GUC on every acquire (2 for
+  service role, 3 for a user) plus, in shared pool mode, 3 more statements
+  resetting the user GUCs on release
+- current: `SET_SESSION_CONTEXT_SQL` applies all GUCs in one statement, and
+  is skipped entirely when the connection's identity marker already matches
+
+Without `--dsn` connections are simulated: every statement costs `--rtt-ms`
+of awaited latency, which is what dominates against a remote database. With
+`--dsn` the same flows run against a real Postgres through asyncpg pools.
+JWT verification is not included (the current flow also skips it on reuse).
+Importing the app needs the usual SUPABASE_* settings in the environment.
+
+    python scripts/benchmark_db_session_setup.py --calls 500 --concurrency 8 \\
+        --rtt-ms 1.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.database.connection import (  # noqa: E402
+    SERVICE_ROLE_CLAIMS_JSON,
+    SERVICE_ROLE_IDENTITY,
+    RLSConnection,
+    _apply_session_context,
+    _session_identity_matches,
+)
+
+USER_IDENTITY = "authenticated:bench-user:0"
+USER_CLAIMS = {"sub": "bench-user", "role": "authenticated"}
+
+
+class _SimulatedConnection(RLSConnection):
+    """RLSConnection stand-in whose statements cost one simulated round trip."""
+
+    def __init__(self, rtt_seconds: float):
+        self._aborted = True  # never connected; keeps asyncpg's __del__ quiet
+        self.rtt_seconds = rtt_seconds
+        self.round_trips = 0
+
+    async def execute(self, query: str, *args: Any, **kwargs: Any) -> str:
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt_seconds)
+        return "SELECT 1"
+
+
+class _SimulatedPool:
+    def __init__(self, size: int, rtt_seconds: float):
+        self.connections = [_SimulatedConnection(rtt_seconds) for _ in range(size)]
+        self._free: asyncio.Queue = asyncio.Queue()
+        for conn in self.connections:
+            self._free.put_nowait(conn)
+
+    async def acquire(self):
+        return await self._free.get()
+
+    async def release(self, conn) -> None:
+        self._free.put_nowait(conn)
+
+    def round_trips(self) -> int:
+        return sum(conn.round_trips for conn in self.connections)
+
+
+async def _legacy_service(conn) -> None:
+    await conn.execute(
+        "SELECT set_config('request.jwt.claims', $1, false)",
+        json.dumps({"role": "service_role"}),
+    )
+    await conn.execute("SELECT set_config('role', $1, false)", "service_role")
+
+
+async def _legacy_user(conn) -> None:
+    await conn.execute(
+        "SELECT set_config('request.jwt.claims', $1, false)", json.dumps(USER_CLAIMS)
+    )
+    await conn.execute("SELECT set_config('role', $1, false)", "authenticated")
+    await conn.execute("SELECT set_config('request.jwt.claim.sub', $1, false)", "u")
+
+
+async def _legacy_user_release(conn) -> None:
+    await conn.execute("SELECT set_config('request.jwt.claims', NULL, false)")
+    await conn.execute("SELECT set_config('role', 'anon', false)")
+    await conn.execute("SELECT set_config('request.jwt.claim.sub', NULL, false)")
+
+
+async def _current_service(conn) -> None:
+    if not _session_identity_matches(conn, SERVICE_ROLE_IDENTITY):
+        await _apply_session_context(
+            conn,
+            SERVICE_ROLE_IDENTITY,
+            "service_role",
+            claims_json=SERVICE_ROLE_CLAIMS_JSON,
+        )
+
+
+async def _current_user(conn) -> None:
+    if not _session_identity_matches(conn, USER_IDENTITY):
+        await _apply_session_context(
+            conn,
+            USER_IDENTITY,
+            "authenticated",
+            claims_json=json.dumps(USER_CLAIMS),
+            sub="u",
+        )
+
+
+async def _noop(conn) -> None:
+    return None
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 3),
+    }
+
+
+async def _measure(
+    pool,
+    setup: Callable[[Any], Awaitable[None]],
+    teardown: Callable[[Any], Awaitable[None]],
+    args: argparse.Namespace,
+) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+
+    async def _call():
+        async with semaphore:
+            started = time.perf_counter()
+            conn = await pool.acquire()
+            try:
+                await setup(conn)
+                await conn.execute("SELECT 1")  # the repository query
+            finally:
+                await teardown(conn)
+                await pool.release(conn)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_call() for _ in range(args.calls)))
+    wall = time.perf_counter() - started
+    return {
+        "call_latency": _summary(latencies),
+        "calls_per_second": round(args.calls / wall, 1),
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    flows = {
+        "service_legacy": (_legacy_service, _noop, False),
+        "service_current": (_current_service, _noop, True),
+        "user_shared_legacy": (_legacy_user, _legacy_user_release, False),
+        "user_shared_current": (_current_user, _noop, True),
+    }
+    report: Dict[str, Any] = {
+        "calls": args.calls,
+        "concurrency": args.concurrency,
+        "pool_size": args.pool_size,
+        "mode": "postgres" if args.dsn else "simulated",
+    }
+
+    for name, (setup, teardown, rls_pool) in flows.items():
+        if args.dsn:
+            import asyncpg
+
+            pool = await asyncpg.create_pool(
+                args.dsn,
+                min_size=args.pool_size,
+                max_size=args.pool_size,
+                **({"connection_class": RLSConnection} if rls_pool else {}),
+            )
+            try:
+                report[name] = await _measure(pool, setup, teardown, args)
+            finally:
+                await pool.close()
+        else:
+            pool = _SimulatedPool(args.pool_size, args.rtt_ms / 1000)
+            report[name] = await _measure(pool, setup, teardown, args)
+            report[name]["round_trips_per_call"] = round(
+                pool.round_trips() / args.calls, 2
+            )
+    return report
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument(
+        "--rtt-ms", type=float, default=1.0, help="simulated latency per statement"
+    )
+    parser.add_argument("--dsn", help="run against this Postgres instead")
+    return parser.parse_args()
+
+
+def main() -> int:
+    report = asyncio.run(run_benchmark(_parse_args()))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Node dispatch benchmark for the contract analysis workflow graph.
+
+Compares the two ways ContractAnalysisWorkflow has executed its async nodes:
+
+- bridge: sync node wrappers that submit the node coroutine to a dedicated
+  background event loop thread and block on the result (the former
+  `_run_async_node`). LangGraph runs sync nodes in its executor, so every
+  node costs an executor hop plus a cross-thread loop hop.
+- native: `async def` node wrappers awaited directly on the caller's loop
+  (current behaviour).
+
+The graph has the same shape as the analysis pipeline (a linear chain of
+nodes) with trivial node bodies, so the numbers isolate orchestration
+overhead from model and database time. `--io-ms` adds a simulated awaited
+I/O wait per node to show how the bridge serialises concurrent analyses.
+
+    python scripts/benchmark_node_dispatch.py --nodes 8 --runs 200 \\
+        --concurrency 16 --io-ms 5
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, TypedDict
+
+from langgraph.graph import StateGraph
+
+
+class _BenchState(TypedDict, total=False):
+    visited: int
+
+
+class _BackgroundLoopBridge:
+    """Minimal re-creation of the removed background-loop node bridge."""
+
+    def __init__(self):
+        self._loop = None
+        self._ready = threading.Event()
+
+    def start(self) -> None:
+        def _worker():
+            self._loop = asyncio.new_event_loop()
+            self._ready.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=_worker, name="workflow-loop", daemon=True).start()
+        self._ready.wait()
+
+    def run(self, coro_factory: Callable[[], Any]) -> Any:
+        future = asyncio.run_coroutine_threadsafe(coro_factory(), self._loop)
+        return future.result()
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def _node_body(io_seconds: float):
+    async def execute(state: _BenchState) -> _BenchState:
+        if io_seconds:
+            await asyncio.sleep(io_seconds)
+        return {"visited": state.get("visited", 0) + 1}
+
+    return execute
+
+
+def _build_graph(node_count: int, make_node: Callable[[], Callable]):
+    graph = StateGraph(_BenchState)
+    names = [f"node_{i}" for i in range(node_count)]
+    for name in names:
+        graph.add_node(name, make_node())
+    graph.set_entry_point(names[0])
+    for current, following in zip(names, names[1:]):
+        graph.add_edge(current, following)
+    graph.set_finish_point(names[-1])
+    return graph.compile()
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 3),
+    }
+
+
+async def _measure(app, args: argparse.Namespace) -> Dict[str, Any]:
+    # Sequential runs: per-node dispatch overhead
+    await app.ainvoke({"visited": 0})  # warm up
+    sequential: List[float] = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        await app.ainvoke({"visited": 0})
+        sequential.append(time.perf_counter() - started)
+
+    # Concurrent runs: throughput with many analyses sharing one loop
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def _one():
+        async with semaphore:
+            await app.ainvoke({"visited": 0})
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_one() for _ in range(args.runs)))
+    wall = time.perf_counter() - started
+
+    io_floor = args.io_ms / 1000 * args.nodes
+    per_node = [max(s - io_floor, 0.0) / args.nodes for s in sequential]
+    return {
+        "run_latency": _summary(sequential),
+        "per_node_dispatch_overhead": _summary(per_node),
+        "concurrent_runs_per_second": round(args.runs / wall, 1),
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    io_seconds = args.io_ms / 1000
+
+    bridge = _BackgroundLoopBridge()
+    bridge.start()
+
+    def _bridged_node():
+        execute = _node_body(io_seconds)
+
+        def node(state: _BenchState) -> _BenchState:
+            return bridge.run(lambda: execute(state))
+
+        return node
+
+    try:
+        bridged = await _measure(_build_graph(args.nodes, _bridged_node), args)
+    finally:
+        bridge.stop()
+
+    native = await _measure(
+        _build_graph(args.nodes, lambda: _node_body(io_seconds)), args
+    )
+
+    return {
+        "nodes": args.nodes,
+        "runs": args.runs,
+        "concurrency": args.concurrency,
+        "io_ms": args.io_ms,
+        "bridge": bridged,
+        "native": native,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--io-ms", type=float, default=0.0, help="simulated awaited I/O per node"
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    report = asyncio.run(run_benchmark(_parse_args()))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Offline load benchmark for the contract analysis workflow.
+
+Drives N concurrent contracts through the real LangGraph workflow with LLM
+and OCR calls served from a recorded corpus (see app/core/llm_replay.py), so
+orchestration overhead, database contention and concurrency limits can be
+measured without live Gemini/OpenRouter.
+
+Typical use:
+
+    # 1. Record a corpus once against the live providers
+    python scripts/benchmark_workflow.py --manifest contracts.json \\
+        --mode record --corpus storage/llm_corpus --concurrency 1
+
+    # 2. Replay it under load, optionally with injected faults
+    python scripts/benchmark_workflow.py --manifest contracts.json \\
+        --mode replay --corpus storage/llm_corpus --concurrency 8 --repeat 5 \\
+        --latency-scale 0.5 --rate-limit-rate 0.02 --malformed-rate 0.05
+
+The manifest is a JSON list of contracts that already exist in the database:
+
+    [{"user_id": "...", "token": "<user JWT>", "australian_state": "NSW",
+      "document_data": {"document_id": "...", "content_hash": "...",
+                        "file_path": "...", "file_type": "pdf", "filename": "..."}}]
+
+The database and storage are still real; only model calls are replayed.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add backend root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.auth_context import AuthContext  # noqa: E402
+from app.core.llm_metrics import llm_metrics  # noqa: E402
+from app.core.llm_replay import (  # noqa: E402
+    FaultInjection,
+    ReplayMode,
+    configure_llm_replay,
+)
+
+logger = logging.getLogger("benchmark_workflow")
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _latency_summary(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 3) if values else 0.0,
+        "p50": round(_percentile(values, 50), 3),
+        "p95": round(_percentile(values, 95), 3),
+        "max": round(max(values), 3) if values else 0.0,
+    }
+
+
+def _llm_latency_by_node() -> Dict[str, Dict[str, Any]]:
+    by_node: Dict[str, Dict[str, Any]] = {}
+    for series in llm_metrics.snapshot()["series"]:
+        latency = series["latency_seconds"]
+        entry = by_node.setdefault(series["node"], {"calls": 0, "total_seconds": 0.0})
+        entry["calls"] += latency.get("count", 0)
+        entry["total_seconds"] += latency.get("sum", 0.0)
+    for entry in by_node.values():
+        entry["mean_seconds"] = (
+            round(entry["total_seconds"] / entry["calls"], 3) if entry["calls"] else 0.0
+        )
+        entry["total_seconds"] = round(entry["total_seconds"], 3)
+    return by_node
+
+
+async def _run_contract(
+    service: Any, job: Dict[str, Any], index: int, semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    async with semaphore:
+        # Each task has its own context, so per-contract auth does not leak
+        AuthContext.set_auth_context(job.get("token") or "", user_id=job["user_id"])
+        started = time.perf_counter()
+        try:
+            response = await service.analyze_contract(
+                document_data=job["document_data"],
+                user_id=job["user_id"],
+                australian_state=job.get("australian_state", "NSW"),
+                session_id=f"benchmark_{index}",
+                contract_type=job.get("contract_type", "purchase_agreement"),
+                enable_websocket_progress=False,
+            )
+            success = bool(getattr(response, "success", False))
+            error = getattr(response, "error", None)
+        except Exception as e:
+            success, error = False, str(e)
+        return {
+            "index": index,
+            "success": success,
+            "error": error,
+            "seconds": time.perf_counter() - started,
+        }
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    replay = configure_llm_replay(
+        args.mode,
+        corpus_dir=args.corpus,
+        faults=FaultInjection(
+            latency_ms=args.latency_ms,
+            latency_scale=args.latency_scale,
+            rate_limit_rate=args.rate_limit_rate,
+            timeout_rate=args.timeout_rate,
+            malformed_rate=args.malformed_rate,
+            seed=args.seed,
+        ),
+    )
+
+    from app.services.contract_analysis_service import ContractAnalysisService
+
+    with open(args.manifest, "r", encoding="utf-8") as f:
+        manifest: List[Dict[str, Any]] = json.load(f)
+    jobs = manifest * args.repeat
+
+    service = ContractAnalysisService(enable_websocket_progress=False)
+    await service._ensure_workflow_initialized()
+    service.workflow.reset_metrics()
+    llm_metrics.reset()
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(_run_contract(service, job, i, semaphore) for i, job in enumerate(jobs))
+    )
+    wall_seconds = time.perf_counter() - started
+
+    completed = [r for r in results if r["success"]]
+    workflow_metrics = service.workflow.get_metrics()
+    node_latency = {
+        name: {
+            "executions": m.get("executions", 0),
+            "failures": m.get("failures", 0),
+            "mean_seconds": round(m.get("average_duration", 0.0), 3),
+        }
+        for name, m in workflow_metrics.get("node_metrics", {}).items()
+    }
+
+    return {
+        "mode": args.mode,
+        "contracts": len(jobs),
+        "concurrency": args.concurrency,
+        "succeeded": len(completed),
+        "failed": len(jobs) - len(completed),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_per_minute": (
+            round(len(completed) / wall_seconds * 60, 2) if wall_seconds else 0.0
+        ),
+        "contract_latency_seconds": _latency_summary([r["seconds"] for r in results]),
+        "node_latency": node_latency,
+        "llm_latency_by_node": _llm_latency_by_node(),
+        "replay": replay.stats(),
+        "errors": sorted({r["error"] for r in results if r["error"]})[:20],
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--manifest", required=True, help="JSON list of contracts")
+    parser.add_argument(
+        "--mode",
+        choices=[ReplayMode.REPLAY, ReplayMode.RECORD, ReplayMode.OFF],
+        default=ReplayMode.REPLAY,
+    )
+    parser.add_argument("--corpus", default="storage/llm_corpus")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument(
+        "--latency-ms", type=float, default=None, help="fixed simulated latency"
+    )
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="write the JSON report to this path")
+    return parser.parse_args()
+
+
+def main() -> int:
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    args = _parse_args()
+    report = asyncio.run(run_benchmark(args))
+    text = json.dumps(report, indent=2, default=str)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    print(text)
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
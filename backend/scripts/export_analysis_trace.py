@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Export the per-node timing trace of a contract analysis as Chrome trace JSON.
+
+Traces are recorded by app.core.span_trace during the analysis and stored in
+`analysis_traces` by the analysis task. The output opens in chrome://tracing
+or https://ui.perfetto.dev; parallel Step 2 branches are laid out on separate
+lanes.
+
+    python scripts/export_analysis_trace.py <analysis_id> -o trace.json
+    python scripts/export_analysis_trace.py --content-hash <hash>
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.span_trace import chrome_trace  # noqa: E402
+from app.database.connection import get_service_role_connection  # noqa: E402
+
+
+async def load_trace(analysis_id: str = None, content_hash: str = None):
+    async with get_service_role_connection() as conn:
+        if analysis_id:
+            trace = await conn.fetchval(
+                "SELECT trace FROM analysis_traces WHERE analysis_id = $1::uuid",
+                analysis_id,
+            )
+        else:
+            trace = await conn.fetchval(
+                """
+                SELECT trace FROM analysis_traces
+                WHERE content_hash = $1
+                ORDER BY created_at DESC
+                LIMIT 1
+                """,
+                content_hash,
+            )
+    if isinstance(trace, str):
+        trace = json.loads(trace)
+    return trace
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("analysis_id", nargs="?", help="Analysis ID")
+    parser.add_argument(
+        "--content-hash", help="Export the latest trace for a contract instead"
+    )
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    if not args.analysis_id and not args.content_hash:
+        parser.error("either analysis_id or --content-hash is required")
+
+    trace = await load_trace(args.analysis_id, args.content_hash)
+    if not trace:
+        print("No trace stored for this analysis", file=sys.stderr)
+        return 1
+
+    payload = json.dumps(chrome_trace(trace), indent=2, default=str)
+    if args.output:
+        Path(args.output).write_text(payload)
+        print(
+            f"Wrote {trace.get('span_count', 0)} spans to {args.output}",
+            file=sys.stderr,
+        )
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
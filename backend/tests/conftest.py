@@ -224,6 +224,26 @@ def setup_test_environment(monkeypatch):
         monkeypatch.setenv(key, value)
 
 
+@pytest.fixture(autouse=True)
+def clear_verified_claims_cache():
+    """Keep verified token claims from leaking between tests."""
+    from app.core.verified_claims import reset_verified_claims_cache
+
+    reset_verified_claims_cache()
+    yield
+    reset_verified_claims_cache()
+
+
+@pytest.fixture(autouse=True)
+def clear_contract_cache():
+    """Give every test an empty, process-local contract cache."""
+    from app.services.contract_cache import ContractCache, reset_contract_cache
+
+    reset_contract_cache(ContractCache())
+    yield
+    reset_contract_cache()
+
+
 @pytest.fixture
 def mock_redis_client():
     """Mock Redis client for caching tests."""
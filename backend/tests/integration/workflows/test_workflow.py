@@ -5,6 +5,8 @@ Test runner for LangGraph Contract Analysis Workflow
 import asyncio
 import os
 
+import pytest
+
 from app.agents.contract_workflow import ContractAnalysisWorkflow
 from app.agents.states.contract_state import create_initial_state
 from app.schema.enums import AustralianState
@@ -148,7 +150,8 @@ async def test_workflow_execution():
         return None
 
 
-def test_workflow_components():
+@pytest.mark.asyncio
+async def test_workflow_components():
     """Test individual workflow components"""
 
     print("\n" + "=" * 50)
@@ -168,7 +171,10 @@ def test_workflow_components():
     # Test state creation
     try:
         initial_state = create_initial_state(
-            user_id="test_user", australian_state=AustralianState.NSW, user_type="buyer"
+            user_id="test_user",
+            content_hash="test_hash",
+            australian_state=AustralianState.NSW,
+            user_type="buyer",
         )
         print("✅ State creation: SUCCESS")
     except Exception as e:
@@ -180,7 +186,7 @@ def test_workflow_components():
     test_state["document_data"] = {"content": "test content"}
 
     try:
-        validated_state = workflow.validate_input(test_state)
+        validated_state = await workflow.validate_input(test_state)
         if validated_state.get("current_step") == "input_validated":
             print("✅ Input validation: SUCCESS")
         else:
@@ -200,7 +206,7 @@ async def main():
     print("=" * 60)
 
     # Test components first
-    if not test_workflow_components():
+    if not await test_workflow_components():
         print("\n❌ Component tests failed. Skipping workflow execution test.")
         return
 
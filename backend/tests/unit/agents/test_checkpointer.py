@@ -0,0 +1,149 @@
+"""
+Unit tests for workflow checkpointing and node-granular resume.
+"""
+
+import operator
+from contextlib import asynccontextmanager
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph
+
+from app.agents.checkpointer import (
+    PostgresCheckpointSaver,
+    ainvoke_checkpointed,
+    subflow_thread_id,
+)
+
+
+class _FanOutState(TypedDict, total=False):
+    results: Annotated[list, operator.add]
+
+
+def _fan_out_graph(calls, failing):
+    """start -> (a | b | c) where branch ``b`` raises while ``failing`` is set."""
+
+    def branch(name):
+        async def run(state):
+            calls.append(name)
+            if name in failing:
+                raise RuntimeError(f"{name} crashed")
+            return {"results": [name]}
+
+        return run
+
+    graph = StateGraph(_FanOutState)
+    graph.add_node("start", lambda state: {})
+    graph.set_entry_point("start")
+    for name in ("a", "b", "c"):
+        graph.add_node(name, branch(name))
+        graph.add_edge("start", name)
+    return graph.compile()
+
+
+class TestResume:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_finished_parallel_branches_are_not_repeated(self):
+        calls, failing = [], {"b"}
+        graph = _fan_out_graph(calls, failing)
+        saver = InMemorySaver()
+
+        with pytest.raises(RuntimeError):
+            await ainvoke_checkpointed(graph, {"results": []}, "t1", saver)
+        assert sorted(calls) == ["a", "b", "c"]
+
+        failing.clear()
+        calls.clear()
+        result = await ainvoke_checkpointed(graph, {"results": []}, "t1", saver)
+
+        assert calls == ["b"]
+        assert sorted(result["results"]) == ["a", "b", "c"]
+        # Completed runs drop their thread
+        assert saver.get_tuple({"configurable": {"thread_id": "t1"}}) is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fresh_run_discards_interrupted_thread(self):
+        calls, failing = [], {"b"}
+        graph = _fan_out_graph(calls, failing)
+        saver = InMemorySaver()
+
+        with pytest.raises(RuntimeError):
+            await ainvoke_checkpointed(graph, {"results": []}, "t1", saver)
+
+        failing.clear()
+        calls.clear()
+        await ainvoke_checkpointed(
+            graph, {"results": []}, "t1", saver, allow_resume=False
+        )
+        assert sorted(calls) == ["a", "b", "c"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_subflow_thread_derived_from_parent_run(self):
+        seen = []
+
+        async def node(state):
+            seen.append(subflow_thread_id("step2"))
+            return {}
+
+        graph = StateGraph(_FanOutState)
+        graph.add_node("node", node)
+        graph.set_entry_point("node")
+        await ainvoke_checkpointed(graph.compile(), {}, "parent", InMemorySaver())
+
+        assert seen == ["parent/step2"]
+        assert subflow_thread_id("step2") is None
+
+
+class _RecordingConnection:
+    def __init__(self):
+        self.executemany_rows = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def executemany(self, query, rows):
+        self.executemany_rows.extend(rows)
+
+    async def execute(self, query, *args):
+        return "OK"
+
+
+class TestPostgresCheckpointSaver:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_put_stores_only_changed_serializable_channels(self):
+        conn = _RecordingConnection()
+
+        @asynccontextmanager
+        async def connection():
+            yield conn
+
+        saver = PostgresCheckpointSaver(connection_factory=connection)
+        checkpoint = {
+            "v": 4,
+            "id": "ckpt-1",
+            "ts": "2024-01-01T00:00:00+00:00",
+            "channel_values": {
+                "text": "contract",
+                "unchanged": "large value",
+                "notify_progress": lambda *args: None,
+            },
+            "channel_versions": {"text": "2", "unchanged": "1", "notify_progress": "2"},
+            "versions_seen": {},
+            "updated_channels": None,
+        }
+
+        next_config = await saver.aput(
+            {"configurable": {"thread_id": "t1", "checkpoint_ns": ""}},
+            checkpoint,
+            {"step": 1},
+            {"text": "2", "notify_progress": "2"},
+        )
+
+        assert next_config["configurable"]["checkpoint_id"] == "ckpt-1"
+        assert [row[2] for row in conn.executemany_rows] == ["text"]
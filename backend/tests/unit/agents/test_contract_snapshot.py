@@ -0,0 +1,128 @@
+"""
+Unit tests for the per-workflow contract snapshot.
+"""
+
+from contextlib import asynccontextmanager
+from typing import Annotated, Any, Dict, Optional, TypedDict
+
+import pytest
+from langgraph.graph import StateGraph
+
+import app.services.repositories.contracts_repository as contracts_module
+from app.agents.states.base import merge_contract_snapshot
+from app.services.repositories.contracts_repository import ContractsRepository
+
+
+class _SnapshotState(TypedDict, total=False):
+    contract_snapshot: Annotated[Optional[Dict[str, Any]], merge_contract_snapshot]
+
+
+def _snapshot(*keys, content_hash="h1"):
+    return {"content_hash": content_hash, "populated_keys": sorted(keys)}
+
+
+class TestMergeContractSnapshot:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_parallel_writers_union_populated_keys(self):
+        def writer(key):
+            async def run(state):
+                snapshot = state["contract_snapshot"]
+                keys = set(snapshot["populated_keys"]) | {key}
+                return {
+                    "contract_snapshot": {**snapshot, "populated_keys": sorted(keys)}
+                }
+
+            return run
+
+        graph = StateGraph(_SnapshotState)
+        graph.add_node("start", lambda state: {})
+        graph.set_entry_point("start")
+        for key in ("conditions", "warranties"):
+            graph.add_node(key, writer(key))
+            graph.add_edge("start", key)
+
+        result = await graph.compile().ainvoke(
+            {"contract_snapshot": _snapshot("extracted_entity")}
+        )
+        assert result["contract_snapshot"]["populated_keys"] == [
+            "conditions",
+            "extracted_entity",
+            "warranties",
+        ]
+
+    @pytest.mark.unit
+    def test_other_contract_replaces_and_none_keeps(self):
+        current = _snapshot("conditions")
+        assert merge_contract_snapshot(current, None) is current
+        replacement = _snapshot(content_hash="h2")
+        assert merge_contract_snapshot(current, replacement) is replacement
+
+
+class _FakeConnection:
+    def __init__(self, row=None, value=None):
+        self.row, self.value, self.queries = row, value, []
+
+    async def fetchrow(self, query, *args):
+        self.queries.append(query)
+        return self.row
+
+    async def fetchval(self, query, *args):
+        self.queries.append(query)
+        return self.value
+
+
+class TestSnapshotQueries:
+    @pytest.fixture
+    def connection(self, monkeypatch):
+        conn = _FakeConnection()
+
+        @asynccontextmanager
+        async def _service_role_connection():
+            yield conn
+
+        monkeypatch.setattr(
+            contracts_module, "get_service_role_connection", _service_role_connection
+        )
+        return conn
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_populated_keys_query_returns_no_payloads(self, connection):
+        connection.row = {"populated": ["conditions", "parties_property"]}
+        keys = await ContractsRepository().get_populated_analysis_keys("h1")
+
+        assert keys == ["conditions", "parties_property"]
+        select_list = connection.queries[0].split("FROM")[0]
+        assert "jsonb_typeof(special_risks)" in select_list
+        assert "raw_text" not in select_list
+
+        connection.row = None
+        assert await ContractsRepository().get_populated_analysis_keys("h1") == []
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_section_value_fetches_single_whitelisted_column(self, connection):
+        connection.value = '{"confidence_score": 0.9}'
+        repo = ContractsRepository()
+
+        assert await repo.get_section_analysis_value("h1", "conditions") == {
+            "confidence_score": 0.9
+        }
+        with pytest.raises(ValueError):
+            await repo.get_section_analysis_value("h1", "raw_text; DROP TABLE x")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_snapshot_includes_stored_fingerprints(self, connection):
+        connection.row = {
+            "populated": ["conditions"],
+            "fingerprints": '{"conditions": {"fingerprint": "abc"}}',
+        }
+        snapshot = await ContractsRepository().get_analysis_snapshot("h1")
+
+        assert snapshot == {
+            "populated_keys": ["conditions"],
+            "fingerprints": {"conditions": {"fingerprint": "abc"}},
+        }
+        assert "analysis_fingerprints" in connection.queries[0]
@@ -0,0 +1,72 @@
+"""
+Unit tests for the run-scoped full-text memo.
+"""
+
+import asyncio
+
+import pytest
+
+from app.agents.full_text_memo import FullTextMemo, full_text_memo_scope, memoized
+
+
+def _counting_fetch(calls, value="text", delay=0.01):
+    async def fetch():
+        calls.append(value)
+        await asyncio.sleep(delay)
+        return value
+
+    return fetch
+
+
+class TestFullTextMemo:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_fetch(self):
+        memo, calls = FullTextMemo(), []
+        fetch = _counting_fetch(calls)
+
+        results = await asyncio.gather(
+            *(memo.get_or_fetch(("full_text", "a1"), fetch) for _ in range(5))
+        )
+        assert results == ["text"] * 5
+        assert calls == ["text"]
+
+        await memo.get_or_fetch(("full_text", "a1"), fetch)
+        assert memo.stats() == {"hits": 5, "misses": 1, "hit_rate": 0.833}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failures_are_shared_but_not_cached(self):
+        memo, attempts = FullTextMemo(), []
+
+        async def flaky():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            if len(attempts) == 1:
+                raise RuntimeError("storage unavailable")
+            return "text"
+
+        outcomes = await asyncio.gather(
+            memo.get_or_fetch("k", flaky),
+            memo.get_or_fetch("k", flaky),
+            return_exceptions=True,
+        )
+        assert all(isinstance(o, RuntimeError) for o in outcomes)
+        assert await memo.get_or_fetch("k", flaky) == "text"
+        assert len(attempts) == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_memo_only_applies_inside_a_run_scope(self):
+        calls = []
+        fetch = _counting_fetch(calls, delay=0)
+
+        await memoized("k", fetch)
+        await memoized("k", fetch)
+        assert len(calls) == 2
+
+        with full_text_memo_scope() as memo:
+            await memoized("k", fetch)
+            await memoized("k", fetch)
+        assert len(calls) == 3
+        assert memo.stats()["hits"] == 1
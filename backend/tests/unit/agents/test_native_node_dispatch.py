@@ -0,0 +1,41 @@
+"""
+Unit tests for awaiting workflow nodes natively on the caller's event loop.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.agents.contract_workflow import ContractAnalysisWorkflow
+
+
+def _workflow() -> ContractAnalysisWorkflow:
+    with (
+        patch("app.agents.contract_workflow.get_openai_client"),
+        patch("app.agents.contract_workflow.get_gemini_client"),
+    ):
+        return ContractAnalysisWorkflow(
+            model_name="gpt-4",
+            enable_validation=False,
+            enable_quality_checks=False,
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_nodes_run_on_caller_event_loop():
+    workflow = _workflow()
+    caller_loop = asyncio.get_running_loop()
+    seen_loops = []
+
+    async def _execute(state):
+        seen_loops.append(asyncio.get_running_loop())
+        return {**state, "validated": True}
+
+    with patch.object(workflow.input_validation_node, "execute", _execute):
+        assert asyncio.iscoroutinefunction(workflow.validate_input)
+        result = await workflow.validate_input({"user_id": "test_user"})
+
+    assert seen_loops == [caller_loop]
+    assert result["validated"] is True
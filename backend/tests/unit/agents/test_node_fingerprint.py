@@ -0,0 +1,112 @@
+"""
+Unit tests for node input fingerprints used by incremental re-analysis.
+"""
+
+import json
+from datetime import datetime
+from enum import Enum
+
+import pytest
+
+from app.agents.node_fingerprint import changed_inputs, compute_fingerprint
+from app.agents.states.base import merge_contract_snapshot
+
+SIGNATURE = {
+    "composition": "conditions_analysis",
+    "composition_version": "1.0.0",
+    "system_prompts": {"assistant/core": "1.0.0"},
+    "user_prompt": "1.0.0",
+    "primary_model": "gpt-4",
+    "fallback_models": [],
+}
+
+
+class _State(str, Enum):
+    NSW = "NSW"
+    VIC = "VIC"
+
+
+def _inputs(**overrides):
+    inputs = {
+        "australian_state": _State.NSW,
+        "extracted_entity": {"parties": ["a", "b"], "price": 850000},
+        "contract_type": "purchase_agreement",
+    }
+    inputs.update(overrides)
+    return inputs
+
+
+class TestComputeFingerprint:
+    @pytest.mark.unit
+    def test_stable_across_key_order_and_serialisation(self):
+        inputs = _inputs(settlement_date=datetime(2024, 3, 1, 12, 0))
+        round_tripped = {
+            "settlement_date": "2024-03-01T12:00:00",
+            "contract_type": "purchase_agreement",
+            "extracted_entity": {"price": 850000, "parties": ["a", "b"]},
+            "australian_state": "NSW",
+        }
+
+        first = compute_fingerprint(inputs, SIGNATURE)
+        second = compute_fingerprint(round_tripped, SIGNATURE)
+
+        assert first["fingerprint"] == second["fingerprint"]
+        assert first["model"] == "gpt-4"
+        assert json.loads(json.dumps(first)) == first
+
+    @pytest.mark.unit
+    def test_only_changed_inputs_are_reported(self):
+        stored = compute_fingerprint(_inputs(), SIGNATURE)
+        current = compute_fingerprint(_inputs(australian_state=_State.VIC), SIGNATURE)
+
+        assert current["fingerprint"] != stored["fingerprint"]
+        assert changed_inputs(stored, current) == ["australian_state"]
+        assert changed_inputs(stored, stored) == []
+
+    @pytest.mark.unit
+    def test_prompt_or_model_change_invalidates(self):
+        stored = compute_fingerprint(_inputs(), SIGNATURE)
+        current = compute_fingerprint(_inputs(), {**SIGNATURE, "user_prompt": "1.1.0"})
+
+        assert current["fingerprint"] != stored["fingerprint"]
+        assert changed_inputs(stored, current) == ["composition"]
+
+    @pytest.mark.unit
+    def test_missing_stored_fingerprint_reports_every_input(self):
+        current = compute_fingerprint(_inputs(), SIGNATURE)
+        assert changed_inputs(None, current) == sorted(current["inputs"])
+
+
+class TestSnapshotFingerprints:
+    @pytest.mark.unit
+    def test_parallel_writers_merge_fingerprints(self):
+        base = {
+            "content_hash": "h1",
+            "populated_keys": ["extracted_entity"],
+            "fingerprints": {"extracted_entity": {"fingerprint": "e"}},
+        }
+        conditions = {
+            **base,
+            "populated_keys": ["conditions", "extracted_entity"],
+            "fingerprints": {
+                **base["fingerprints"],
+                "conditions": {"fingerprint": "c"},
+            },
+        }
+        warranties = {
+            **base,
+            "populated_keys": ["extracted_entity", "warranties"],
+            "fingerprints": {
+                **base["fingerprints"],
+                "warranties": {"fingerprint": "w"},
+            },
+        }
+
+        merged = merge_contract_snapshot(
+            merge_contract_snapshot(base, conditions), warranties
+        )
+        assert sorted(merged["fingerprints"]) == [
+            "conditions",
+            "extracted_entity",
+            "warranties",
+        ]
@@ -0,0 +1,73 @@
+"""
+Unit tests for the run-scoped blob store used to keep workflow state lean.
+"""
+
+import pytest
+
+from app.agents.run_blobs import (
+    MIN_BLOB_BYTES,
+    estimate_state_bytes,
+    has_text,
+    is_blob_ref,
+    resolve_blob,
+    run_blob_scope,
+    stash_blob,
+)
+
+FULL_TEXT = "Clause 1. The purchaser agrees to buy the property. " * 400
+
+
+class TestRunBlobs:
+    @pytest.mark.unit
+    def test_outside_a_scope_payloads_stay_inline(self):
+        assert stash_blob(FULL_TEXT, "full_text") is FULL_TEXT
+        assert resolve_blob("plain value") == "plain value"
+
+    @pytest.mark.unit
+    def test_large_text_becomes_a_handle_that_resolves_in_scope(self):
+        with run_blob_scope() as store:
+            ref = stash_blob(FULL_TEXT, "full_text")
+            again = stash_blob(FULL_TEXT, "contract_text")
+
+            assert is_blob_ref(ref) and ref["size"] == len(FULL_TEXT)
+            assert again["__blob__"] == ref["__blob__"]
+            assert resolve_blob(ref) == FULL_TEXT
+            assert stash_blob("short", "full_text") == "short"
+            assert store.stats()["blobs"] == 1
+            assert store.stats()["stashed_bytes"] == len(FULL_TEXT)
+
+        # Handle outlived its run (e.g. resumed elsewhere): readers fall back
+        assert resolve_blob(ref) is None
+        with run_blob_scope() as other:
+            assert resolve_blob(ref) is None
+            assert other.stats()["misses"] == 1
+
+    @pytest.mark.unit
+    def test_has_text_accepts_handles_and_rejects_blank_text(self):
+        with run_blob_scope():
+            assert has_text(stash_blob(FULL_TEXT, "full_text"))
+        assert has_text("some text")
+        assert not has_text("   ")
+        assert not has_text(None)
+
+    @pytest.mark.unit
+    def test_state_size_counts_handles_not_payloads(self):
+        state = {
+            "step0_ocr_processing": {"full_text": FULL_TEXT, "method": "ocr"},
+            "extracted_text": FULL_TEXT,
+            "financial_terms": {"purchase_price": 850000},
+        }
+        inline = estimate_state_bytes(state)
+
+        with run_blob_scope():
+            ref = stash_blob(FULL_TEXT, "full_text")
+            lean = estimate_state_bytes(
+                {
+                    **state,
+                    "step0_ocr_processing": {"full_text": ref, "method": "ocr"},
+                    "extracted_text": ref,
+                }
+            )
+
+        assert inline > 2 * len(FULL_TEXT)
+        assert lean < MIN_BLOB_BYTES
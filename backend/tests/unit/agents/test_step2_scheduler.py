@@ -0,0 +1,210 @@
+"""
+Unit tests for critical-path scheduling of the Step 2 analyzers.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.agents.step2_scheduler import (
+    STEP2_ANALYZER_DEPENDENCIES,
+    NodeLatencyHistory,
+    critical_path_ranks,
+    realized_critical_path,
+    run_dependency_graph,
+)
+from app.core.llm_priority import priority_slot
+from app.schema.enums import ProcessingStatus
+from app.agents.subflows.step2_section_analysis_workflow import (
+    Step2AnalysisWorkflow,
+)
+
+DEPS = {
+    "financial": (),
+    "conditions": (),
+    "diagram": (),
+    "settlement": ("financial", "conditions"),
+    "adjustments": ("settlement", "financial"),
+    "title": ("diagram",),
+}
+
+
+class TestCriticalPathRanks:
+    @pytest.mark.unit
+    def test_rank_is_longest_remaining_chain(self):
+        estimates = {
+            "financial": 3,
+            "conditions": 1,
+            "diagram": 5,
+            "settlement": 2,
+            "adjustments": 2,
+            "title": 1,
+        }
+        ranks = critical_path_ranks(DEPS, estimates)
+
+        assert ranks["adjustments"] == 2
+        assert ranks["settlement"] == 4
+        assert ranks["financial"] == 7
+        assert ranks["diagram"] == 6
+        # financial -> settlement -> adjustments outranks the slower diagram alone
+        assert ranks["financial"] > ranks["diagram"] > ranks["conditions"]
+
+    @pytest.mark.unit
+    def test_step2_graph_is_acyclic_and_history_overrides_priors(self):
+        history = NodeLatencyHistory(alpha=0.5)
+        history.observe("analyze_warranties", 10.0)
+        history.observe("analyze_warranties", 20.0)
+
+        assert history.estimate("analyze_warranties") == 15.0
+        ranks = critical_path_ranks(
+            STEP2_ANALYZER_DEPENDENCIES,
+            history.estimates(STEP2_ANALYZER_DEPENDENCIES),
+        )
+        assert set(ranks) == set(STEP2_ANALYZER_DEPENDENCIES)
+
+    @pytest.mark.unit
+    def test_cycles_and_unknown_dependencies_are_rejected(self):
+        with pytest.raises(ValueError):
+            critical_path_ranks({"a": ("b",), "b": ("a",)}, {})
+        with pytest.raises(ValueError):
+            critical_path_ranks({"a": ("missing",)}, {})
+
+
+class TestRunDependencyGraph:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_dependents_start_when_their_own_inputs_finish(self):
+        durations = {"diagram": 0.2, "title": 0.01}
+        finished = []
+
+        async def run(node):
+            await asyncio.sleep(durations.get(node, 0.02))
+            finished.append(node)
+
+        timings = await run_dependency_graph(DEPS, run)
+
+        # Settlement and adjustments do not wait for the slow diagram branch
+        assert timings["adjustments"][1] < timings["diagram"][1]
+        assert finished.index("adjustments") < finished.index("diagram")
+        for node, upstream in DEPS.items():
+            for dep in upstream:
+                assert timings[dep][1] <= timings[node][0]
+
+        path = realized_critical_path(DEPS, timings)
+        assert path["nodes"] == ["diagram", "title"]
+        assert path["segments"][0]["node"] == "diagram"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failure_cancels_running_nodes(self):
+        cancelled = []
+
+        async def run(node):
+            if node == "conditions":
+                raise RuntimeError("boom")
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(node)
+                raise
+
+        with pytest.raises(RuntimeError):
+            await run_dependency_graph(DEPS, run)
+        assert set(cancelled) == {"financial", "diagram"}
+
+
+class TestAnalyzerUpdateMerge:
+    @pytest.mark.unit
+    def test_only_changed_keys_are_applied(self):
+        seen = {"conditions": None, "financial_terms": None, "processing_errors": ["a"]}
+        working = {**seen, "financial_terms": {"done": True}}
+        update = {}
+        # A full-state copy from an analyzer that started before financial terms finished
+        result = {**seen, "conditions": {"ok": True}, "processing_errors": ["a", "b"]}
+
+        Step2AnalysisWorkflow._apply_analyzer_update(working, update, seen, result)
+
+        assert working["financial_terms"] == {"done": True}
+        assert working["conditions"] == {"ok": True}
+        assert working["processing_errors"] == ["a", "b"]
+        assert update == {"conditions": {"ok": True}, "processing_errors": ["b"]}
+
+
+CACHED_COLUMNS = {
+    "financial_terms": {"purchase_price": 900000, "confidence_score": 0.9},
+    "conditions": {"finance_clause": True, "confidence_score": 0.8},
+}
+
+
+class _SlotOnlyLLMService:
+    """Takes a Step 2 LLM slot like the real service, then fails to parse."""
+
+    async def generate_content(self, **_kwargs):
+        async with priority_slot():
+            return SimpleNamespace(success=False, parsed_data=None)
+
+
+class TestAnalyzerResume:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_rerun_reuses_analyzer_columns_listed_in_snapshot(self):
+        workflow = Step2AnalysisWorkflow()
+        state = {
+            "content_hash": "hash-1",
+            "progress": {
+                "current_step": 4,
+                "total_steps": 10,
+                "status": ProcessingStatus.PROCESSING,
+            },
+            "contract_snapshot": {
+                "content_hash": "hash-1",
+                "populated_keys": sorted(CACHED_COLUMNS),
+                "fingerprints": {},
+            },
+        }
+
+        async def analyze_diagram(_state):
+            async with priority_slot():
+                return {}
+
+        cached_reads = AsyncMock(side_effect=lambda _hash, key: CACHED_COLUMNS[key])
+        with (
+            patch(
+                "app.services.repositories.contracts_repository.ContractsRepository"
+                ".get_section_analysis_value",
+                cached_reads,
+            ),
+            patch.object(workflow, "analyze_diagram", analyze_diagram),
+            patch.object(
+                workflow.prompt_manager,
+                "render_composed",
+                AsyncMock(return_value={"user_prompt": "prompt", "metadata": {}}),
+            ),
+        ):
+            for name in STEP2_ANALYZER_DEPENDENCIES:
+                node = workflow.nodes.get(name)
+                if node is None:
+                    continue
+                node.prompt_manager = workflow.prompt_manager
+                node._build_context_and_parser = AsyncMock(
+                    return_value=({}, None, "composition")
+                )
+                node._get_llm_service = AsyncMock(return_value=_SlotOnlyLLMService())
+
+            update = await workflow.run_section_analyzers(state)
+
+        llm_calls = update["analyzer_schedule"]["llm_calls"]
+        # Analyzers whose columns are already persisted make no model calls
+        assert not llm_calls.get("analyze_financial_terms")
+        assert not llm_calls.get("analyze_conditions")
+        assert set(llm_calls) == set(STEP2_ANALYZER_DEPENDENCIES) - {
+            "analyze_financial_terms",
+            "analyze_conditions",
+        }
+        assert sorted(call.args[1] for call in cached_reads.await_args_list) == sorted(
+            CACHED_COLUMNS
+        )
+        for column, value in CACHED_COLUMNS.items():
+            assert update[column] == value
@@ -0,0 +1,109 @@
+"""
+Unit tests for the shared pooled HTTP transport used by the OpenAI client.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.clients.openai.client import OpenAIClient
+from app.clients.openai.config import OpenAIClientConfig
+from app.clients.openai.http_pool import SharedHTTPTransport
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestSharedHTTPTransport:
+    @pytest.mark.unit
+    def test_sync_requests_reuse_connection(self, local_server):
+        transport = SharedHTTPTransport(http2=False)
+        client = transport.get_sync_client()
+        for _ in range(3):
+            assert client.get(local_server).status_code == 200
+
+        stats = transport.stats()
+        assert transport.get_sync_client() is client
+        assert stats["requests"] == 3
+        assert stats["new_connections"] == 1
+        assert stats["reused_connections"] == 2
+        assert stats["open_connections"] == 1
+        client.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_async_requests_reuse_connection(self, local_server):
+        transport = SharedHTTPTransport(http2=False)
+        client = transport.get_async_client()
+        for _ in range(3):
+            assert (await client.get(local_server)).status_code == 200
+        assert transport.get_async_client() is client
+
+        stats = transport.stats()
+        assert stats["new_connections"] == 1
+        assert stats["reuse_ratio"] == pytest.approx(2 / 3, abs=1e-3)
+
+        await transport.aclose()
+        assert transport.stats()["clients"] == 0
+
+
+class TestOpenAIClientPooling:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_per_key_clients_share_one_pool(self):
+        client = OpenAIClient(OpenAIClientConfig(api_key="key-a"))
+
+        lc_a = client._get_or_create_langchain_client_for("key-a", "model-x")
+        lc_b = client._get_or_create_langchain_client_for("key-b", "model-y")
+        assert lc_a is not lc_b
+        assert lc_a.http_async_client is lc_b.http_async_client
+        assert lc_a.http_client is lc_b.http_client
+
+        sdk_a = client._get_or_create_async_openai_client_for("key-a")
+        sdk_b = client._get_or_create_async_openai_client_for("key-b")
+        assert sdk_a._client is sdk_b._client is lc_a.http_async_client
+        # Credentials stay per key even though the transport is shared
+        assert sdk_a.auth_headers["Authorization"] == "Bearer key-a"
+        assert sdk_b.auth_headers["Authorization"] == "Bearer key-b"
+
+        await client.close()
+        # Closing one client leaves the process-wide pool to the others
+        assert not lc_a.http_async_client.is_closed
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_recreated_pool_replaces_cached_clients(self):
+        client = OpenAIClient(OpenAIClientConfig(api_key="key-a"))
+
+        sdk_old = client._get_or_create_async_openai_client_for("key-a")
+        assert client._get_or_create_async_openai_client_for("key-a") is sdk_old
+
+        await client._transport.aclose()
+        sdk_new = client._get_or_create_async_openai_client_for("key-a")
+
+        assert sdk_new is not sdk_old
+        assert not sdk_new._client.is_closed
+        # Evicted, not accumulated
+        assert len(client._async_openai_clients_by_key) == 1
@@ -0,0 +1,178 @@
+"""
+Unit tests for incremental JSON repair and partial-parse recovery.
+"""
+
+import json
+from enum import Enum
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.prompts.json_repair import (
+    RepairPath,
+    close_unterminated_json,
+    coerce_to_model,
+    repair_json,
+)
+from app.core.prompts.parsers import RetryingPydanticOutputParser
+
+
+class RiskLevel(str, Enum):
+    LOW = "low"
+    HIGH_RISK = "high_risk"
+
+
+class Item(BaseModel):
+    name: str
+    amount: int
+
+
+class Report(BaseModel):
+    title: str
+    price: float
+    approved: bool
+    level: RiskLevel
+    items: List[Item]
+    tags: List[str] = []
+    note: Optional[str] = None
+
+
+class TestCloseUnterminatedJson:
+    @pytest.mark.unit
+    def test_complete_document_drops_trailing_text(self):
+        text, closed, dropped = close_unterminated_json('{"a": 1} and more')
+        assert text == '{"a": 1}'
+        assert closed is False
+        assert dropped is True
+
+    @pytest.mark.unit
+    def test_truncated_string_value_is_closed(self):
+        text, closed, _ = close_unterminated_json('{"a": [1, 2], "b": "trunc')
+        assert closed is True
+        assert json.loads(text) == {"a": [1, 2], "b": "trunc"}
+
+    @pytest.mark.unit
+    def test_dangling_key_and_partial_literal_are_dropped(self):
+        text, _, _ = close_unterminated_json('{"a": 1, "b": {"c": tr')
+        assert json.loads(text) == {"a": 1, "b": {}}
+        text, _, _ = close_unterminated_json('{"a": 1, "unfinished_ke')
+        assert json.loads(text) == {"a": 1}
+
+    @pytest.mark.unit
+    def test_braces_inside_strings_are_ignored(self):
+        text, closed, _ = close_unterminated_json('{"a": "x } ] \\" y", "b": [')
+        assert closed is True
+        assert json.loads(text) == {"a": 'x } ] " y', "b": []}
+
+
+class TestRepairJson:
+    @pytest.mark.unit
+    def test_valid_json_has_empty_repair_path(self):
+        result = repair_json('{"a": 1}')
+        assert result.data == {"a": 1}
+        assert result.repair_path == []
+
+    @pytest.mark.unit
+    def test_fences_and_prose_reported(self):
+        result = repair_json('Here you go:\n```json\n{"a": 1}\n```\nHope this helps')
+        assert result.data == {"a": 1}
+        assert RepairPath.FENCES_STRIPPED in result.repair_path
+
+        result = repair_json('Sure! {"a": 1} Let me know.')
+        assert result.data == {"a": 1}
+        assert result.repair_path == [
+            RepairPath.LEADING_PROSE_STRIPPED,
+            RepairPath.TRAILING_PROSE_STRIPPED,
+        ]
+
+    @pytest.mark.unit
+    def test_truncated_fence_and_trailing_commas(self):
+        result = repair_json('```json\n{"a": [1, 2,], "b": {"c": 3,}, "d": "x')
+        assert result.data == {"a": [1, 2], "b": {"c": 3}, "d": "x"}
+        assert RepairPath.STRUCTURE_CLOSED in result.repair_path
+        assert RepairPath.TRAILING_COMMAS_REMOVED in result.repair_path
+
+    @pytest.mark.unit
+    def test_no_json(self):
+        assert repair_json("no structured output here").data is None
+        assert repair_json("").data is None
+
+
+class TestCoerceToModel:
+    @pytest.mark.unit
+    def test_near_miss_types_are_coerced(self):
+        changes: List[str] = []
+        data = coerce_to_model(
+            {
+                "title": 42,
+                "price": "$1,250.50",
+                "approved": "Yes",
+                "level": "High Risk",
+                "items": {"name": "deposit", "amount": "5,000"},
+                "tags": "urgent",
+                "note": None,
+            },
+            Report,
+            changes=changes,
+        )
+        report = Report(**data)
+        assert report.title == "42"
+        assert report.price == pytest.approx(1250.5)
+        assert report.approved is True
+        assert report.level == RiskLevel.HIGH_RISK
+        assert report.items == [Item(name="deposit", amount=5000)]
+        assert report.tags == ["urgent"]
+        assert changes
+
+    @pytest.mark.unit
+    def test_valid_values_are_untouched(self):
+        changes: List[str] = []
+        original = {"name": "a", "amount": 1}
+        assert coerce_to_model(original, Item, changes=changes) == original
+        assert changes == []
+
+
+class TestParserRepair:
+    @pytest.mark.unit
+    def test_parse_with_retry_recovers_truncated_output(self):
+        parser = RetryingPydanticOutputParser(pydantic_object=Item)
+        result = parser.parse_with_retry('Result: {"name": "x", "amount": "12", "extra": "cut')
+        assert result.success
+        assert result.parsed_data == Item(name="x", amount=12)
+        assert result.repair_path == [
+            RepairPath.LEADING_PROSE_STRIPPED,
+            RepairPath.STRUCTURE_CLOSED,
+            RepairPath.TYPES_COERCED,
+        ]
+
+    @pytest.mark.unit
+    def test_missing_fields_reported_and_merged(self):
+        parser = RetryingPydanticOutputParser(pydantic_object=Report)
+        truncated = (
+            '{"title": "T", "price": 1, "approved": true, "level": "low", "items": [{"na'
+        )
+        result = parser.parse_with_retry(truncated)
+        assert not result.success
+        assert result.missing_fields == ["items[0].name", "items[0].amount"]
+        assert result.partial_data["title"] == "T"
+
+        prompt = parser.build_missing_fields_prompt(result.missing_fields)
+        assert "items" in prompt
+        assert '"approved"' not in prompt
+
+        merged = parser.merge_missing_fields(
+            result.partial_data,
+            '{"items": [{"name": "a", "amount": 2}]}',
+            result.repair_path,
+        )
+        assert merged.success
+        assert merged.parsed_data.items == [Item(name="a", amount=2)]
+        assert merged.repair_path[-1] == RepairPath.MISSING_FIELDS_REASKED
+
+    @pytest.mark.unit
+    def test_non_missing_validation_errors_do_not_request_reask(self):
+        parser = RetryingPydanticOutputParser(pydantic_object=Item)
+        result = parser.parse_with_retry('{"name": "x", "amount": "not a number"')
+        assert not result.success
+        assert result.missing_fields == []
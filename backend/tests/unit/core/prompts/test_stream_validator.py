@@ -0,0 +1,72 @@
+"""
+Unit tests for incremental streamed-output schema validation.
+"""
+
+from typing import List
+
+import pytest
+from pydantic import BaseModel, Field
+
+from app.core.prompts.stream_validator import StreamDivergence, StreamingSchemaValidator
+
+
+class Analysis(BaseModel):
+    summary: str
+    risks: List[str] = []
+    score: float = Field(0.0, alias="overall_score")
+
+
+def _feed_all(validator: StreamingSchemaValidator, text: str, size: int = 5):
+    partials = []
+    for i in range(0, len(text), size):
+        partial = validator.feed(text[i : i + size])
+        if partial is not None:
+            partials.append(partial)
+        if validator.divergence:
+            break
+    return partials
+
+
+class TestStreamingSchemaValidator:
+    @pytest.mark.unit
+    def test_valid_stream_reports_partials_per_field(self):
+        validator = StreamingSchemaValidator(Analysis)
+        text = '```json\n{"summary": "ok, {fine}", "risks": ["a", "b"], "overall_score": 0.5}\n```'
+        partials = _feed_all(validator, text)
+
+        assert validator.divergence is None
+        assert validator.completed_fields == ["summary", "risks", "overall_score"]
+        assert partials[0] == {"summary": "ok, {fine}"}
+        assert partials[-1]["overall_score"] == 0.5
+
+    @pytest.mark.unit
+    def test_short_preamble_is_allowed(self):
+        validator = StreamingSchemaValidator(Analysis)
+        _feed_all(validator, 'Here is the analysis [v2]: {"summary": "x"}')
+        assert validator.divergence is None
+
+    @pytest.mark.unit
+    def test_prose_instead_of_json_diverges(self):
+        validator = StreamingSchemaValidator(Analysis, max_prose_chars=50)
+        _feed_all(validator, "Unfortunately the document could not be analysed because " * 3)
+        assert validator.divergence == StreamDivergence.PROSE_INSTEAD_OF_JSON
+
+    @pytest.mark.unit
+    def test_top_level_array_diverges(self):
+        validator = StreamingSchemaValidator(Analysis)
+        _feed_all(validator, '```json\n[{"summary": "x"}]')
+        assert validator.divergence == StreamDivergence.TOP_LEVEL_ARRAY
+
+    @pytest.mark.unit
+    def test_unexpected_first_key_diverges(self):
+        validator = StreamingSchemaValidator(Analysis)
+        _feed_all(validator, '{"analysis": {"summary": "x"}}')
+        assert validator.divergence == (
+            f"{StreamDivergence.UNEXPECTED_TOP_LEVEL_KEY}:analysis"
+        )
+
+    @pytest.mark.unit
+    def test_unknown_key_after_known_key_is_tolerated(self):
+        validator = StreamingSchemaValidator(Analysis)
+        _feed_all(validator, '{"summary": "x", "notes": "extra"}')
+        assert validator.divergence is None
@@ -0,0 +1,105 @@
+"""
+Unit tests for the fair-share LLM queue used by batch contract analysis.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.llm_fair_share import (
+    FairShareLLMQueue,
+    contract_lane,
+    fair_share_scope,
+    fair_share_slot,
+)
+
+
+async def _call(order, key, release):
+    with contract_lane(key):
+        async with fair_share_slot():
+            order.append(key)
+            await release.wait()
+
+
+class TestFairShareLLMQueue:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_slot_is_a_noop_outside_a_batch(self):
+        async with fair_share_slot():
+            pass
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_global_cap_and_round_robin_across_contracts(self):
+        queue = FairShareLLMQueue(max_concurrent=2)
+        order, release = [], asyncio.Event()
+
+        with fair_share_scope(queue):
+            # Contract "a" bursts first; "b" and "c" arrive behind it
+            tasks = [
+                asyncio.create_task(_call(order, key, release))
+                for key in ["a", "a", "a", "a", "b", "c"]
+            ]
+            await asyncio.sleep(0)
+            assert order == ["a", "a"]
+            assert queue.stats()["waiting"] == 4
+
+            release.set()
+            await asyncio.gather(*tasks)
+
+        # The burst does not monopolise the cap: freed slots alternate between
+        # contracts by calls in flight, so "b" and "c" run before a's backlog ends
+        assert set(order[2:5]) == {"a", "b", "c"}
+        assert order[-1] == "a"
+        assert queue.stats()["active"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_further_progressed_contract_goes_first(self):
+        queue = FairShareLLMQueue(max_concurrent=1)
+        gate = asyncio.Event()
+
+        with fair_share_scope(queue):
+            # "ahead" has completed two calls already
+            for _ in range(2):
+                with contract_lane("ahead"):
+                    async with fair_share_slot():
+                        pass
+
+            order = []
+            blocker = asyncio.create_task(_call(order, "blocker", gate))
+            await asyncio.sleep(0)
+            behind = asyncio.create_task(_call(order, "behind", asyncio.Event()))
+            ahead = asyncio.create_task(_call(order, "ahead", asyncio.Event()))
+            await asyncio.sleep(0)
+            gate.set()
+            await blocker
+            await asyncio.sleep(0)
+
+            assert order == ["blocker", "ahead"]
+            for task in (behind, ahead):
+                task.cancel()
+            await asyncio.gather(behind, ahead, return_exceptions=True)
+
+        assert queue.stats()["active"] == 0
+        assert queue.stats()["waiting"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_a_slot(self):
+        queue = FairShareLLMQueue(max_concurrent=1)
+        order, release = [], asyncio.Event()
+
+        with fair_share_scope(queue):
+            first = asyncio.create_task(_call(order, "a", release))
+            waiting = asyncio.create_task(_call(order, "b", release))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+
+            release.set()
+            await first
+            await _call(order, "c", release)
+
+        assert order == ["a", "c"]
+        assert queue.stats()["active"] == 0
@@ -0,0 +1,138 @@
+"""
+Unit tests for the in-process LLM call metrics registry.
+"""
+
+import pytest
+
+from app.core.llm_metrics import (
+    CallOutcome,
+    LLMMetricsRegistry,
+    estimate_cost_usd,
+    get_call_context,
+    llm_call_context,
+    report_token_usage,
+    track_llm_call,
+)
+
+
+@pytest.fixture
+def registry():
+    return LLMMetricsRegistry(max_tracked_contracts=2)
+
+
+class TestLLMCallContext:
+    @pytest.mark.unit
+    def test_nested_context_inherits_labels(self):
+        with llm_call_context(node="node_a", composition="comp", contract_key="h1"):
+            with llm_call_context(is_fallback=True) as inner:
+                assert inner.node == "node_a"
+                assert inner.composition == "comp"
+                assert inner.contract_key == "h1"
+                assert inner.is_fallback is True
+            assert get_call_context().is_fallback is False
+        assert get_call_context().node is None
+
+
+class TestCostEstimation:
+    @pytest.mark.unit
+    def test_specific_model_prefix_wins(self):
+        mini = estimate_cost_usd("gpt-4o-mini", 1_000_000, 0)
+        full = estimate_cost_usd("gpt-4o", 1_000_000, 0)
+        assert mini == pytest.approx(0.15)
+        assert full == pytest.approx(2.50)
+
+    @pytest.mark.unit
+    def test_vendor_prefix_and_unknown_model(self):
+        assert estimate_cost_usd("openai/gpt-4o", 0, 1_000_000) == pytest.approx(10.0)
+        assert estimate_cost_usd("models/gemini-2.5-flash", 1_000_000, 0) > 0
+        assert estimate_cost_usd("some-local-model", 1000, 1000) == 0.0
+        assert estimate_cost_usd(None, 1000, 1000) == 0.0
+
+
+class TestTrackLLMCall:
+    @pytest.mark.unit
+    def test_reported_usage_and_contract_rollup(self, registry):
+        with llm_call_context(node="risk", composition="risk_v1", contract_key="h1"):
+            with track_llm_call("gpt-4o", prompt_chars=400, registry=registry) as call:
+                report_token_usage(1000, 200)
+                call.mark_response("x" * 80)
+
+        rollup = registry.get_contract_rollup("h1")
+        assert rollup["calls"] == 1
+        assert rollup["input_tokens"] == 1000
+        assert rollup["output_tokens"] == 200
+        assert rollup["outcomes"] == {CallOutcome.SUCCESS: 1}
+        assert rollup["by_node"]["risk"]["calls"] == 1
+        assert rollup["by_model"]["gpt-4o"]["estimated_cost_usd"] > 0
+
+        series = registry.snapshot()["series"]
+        assert len(series) == 1
+        assert series[0]["node"] == "risk"
+        assert series[0]["composition"] == "risk_v1"
+        assert series[0]["latency_seconds"]["count"] == 1
+
+    @pytest.mark.unit
+    def test_estimates_tokens_without_reported_usage(self, registry):
+        with track_llm_call("gpt-4o", prompt_chars=400, registry=registry) as call:
+            call.mark_response("x" * 80)
+
+        series = registry.snapshot()["series"][0]
+        assert series["input_tokens"]["sum"] == 100
+        assert series["output_tokens"]["sum"] == 20
+        assert series["node"] == "unknown"
+
+    @pytest.mark.unit
+    def test_outcomes_for_parse_fail_fallback_and_error(self, registry):
+        with llm_call_context(node="n", contract_key="h1"):
+            with track_llm_call("m", registry=registry) as call:
+                call.set_outcome(CallOutcome.PARSE_FAIL)
+            with llm_call_context(is_fallback=True):
+                with track_llm_call("m", registry=registry):
+                    pass
+            with pytest.raises(RuntimeError):
+                with track_llm_call("m", registry=registry):
+                    raise RuntimeError("boom")
+
+        outcomes = registry.get_contract_rollup("h1")["outcomes"]
+        assert outcomes == {
+            CallOutcome.PARSE_FAIL: 1,
+            CallOutcome.FALLBACK: 1,
+            CallOutcome.ERROR: 1,
+        }
+
+    @pytest.mark.unit
+    def test_report_without_tracking_is_noop(self):
+        report_token_usage(10, 10)
+
+
+class TestRegistry:
+    @pytest.mark.unit
+    def test_contract_rollups_are_bounded_and_popped(self, registry):
+        for key in ("h1", "h2", "h3"):
+            with llm_call_context(contract_key=key):
+                with track_llm_call("m", registry=registry):
+                    pass
+
+        assert registry.get_contract_rollup("h1") is None
+        assert registry.pop_contract_rollup("h3")["calls"] == 1
+        assert registry.get_contract_rollup("h3") is None
+        assert registry.snapshot()["tracked_contracts"] == 1
+
+    @pytest.mark.unit
+    def test_render_prometheus(self, registry):
+        with llm_call_context(node="n", composition="c"):
+            with track_llm_call("gpt-4o", registry=registry) as call:
+                report_token_usage(1000, 100)
+                call.mark_response("ok")
+
+        text = registry.render_prometheus()
+        assert "# TYPE llm_call_latency_seconds histogram" in text
+        assert (
+            'llm_call_input_tokens_bucket{operation="llm",node="n",composition="c",'
+            'model="gpt-4o",outcome="success",le="1000"} 1'
+        ) in text
+        assert 'llm_call_input_tokens_count{operation="llm"' in text
+        assert "# TYPE llm_call_estimated_cost_usd_total counter" in text
+
+        registry.reset()
+        assert registry.snapshot()["series"] == []
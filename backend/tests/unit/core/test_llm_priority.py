@@ -0,0 +1,76 @@
+"""
+Unit tests for priority-ordered LLM slots.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.llm_priority import (
+    PriorityLLMGate,
+    llm_priority,
+    priority_gate_scope,
+    priority_slot,
+)
+
+
+async def _call(order, label, priority, release):
+    with llm_priority(priority, label):
+        async with priority_slot():
+            order.append(label)
+            await release.wait()
+
+
+class TestPriorityLLMGate:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_slot_is_a_noop_outside_a_scope(self):
+        async with priority_slot():
+            pass
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_waiting_calls_are_granted_by_priority(self):
+        gate = PriorityLLMGate(max_concurrent=1)
+        order, release = [], asyncio.Event()
+
+        with priority_gate_scope(gate):
+            tasks = [
+                asyncio.create_task(_call(order, label, priority, release))
+                for label, priority in [
+                    ("first", 0),
+                    ("warranties", 25),
+                    ("financial", 90),
+                    ("conditions", 55),
+                    ("parties", 25),
+                ]
+            ]
+            await asyncio.sleep(0)
+            assert order == ["first"]
+
+            release.set()
+            await asyncio.gather(*tasks)
+
+        assert order == ["first", "financial", "conditions", "warranties", "parties"]
+        assert gate.calls["financial"] == 1
+        assert gate.stats()["active"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_a_slot(self):
+        gate = PriorityLLMGate(max_concurrent=1)
+        order, release = [], asyncio.Event()
+
+        with priority_gate_scope(gate):
+            first = asyncio.create_task(_call(order, "a", 0, release))
+            waiting = asyncio.create_task(_call(order, "b", 10, release))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+
+            release.set()
+            await first
+            await _call(order, "c", 0, release)
+
+        assert order == ["a", "c"]
+        assert gate.stats()["active"] == 0
@@ -0,0 +1,133 @@
+"""
+Unit tests for the record/replay LLM stand-in.
+"""
+
+import pytest
+
+import app.core.llm_replay as llm_replay_module
+from app.clients.base.exceptions import ClientRateLimitError, ClientTimeoutError
+from app.core.llm_replay import (
+    FaultInjection,
+    LLMCorpus,
+    LLMReplay,
+    ReplayMissError,
+    ReplayMode,
+    configure_llm_replay,
+    request_fingerprint,
+)
+from app.services.ai.llm_service import LLMService
+
+
+def _factory(responses):
+    remaining = list(responses)
+
+    async def call():
+        return remaining.pop(0)
+
+    return call
+
+
+async def _record(corpus, prompt, responses):
+    recorder = LLMReplay(ReplayMode.RECORD, corpus)
+    call = _factory(responses)
+    for _ in responses:
+        await recorder.call("llm", "m", prompt, call)
+
+
+class TestFingerprint:
+    @pytest.mark.unit
+    def test_callables_ignored_and_bytes_hashed(self):
+        base = request_fingerprint("llm", "m", "p", {"temperature": 0.1})
+        assert base == request_fingerprint(
+            "llm", "m", "p", {"temperature": 0.1, "on_chunk": lambda d: None}
+        )
+        assert base != request_fingerprint("llm", "m", "p", {"temperature": 0.2})
+        assert request_fingerprint("ocr", "m", "p", {"file": b"a"}) != (
+            request_fingerprint("ocr", "m", "p", {"file": b"b"})
+        )
+
+
+class TestRecordReplay:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_replay_serves_recorded_responses_in_order(self, tmp_path):
+        corpus = LLMCorpus(str(tmp_path))
+        await _record(corpus, "prompt", ["first", "second"])
+        assert corpus.count() == 1
+
+        async def live_call():
+            raise AssertionError("replay must not call the provider")
+
+        replay = LLMReplay(
+            ReplayMode.REPLAY, LLMCorpus(str(tmp_path)), FaultInjection(latency_ms=0)
+        )
+        results = [
+            await replay.call("llm", "m", "prompt", live_call) for _ in range(3)
+        ]
+        assert results == ["first", "second", "first"]
+        assert replay.stats()["replayed"] == 3
+
+        with pytest.raises(ReplayMissError):
+            await replay.call("llm", "m", "other prompt", live_call)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_streaming_replay_feeds_chunks(self, tmp_path):
+        corpus = LLMCorpus(str(tmp_path))
+        text = '{"name": "' + "x" * 150 + '"}'
+        await _record(corpus, "prompt", [text])
+
+        chunks = []
+        replay = LLMReplay(ReplayMode.REPLAY, corpus, FaultInjection(latency_ms=0))
+        result = await replay.call(
+            "llm", "m", "prompt", _factory([]), on_chunk=chunks.append
+        )
+        assert result == text
+        assert len(chunks) > 1
+        assert "".join(chunks) == text
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fault_injection(self, tmp_path):
+        corpus = LLMCorpus(str(tmp_path))
+        await _record(corpus, "prompt", ['{"name": "alice"}'])
+
+        async def replay_with(**faults):
+            replay = LLMReplay(
+                ReplayMode.REPLAY, corpus, FaultInjection(latency_ms=0, **faults)
+            )
+            return await replay.call("llm", "m", "prompt", _factory([]))
+
+        with pytest.raises(ClientRateLimitError):
+            await replay_with(rate_limit_rate=1.0)
+        with pytest.raises(ClientTimeoutError):
+            await replay_with(timeout_rate=1.0)
+        assert await replay_with(malformed_rate=1.0) == '{"name":'
+
+
+class TestLLMServiceReplay:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_generate_content_without_clients(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(llm_replay_module, "_llm_replay", None)
+        service = LLMService()
+
+        recorder = configure_llm_replay(ReplayMode.RECORD, str(tmp_path))
+
+        class _Client:
+            async def generate_content(self, prompt, **kwargs):
+                return "recorded answer"
+
+        service._openai_client = _Client()
+        assert await service.generate_content("hi", model="gpt-4o") == (
+            "recorded answer"
+        )
+        assert recorder.stats()["recorded"] == 1
+
+        configure_llm_replay(
+            ReplayMode.REPLAY, str(tmp_path), FaultInjection(latency_ms=0)
+        )
+        service._openai_client = None
+        assert await service.generate_content("hi", model="gpt-4o") == (
+            "recorded answer"
+        )
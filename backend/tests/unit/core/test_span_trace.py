@@ -0,0 +1,120 @@
+"""
+Unit tests for the per-analysis span recorder and Chrome trace export.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.llm_metrics import LLMMetricsRegistry, track_llm_call
+from app.core.span_trace import (
+    NOOP_SPAN,
+    chrome_trace,
+    current_span,
+    pop_finished_trace,
+    span,
+    trace_run,
+    trace_scope,
+)
+
+
+class TestSpans:
+    @pytest.mark.unit
+    def test_spans_are_noops_outside_a_trace(self):
+        with span("node:orphan") as s:
+            assert s is NOOP_SPAN
+            s.set(cache_hit=True)
+        assert current_span() is NOOP_SPAN
+
+    @pytest.mark.unit
+    def test_nested_spans_record_parents_and_attributes(self):
+        with trace_scope("hash-1") as recorder:
+            with span("analysis"):
+                with span("node:a") as node:
+                    node.set(cache_hit=False)
+                    with span("generate", model="m1"):
+                        pass
+
+        trace = pop_finished_trace(recorder.run_key)
+        assert pop_finished_trace(recorder.run_key) is None
+        by_name = {s["name"]: s for s in trace["spans"]}
+        assert trace["span_count"] == 3
+        assert by_name["analysis"]["parent_id"] is None
+        assert by_name["node:a"]["parent_id"] == by_name["analysis"]["span_id"]
+        assert by_name["generate"]["parent_id"] == by_name["node:a"]["span_id"]
+        assert by_name["node:a"]["attributes"] == {"cache_hit": False}
+        assert by_name["generate"]["attributes"] == {"model": "m1"}
+
+    @pytest.mark.unit
+    def test_exception_is_recorded_on_span(self):
+        with trace_scope("hash-2") as recorder:
+            with pytest.raises(ValueError):
+                with span("node:failing"):
+                    raise ValueError("boom")
+
+        (failed,) = pop_finished_trace(recorder.run_key)["spans"]
+        assert failed["attributes"]["error"] == "ValueError"
+
+    @pytest.mark.unit
+    def test_llm_call_span_carries_model_and_tokens(self):
+        registry = LLMMetricsRegistry()
+        with trace_scope("hash-3") as recorder:
+            with track_llm_call(
+                "gpt-4", operation="generate", prompt_chars=400, registry=registry
+            ) as call:
+                call.mark_response("x" * 40)
+
+        (call_span,) = pop_finished_trace(recorder.run_key)["spans"]
+        assert call_span["name"] == "generate_call"
+        assert call_span["attributes"]["model"] == "gpt-4"
+        assert call_span["attributes"]["outcome"] == "success"
+        assert call_span["attributes"]["tokens_estimated"] is True
+        assert call_span["attributes"]["input_tokens"] > 0
+
+
+class TestFinishedTraces:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_on_one_contract_keep_their_own_traces(self):
+        async def run(name):
+            with trace_run("same-hash") as key:
+                await asyncio.sleep(0)
+                with trace_scope("same-hash"):
+                    with span(f"node:{name}"):
+                        await asyncio.sleep(0.01)
+            return key
+
+        key_a, key_b = await asyncio.gather(run("a"), run("b"))
+
+        assert key_a != key_b and key_a.startswith("same-hash:")
+        (span_a,) = pop_finished_trace(key_a)["spans"]
+        (span_b,) = pop_finished_trace(key_b)["spans"]
+        assert (span_a["name"], span_b["name"]) == ("node:a", "node:b")
+
+
+class TestChromeTrace:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_parallel_branches_get_separate_lanes(self):
+        async def branch(name):
+            with span(f"node:{name}"):
+                await asyncio.sleep(0.01)
+
+        with trace_scope("hash-4") as recorder:
+            with span("subflow:step2"):
+                await asyncio.gather(branch("a"), branch("b"))
+
+        events = chrome_trace(pop_finished_trace(recorder.run_key))["traceEvents"]
+        spans = {e["name"]: e for e in events if e["ph"] == "X"}
+        assert (
+            spans["node:a"]["args"]["parent_id"]
+            == spans["subflow:step2"]["args"]["span_id"]
+        )
+        assert (
+            spans["node:b"]["args"]["parent_id"]
+            == spans["subflow:step2"]["args"]["span_id"]
+        )
+        # Overlapping siblings cannot nest in one lane
+        assert spans["node:a"]["tid"] != spans["node:b"]["tid"]
+        for e in spans.values():
+            assert e["dur"] >= 0
@@ -0,0 +1,51 @@
+"""
+Unit tests for the verified token claims cache.
+"""
+
+import json
+import time
+
+from app.core.verified_claims import EXPIRY_MARGIN_SECONDS, VerifiedClaimsCache
+
+
+def test_put_serialises_and_get_returns_entry():
+    cache = VerifiedClaimsCache(ttl_seconds=60)
+    claims = {"sub": "user-1", "exp": int(time.time()) + 3600}
+
+    stored = cache.put("token-a", claims)
+
+    assert json.loads(stored.claims_json) == claims
+    assert cache.get("token-a") is stored
+    assert cache.get("token-b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entry_bounded_by_token_expiry():
+    cache = VerifiedClaimsCache(ttl_seconds=3600)
+    exp = int(time.time()) + EXPIRY_MARGIN_SECONDS + 30
+
+    stored = cache.put("token-a", {"exp": exp})
+
+    assert stored.expires_at == exp - EXPIRY_MARGIN_SECONDS
+
+
+def test_token_inside_expiry_margin_is_not_cached():
+    cache = VerifiedClaimsCache(ttl_seconds=3600)
+
+    stored = cache.put("token-a", {"exp": int(time.time()) + 60})
+
+    assert stored.claims_json
+    assert cache.get("token-a") is None
+
+
+def test_invalidate_and_lru_bound():
+    cache = VerifiedClaimsCache(max_entries=2, ttl_seconds=60)
+    for token in ("a", "b", "c"):
+        cache.put(token, {"sub": token})
+
+    assert cache.get("a") is None
+    assert cache.invalidate("b")
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.stats()["entries"] == 1
@@ -6,7 +6,7 @@ import pytest
 from unittest.mock import AsyncMock, patch
 import asyncpg
 
-from app.database.connection import _setup_user_session
+from app.database.connection import SET_SESSION_CONTEXT_SQL, _setup_user_session
 
 
 class TestDatabaseConnectionBasic:
@@ -26,7 +26,7 @@ class TestDatabaseConnectionBasic:
 
         # Should set anonymous role
         mock_connection.execute.assert_called_once_with(
-            "SELECT set_config('role', $1, false)", "anon"
+            SET_SESSION_CONTEXT_SQL, None, "anon", None
         )
 
     @pytest.mark.asyncio
@@ -39,7 +39,7 @@ class TestDatabaseConnectionBasic:
 
         # Should set anonymous role and log warning
         mock_connection.execute.assert_called_once_with(
-            "SELECT set_config('role', $1, false)", "anon"
+            SET_SESSION_CONTEXT_SQL, None, "anon", None
         )
 
     @pytest.mark.asyncio
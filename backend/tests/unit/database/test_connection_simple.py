@@ -8,7 +8,7 @@ import pytest
 from unittest.mock import Mock, AsyncMock, patch
 import asyncpg
 
-from app.database.connection import _setup_user_session
+from app.database.connection import SET_SESSION_CONTEXT_SQL, _setup_user_session
 
 
 class TestDatabaseConnectionSimple:
@@ -62,7 +62,7 @@ class TestDatabaseConnectionSimple:
 
         # Should set anonymous role
         mock_connection.execute.assert_called_once_with(
-            "SELECT set_config('role', $1, false)", "anon"
+            SET_SESSION_CONTEXT_SQL, None, "anon", None
         )
 
     @pytest.mark.asyncio
@@ -76,7 +76,7 @@ class TestDatabaseConnectionSimple:
 
         # Should set anonymous role and log warning
         mock_connection.execute.assert_called_once_with(
-            "SELECT set_config('role', $1, false)", "anon"
+            SET_SESSION_CONTEXT_SQL, None, "anon", None
         )
 
     @pytest.mark.asyncio
@@ -230,22 +230,13 @@ class TestDatabaseConnectionSimple:
 
             await _setup_user_session(mock_connection, "test-user-id")
 
-        # Should set all required RLS context variables
-        expected_calls = [
-            (
-                "SELECT set_config('request.jwt.claims', $1, false)",
-                '{"sub": "test-user-id", "role": "authenticated", "exp": 9999999999}',
-            ),
-            ("SELECT set_config('role', $1, false)", "authenticated"),
-            ("SELECT set_config('request.jwt.claim.sub', $1, false)", "test-user-id"),
-        ]
-
-        # Check that all expected calls were made (order may vary)
-        actual_calls = [
-            (call[0][0], call[0][1]) for call in mock_connection.execute.call_args_list
-        ]
-        for expected_call in expected_calls:
-            assert expected_call in actual_calls
+        # Should set all required RLS context variables in one statement
+        mock_connection.execute.assert_called_once_with(
+            SET_SESSION_CONTEXT_SQL,
+            '{"sub": "test-user-id", "role": "authenticated", "exp": 9999999999}',
+            "authenticated",
+            "test-user-id",
+        )
 
     @pytest.mark.asyncio
     async def test_setup_user_session_jwt_import_failure(self, mock_connection):
@@ -0,0 +1,131 @@
+"""
+Unit tests for connection pool statistics and adaptive shared-pool sizing.
+"""
+
+import asyncio
+
+import pytest
+
+from app.database.connection import ConnectionPoolManager
+from app.database.pool_stats import AdaptivePoolSizer, PoolStats, pool_is_saturated
+
+
+class _FakePool:
+    """Minimal asyncpg.Pool stand-in that opens connections on demand."""
+
+    def __init__(self, max_size: int, open_connections: int = 0, init=None):
+        self.max_size = max_size
+        self.idle = [object() for _ in range(open_connections)]
+        self.in_use = set()
+        self.init = init
+
+    def get_size(self):
+        return len(self.idle) + len(self.in_use)
+
+    def get_idle_size(self):
+        return len(self.idle)
+
+    def get_max_size(self):
+        return self.max_size
+
+    async def acquire(self, timeout=None):
+        await asyncio.sleep(0)
+        if self.idle:
+            conn = self.idle.pop()
+        else:
+            conn = object()
+            if self.init:
+                await self.init(conn)
+        self.in_use.add(conn)
+        return conn
+
+    async def release(self, conn):
+        self.in_use.discard(conn)
+        self.idle.append(conn)
+
+
+def test_pool_stats_snapshot():
+    stats = PoolStats("service")
+    stats.record_acquire(0.002, saturated=False)
+    stats.record_acquire(0.010, saturated=True)
+    stats.record_release()
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["acquires"] == 2
+    assert snapshot["saturation_ratio"] == 0.5
+    assert snapshot["in_use"] == 1
+    assert snapshot["peak_in_use"] == 2
+    assert snapshot["acquire_wait_ms"]["max"] == 10.0
+
+
+def test_pool_is_saturated():
+    pool = _FakePool(max_size=1, open_connections=1)
+    assert not pool_is_saturated(pool)
+    pool.in_use.add(pool.idle.pop())
+    assert pool_is_saturated(pool)
+
+
+def test_sizer_target_follows_recent_concurrency():
+    sizer = AdaptivePoolSizer(min_size=2, max_size=10, headroom=1.5)
+    assert sizer.target_size() == 2
+
+    for in_use in (1, 4, 4, 4):
+        sizer.observe(in_use, now=100.0)
+    assert sizer.target_size() == 6
+
+    sizer.observe(1, now=1000.0)  # older samples fell out of the window
+    assert sizer.target_size() == 2
+
+    for _ in range(5):
+        sizer.observe(20, now=1000.0)
+    assert sizer.target_size() == 10
+
+
+@pytest.mark.asyncio
+async def test_prewarm_opens_a_bounded_batch_of_new_connections():
+    stats = PoolStats("service")
+    pool = _FakePool(max_size=10, init=stats.on_connection_opened)
+    busy = await pool.acquire()  # a request holds the only connection
+    sizer = AdaptivePoolSizer(min_size=1, max_size=10)
+    for _ in range(3):
+        sizer.observe(4)
+
+    sizer.maybe_prewarm(pool)
+    await sizer._prewarm_task
+
+    assert pool.get_size() == 3  # PREWARM_MAX_CONNECTIONS toward a target of 5
+    assert pool.get_idle_size() == 2
+    assert busy in pool.in_use
+    assert sizer.prewarmed_connections == 2
+    # Pre-warm opens are not counted as request-driven churn
+    assert stats.snapshot()["connections_opened"] == 1
+    assert stats.snapshot()["prewarmed_connections"] == 2
+
+
+@pytest.mark.asyncio
+async def test_prewarm_skipped_while_idle_connections_remain():
+    pool = _FakePool(max_size=10, open_connections=1)
+    sizer = AdaptivePoolSizer(min_size=1, max_size=10)
+    for _ in range(3):
+        sizer.observe(4)
+
+    sizer.maybe_prewarm(pool)
+
+    assert sizer._prewarm_task is None
+    assert pool.get_size() == 1
+
+
+@pytest.mark.asyncio
+async def test_manager_acquire_release_records_stats():
+    ConnectionPoolManager._reset_metrics()
+    pool = _FakePool(max_size=2)
+
+    conn = await ConnectionPoolManager.acquire(pool)
+    assert ConnectionPoolManager._pool_stats["per_user"].in_use == 1
+    await ConnectionPoolManager.release(pool, conn)
+
+    stats = ConnectionPoolManager._pool_stats["per_user"].snapshot()
+    assert stats["acquires"] == 1
+    assert stats["in_use"] == 0
+    ConnectionPoolManager._reset_metrics()
@@ -0,0 +1,77 @@
+"""
+Tests for query fingerprints, latency histograms and the slow-query log.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.core.span_trace import trace_scope
+from app.database import query_trace
+
+
+@pytest.fixture(autouse=True)
+def _clean_stats():
+    query_trace.reset_query_stats()
+    yield
+    query_trace.reset_query_stats()
+
+
+def test_fingerprint_ignores_literals_and_whitespace():
+    a = query_trace.fingerprint(
+        "SELECT * FROM contracts  WHERE state = 'NSW' AND id IN ($1, $2) LIMIT 10"
+    )
+    b = query_trace.fingerprint(
+        "SELECT * FROM contracts\n WHERE state = 'VIC' AND id IN ($3, $4, $5) LIMIT 5"
+    )
+    assert a == b == "SELECT * FROM contracts WHERE state = ? AND id IN (?) LIMIT ?"
+
+
+def test_slow_queries_are_logged_with_redacted_params():
+    with patch.object(query_trace.get_settings(), "db_slow_query_threshold_ms", 100.0):
+        query_trace.record_query("SELECT $1", ("secret@example.com",), 0.02, 1)
+        query_trace.record_query("SELECT $1", ("secret@example.com", None), 0.3, 1)
+
+    (stats,) = query_trace.get_query_stats()
+    assert stats["calls"] == 2 and stats["rows"] == 2
+    assert stats["histogram_ms"]["25"] == 1 and stats["histogram_ms"]["500"] == 1
+    assert stats["p50_ms"] == 25
+
+    (slow,) = query_trace.get_slow_queries()
+    assert slow["duration_ms"] == 300.0
+    assert slow["params"] == ["str[18]", "null"]
+    assert "secret" not in str(slow)
+
+
+@pytest.mark.asyncio
+async def test_observe_counts_rows_and_records_trace_span():
+    async def fetch():
+        return [{"id": 1}, {"id": 2}]
+
+    with (
+        patch.object(query_trace.get_settings(), "db_query_trace_spans", True),
+        trace_scope() as recorder,
+    ):
+        rows = await query_trace.observe(
+            "SELECT id FROM documents", (), "fetch", fetch(), statement="docs.list"
+        )
+
+    assert len(rows) == 2
+    (span,) = recorder.spans
+    assert span.name == "db:query"
+    assert span.attributes["rows"] == 2
+    assert span.attributes["statement"] == "docs.list"
+    assert query_trace.get_query_stats()[0]["statement"] == "docs.list"
+
+
+@pytest.mark.asyncio
+async def test_observe_records_failures():
+    async def execute():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await query_trace.observe(
+            "UPDATE documents SET x = 1", (), "execute", execute()
+        )
+
+    assert query_trace.get_query_stats()[0]["errors"] == 1
@@ -0,0 +1,125 @@
+"""
+Checks application SQL against the schema built from supabase/migrations.
+
+Queries referencing a missing column only fail at runtime, and sections that
+degrade on error (e.g. taxonomy analytics) hide the failure entirely.
+"""
+
+import ast
+import re
+from pathlib import Path
+from typing import Dict, Iterator, Set, Tuple
+
+import pytest
+
+from app.services.repositories import contracts_repository, documents_repository
+
+BACKEND_DIR = Path(__file__).resolve().parents[3]
+MIGRATIONS_DIR = BACKEND_DIR.parent / "supabase" / "migrations"
+
+_CREATE_TABLE = re.compile(
+    r"CREATE TABLE (?:IF NOT EXISTS )?(?:public\.)?(\w+)\s*\(", re.IGNORECASE
+)
+_ALTER_TABLE = re.compile(
+    r"ALTER TABLE (?:IF EXISTS )?(?:ONLY )?(?:public\.)?(\w+)\s+(.*?);",
+    re.IGNORECASE | re.DOTALL,
+)
+_ADD_COLUMN = re.compile(r"ADD COLUMN (?:IF NOT EXISTS )?(\w+)", re.IGNORECASE)
+_DROP_COLUMN = re.compile(r"DROP COLUMN (?:IF EXISTS )?(\w+)", re.IGNORECASE)
+_TABLE_REFERENCE = re.compile(
+    r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(?:public\.)?(\w+)", re.IGNORECASE
+)
+_NOT_A_COLUMN = {"CONSTRAINT", "PRIMARY", "UNIQUE", "FOREIGN", "CHECK", "EXCLUDE"}
+
+
+def _strip_comments(sql: str) -> str:
+    return re.sub(r"--[^\n]*", "", sql)
+
+
+def _split_top_level(body: str) -> Iterator[str]:
+    depth, start = 0, 0
+    for i, char in enumerate(body):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            yield body[start:i]
+            start = i + 1
+    yield body[start:]
+
+
+def _table_body(sql: str, start: int) -> str:
+    depth, end = 1, start
+    while depth:
+        if sql[end] == "(":
+            depth += 1
+        elif sql[end] == ")":
+            depth -= 1
+        end += 1
+    return sql[start : end - 1]
+
+
+def _migrated_schema() -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+    """(columns per table, columns dropped per table) after all migrations"""
+    columns: Dict[str, Set[str]] = {}
+    dropped: Dict[str, Set[str]] = {}
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        sql = _strip_comments(path.read_text())
+        for match in _CREATE_TABLE.finditer(sql):
+            table = columns.setdefault(match.group(1), set())
+            for item in _split_top_level(_table_body(sql, match.end())):
+                words = item.split()
+                if words and words[0].upper() not in _NOT_A_COLUMN:
+                    table.add(words[0].strip('"'))
+        for match in _ALTER_TABLE.finditer(sql):
+            name, actions = match.groups()
+            for column in _ADD_COLUMN.findall(actions):
+                columns.setdefault(name, set()).add(column)
+                dropped.get(name, set()).discard(column)
+            for column in _DROP_COLUMN.findall(actions):
+                columns.get(name, set()).discard(column)
+                dropped.setdefault(name, set()).add(column)
+    return columns, dropped
+
+
+def _sql_literals() -> Iterator[Tuple[Path, int, str]]:
+    for path in sorted((BACKEND_DIR / "app").rglob("*.py")):
+        for node in ast.walk(ast.parse(path.read_text())):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                yield path, node.lineno, _strip_comments(node.value)
+
+
+SCHEMA, DROPPED = _migrated_schema()
+
+
+def test_migrations_parse_into_known_tables():
+    assert {"contracts", "documents", "contract_daily_rollups"} <= set(SCHEMA)
+    assert "ocr_confidence" in DROPPED["contracts"]
+    assert "ocr_confidence" not in SCHEMA["contracts"]
+
+
+def test_queries_do_not_reference_dropped_columns():
+    offenders = []
+    for path, lineno, sql in _sql_literals():
+        for table in set(_TABLE_REFERENCE.findall(sql)) & set(DROPPED):
+            for column in DROPPED[table]:
+                if re.search(rf"\b{column}\b", sql):
+                    location = f"{path.relative_to(BACKEND_DIR)}:{lineno}"
+                    offenders.append(f"{location} {table}.{column}")
+
+    assert offenders == []
+
+
+@pytest.mark.parametrize(
+    "table, projection",
+    [
+        ("contracts", contracts_repository.CONTRACT_LIST_ITEM_COLUMNS),
+        ("contracts", contracts_repository.CONTRACT_SCALAR_COLUMNS),
+        ("contracts", contracts_repository.SECTION_ANALYSIS_SNAPSHOT_KEYS),
+        ("contracts", contracts_repository.CONTRACT_LIST_FILTERS),
+        ("documents", documents_repository.DOCUMENT_LIST_ITEM_COLUMNS),
+    ],
+)
+def test_repository_projections_exist_in_schema(table, projection):
+    assert set(projection) - SCHEMA[table] == set()
@@ -0,0 +1,140 @@
+"""
+Unit tests for single-statement RLS session setup, the per-connection
+identity marker and the verified claims cache.
+"""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.database.connection import (
+    SERVICE_ROLE_IDENTITY,
+    SET_SESSION_CONTEXT_SQL,
+    RLSConnection,
+    _apply_session_context,
+    _session_identity_matches,
+    _setup_service_session,
+    _setup_user_session,
+    _user_session_identity,
+)
+
+
+def _connection(execute=None) -> RLSConnection:
+    # Unconnected instance; _aborted keeps asyncpg's __del__ quiet
+    conn = RLSConnection.__new__(RLSConnection)
+    conn._aborted = True
+    conn.execute = execute or AsyncMock()
+    return conn
+
+
+@pytest.mark.asyncio
+async def test_service_session_applied_once_then_reused():
+    conn = _connection()
+
+    await _setup_service_session(conn)
+    await _setup_service_session(conn)
+
+    conn.execute.assert_called_once_with(
+        SET_SESSION_CONTEXT_SQL, '{"role": "service_role"}', "service_role", None
+    )
+    assert conn.rls_identity == SERVICE_ROLE_IDENTITY
+
+
+@pytest.mark.asyncio
+async def test_identity_read_through_pool_proxy():
+    conn = _connection()
+    proxy = SimpleNamespace(_con=conn, execute=conn.execute)
+
+    await _setup_service_session(proxy)
+
+    assert _session_identity_matches(proxy, SERVICE_ROLE_IDENTITY)
+
+
+@pytest.mark.asyncio
+async def test_user_session_skipped_when_connection_carries_identity():
+    conn = _connection()
+    conn.rls_identity = _user_session_identity("user-1", "token-a")
+    conn.rls_identity_expires_at = time.time() + 3600
+
+    with patch("app.database.connection.AuthContext") as auth:
+        auth.get_user_token.return_value = "token-a"
+        await _setup_user_session(conn, "user-1")
+
+    conn.execute.assert_not_called()
+
+
+def test_identity_expires_and_is_bound_to_token():
+    conn = _connection()
+    conn.rls_identity = _user_session_identity("user-1", "token-a")
+    conn.rls_identity_expires_at = time.time() - 1
+
+    assert not _session_identity_matches(conn, conn.rls_identity)
+    conn.rls_identity_expires_at = None
+    assert _session_identity_matches(conn, _user_session_identity("user-1", "token-a"))
+    assert not _session_identity_matches(
+        conn, _user_session_identity("user-1", "token-b")
+    )
+
+
+@pytest.mark.asyncio
+async def test_failed_setup_clears_identity():
+    conn = _connection(AsyncMock(side_effect=RuntimeError("boom")))
+    conn.rls_identity = SERVICE_ROLE_IDENTITY
+
+    with pytest.raises(RuntimeError):
+        await _apply_session_context(conn, "anon", "anon")
+
+    assert conn.rls_identity is None
+
+
+@pytest.mark.asyncio
+async def test_failed_anon_setup_resets_and_raises():
+    conn = _connection(AsyncMock(side_effect=[RuntimeError("boom"), None]))
+
+    with pytest.raises(RuntimeError):
+        await _setup_user_session(conn, None)
+
+    # Reset attempted, but the connection is not trusted as anon afterwards
+    assert conn.execute.await_count == 2
+    assert conn.rls_identity is None
+
+
+def test_release_reset_keeps_cleanup_but_not_reset_all():
+    conn = _connection()
+    conn._reset_query = None
+    conn._server_caps = SimpleNamespace(
+        advisory_locks=True,
+        sql_close_all=True,
+        notifications=True,
+        plpgsql=True,
+        sql_reset=True,
+    )
+
+    reset = conn._get_reset_query()
+
+    assert "RESET ALL" not in reset
+    assert "pg_advisory_unlock_all" in reset
+    assert "UNLISTEN" in reset
+
+
+@pytest.mark.asyncio
+async def test_user_session_uses_cached_verified_claims():
+    from app.core.verified_claims import get_verified_claims_cache
+
+    claims = {"sub": "user-1", "role": "authenticated", "exp": time.time() + 3600}
+    verified = get_verified_claims_cache().put("token-a", claims)
+    conn = _connection()
+
+    with patch("app.database.connection.AuthContext") as auth, patch(
+        "app.database.connection.BackendTokenService"
+    ) as backend_tokens:
+        auth.get_user_token.return_value = "token-a"
+        await _setup_user_session(conn, "user-1")
+
+    backend_tokens.is_backend_token.assert_not_called()
+    conn.execute.assert_called_once_with(
+        SET_SESSION_CONTEXT_SQL, verified.claims_json, "authenticated", "user-1"
+    )
+    assert conn.rls_identity == _user_session_identity("user-1", "token-a")
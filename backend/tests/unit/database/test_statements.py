@@ -0,0 +1,90 @@
+"""
+Unit tests for registered repository statements and per-connection prepares.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import asyncpg
+import pytest
+
+from app.database import statements
+from app.database.connection import RLSConnection
+from app.services.repositories.contracts_repository import (
+    SECTION_ANALYSIS_SNAPSHOT_KEYS,
+    _contract_statement,
+)
+
+
+def _connection(prepare) -> RLSConnection:
+    # Unconnected instance; _aborted keeps asyncpg's __del__ quiet
+    conn = RLSConnection.__new__(RLSConnection)
+    conn._aborted = True
+    conn.prepare = prepare
+    return conn
+
+
+def test_register_statement_is_idempotent_but_rejects_conflicts():
+    name = statements.register_statement("tests.select_one", "SELECT 1")
+    assert statements.register_statement(name, "SELECT 1") == name
+    with pytest.raises(ValueError):
+        statements.register_statement(name, "SELECT 2")
+    with pytest.raises(ValueError):
+        statements.get_statement_sql("tests.missing")
+
+
+@pytest.mark.asyncio
+async def test_plain_connection_runs_registered_sql():
+    name = statements.register_statement("tests.by_id", "SELECT $1::int AS id")
+    conn = MagicMock()
+    conn.fetchrow = AsyncMock(return_value={"id": 7})
+
+    row = await statements.fetchrow(conn, name, 7)
+
+    assert row == {"id": 7}
+    conn.fetchrow.assert_awaited_once_with("SELECT $1::int AS id", 7)
+    assert statements.get_statement_stats()[name]["calls"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_statement_prepared_once_per_connection():
+    name = statements.register_statement("tests.count", "SELECT count(*) FROM t")
+    prepared = MagicMock()
+    prepared.fetchval = AsyncMock(return_value=3)
+    conn = _connection(AsyncMock(return_value=prepared))
+    prepares_before = statements._stats[name].prepares
+
+    assert await statements.fetchval(conn, name) == 3
+    assert await statements.fetchval(conn, name) == 3
+
+    conn.prepare.assert_awaited_once_with("SELECT count(*) FROM t")
+    assert conn.prepared_statements[name] is prepared
+    assert statements._stats[name].prepares == prepares_before + 1
+
+
+@pytest.mark.asyncio
+async def test_statement_reprepared_after_schema_change():
+    name = statements.register_statement("tests.rows", "SELECT * FROM t")
+    stale = MagicMock()
+    stale.fetch = AsyncMock(
+        side_effect=asyncpg.exceptions.InvalidCachedStatementError("stale plan")
+    )
+    fresh = MagicMock()
+    fresh.fetch = AsyncMock(return_value=[{"a": 1}])
+    conn = _connection(AsyncMock(side_effect=[stale, fresh]))
+
+    assert await statements.fetch(conn, name) == [{"a": 1}]
+    assert conn.prepared_statements[name] is fresh
+
+
+def test_contract_projection_statements():
+    full = statements.get_statement_sql(_contract_statement(None))
+    assert all(key in full for key in SECTION_ANALYSIS_SNAPSHOT_KEYS)
+    assert "COALESCE" not in full
+
+    name = _contract_statement(("raw_text",))
+    assert name == _contract_statement(["raw_text", "raw_text"])
+    sql = statements.get_statement_sql(name)
+    assert "raw_text" in sql and "extracted_entity" not in sql
+
+    with pytest.raises(ValueError):
+        _contract_statement(("ocr_confidence",))
@@ -0,0 +1,154 @@
+"""
+Unit tests for the set-based batch repository methods and their callers.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.progress_write_buffer import ProgressWriteBuffer
+from app.services.repositories.analysis_progress_repository import (
+    AnalysisProgressRepository,
+)
+from app.services.repositories.documents_repository import DocumentsRepository
+from app.services.repositories.user_docs_repository import UserDocsRepository
+
+NOW = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def _connection(conn):
+    context = AsyncMock()
+    context.__aenter__.return_value = conn
+    return context
+
+
+def _document_row(document_id):
+    return {
+        "id": document_id,
+        "user_id": uuid4(),
+        "original_filename": "contract.pdf",
+        "storage_path": f"docs/{document_id}.pdf",
+        "file_type": "pdf",
+        "file_size": 10,
+        "content_hash": "hash",
+        "processing_status": "uploaded",
+        "processing_started_at": None,
+        "processing_completed_at": None,
+        "processing_errors": None,
+        "artifact_text_id": None,
+        "total_pages": 2,
+        "total_word_count": 100,
+        "upload_metadata": "{}",
+        "processing_results": None,
+        "created_at": NOW,
+        "updated_at": NOW,
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_documents_is_one_any_query():
+    conn = AsyncMock()
+    found, missing = uuid4(), uuid4()
+    conn.fetch.return_value = [_document_row(found)]
+
+    with patch(
+        "app.services.repositories.documents_repository.get_user_connection",
+        side_effect=lambda _: _connection(conn),
+    ):
+        documents = await DocumentsRepository().get_documents([found, missing, found])
+
+    conn.fetch.assert_awaited_once()
+    query, ids = conn.fetch.await_args.args
+    assert "ANY($1::uuid[])" in query
+    assert ids == [found, missing]
+    assert list(documents) == [found]
+    assert documents[found].storage_path == f"docs/{found}.pdf"
+
+
+@pytest.mark.asyncio
+async def test_upsert_progress_many_dedupes_keys_in_one_statement():
+    conn = AsyncMock()
+    user_id = str(uuid4())
+
+    with patch(
+        "app.services.repositories.analysis_progress_repository.get_user_connection",
+        side_effect=lambda _: _connection(conn),
+    ):
+        ok = await AnalysisProgressRepository().upsert_progress_many(
+            [
+                ("h1", user_id, {"progress_percent": 10}),
+                ("h2", user_id, {"step_started_at": "2024-05-01T00:00:00Z"}),
+                ("h1", user_id, {"progress_percent": 20}),
+            ]
+        )
+
+    assert ok
+    conn.execute.assert_awaited_once()
+    query, hashes, _, _, percents, _, started, *_ = conn.execute.await_args.args
+    assert "GREATEST" in query
+    assert hashes == ["h1", "h2"] and percents == [20, None]
+    assert started[1] == NOW
+
+
+@pytest.mark.asyncio
+async def test_batch_upsert_document_pages_single_statement():
+    conn = AsyncMock()
+    document_id, artifact_id = uuid4(), uuid4()
+    conn.fetch.return_value = [
+        {
+            "document_id": document_id,
+            "page_number": page,
+            "artifact_page_id": artifact_id,
+            "annotations": None,
+            "flags": None,
+            "created_at": NOW,
+            "updated_at": NOW,
+        }
+        for page in (2, 1)
+    ]
+
+    with patch(
+        "app.services.repositories.user_docs_repository.get_user_connection",
+        side_effect=lambda _: _connection(conn),
+    ):
+        pages = await UserDocsRepository(uuid4()).batch_upsert_document_pages(
+            document_id,
+            [
+                {"page_number": 1, "artifact_page_id": artifact_id},
+                {"page_number": 2, "artifact_page_id": artifact_id, "flags": {"x": 1}},
+            ],
+        )
+
+    conn.fetch.assert_awaited_once()
+    args = conn.fetch.await_args.args
+    assert args[2] == [1, 2] and args[5] == [None, '{"x": 1}']
+    assert [page.page_number for page in pages] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_flush_user_writes_all_pending_progress_at_once():
+    buffer = ProgressWriteBuffer(flush_interval_seconds=60)
+    user_id = str(uuid4())
+    with patch(
+        "app.services.progress_write_buffer.AnalysisProgressRepository"
+    ) as repo_cls:
+        repo = repo_cls.return_value
+        repo.upsert_progress = AsyncMock(return_value=True)
+        repo.upsert_progress_many = AsyncMock(return_value=True)
+
+        for content_hash in ("h1", "h2"):
+            await buffer.record_progress(content_hash, user_id, {"progress_percent": 5})
+            await buffer.record_progress(
+                content_hash, user_id, {"progress_percent": 40}
+            )
+        await buffer.flush_user(user_id)
+
+    assert repo.upsert_progress.await_count == 2  # first update per key
+    (records,) = repo.upsert_progress_many.await_args.args
+    assert sorted((h, d["progress_percent"]) for h, _, d in records) == [
+        ("h1", 40),
+        ("h2", 40),
+    ]
+    assert buffer.stats()["pending_progress"] == 0
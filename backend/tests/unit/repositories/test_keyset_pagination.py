@@ -0,0 +1,107 @@
+"""
+Tests for keyset (created_at, id) pagination of document and contract listings.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.repositories.contracts_repository import ContractsRepository
+from app.services.repositories.documents_repository import DocumentsRepository
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page
+
+NOW = datetime(2024, 5, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+
+
+def _rows(count):
+    return [
+        {"id": uuid4(), "created_at": NOW - timedelta(minutes=i), "content_hash": "h"}
+        for i in range(count)
+    ]
+
+
+def test_cursor_round_trip_and_malformed_cursor():
+    row_id = uuid4()
+    assert decode_cursor(encode_cursor(NOW, row_id)) == (NOW, row_id)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_page_uses_extra_row_to_detect_more():
+    rows = _rows(3)
+
+    page, next_cursor = keyset_page(rows, limit=2)
+    assert page == rows[:2]
+    assert decode_cursor(next_cursor) == (rows[1]["created_at"], rows[1]["id"])
+
+    assert keyset_page(rows, limit=3) == (rows, None)
+
+
+@pytest.mark.asyncio
+async def test_documents_page_after_cursor_with_status():
+    conn = AsyncMock()
+    conn.fetch.return_value = _rows(2)
+    cursor = encode_cursor(NOW, uuid4())
+
+    with patch(
+        "app.services.repositories.documents_repository.get_user_connection"
+    ) as get_conn:
+        get_conn.return_value.__aenter__.return_value = conn
+        items, next_cursor = await DocumentsRepository(
+            uuid4()
+        ).list_user_documents_page(limit=5, cursor=cursor, status_filter="completed")
+
+    query, *params = conn.fetch.call_args.args
+    assert "OFFSET" not in query
+    assert "processing_status = $2 AND (created_at, id) < ($3, $4)" in query
+    assert "processing_results" not in query
+    assert params[:2] == [6, "completed"]
+    assert len(items) == 2 and next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_contracts_page_filters_and_user_scope():
+    conn = AsyncMock()
+    conn.fetch.return_value = _rows(3)
+
+    user_id = uuid4()
+
+    with patch(
+        "app.services.repositories.contracts_repository.get_user_connection"
+    ) as get_conn:
+        get_conn.return_value.__aenter__.return_value = conn
+        items, next_cursor = await ContractsRepository(user_id).list_contracts_page(
+            contract_type="purchase_agreement", state="NSW", limit=2
+        )
+
+    query, *params = conn.fetch.call_args.args
+    # Driven from the user's documents, not the global (created_at, id) index
+    assert (
+        "content_hash IN (SELECT content_hash FROM documents WHERE user_id = $2)"
+        " AND contract_type = $3 AND state = $4"
+    ) in query
+    assert "ORDER BY created_at DESC, id DESC" in query
+    assert params == [3, user_id, "purchase_agreement", "NSW"]
+    assert len(items) == 2 and next_cursor is not None
+
+
+@pytest.mark.asyncio
+async def test_service_contracts_page_after_cursor_is_not_user_scoped():
+    conn = AsyncMock()
+    conn.fetch.return_value = _rows(1)
+    cursor_id = uuid4()
+
+    with patch(
+        "app.services.repositories.contracts_repository.get_service_role_connection"
+    ) as get_conn:
+        get_conn.return_value.__aenter__.return_value = conn
+        await ContractsRepository().list_contracts_page(
+            state="NSW", cursor=encode_cursor(NOW, cursor_id)
+        )
+
+    query, *params = conn.fetch.call_args.args
+    assert "documents" not in query
+    assert "WHERE state = $2 AND (created_at, id) < ($3, $4)" in query
+    assert params == [51, "NSW", NOW, cursor_id]
@@ -0,0 +1,63 @@
+"""
+Unit tests for bulk contract analysis running cache misses as one batch task.
+"""
+
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.router import contracts
+from app.schema.contract_analysis import ContractAnalysisResponse
+
+
+async def _fake_start(request, user, document_service, cache_service, launch_analysis):
+    document_id = request["document_id"]
+    if document_id == "cached":
+        return ContractAnalysisResponse(
+            contract_id="c-cached", analysis_id="a-cached", status="completed"
+        )
+    task_id = await launch_analysis(
+        f"c-{document_id}",
+        f"a-{document_id}",
+        str(user.id),
+        {"id": document_id},
+        request["analysis_options"],
+        f"hash-{document_id}",
+        cache_service,
+    )
+    return ContractAnalysisResponse(
+        contract_id=f"c-{document_id}",
+        analysis_id=f"a-{document_id}",
+        status="queued",
+        task_id=task_id,
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_bulk_analyze_queues_cache_misses_in_one_batch_task():
+    user = Mock(id="user-1", credits_remaining=10, subscription_status="free")
+    start_batch = AsyncMock(return_value="task-1")
+
+    with (
+        patch.object(contracts, "_start_contract_analysis", side_effect=_fake_start),
+        patch.object(contracts, "_start_batch_analysis", start_batch),
+        patch.object(contracts, "get_user_document_service", AsyncMock()),
+    ):
+        response = await contracts.bulk_contract_analysis(
+            Mock(),
+            [{"document_id": "d1"}, {"document_id": "cached"}, {"document_id": "d2"}],
+            user,
+            Mock(),
+        )
+
+    start_batch.assert_awaited_once()
+    analyses, user_id = start_batch.await_args.args
+    assert user_id == "user-1"
+    assert [a["analysis_id"] for a in analyses] == ["a-d1", "a-d2"]
+    assert analyses[0]["analysis_options"]["content_hash"] == "hash-d1"
+
+    results = json.loads(response.body)["data"]["results"]
+    assert [r["task_id"] for r in results] == ["task-1", None, "task-1"]
+    assert [r["cache_hit"] for r in results] == [False, True, False]
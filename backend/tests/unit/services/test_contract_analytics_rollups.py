@@ -0,0 +1,119 @@
+"""
+Unit tests for taxonomy analytics served from contract_daily_rollups.
+"""
+
+from datetime import date, datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.analytics.contract_analytics_service import (
+    ContractAnalyticsService,
+)
+
+BUCKETS = [
+    {
+        "contract_type": "purchase_agreement",
+        "state": "NSW",
+        "purchase_method": "auction",
+        "use_category": None,
+        "count": 6,
+    },
+    {
+        "contract_type": "purchase_agreement",
+        "state": "VIC",
+        "purchase_method": None,
+        "use_category": None,
+        "count": 2,
+    },
+    {
+        "contract_type": "lease_agreement",
+        "state": "NSW",
+        "purchase_method": None,
+        "use_category": "residential",
+        "count": 2,
+    },
+]
+
+
+def _service():
+    with patch(
+        "app.services.analytics.contract_analytics_service.ContractsRepository"
+    ) as repo_cls:
+        service = ContractAnalyticsService()
+    repo = repo_cls.return_value
+    repo.get_rollup_buckets = AsyncMock(return_value=BUCKETS)
+    repo.get_daily_rollups = AsyncMock(
+        return_value=[{**BUCKETS[0], "day": date(2024, 5, 1)}]
+    )
+    return service, repo
+
+
+@pytest.mark.asyncio
+async def test_taxonomy_analytics_aggregates_rollup_buckets():
+    service, repo = _service()
+
+    analytics = await service.get_taxonomy_analytics()
+
+    repo.get_rollup_buckets.assert_awaited_once_with()
+    stats = analytics["basic_stats"]
+    assert stats["total_contracts"] == 10
+    assert stats["by_type"] == {"purchase_agreement": 8, "lease_agreement": 2}
+    assert stats["by_state"] == {"NSW": 8, "VIC": 2}
+
+    inference = analytics["ocr_inference"]
+    assert inference["overall_inference_success_rate"] == 0.8
+    assert inference["by_contract_type"]["purchase_agreement"]["with_inference"] == 6
+    assert analytics["geographic_distribution"]["NSW"] == {
+        "total": 8,
+        "purchase_agreement": 6,
+        "purchase_auction": 6,
+        "lease_agreement": 2,
+        "lease_residential": 2,
+    }
+    assert analytics["trends"]["daily_trends"]["2024-05-01"]["total"] == 6
+    assert analytics["ocr_inference"]["low_confidence_alerts"] == []
+
+
+@pytest.mark.asyncio
+async def test_failing_section_degrades_to_empty():
+    service, repo = _service()
+    repo.get_daily_rollups.side_effect = RuntimeError("boom")
+
+    analytics = await service.get_taxonomy_analytics()
+
+    assert analytics["trends"] == {}
+    assert analytics["basic_stats"]["total_contracts"] == 10
+
+
+@pytest.mark.asyncio
+async def test_performance_insights_judge_categories_by_inference_rate():
+    service, _ = _service()
+
+    insights = await service.get_performance_insights()
+
+    # purchase_agreement infers purchase_method for 6 of 8, leases for 2 of 2
+    assert insights["improvement_opportunities"] == [
+        {
+            "category": "purchase_method",
+            "value": "purchase_agreement",
+            "inference_success_rate": 0.75,
+            "sample_count": 8,
+            "recommendation": "Improve OCR patterns for purchase_method detection",
+        }
+    ]
+    assert [c["value"] for c in insights["high_performing_categories"]] == [
+        "lease_agreement"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_date_range_limits_inference_breakdown_to_range_days():
+    service, repo = _service()
+
+    await service.get_taxonomy_analytics(
+        datetime(2024, 5, 1, 9), datetime(2024, 5, 3, 18)
+    )
+
+    repo.get_rollup_buckets.assert_any_await(date(2024, 5, 1), date(2024, 5, 3))
+    repo.get_daily_rollups.assert_awaited_once_with(date(2024, 5, 1), date(2024, 5, 3))
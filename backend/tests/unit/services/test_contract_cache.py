@@ -0,0 +1,145 @@
+"""
+Unit tests for the read-through contract cache and its repository wiring.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.models.supabase_models import Contract
+from app.services.contract_cache import ContractCache, get_contract_cache
+from app.services.repositories.contracts_repository import ContractsRepository
+
+REPO = "app.services.repositories.contracts_repository"
+NOW = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def _row(content_hash="hash"):
+    return {
+        "id": uuid4(),
+        "content_hash": content_hash,
+        "created_at": NOW,
+        "updated_at": NOW,
+        "contract_type": "purchase_agreement",
+        "extracted_entity": {"parties": ["a"]},
+    }
+
+
+def _connection(conn):
+    context = AsyncMock()
+    context.__aenter__.return_value = conn
+    return context
+
+
+@pytest.mark.asyncio
+async def test_put_after_invalidation_is_dropped():
+    cache = ContractCache()
+    contract = Contract(**_row())
+
+    missed, stamp = await cache.lookup("hash")
+    assert missed is None
+    cache.invalidate_local("hash")  # a write lands while the read is in flight
+
+    assert not await cache.put("hash", contract, stamp)
+    _, fresh_stamp = await cache.lookup("hash")
+    assert await cache.put("hash", contract, fresh_stamp)
+
+    cached, _ = await cache.lookup("hash")
+    cached.extracted_entity["parties"].append("b")
+    again, _ = await cache.lookup("hash")
+    assert again.extracted_entity == {"parties": ["a"]}
+    assert cache.stats()["stale_puts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_hit_memory_until_a_write_invalidates():
+    conn = AsyncMock()
+    conn.fetchrow.return_value = _row()
+    conn.execute.return_value = "UPDATE 1"
+    conn.transaction = MagicMock(return_value=AsyncMock())
+    repo = ContractsRepository()
+
+    with patch(
+        f"{REPO}.get_service_role_connection", side_effect=lambda: _connection(conn)
+    ):
+        first = await repo.get_contract_by_content_hash("hash")
+        second = await repo.get_contract_by_content_hash("hash")
+        assert conn.fetchrow.await_count == 1
+        assert second.id == first.id
+
+        await repo.update_section_analysis_key("hash", "conditions", {"x": 1})
+        await repo.get_contract_by_content_hash("hash")
+
+    assert conn.fetchrow.await_count == 2
+    assert get_contract_cache().stats()["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_user_id_lookup_checks_access_once():
+    service_conn, user_conn = AsyncMock(), AsyncMock()
+    row = _row()
+    service_conn.fetchrow.return_value = row
+    user_conn.fetchval.return_value = True
+
+    with (
+        patch(
+            f"{REPO}.get_service_role_connection",
+            side_effect=lambda: _connection(service_conn),
+        ),
+        patch(
+            f"{REPO}.get_user_connection", side_effect=lambda _: _connection(user_conn)
+        ),
+    ):
+        await ContractsRepository().get_contract_by_content_hash("hash")
+        repo = ContractsRepository(user_id=uuid4())
+        assert await repo.get_contract_id_by_content_hash("hash") == row["id"]
+        assert await repo.get_contract_id_by_content_hash("hash") == row["id"]
+
+    user_conn.fetchval.assert_awaited_once()
+    assert "EXISTS" in user_conn.fetchval.await_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_user_without_access_gets_rls_result():
+    service_conn, user_conn = AsyncMock(), AsyncMock()
+    service_conn.fetchrow.return_value = _row()
+    user_conn.fetchval.side_effect = [False, None]
+
+    with (
+        patch(
+            f"{REPO}.get_service_role_connection",
+            side_effect=lambda: _connection(service_conn),
+        ),
+        patch(
+            f"{REPO}.get_user_connection", side_effect=lambda _: _connection(user_conn)
+        ),
+    ):
+        await ContractsRepository().get_contract_by_content_hash("hash")
+        repo = ContractsRepository(user_id=uuid4())
+        assert await repo.get_contract_id_by_content_hash("hash") is None
+
+
+@pytest.mark.asyncio
+async def test_user_without_access_is_not_served_the_cached_contract():
+    service_conn, user_conn = AsyncMock(), AsyncMock()
+    service_conn.fetchrow.return_value = _row()
+    user_conn.fetchval.return_value = False
+    user_conn.fetchrow.return_value = None  # RLS hides the row
+
+    with (
+        patch(
+            f"{REPO}.get_service_role_connection",
+            side_effect=lambda: _connection(service_conn),
+        ),
+        patch(
+            f"{REPO}.get_user_connection", side_effect=lambda _: _connection(user_conn)
+        ),
+    ):
+        await ContractsRepository().get_contract_by_content_hash("hash")
+        repo = ContractsRepository(user_id=uuid4())
+        assert await repo.get_contract_by_content_hash("hash") is None
+
+    user_conn.fetchrow.assert_awaited_once()
+    assert service_conn.fetchrow.await_count == 1
@@ -113,3 +113,87 @@ async def test_generate_content_with_parser_all_attempts_fail_returns_last_resul
     assert hasattr(result, "success") and result.success is False
     assert result.parsed_data is None
     assert client.calls == 3
+
+
+class _StubStreamingClient:
+    """Stub client that streams each response in small chunks through on_chunk."""
+
+    def __init__(self, responses: list[str], chunk_size: int = 8):
+        self._responses = list(responses)
+        self._chunk_size = chunk_size
+        self.calls: int = 0
+        self.streamed_chars: list[int] = []
+
+    async def generate_content(self, prompt: str, **kwargs: Any) -> str:
+        self.calls += 1
+        response = self._responses.pop(0)
+        on_chunk = kwargs.get("on_chunk")
+        sent = 0
+        try:
+            for i in range(0, len(response), self._chunk_size):
+                chunk = response[i : i + self._chunk_size]
+                sent += len(chunk)
+                if on_chunk is not None:
+                    await on_chunk(chunk)
+        finally:
+            self.streamed_chars.append(sent)
+        return response
+
+
+@pytest.mark.asyncio
+async def test_generate_content_stream_aborts_on_prose_and_retries():
+    """Prose instead of JSON is aborted early and the next attempt is used."""
+
+    prose = "I am sorry, but " + ("I cannot produce that analysis. " * 100)
+    valid_response = json.dumps({"name": "carol"})
+    client = _StubStreamingClient([prose, valid_response])
+
+    service = LLMService()
+    service._openai_client = client
+    parser = PydanticOutputParser(_TestModel)
+
+    result = await service.generate_content(
+        prompt="Test prompt",
+        model="gpt-4",
+        output_parser=parser,
+        parse_generation_max_attempts=1,
+        stream=True,
+    )
+
+    assert result.success is True
+    assert result.parsed_data.name == "carol"
+    assert client.calls == 2
+    # First attempt stopped well before the full prose response was consumed
+    assert client.streamed_chars[0] < len(prose) // 2
+
+
+@pytest.mark.asyncio
+async def test_generate_content_stream_publishes_partials():
+    """Each completed top-level field is published through on_partial."""
+
+    class _TwoFieldModel(BaseModel):
+        name: str
+        city: str
+
+    response = json.dumps({"name": "dave", "city": "Sydney"})
+    client = _StubStreamingClient([response], chunk_size=4)
+
+    service = LLMService()
+    service._openai_client = client
+    partials: list[dict] = []
+
+    async def _on_partial(partial: dict) -> None:
+        partials.append(partial)
+
+    result = await service.generate_content(
+        prompt="Test prompt",
+        model="gpt-4",
+        output_parser=PydanticOutputParser(_TwoFieldModel),
+        parse_generation_max_attempts=0,
+        stream=True,
+        on_partial=_on_partial,
+    )
+
+    assert result.success is True
+    assert partials[0] == {"name": "dave"}
+    assert partials[-1] == {"name": "dave", "city": "Sydney"}
@@ -0,0 +1,90 @@
+"""
+Unit tests for the coalescing progress write-behind buffer.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.progress_write_buffer import ProgressWriteBuffer
+
+REPO = "app.services.progress_write_buffer.AnalysisProgressRepository"
+
+
+def _progress(percent, step="step", status="in_progress"):
+    return {"current_step": step, "progress_percent": percent, "status": status}
+
+
+@pytest.mark.asyncio
+async def test_ticks_within_interval_coalesce_to_latest():
+    buffer = ProgressWriteBuffer(flush_interval_seconds=60)
+    user_id = str(uuid4())
+    with patch(REPO) as repo_cls:
+        upsert = repo_cls.return_value.upsert_progress = AsyncMock(return_value=True)
+
+        await buffer.record_progress("hash", user_id, _progress(5, "queued"))
+        for percent in (10, 30, 20):
+            await buffer.record_progress("hash", user_id, _progress(percent))
+        assert upsert.await_count == 1  # first update is written straight away
+        assert buffer.latest_percent("hash", user_id) == 30
+
+        await buffer.flush_user(user_id)
+
+    assert upsert.await_count == 2
+    assert upsert.await_args.args[2]["progress_percent"] == 30
+    assert buffer.stats()["pending_progress"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pending_progress_written_once_interval_passes():
+    buffer = ProgressWriteBuffer(flush_interval_seconds=0.05)
+    user_id = str(uuid4())
+    with patch(REPO) as repo_cls:
+        upsert = repo_cls.return_value.upsert_progress = AsyncMock(return_value=True)
+
+        await buffer.record_progress("hash", user_id, _progress(5, "queued"))
+        await buffer.record_progress("hash", user_id, _progress(40))
+        assert upsert.await_count == 1
+
+        # No further update arrives; the deadline timer writes the latest value
+        await asyncio.sleep(0.1)
+
+    assert upsert.await_count == 2
+    assert upsert.await_args.args[2]["progress_percent"] == 40
+    assert buffer.stats()["pending_progress"] == 0
+
+
+@pytest.mark.asyncio
+async def test_terminal_progress_written_immediately_with_retry():
+    buffer = ProgressWriteBuffer(flush_interval_seconds=60)
+    user_id = str(uuid4())
+    with (
+        patch(REPO) as repo_cls,
+        patch("app.services.progress_write_buffer.TERMINAL_RETRY_DELAY_SECONDS", 0),
+    ):
+        upsert = repo_cls.return_value.upsert_progress = AsyncMock(
+            side_effect=[True, False, True]
+        )
+        await buffer.record_progress("hash", user_id, _progress(50))
+
+        ok = await buffer.record_progress(
+            "hash", user_id, _progress(100, "analysis_complete", "completed")
+        )
+
+    assert ok
+    assert upsert.await_count == 3
+    assert upsert.await_args.args[2]["status"] == "completed"
+    assert buffer.latest_percent("hash", user_id) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_write_stays_pending():
+    buffer = ProgressWriteBuffer(flush_interval_seconds=0)
+    user_id = str(uuid4())
+    with patch(REPO) as repo_cls:
+        repo_cls.return_value.upsert_progress = AsyncMock(return_value=False)
+        assert not await buffer.record_progress("hash", user_id, _progress(40))
+
+    assert buffer.stats()["pending_progress"] == 1
@@ -0,0 +1,137 @@
+"""
+Unit tests for Step 2 clause retrieval
+"""
+
+from pathlib import Path
+
+import pytest
+
+from app.core.prompts import ContextType, PromptContext
+from app.core.prompts.composer import PromptComposer
+from app.utils.clause_retrieval import (
+    ClauseIndex,
+    build_section_context,
+    select_clauses,
+    split_clauses,
+)
+
+PROMPTS_DIR = Path(__file__).parents[3] / "app" / "prompts"
+
+FILLER = "The parties acknowledge the general provisions of this agreement. " * 4
+
+CONTRACT = f"""--- Page 1 ---
+1. Parties
+The vendor is Jane Citizen and the purchaser is John Smith.
+{FILLER}
+2. Price
+The purchase price is $850,000. A deposit of 10% is payable on exchange.
+{FILLER}
+--- Page 2 ---
+3. Finance
+This contract is subject to finance approval within 21 days. See clause 5.
+{FILLER}
+4. Settlement
+Settlement occurs 42 days after the contract date at the vendor's bank.
+{FILLER}
+5. Termination
+If finance approval is not obtained the purchaser may terminate by notice.
+{FILLER}
+"""
+
+
+class TestSplitClauses:
+    @pytest.mark.unit
+    def test_clauses_tagged_with_heading_and_page(self):
+        clauses = split_clauses(CONTRACT)
+
+        assert [c.clause_id for c in clauses] == ["1", "2", "3", "4", "5"]
+        assert [c.page_number for c in clauses] == [1, 1, 2, 2, 2]
+        assert clauses[1].text.startswith("2. Price")
+
+    @pytest.mark.unit
+    def test_unstructured_text_still_splits(self):
+        text = "\n\n".join(["word " * 60] * 3)
+        clauses = split_clauses(text)
+        assert len(clauses) == 3
+        assert all(c.clause_id is None and c.page_number is None for c in clauses)
+
+
+class TestSelectClauses:
+    @pytest.mark.unit
+    def test_ranked_hits_then_cross_references(self):
+        index = ClauseIndex(split_clauses(CONTRACT))
+        selected = select_clauses(index, "within 21 days", max_chars=1100)
+
+        assert [(c["clause_id"], c["via"]) for c in selected] == [
+            ("3", "bm25"),
+            ("4", "bm25"),
+            ("5", "cross_reference"),
+        ]
+
+    @pytest.mark.unit
+    def test_budget_is_respected(self):
+        index = ClauseIndex(split_clauses(CONTRACT))
+        selected = select_clauses(index, "purchase price deposit", max_chars=400)
+
+        assert [c["clause_id"] for c in selected] == ["2"]
+        assert sum(len(c["text"]) for c in selected) <= 400
+
+
+class TestBuildSectionContext:
+    @pytest.mark.unit
+    def test_sections_get_their_own_slices(self):
+        seeds = {
+            "snippets": {
+                "settlement_logistics": [
+                    {"section_key": "settlement_logistics", "snippet_text": "42 days"}
+                ]
+            }
+        }
+        context = build_section_context(CONTRACT, seeds, max_chars=400)
+
+        assert context["financial_terms"][0]["clause_id"] == "2"
+        assert context["settlement_logistics"][0]["clause_id"] == "4"
+        assert build_section_context("") == {}
+
+
+class TestStep2PromptEvidence:
+    """Retrieved clauses replace the seed / full-text context in Step 2 prompts."""
+
+    VARIABLES = {
+        "analysis_timestamp": "2024-05-01T00:00:00Z",
+        "australian_state": "NSW",
+        "contract_type": "purchase_agreement",
+        "contract_text": "FULL-CONTRACT-TEXT",
+        "extracted_entity": {},
+        "legal_requirements_matrix": {},
+        "seed_snippets": [{"snippet_text": "SEED-SNIPPET"}],
+    }
+
+    def _render(self, composition, retrieved_clauses):
+        composer = PromptComposer(PROMPTS_DIR, PROMPTS_DIR / "config")
+        context = PromptContext(
+            context_type=ContextType.ANALYSIS,
+            variables={**self.VARIABLES, "retrieved_clauses": retrieved_clauses},
+        )
+        return composer.compose(composition, context).user_content
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "composition", ["step2_title_encumbrances", "step2_conditions"]
+    )
+    def test_clauses_replace_seeds_and_full_text(self, composition):
+        clauses = [{"clause_id": "7", "text": "RETRIEVED-CLAUSE"}]
+
+        with_clauses = self._render(composition, clauses)
+        assert "RETRIEVED-CLAUSE" in with_clauses
+        assert "SEED-SNIPPET" not in with_clauses
+        assert "FULL-CONTRACT-TEXT" not in with_clauses
+
+        without = self._render(composition, None)
+        assert "SEED-SNIPPET" in without
+        assert "Retrieved Clauses" not in without
+
+    @pytest.mark.unit
+    def test_full_text_is_the_fallback_for_title(self):
+        rendered = self._render("step2_title_encumbrances", None)
+        assert rendered.count("FULL-CONTRACT-TEXT") == 1
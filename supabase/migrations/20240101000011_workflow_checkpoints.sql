@@ -0,0 +1,52 @@
+-- LangGraph workflow checkpoints for node-granular resume
+-- (written by backend/app/agents/checkpointer.py via the service-role pool)
+
+CREATE TABLE workflow_checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    checkpoint_type TEXT NOT NULL,
+    checkpoint BYTEA NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BYTEA NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+
+-- Channel values, one row per (channel, version): a checkpoint only adds rows
+-- for the channels that changed in its superstep
+CREATE TABLE workflow_checkpoint_blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BYTEA,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+
+-- Pending writes of tasks completed within a (possibly interrupted) superstep
+CREATE TABLE workflow_checkpoint_writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BYTEA NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+
+CREATE INDEX idx_workflow_checkpoints_thread_created ON workflow_checkpoints(thread_id, created_at DESC);
+CREATE INDEX idx_workflow_checkpoint_blobs_thread ON workflow_checkpoint_blobs(thread_id);
+CREATE INDEX idx_workflow_checkpoint_writes_thread ON workflow_checkpoint_writes(thread_id);
+
+-- Service role only: no policies for end users
+ALTER TABLE workflow_checkpoints ENABLE ROW LEVEL SECURITY;
+ALTER TABLE workflow_checkpoint_blobs ENABLE ROW LEVEL SECURITY;
+ALTER TABLE workflow_checkpoint_writes ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,22 @@
+-- Per-node timing traces of contract analysis runs
+-- (written by RunsRepository.save_analysis_trace; export with
+-- backend/scripts/export_analysis_trace.py)
+
+CREATE TABLE analysis_traces (
+    analysis_id UUID PRIMARY KEY REFERENCES analyses(id) ON DELETE CASCADE,
+    user_id UUID REFERENCES profiles(id),
+    content_hash VARCHAR(64) NOT NULL,
+    trace JSONB NOT NULL,
+    span_count INTEGER NOT NULL DEFAULT 0,
+    duration_ms INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX idx_analysis_traces_content_hash ON analysis_traces(content_hash, created_at DESC);
+
+ALTER TABLE analysis_traces ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can access their own analysis traces" ON analysis_traces
+    FOR ALL USING (user_id = auth.uid());
+CREATE POLICY "Service role can access all analysis traces" ON analysis_traces
+    FOR ALL USING (auth.jwt() ->> 'role' = 'service_role');
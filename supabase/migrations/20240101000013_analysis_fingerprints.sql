@@ -0,0 +1,9 @@
+-- Input fingerprints of the workflow nodes that produced each per-section
+-- analysis column (see backend/app/agents/node_fingerprint.py). A cached
+-- column is reused on re-analysis only while its fingerprint still matches.
+
+ALTER TABLE contracts
+    ADD COLUMN IF NOT EXISTS analysis_fingerprints JSONB NOT NULL DEFAULT '{}'::jsonb;
+
+COMMENT ON COLUMN contracts.analysis_fingerprints IS
+    'Per analysis column: {fingerprint, inputs, composition, model} of the node that wrote it';
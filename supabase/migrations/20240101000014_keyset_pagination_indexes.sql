@@ -0,0 +1,25 @@
+-- Composite indexes for keyset (created_at, id) pagination of document and
+-- contract listings (see backend/app/utils/pagination.py). Each matches a
+-- page query's equality filter followed by its ORDER BY created_at DESC,
+-- id DESC, so a page is a bounded index range scan at any depth.
+
+-- Documents: the RLS predicate (auth.uid() = user_id) is the leading column
+CREATE INDEX IF NOT EXISTS idx_documents_user_created_id
+    ON documents (user_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_documents_user_status_created_id
+    ON documents (user_id, processing_status, created_at DESC, id DESC);
+
+-- Contracts: covering the slim list projection (CONTRACT_LIST_ITEM_COLUMNS)
+-- so listings can be answered with index-only scans
+CREATE INDEX IF NOT EXISTS idx_contracts_created_id
+    ON contracts (created_at DESC, id DESC)
+    INCLUDE (content_hash, contract_type, purchase_method, use_category, state, updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_contracts_type_created_id
+    ON contracts (contract_type, created_at DESC, id DESC)
+    INCLUDE (content_hash, purchase_method, use_category, state, updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_contracts_state_created_id
+    ON contracts (state, created_at DESC, id DESC)
+    INCLUDE (content_hash, contract_type, purchase_method, use_category, updated_at);
@@ -0,0 +1,123 @@
+-- Daily contract counts per taxonomy bucket, read by ContractAnalyticsService
+-- instead of aggregating the whole contracts table on every dashboard load.
+--
+-- Maintained incrementally by a trigger on contracts (insert, delete, and
+-- updates of the bucket columns). refresh_contract_daily_rollups(p_since)
+-- recomputes days from p_since onwards from contracts; the periodic
+-- app.tasks.cleanup_tasks.refresh_contract_rollups job runs it over a short
+-- trailing window to reconcile any drift.
+
+CREATE TABLE contract_daily_rollups (
+    day DATE NOT NULL,
+    contract_type contract_type,
+    state australian_state,
+    purchase_method purchase_method,
+    use_category use_category,
+    contract_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    CONSTRAINT contract_daily_rollups_bucket
+        UNIQUE NULLS NOT DISTINCT (day, contract_type, state, purchase_method, use_category)
+);
+
+ALTER TABLE contract_daily_rollups ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role can access contract rollups" ON contract_daily_rollups
+    FOR ALL USING (auth.jwt() ->> 'role' = 'service_role');
+
+-- Add delta to one bucket
+CREATE OR REPLACE FUNCTION bump_contract_daily_rollup(
+    p_day DATE,
+    p_contract_type contract_type,
+    p_state australian_state,
+    p_purchase_method purchase_method,
+    p_use_category use_category,
+    p_delta BIGINT
+)
+RETURNS VOID
+LANGUAGE sql
+SECURITY DEFINER SET search_path = public, pg_temp
+AS $$
+    INSERT INTO contract_daily_rollups (
+        day, contract_type, state, purchase_method, use_category, contract_count
+    ) VALUES (
+        p_day, p_contract_type, p_state, p_purchase_method, p_use_category, p_delta
+    )
+    ON CONFLICT ON CONSTRAINT contract_daily_rollups_bucket DO UPDATE SET
+        contract_count = contract_daily_rollups.contract_count + EXCLUDED.contract_count,
+        updated_at = NOW();
+$$;
+
+CREATE OR REPLACE FUNCTION maintain_contract_daily_rollups()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER SET search_path = public, pg_temp
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_contract_daily_rollup(
+            (OLD.created_at AT TIME ZONE 'UTC')::date,
+            OLD.contract_type, OLD.state, OLD.purchase_method, OLD.use_category, -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_contract_daily_rollup(
+            (NEW.created_at AT TIME ZONE 'UTC')::date,
+            NEW.contract_type, NEW.state, NEW.purchase_method, NEW.use_category, 1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER maintain_contract_daily_rollups_insert_delete
+    AFTER INSERT OR DELETE ON contracts
+    FOR EACH ROW EXECUTE FUNCTION maintain_contract_daily_rollups();
+
+CREATE TRIGGER maintain_contract_daily_rollups_update
+    AFTER UPDATE OF contract_type, state, purchase_method, use_category ON contracts
+    FOR EACH ROW
+    WHEN (
+        OLD.contract_type IS DISTINCT FROM NEW.contract_type
+        OR OLD.state IS DISTINCT FROM NEW.state
+        OR OLD.purchase_method IS DISTINCT FROM NEW.purchase_method
+        OR OLD.use_category IS DISTINCT FROM NEW.use_category
+    )
+    EXECUTE FUNCTION maintain_contract_daily_rollups();
+
+-- Recompute buckets for days >= p_since (NULL: all days). The lock holds back
+-- concurrent trigger bumps until the recomputed rows are committed, so a
+-- contract is counted exactly once either way.
+CREATE OR REPLACE FUNCTION refresh_contract_daily_rollups(p_since DATE DEFAULT NULL)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER SET search_path = public, pg_temp
+AS $$
+DECLARE
+    v_buckets INTEGER;
+BEGIN
+    LOCK TABLE contract_daily_rollups IN SHARE ROW EXCLUSIVE MODE;
+
+    DELETE FROM contract_daily_rollups
+    WHERE p_since IS NULL OR day >= p_since;
+
+    INSERT INTO contract_daily_rollups (
+        day, contract_type, state, purchase_method, use_category, contract_count
+    )
+    SELECT (created_at AT TIME ZONE 'UTC')::date,
+           contract_type, state, purchase_method, use_category, COUNT(*)
+    FROM contracts
+    WHERE p_since IS NULL OR created_at >= (p_since::timestamp AT TIME ZONE 'UTC')
+    GROUP BY 1, 2, 3, 4, 5;
+
+    GET DIAGNOSTICS v_buckets = ROW_COUNT;
+    RETURN v_buckets;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION refresh_contract_daily_rollups(DATE) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION bump_contract_daily_rollup(
+    DATE, contract_type, australian_state, purchase_method, use_category, BIGINT
+) FROM PUBLIC, anon, authenticated;
+
+-- Backfill
+SELECT refresh_contract_daily_rollups(NULL);
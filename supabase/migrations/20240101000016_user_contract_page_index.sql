@@ -0,0 +1,11 @@
+-- User-scoped contract listings (ContractsRepository.list_contracts_page with
+-- a user_id) select the user's contracts through their documents:
+--
+--   content_hash IN (SELECT content_hash FROM documents WHERE user_id = $2)
+--
+-- This index answers that subquery with an index-only scan of the user's own
+-- documents; each hash then resolves through the unique contracts.content_hash
+-- index. A page costs the user's document count, not a walk of the global
+-- idx_contracts_created_id with RLS discarding other users' contracts.
+CREATE INDEX IF NOT EXISTS idx_documents_user_content_hash
+    ON documents (user_id, content_hash);